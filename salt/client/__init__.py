@@ -170,6 +170,11 @@ class LocalClient(object):
                 listen=False,
                 io_loop=io_loop,
                 keep_loop=keep_loop)
+        # The jobs whose events the event publisher sends this client
+        self.event_jids = set()
+        # Whether the event publisher sends all events while a job is
+        # published
+        self.event_filter_lifted = False
         self.utils = salt.loader.utils(self.opts)
         self.functions = salt.loader.minion_mods(self.opts, utils=self.utils)
         self.returners = salt.loader.returners(self.opts, self.functions)
@@ -245,9 +250,44 @@ class LocalClient(object):
 
         if 'jid' in pub_data:
             self.event.subscribe(pub_data['jid'])
+            self._filter_job_events(pub_data['jid'])
 
         return pub_data
 
+    def _filter_job_events(self, *jids, **kwargs):
+        '''
+        Have the event publisher send this client the events of the passed
+        jobs, or stop sending them with ``remove=True``. While the client
+        waits for any job, the events of all other jobs are not sent to it.
+        '''
+        remove = kwargs.get('remove', False)
+        event_jids = set(self.event_jids)
+        for jid in jids:
+            if not jid:
+                continue
+            if remove:
+                event_jids.discard(jid)
+            else:
+                event_jids.add(jid)
+        if event_jids == self.event_jids and not self.event_filter_lifted:
+            return
+        self.event_jids = event_jids
+        self.event_filter_lifted = False
+        prefixes = ['salt/job/{0}/'.format(jid) for jid in sorted(event_jids)]
+        if prefixes and self.opts.get('order_masters'):
+            prefixes.append('syndic/')
+        self.event.set_publish_filter(prefixes)
+
+    def _lift_job_event_filter(self):
+        '''
+        Have the event publisher send this client all events until the next
+        call to _filter_job_events, so that none of the events of a job being
+        published are dropped before its jid is known
+        '''
+        if self.event_jids and not self.event_filter_lifted:
+            self.event.set_publish_filter([])
+            self.event_filter_lifted = True
+
     def _check_pub_data(self, pub_data, listen=True):
         '''
         Common checks on the pub_data data structure returned from running pub
@@ -291,6 +331,7 @@ class LocalClient(object):
             self.event.subscribe('syndic/.*/{0}'.format(pub_data['jid']), 'regex')
 
         self.event.subscribe('salt/job/{0}'.format(pub_data['jid']))
+        self._filter_job_events(pub_data['jid'])
 
         return pub_data
 
@@ -825,18 +866,20 @@ class LocalClient(object):
             if not pub_data:
                 yield pub_data
             else:
-                if kwargs.get('yield_pub_data'):
-                    yield pub_data
-                for fn_ret in self.get_iter_returns(pub_data['jid'],
-                                                    pub_data['minions'],
-                                                    timeout=self._get_timeout(timeout),
-                                                    tgt=tgt,
-                                                    tgt_type=tgt_type,
-                                                    **kwargs):
-                    if not fn_ret:
-                        continue
-                    yield fn_ret
-                self._clean_up_subscriptions(pub_data['jid'])
+                try:
+                    if kwargs.get('yield_pub_data'):
+                        yield pub_data
+                    for fn_ret in self.get_iter_returns(pub_data['jid'],
+                                                        pub_data['minions'],
+                                                        timeout=self._get_timeout(timeout),
+                                                        tgt=tgt,
+                                                        tgt_type=tgt_type,
+                                                        **kwargs):
+                        if not fn_ret:
+                            continue
+                        yield fn_ret
+                finally:
+                    self._clean_up_subscriptions(pub_data['jid'])
         finally:
             if not was_listening:
                 self.event.close_pub()
@@ -892,19 +935,20 @@ class LocalClient(object):
             if not pub_data:
                 yield pub_data
             else:
-                for fn_ret in self.get_iter_returns(pub_data['jid'],
-                                                    pub_data['minions'],
-                                                    timeout=timeout,
-                                                    tgt=tgt,
-                                                    tgt_type=tgt_type,
-                                                    block=False,
-                                                    **kwargs):
-                    if fn_ret and any([show_jid, verbose]):
-                        for minion in fn_ret:
-                            fn_ret[minion]['jid'] = pub_data['jid']
-                    yield fn_ret
-
-                self._clean_up_subscriptions(pub_data['jid'])
+                try:
+                    for fn_ret in self.get_iter_returns(pub_data['jid'],
+                                                        pub_data['minions'],
+                                                        timeout=timeout,
+                                                        tgt=tgt,
+                                                        tgt_type=tgt_type,
+                                                        block=False,
+                                                        **kwargs):
+                        if fn_ret and any([show_jid, verbose]):
+                            for minion in fn_ret:
+                                fn_ret[minion]['jid'] = pub_data['jid']
+                        yield fn_ret
+                finally:
+                    self._clean_up_subscriptions(pub_data['jid'])
         finally:
             if not was_listening:
                 self.event.close_pub()
@@ -981,25 +1025,28 @@ class LocalClient(object):
         # start this before the cache lookup-- in case new stuff comes in
         event_iter = self.get_event_iter_returns(jid, minions, timeout=timeout)
 
-        # get the info from the cache
-        ret = self.get_cache_returns(jid)
-        if ret != {}:
-            found.update(set(ret))
-            yield ret
-
-        # if you have all the returns, stop
-        if len(found.intersection(minions)) >= len(minions):
-            raise StopIteration()
+        try:
+            # get the info from the cache
+            ret = self.get_cache_returns(jid)
+            if ret != {}:
+                found.update(set(ret))
+                yield ret
 
-        # otherwise, get them from the event system
-        for event in event_iter:
-            if event != {}:
-                found.update(set(event))
-                yield event
+            # if you have all the returns, stop
             if len(found.intersection(minions)) >= len(minions):
-                self._clean_up_subscriptions(jid)
                 raise StopIteration()
 
+            # otherwise, get them from the event system
+            for event in event_iter:
+                if event != {}:
+                    found.update(set(event))
+                    yield event
+                if len(found.intersection(minions)) >= len(minions):
+                    self._clean_up_subscriptions(jid)
+                    raise StopIteration()
+        finally:
+            event_iter.close()
+
     # TODO: tests!!
     def get_returns_no_block(
             self,
@@ -1062,171 +1109,182 @@ class LocalClient(object):
             log.warning('Returner unavailable: %s', exc)
         # Wait for the hosts to check in
         last_time = False
-        # iterator for this job's return
-        if self.opts['order_masters']:
-            # If we are a MoM, we need to gather expected minions from downstreams masters.
-            ret_iter = self.get_returns_no_block('(salt/job|syndic/.*)/{0}'.format(jid), 'regex')
-        else:
-            ret_iter = self.get_returns_no_block('salt/job/{0}'.format(jid))
-        # iterator for the info of this job
-        jinfo_iter = []
+        # Only stop the events of the jid being sent again if they were not
+        # sent before, e.g. since _check_pub_data
+        filtered = jid in self.event_jids
+        self._filter_job_events(jid)
         # open event jids that need to be un-subscribed from later
         open_jids = set()
-        timeout_at = time.time() + timeout
-        gather_syndic_wait = time.time() + self.opts['syndic_wait']
-        # are there still minions running the job out there
-        # start as True so that we ping at least once
-        minions_running = True
-        log.debug(
-            'get_iter_returns for jid %s sent to %s will timeout at %s',
-            jid, minions, datetime.fromtimestamp(timeout_at).time()
-        )
-        while True:
-            # Process events until timeout is reached or all minions have returned
-            for raw in ret_iter:
-                # if we got None, then there were no events
-                if raw is None:
-                    break
-                if 'minions' in raw.get('data', {}):
-                    minions.update(raw['data']['minions'])
-                    if 'missing' in raw.get('data', {}):
-                        missing.extend(raw['data']['missing'])
-                    continue
-                if 'return' not in raw['data']:
-                    continue
-                if kwargs.get('raw', False):
-                    found.add(raw['data']['id'])
-                    yield raw
-                else:
-                    found.add(raw['data']['id'])
-                    ret = {raw['data']['id']: {'ret': raw['data']['return']}}
-                    if 'out' in raw['data']:
-                        ret[raw['data']['id']]['out'] = raw['data']['out']
-                    if 'retcode' in raw['data']:
-                        ret[raw['data']['id']]['retcode'] = raw['data']['retcode']
-                    if 'jid' in raw['data']:
-                        ret[raw['data']['id']]['jid'] = raw['data']['jid']
-                    if kwargs.get('_cmd_meta', False):
-                        ret[raw['data']['id']].update(raw['data'])
-                    log.debug('jid %s return from %s', jid, raw['data']['id'])
-                    yield ret
-
-            # if we have all of the returns (and we aren't a syndic), no need for anything fancy
-            if len(found.intersection(minions)) >= len(minions) and not self.opts['order_masters']:
-                # All minions have returned, break out of the loop
-                log.debug('jid %s found all minions %s', jid, found)
-                break
-            elif len(found.intersection(minions)) >= len(minions) and self.opts['order_masters']:
-                if len(found) >= len(minions) and len(minions) > 0 and time.time() > gather_syndic_wait:
-                    # There were some minions to find and we found them
-                    # However, this does not imply that *all* masters have yet responded with expected minion lists.
-                    # Therefore, continue to wait up to the syndic_wait period (calculated in gather_syndic_wait) to see
-                    # if additional lower-level masters deliver their lists of expected
-                    # minions.
-                    break
-            # If we get here we may not have gathered the minion list yet. Keep waiting
-            # for all lower-level masters to respond with their minion lists
-
-            # let start the timeouts for all remaining minions
-
-            for id_ in minions - found:
-                # if we have a new minion in the list, make sure it has a timeout
-                if id_ not in minion_timeouts:
-                    minion_timeouts[id_] = time.time() + timeout
-
-            # if the jinfo has timed out and some minions are still running the job
-            # re-do the ping
-            if time.time() > timeout_at and minions_running:
-                # since this is a new ping, no one has responded yet
-                jinfo = self.gather_job_info(jid, list(minions - found), 'list', **kwargs)
-                minions_running = False
-                # if we weren't assigned any jid that means the master thinks
-                # we have nothing to send
-                if 'jid' not in jinfo:
-                    jinfo_iter = []
-                else:
-                    jinfo_iter = self.get_returns_no_block('salt/job/{0}'.format(jinfo['jid']))
-                timeout_at = time.time() + gather_job_timeout
-                # if you are a syndic, wait a little longer
-                if self.opts['order_masters']:
-                    timeout_at += self.opts.get('syndic_wait', 1)
-
-            # check for minions that are running the job still
-            for raw in jinfo_iter:
-                # if there are no more events, lets stop waiting for the jinfo
-                if raw is None:
-                    break
-                try:
-                    if raw['data']['retcode'] > 0:
-                        log.error('saltutil returning errors on minion %s', raw['data']['id'])
-                        minions.remove(raw['data']['id'])
+        try:
+            # iterator for this job's return
+            if self.opts['order_masters']:
+                # If we are a MoM, we need to gather expected minions from downstreams masters.
+                ret_iter = self.get_returns_no_block('(salt/job|syndic/.*)/{0}'.format(jid), 'regex')
+            else:
+                ret_iter = self.get_returns_no_block('salt/job/{0}'.format(jid))
+            # iterator for the info of this job
+            jinfo_iter = []
+            timeout_at = time.time() + timeout
+            gather_syndic_wait = time.time() + self.opts['syndic_wait']
+            # are there still minions running the job out there
+            # start as True so that we ping at least once
+            minions_running = True
+            log.debug(
+                'get_iter_returns for jid %s sent to %s will timeout at %s',
+                jid, minions, datetime.fromtimestamp(timeout_at).time()
+            )
+            while True:
+                # Process events until timeout is reached or all minions have returned
+                for raw in ret_iter:
+                    # if we got None, then there were no events
+                    if raw is None:
                         break
-                except KeyError as exc:
-                    # This is a safe pass. We're just using the try/except to
-                    # avoid having to deep-check for keys.
-                    missing_key = exc.__str__().strip('\'"')
-                    if missing_key == 'retcode':
-                        log.debug('retcode missing from client return')
+                    if 'minions' in raw.get('data', {}):
+                        minions.update(raw['data']['minions'])
+                        if 'missing' in raw.get('data', {}):
+                            missing.extend(raw['data']['missing'])
+                        continue
+                    if 'return' not in raw['data']:
+                        continue
+                    if kwargs.get('raw', False):
+                        found.add(raw['data']['id'])
+                        yield raw
                     else:
-                        log.debug(
-                            'Passing on saltutil error. Key \'%s\' missing '
-                            'from client return. This may be an error in '
-                            'the client.', missing_key
-                        )
-                # Keep track of the jid events to unsubscribe from later
-                open_jids.add(jinfo['jid'])
-
-                # TODO: move to a library??
-                if 'minions' in raw.get('data', {}):
-                    minions.update(raw['data']['minions'])
-                    continue
-                if 'syndic' in raw.get('data', {}):
-                    minions.update(raw['syndic'])
-                    continue
-                if 'return' not in raw.get('data', {}):
-                    continue
-
-                # if the job isn't running there anymore... don't count
-                if raw['data']['return'] == {}:
-                    continue
+                        found.add(raw['data']['id'])
+                        ret = {raw['data']['id']: {'ret': raw['data']['return']}}
+                        if 'out' in raw['data']:
+                            ret[raw['data']['id']]['out'] = raw['data']['out']
+                        if 'retcode' in raw['data']:
+                            ret[raw['data']['id']]['retcode'] = raw['data']['retcode']
+                        if 'jid' in raw['data']:
+                            ret[raw['data']['id']]['jid'] = raw['data']['jid']
+                        if kwargs.get('_cmd_meta', False):
+                            ret[raw['data']['id']].update(raw['data'])
+                        log.debug('jid %s return from %s', jid, raw['data']['id'])
+                        yield ret
+
+                # if we have all of the returns (and we aren't a syndic), no need for anything fancy
+                if len(found.intersection(minions)) >= len(minions) and not self.opts['order_masters']:
+                    # All minions have returned, break out of the loop
+                    log.debug('jid %s found all minions %s', jid, found)
+                    break
+                elif len(found.intersection(minions)) >= len(minions) and self.opts['order_masters']:
+                    if len(found) >= len(minions) and len(minions) > 0 and time.time() > gather_syndic_wait:
+                        # There were some minions to find and we found them
+                        # However, this does not imply that *all* masters have yet responded with expected minion lists.
+                        # Therefore, continue to wait up to the syndic_wait period (calculated in gather_syndic_wait) to see
+                        # if additional lower-level masters deliver their lists of expected
+                        # minions.
+                        break
+                # If we get here we may not have gathered the minion list yet. Keep waiting
+                # for all lower-level masters to respond with their minion lists
 
-                if 'return' in raw['data']['return'] and \
-                    raw['data']['return']['return'] == {}:
-                    continue
+                # let start the timeouts for all remaining minions
 
-                # if we didn't originally target the minion, lets add it to the list
-                if raw['data']['id'] not in minions:
-                    minions.add(raw['data']['id'])
-                # update this minion's timeout, as long as the job is still running
-                minion_timeouts[raw['data']['id']] = time.time() + timeout
-                # a minion returned, so we know its running somewhere
-                minions_running = True
-
-            # if we have hit gather_job_timeout (after firing the job) AND
-            # if we have hit all minion timeouts, lets call it
-            now = time.time()
-            # if we have finished waiting, and no minions are running the job
-            # then we need to see if each minion has timedout
-            done = (now > timeout_at) and not minions_running
-            if done:
-                # if all minions have timeod out
                 for id_ in minions - found:
-                    if now < minion_timeouts[id_]:
-                        done = False
+                    # if we have a new minion in the list, make sure it has a timeout
+                    if id_ not in minion_timeouts:
+                        minion_timeouts[id_] = time.time() + timeout
+
+                # if the jinfo has timed out and some minions are still running the job
+                # re-do the ping
+                if time.time() > timeout_at and minions_running:
+                    # since this is a new ping, no one has responded yet
+                    jinfo = self.gather_job_info(jid, list(minions - found), 'list', **kwargs)
+                    if 'jid' in jinfo:
+                        # Stop the events of the find_job job being sent later,
+                        # whether or not any of them came in
+                        open_jids.add(jinfo['jid'])
+                    minions_running = False
+                    # if we weren't assigned any jid that means the master thinks
+                    # we have nothing to send
+                    if 'jid' not in jinfo:
+                        jinfo_iter = []
+                    else:
+                        jinfo_iter = self.get_returns_no_block('salt/job/{0}'.format(jinfo['jid']))
+                    timeout_at = time.time() + gather_job_timeout
+                    # if you are a syndic, wait a little longer
+                    if self.opts['order_masters']:
+                        timeout_at += self.opts.get('syndic_wait', 1)
+
+                # check for minions that are running the job still
+                for raw in jinfo_iter:
+                    # if there are no more events, lets stop waiting for the jinfo
+                    if raw is None:
                         break
-            if done:
-                break
+                    try:
+                        if raw['data']['retcode'] > 0:
+                            log.error('saltutil returning errors on minion %s', raw['data']['id'])
+                            minions.remove(raw['data']['id'])
+                            break
+                    except KeyError as exc:
+                        # This is a safe pass. We're just using the try/except to
+                        # avoid having to deep-check for keys.
+                        missing_key = exc.__str__().strip('\'"')
+                        if missing_key == 'retcode':
+                            log.debug('retcode missing from client return')
+                        else:
+                            log.debug(
+                                'Passing on saltutil error. Key \'%s\' missing '
+                                'from client return. This may be an error in '
+                                'the client.', missing_key
+                            )
+                    # Keep track of the jid events to unsubscribe from later
+                    open_jids.add(jinfo['jid'])
+
+                    # TODO: move to a library??
+                    if 'minions' in raw.get('data', {}):
+                        minions.update(raw['data']['minions'])
+                        continue
+                    if 'syndic' in raw.get('data', {}):
+                        minions.update(raw['syndic'])
+                        continue
+                    if 'return' not in raw.get('data', {}):
+                        continue
 
-            # don't spin
-            if block:
-                time.sleep(0.01)
-            else:
-                yield
+                    # if the job isn't running there anymore... don't count
+                    if raw['data']['return'] == {}:
+                        continue
 
-        # If there are any remaining open events, clean them up.
-        if open_jids:
-            for jid in open_jids:
-                self.event.unsubscribe(jid)
+                    if 'return' in raw['data']['return'] and \
+                        raw['data']['return']['return'] == {}:
+                        continue
+
+                    # if we didn't originally target the minion, lets add it to the list
+                    if raw['data']['id'] not in minions:
+                        minions.add(raw['data']['id'])
+                    # update this minion's timeout, as long as the job is still running
+                    minion_timeouts[raw['data']['id']] = time.time() + timeout
+                    # a minion returned, so we know its running somewhere
+                    minions_running = True
+
+                # if we have hit gather_job_timeout (after firing the job) AND
+                # if we have hit all minion timeouts, lets call it
+                now = time.time()
+                # if we have finished waiting, and no minions are running the job
+                # then we need to see if each minion has timedout
+                done = (now > timeout_at) and not minions_running
+                if done:
+                    # if all minions have timeod out
+                    for id_ in minions - found:
+                        if now < minion_timeouts[id_]:
+                            done = False
+                            break
+                if done:
+                    break
+
+                # don't spin
+                if block:
+                    time.sleep(0.01)
+                else:
+                    yield
+        finally:
+            # If there are any remaining open events, clean them up.
+            for open_jid in open_jids:
+                self.event.unsubscribe(open_jid)
+            if not filtered:
+                open_jids.add(jid)
+            self._filter_job_events(*open_jids, remove=True)
 
         if expect_minions:
             for minion in list((minions - found)):
@@ -1305,47 +1363,50 @@ class LocalClient(object):
         event_iter = self.get_event_iter_returns(jid, minions, timeout=timeout)
 
         try:
-            data = self.returners['{0}.get_jid'.format(self.opts['master_job_cache'])](jid)
-        except Exception as exc:
-            raise SaltClientError('Returner {0} could not fetch jid data. '
-                                  'Exception details: {1}'.format(
-                                      self.opts['master_job_cache'],
-                                      exc))
-        for minion in data:
-            m_data = {}
-            if 'return' in data[minion]:
-                m_data['ret'] = data[minion].get('return')
-            else:
-                m_data['ret'] = data[minion].get('return')
-            if 'out' in data[minion]:
-                m_data['out'] = data[minion]['out']
-            if minion in ret:
-                ret[minion].update(m_data)
-            else:
-                ret[minion] = m_data
-
-        # if we have all the minion returns, lets just return
-        if len(set(ret).intersection(minions)) >= len(minions):
-            return ret
-
-        # otherwise lets use the listener we created above to get the rest
-        for event_ret in event_iter:
-            # if nothing in the event_ret, skip
-            if event_ret == {}:
-                time.sleep(0.02)
-                continue
-            for minion, m_data in six.iteritems(event_ret):
+            try:
+                data = self.returners['{0}.get_jid'.format(self.opts['master_job_cache'])](jid)
+            except Exception as exc:
+                raise SaltClientError('Returner {0} could not fetch jid data. '
+                                      'Exception details: {1}'.format(
+                                          self.opts['master_job_cache'],
+                                          exc))
+            for minion in data:
+                m_data = {}
+                if 'return' in data[minion]:
+                    m_data['ret'] = data[minion].get('return')
+                else:
+                    m_data['ret'] = data[minion].get('return')
+                if 'out' in data[minion]:
+                    m_data['out'] = data[minion]['out']
                 if minion in ret:
                     ret[minion].update(m_data)
                 else:
                     ret[minion] = m_data
 
-            # are we done yet?
+            # if we have all the minion returns, lets just return
             if len(set(ret).intersection(minions)) >= len(minions):
                 return ret
 
-        # otherwise we hit the timeout, return what we have
-        return ret
+            # otherwise lets use the listener we created above to get the rest
+            for event_ret in event_iter:
+                # if nothing in the event_ret, skip
+                if event_ret == {}:
+                    time.sleep(0.02)
+                    continue
+                for minion, m_data in six.iteritems(event_ret):
+                    if minion in ret:
+                        ret[minion].update(m_data)
+                    else:
+                        ret[minion] = m_data
+
+                # are we done yet?
+                if len(set(ret).intersection(minions)) >= len(minions):
+                    return ret
+
+            # otherwise we hit the timeout, return what we have
+            return ret
+        finally:
+            event_iter.close()
 
     def get_cache_returns(self, jid):
         '''
@@ -1484,44 +1545,45 @@ class LocalClient(object):
         connected_minions = None
         return_count = 0
 
-        for ret in self.get_iter_returns(jid,
-                                         minions,
-                                         timeout=timeout,
-                                         tgt=tgt,
-                                         tgt_type=tgt_type,
-                                         # (gtmanfred) expect_minions is popped here incase it is passed from a client
-                                         # call. If this is not popped, then it would be passed twice to
-                                         # get_iter_returns.
-                                         expect_minions=(kwargs.pop('expect_minions', False) or verbose or show_timeout),
-                                         **kwargs
-                                         ):
-            log.debug('return event: %s', ret)
-            return_count = return_count + 1
-            if progress:
+        try:
+            for ret in self.get_iter_returns(jid,
+                                             minions,
+                                             timeout=timeout,
+                                             tgt=tgt,
+                                             tgt_type=tgt_type,
+                                             # (gtmanfred) expect_minions is popped here incase it is passed from a client
+                                             # call. If this is not popped, then it would be passed twice to
+                                             # get_iter_returns.
+                                             expect_minions=(kwargs.pop('expect_minions', False) or verbose or show_timeout),
+                                             **kwargs
+                                             ):
+                log.debug('return event: %s', ret)
+                return_count = return_count + 1
+                if progress:
+                    for id_, min_ret in six.iteritems(ret):
+                        if not min_ret.get('failed') is True:
+                            yield {'minion_count': len(minions), 'return_count': return_count}
+                # replace the return structure for missing minions
                 for id_, min_ret in six.iteritems(ret):
-                    if not min_ret.get('failed') is True:
-                        yield {'minion_count': len(minions), 'return_count': return_count}
-            # replace the return structure for missing minions
-            for id_, min_ret in six.iteritems(ret):
-                if min_ret.get('failed') is True:
-                    if connected_minions is None:
-                        connected_minions = salt.utils.minions.CkMinions(self.opts).connected_ids()
-                    if self.opts['minion_data_cache'] \
-                            and salt.cache.factory(self.opts).contains('minions/{0}'.format(id_), 'data') \
-                            and connected_minions \
-                            and id_ not in connected_minions:
-
-                        yield {id_: {'out': 'no_return',
-                                     'ret': 'Minion did not return. [Not connected]'}}
-                    else:
-                        # don't report syndics as unresponsive minions
-                        if not os.path.exists(os.path.join(self.opts['syndic_dir'], id_)):
-                            yield {id_: {'out': 'no_return',
-                                         'ret': 'Minion did not return. [No response]'}}
-                else:
-                    yield {id_: min_ret}
+                    if min_ret.get('failed') is True:
+                        if connected_minions is None:
+                            connected_minions = salt.utils.minions.CkMinions(self.opts).connected_ids()
+                        if self.opts['minion_data_cache'] \
+                                and salt.cache.factory(self.opts).contains('minions/{0}'.format(id_), 'data') \
+                                and connected_minions \
+                                and id_ not in connected_minions:
 
-        self._clean_up_subscriptions(jid)
+                            yield {id_: {'out': 'no_return',
+                                         'ret': 'Minion did not return. [Not connected]'}}
+                        else:
+                            # don't report syndics as unresponsive minions
+                            if not os.path.exists(os.path.join(self.opts['syndic_dir'], id_)):
+                                yield {id_: {'out': 'no_return',
+                                             'ret': 'Minion did not return. [No response]'}}
+                    else:
+                        yield {id_: min_ret}
+        finally:
+            self._clean_up_subscriptions(jid)
 
     def get_event_iter_returns(self, jid, minions, timeout=None):
         '''
@@ -1541,24 +1603,30 @@ class LocalClient(object):
             yield {}
             # stop the iteration, since the jid is invalid
             raise StopIteration()
-        # Wait for the hosts to check in
-        while True:
-            raw = self.event.get_event(timeout, auto_reconnect=self.auto_reconnect)
-            if raw is None or time.time() > timeout_at:
-                # Timeout reached
-                break
-            if 'minions' in raw.get('data', {}):
-                continue
-            try:
-                found.add(raw['id'])
-                ret = {raw['id']: {'ret': raw['return']}}
-            except KeyError:
-                # Ignore other erroneous messages
-                continue
-            if 'out' in raw:
-                ret[raw['id']]['out'] = raw['out']
-            yield ret
-            time.sleep(0.02)
+        filtered = jid in self.event_jids
+        self._filter_job_events(jid)
+        try:
+            # Wait for the hosts to check in
+            while True:
+                raw = self.event.get_event(timeout, auto_reconnect=self.auto_reconnect)
+                if raw is None or time.time() > timeout_at:
+                    # Timeout reached
+                    break
+                if 'minions' in raw.get('data', {}):
+                    continue
+                try:
+                    found.add(raw['id'])
+                    ret = {raw['id']: {'ret': raw['return']}}
+                except KeyError:
+                    # Ignore other erroneous messages
+                    continue
+                if 'out' in raw:
+                    ret[raw['id']]['out'] = raw['out']
+                yield ret
+                time.sleep(0.02)
+        finally:
+            if not filtered:
+                self._filter_job_events(jid, remove=True)
 
     def _prep_pub(self,
                   tgt,
@@ -1690,6 +1758,7 @@ class LocalClient(object):
             # If not, we won't get a response, so error out
             if listen and not self.event.connect_pub(timeout=timeout):
                 raise SaltReqTimeoutError()
+            self._lift_job_event_filter()
             payload = channel.send(payload_kwargs, timeout=timeout)
         except SaltReqTimeoutError:
             raise SaltReqTimeoutError(
@@ -1798,6 +1867,7 @@ class LocalClient(object):
             # If not, we won't get a response, so error out
             if listen and not self.event.connect_pub(timeout=timeout):
                 raise SaltReqTimeoutError()
+            self._lift_job_event_filter()
             payload = yield channel.send(payload_kwargs, timeout=timeout)
         except SaltReqTimeoutError:
             raise SaltReqTimeoutError(
@@ -1853,6 +1923,7 @@ class LocalClient(object):
         if self.opts.get('order_masters'):
             self.event.unsubscribe('syndic/.*/{0}'.format(job_id), 'regex')
         self.event.unsubscribe('salt/job/{0}'.format(job_id))
+        self._filter_job_events(job_id, remove=True)
 
 
 class FunctionWrapper(dict):
@@ -8,6 +8,7 @@ import base64
 import copy
 import getpass
 import logging
+import math
 import multiprocessing
 import subprocess
 import hashlib
@@ -15,6 +16,7 @@ import tarfile
 import os
 import re
 import sys
+import threading
 import time
 import uuid
 import tempfile
@@ -55,6 +57,7 @@ from salt.template import compile_template
 # Import 3rd-party libs
 from salt.ext import six
 from salt.ext.six.moves import input  # pylint: disable=import-error,redefined-builtin
+from salt.ext.six.moves import queue  # pylint: disable=import-error
 try:
     import saltwinshell
     HAS_WINSHELL = True
@@ -84,6 +87,10 @@ RSTR = '_edbc7885e4f9aac9b83b35999b68d015148caf467b78fa39c05f669c0ff89878'
 # NOTE - must use non-grouping match groups or output splitting will fail.
 RSTR_RE = r'(?:^|\r?\n)' + RSTR + r'(?:\r?\n|$)'
 
+# Tarball member listing the extension modules an ext_mods delta removes,
+# keep in sync with ssh_py_shim.py
+EXT_DELTA = 'ext-delta'
+
 # METHODOLOGY:
 #
 #   1) Make the _thinnest_ /bin/sh shim (SSH_SH_SHIM) to find the python
@@ -196,6 +203,22 @@ if not is_windows():
 
 log = logging.getLogger(__name__)
 
+# Seconds handle_ssh waits for a return before checking whether the processes
+# running the targets are still alive
+SSH_QUEUE_TIMEOUT = 1
+
+
+def _drain(que):
+    '''
+    Return everything which can be read from the queue without blocking
+    '''
+    items = []
+    while True:
+        try:
+            items.append(que.get(False))
+        except queue.Empty:
+            return items
+
 
 class SSH(object):
     '''
@@ -321,6 +344,9 @@ class SSH(object):
                                              python2_bin=self.opts['python2_bin'],
                                              python3_bin=self.opts['python3_bin'],
                                              extended_cfg=self.opts.get('ssh_ext_alternatives'))
+        if self.opts.get('thin_incremental'):
+            # Keep what is in this thin around for deltas from it later on
+            salt.utils.thin.thin_manifest(self.opts['cachedir'])
         self.mods = mod_data(self.fsclient)
 
     def _get_roster(self):
@@ -515,6 +541,13 @@ class SSH(object):
                 **target)
         ret = {'id': single.id}
         stdout, stderr, retcode = single.run()
+        if hasattr(single.shell, 'connection_stats'):
+            stats = single.shell.connection_stats()
+            log.debug(
+                'Ran %s ssh/scp commands against %s in %.3fs, %s of them over '
+                'the multiplexed master connection, saving about %.3fs',
+                stats['commands'], host, stats['time'], stats['reused'],
+                stats['saved'])
         # This job is done, yield
         try:
             data = salt.utils.json.find_json(stdout)
@@ -534,101 +567,143 @@ class SSH(object):
             }
         que.put(ret)
 
+    def handle_worker(self, jobs, que, sessions, mine=False):
+        '''
+        Run the targets sent over jobs from up to sessions threads, until None
+        is sent for every thread
+        '''
+        def session():
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+                host, target = job
+                try:
+                    self.handle_routine(que, self.opts, host, target, mine)
+                except Exception as exc:
+                    log.error(
+                        'Running target %s failed: %s', host, exc,
+                        exc_info_on_loglevel=logging.DEBUG)
+                    que.put({'id': host,
+                             'ret': ('Target \'{0}\' did not return any data, '
+                                     'probably due to an error.').format(host)})
+
+        threads = []
+        for _ in range(sessions):
+            thread = threading.Thread(target=session)
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+    def close_masters(self):
+        '''
+        Close the multiplexed master connections to the targets, unless they
+        are meant to be reused by later runs
+        '''
+        if not self.opts.get('ssh_multiplex') or self.opts.get('ssh_multiplex_persist'):
+            return
+        for target in six.itervalues(self.targets):
+            if 'host' not in target or target.get('winrm'):
+                continue
+            path = salt.client.ssh.shell.control_path(
+                self.opts, target['host'], target.get('user'), target.get('port'))
+            salt.client.ssh.shell.close_master(path, target['host'])
+
     def handle_ssh(self, mine=False):
         '''
         Spin up the needed threads or processes and execute the subsequent
         routines
         '''
+        try:
+            for ret in self._handle_ssh(mine=mine):
+                yield ret
+        finally:
+            self.close_masters()
+
+    def _prepare_target(self, host):
+        '''
+        Fill in the defaults of a target, return the return of the target if
+        it cannot be run
+        '''
+        for default in self.defaults:
+            if default not in self.targets[host]:
+                self.targets[host][default] = self.defaults[default]
+        if 'host' not in self.targets[host]:
+            self.targets[host]['host'] = host
+        if self.targets[host].get('winrm') and not HAS_WINSHELL:
+            log_msg = 'Please contact sales@saltstack.com for access to the enterprise saltwinshell module.'
+            log.debug(log_msg)
+            return {'fun_args': [],
+                    'jid': None,
+                    'return': log_msg,
+                    'retcode': 1,
+                    'fun': '',
+                    'id': host}
+        return None
+
+    def _runs_wrapper(self, mine=False):
+        '''
+        Return True if the targets run a wrapper function on the master, which
+        loads modules into the process running the target
+        '''
+        if mine:
+            return True
+        if self.opts.get('raw_shell', False) or not self.opts.get('argv'):
+            return False
+        return self.opts['argv'][0] in salt.loader.ssh_wrapper(self.opts, None, {})
+
+    def _handle_ssh(self, mine=False):
+        if not self.targets:
+            log.error('No matching targets found in roster.')
+            return
+        workers = self.opts.get('ssh_workers', 0)
+        if workers and self._runs_wrapper(mine):
+            log.debug('Running wrapper function in a process per target')
+            workers = 0
         que = multiprocessing.Queue()
-        running = {}
-        target_iter = self.targets.__iter__()
-        returned = set()
-        rets = set()
-        init = False
-        while True:
-            if not self.targets:
-                log.error('No matching targets found in roster.')
-                break
-            if len(running) < self.opts.get('ssh_max_procs', 25) and not init:
+        if workers:
+            pool = SSHWorkerPool(self, que, workers, mine)
+        else:
+            pool = SSHProcessPool(self, que, mine)
+        target_iter = iter(self.targets)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and pool.has_capacity():
+                    try:
+                        host = next(target_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    no_ret = self._prepare_target(host)
+                    if no_ret is not None:
+                        yield {host: no_ret}
+                        continue
+                    pool.start(host, self.targets[host])
+                if not pool.running:
+                    break
+                # Block until a target returns, wake up now and then to look
+                # for targets which died without returning anything
                 try:
-                    host = next(target_iter)
-                except StopIteration:
-                    init = True
-                    continue
-                for default in self.defaults:
-                    if default not in self.targets[host]:
-                        self.targets[host][default] = self.defaults[default]
-                if 'host' not in self.targets[host]:
-                    self.targets[host]['host'] = host
-                if self.targets[host].get('winrm') and not HAS_WINSHELL:
-                    returned.add(host)
-                    rets.add(host)
-                    log_msg = 'Please contact sales@saltstack.com for access to the enterprise saltwinshell module.'
-                    log.debug(log_msg)
-                    no_ret = {'fun_args': [],
-                              'jid': None,
-                              'return': log_msg,
-                              'retcode': 1,
-                              'fun': '',
-                              'id': host}
-                    yield {host: no_ret}
-                    continue
-                args = (
-                        que,
-                        self.opts,
-                        host,
-                        self.targets[host],
-                        mine,
-                        )
-                routine = MultiprocessingProcess(
-                                target=self.handle_routine,
-                                args=args)
-                routine.start()
-                running[host] = {'thread': routine}
-                continue
-            ret = {}
-            try:
-                ret = que.get(False)
-                if 'id' in ret:
-                    returned.add(ret['id'])
-                    yield {ret['id']: ret['ret']}
-            except Exception:
-                # This bare exception is here to catch spurious exceptions
-                # thrown by que.get during healthy operation. Please do not
-                # worry about this bare exception, it is entirely here to
-                # control program flow.
-                pass
-            for host in running:
-                if not running[host]['thread'].is_alive():
-                    if host not in returned:
-                        # Try to get any returns that came through since we
-                        # last checked
-                        try:
-                            while True:
-                                ret = que.get(False)
-                                if 'id' in ret:
-                                    returned.add(ret['id'])
-                                    yield {ret['id']: ret['ret']}
-                        except Exception:
-                            pass
-
-                        if host not in returned:
-                            error = ('Target \'{0}\' did not return any data, '
-                                     'probably due to an error.').format(host)
-                            ret = {'id': host,
-                                   'ret': error}
-                            log.error(error)
-                            yield {ret['id']: ret['ret']}
-                    running[host]['thread'].join()
-                    rets.add(host)
-            for host in rets:
-                if host in running:
-                    running.pop(host)
-            if len(rets) >= len(self.targets):
-                break
-            # Sleep when limit or all threads started
-            if len(running) >= self.opts.get('ssh_max_procs', 25) or len(self.targets) >= len(running):
-                time.sleep(0.1)
+                    rets = [que.get(True, SSH_QUEUE_TIMEOUT)]
+                except queue.Empty:
+                    rets = []
+                dead = pool.dead()
+                # Whatever the dead processes put on the queue is readable now
+                rets.extend(_drain(que))
+                for ret in rets:
+                    if 'id' in ret and pool.finish(ret['id']):
+                        yield {ret['id']: ret['ret']}
+                for host in dead:
+                    if pool.finish(host):
+                        error = ('Target \'{0}\' did not return any data, '
+                                 'probably due to an error.').format(host)
+                        log.error(error)
+                        yield {host: error}
+        finally:
+            pool.stop()
 
     def run_iter(self, mine=False, jid=None):
         '''
@@ -662,7 +737,7 @@ class SSH(object):
             }
 
         # save load to the master job cache
-        if self.opts['master_job_cache'] == 'local_cache':
+        if self.opts['master_job_cache'] in ('local_cache', 'sqlite_local_cache'):
             self.returners['{0}.save_load'.format(self.opts['master_job_cache'])](jid, job_load, minions=self.targets.keys())
         else:
             self.returners['{0}.save_load'.format(self.opts['master_job_cache'])](jid, job_load)
@@ -736,7 +811,7 @@ class SSH(object):
         try:
             if isinstance(jid, bytes):
                 jid = jid.decode('utf-8')
-            if self.opts['master_job_cache'] == 'local_cache':
+            if self.opts['master_job_cache'] in ('local_cache', 'sqlite_local_cache'):
                 self.returners['{0}.save_load'.format(self.opts['master_job_cache'])](jid, job_load, minions=self.targets.keys())
             else:
                 self.returners['{0}.save_load'.format(self.opts['master_job_cache'])](jid, job_load)
@@ -806,6 +881,125 @@ class SSH(object):
             sys.exit(salt.defaults.exitcodes.EX_AGGREGATE)
 
 
+class SSHProcessPool(object):
+    '''
+    Run every target in a process of its own, at most ssh_max_procs at once
+    '''
+    def __init__(self, client, que, mine=False):
+        self.client = client
+        self.que = que
+        self.mine = mine
+        self.size = client.opts.get('ssh_max_procs', 25)
+        self.running = {}
+
+    def has_capacity(self):
+        return len(self.running) < self.size
+
+    def start(self, host, target):
+        routine = MultiprocessingProcess(
+            target=self.client.handle_routine,
+            args=(self.que, self.client.opts, host, target, self.mine))
+        routine.start()
+        self.running[host] = routine
+
+    def finish(self, host):
+        '''
+        Forget about a target, return False if it was not running
+        '''
+        routine = self.running.pop(host, None)
+        if routine is None:
+            return False
+        routine.join()
+        return True
+
+    def dead(self):
+        '''
+        Return the running targets whose process exited
+        '''
+        return [host for host, routine in six.iteritems(self.running)
+                if not routine.is_alive()]
+
+    def stop(self):
+        for routine in six.itervalues(self.running):
+            if routine.is_alive():
+                routine.terminate()
+            routine.join()
+        self.running = {}
+
+
+class SSHWorkerPool(object):
+    '''
+    Run the targets from ssh_workers worker processes, each of which runs its
+    share of the ssh_max_procs targets at once from threads. Only suitable for
+    targets not running wrapper functions, as the modules these load are
+    shared by the threads of a process.
+    '''
+    def __init__(self, client, que, workers, mine=False):
+        self.client = client
+        self.que = que
+        self.mine = mine
+        self.size = max(min(client.opts.get('ssh_max_procs', 25), len(client.targets)), 1)
+        workers = min(workers, self.size)
+        self.sessions = int(math.ceil(float(self.size) / workers))
+        # host -> worker running it
+        self.running = {}
+        self.workers = []
+        for _ in range(workers):
+            worker = {'hosts': set()}
+            self._spawn(worker)
+            self.workers.append(worker)
+
+    def _spawn(self, worker):
+        worker['jobs'] = multiprocessing.Queue()
+        worker['process'] = MultiprocessingProcess(
+            target=self.client.handle_worker,
+            args=(worker['jobs'], self.que, self.sessions, self.mine))
+        worker['process'].start()
+
+    def has_capacity(self):
+        return len(self.running) < self.size
+
+    def start(self, host, target):
+        worker = min(self.workers, key=lambda worker: len(worker['hosts']))
+        worker['jobs'].put((host, target))
+        worker['hosts'].add(host)
+        self.running[host] = worker
+
+    def finish(self, host):
+        '''
+        Forget about a target, return False if it was not running
+        '''
+        worker = self.running.pop(host, None)
+        if worker is None:
+            return False
+        worker['hosts'].discard(host)
+        return True
+
+    def dead(self):
+        '''
+        Return the running targets of the workers which exited, and replace
+        these workers
+        '''
+        dead = []
+        for worker in self.workers:
+            if not worker['process'].is_alive():
+                worker['process'].join()
+                dead.extend(worker['hosts'])
+                self._spawn(worker)
+        return dead
+
+    def stop(self):
+        for worker in self.workers:
+            if self.running:
+                worker['process'].terminate()
+            else:
+                for _ in range(self.sessions):
+                    worker['jobs'].put(None)
+        for worker in self.workers:
+            worker['process'].join()
+        self.running = {}
+
+
 class Single(object):
     '''
     Hold onto a single ssh execution
@@ -842,6 +1036,8 @@ class Single(object):
         self.mine = mine
         self.mine_functions = kwargs.get('mine_functions')
         self.cmd_umask = kwargs.get('cmd_umask', None)
+        # Checksum of the thin delta last sent, instead of the one of the thin
+        self.thin_checksum = None
 
         self.winrm = winrm
 
@@ -946,24 +1142,47 @@ class Single(object):
             return arg
         return ''.join(['\\' + char if re.match(r'\W', char) else char for char in arg])
 
-    def deploy(self):
+    def _cachedir(self):
+        if '_caller_cachedir' in self.opts:
+            return self.opts['_caller_cachedir']
+        return self.opts['cachedir']
+
+    def deploy(self, code_checksum=None):
         '''
-        Deploy salt-thin
+        Deploy salt-thin. With thin_incremental and the code checksum of the
+        thin the target has, only deploy what changed since that thin.
         '''
+        thin = self.thin
+        self.thin_checksum = None
+        if self.opts.get('thin_incremental'):
+            delta = salt.utils.thin.gen_thin_delta(self._cachedir(), code_checksum)
+            if delta is not None:
+                log.debug('Deploying thin delta %s to %s', delta, self.id)
+                thin = delta
+                self.thin_checksum = salt.utils.hashutils.get_hash(delta, 'sha1')
         self.shell.send(
-            self.thin,
+            thin,
             os.path.join(self.thin_dir, 'salt-thin.tgz'),
         )
-        self.deploy_ext()
+        if not self.opts.get('thin_incremental'):
+            # Otherwise the shim asks for the ext_mods it is missing
+            self.deploy_ext()
         return True
 
-    def deploy_ext(self):
+    def deploy_ext(self, version=None):
         '''
-        Deploy the ext_mods tarball
+        Deploy the ext_mods tarball. With thin_incremental and the version of
+        the ext_mods the target has, only deploy what changed since.
         '''
         if self.mods.get('file'):
+            ext_mods = self.mods['file']
+            if self.opts.get('thin_incremental'):
+                delta = ext_mods_delta(self.mods, version)
+                if delta is not None:
+                    log.debug('Deploying ext_mods delta %s to %s', delta, self.id)
+                    ext_mods = delta
             self.shell.send(
-                self.mods['file'],
+                ext_mods,
                 os.path.join(self.thin_dir, 'salt-ext_mods.tgz'),
             )
         return True
@@ -1171,11 +1390,7 @@ class Single(object):
         '''
         sudo = 'sudo' if self.target['sudo'] else ''
         sudo_user = self.target['sudo_user']
-        if '_caller_cachedir' in self.opts:
-            cachedir = self.opts['_caller_cachedir']
-        else:
-            cachedir = self.opts['cachedir']
-        thin_code_digest, thin_sum = salt.utils.thin.thin_sum(cachedir, 'sha1')
+        thin_code_digest, thin_sum = salt.utils.thin.thin_sum(self._cachedir(), 'sha1')
         debug = ''
         if not self.opts.get('log_level'):
             self.opts['log_level'] = 'info'
@@ -1196,10 +1411,11 @@ OPTIONS.wipe = {wipe}
 OPTIONS.tty = {tty}
 OPTIONS.cmd_umask = {cmd_umask}
 OPTIONS.code_checksum = {code_checksum}
+OPTIONS.incremental = {incremental}
 ARGS = {arguments}\n'''.format(config=self.minion_config,
                                delimeter=RSTR,
                                saltdir=self.thin_dir,
-                               checksum=thin_sum,
+                               checksum=self.thin_checksum or thin_sum,
                                hashfunc='sha1',
                                version=salt.version.__version__,
                                ext_mods=self.mods.get('version', ''),
@@ -1207,6 +1423,7 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
                                tty=self.tty,
                                cmd_umask=self.cmd_umask,
                                code_checksum=thin_code_digest,
+                               incremental=bool(self.opts.get('thin_incremental')),
                                arguments=self.argv)
         py_code = SSH_PY_SHIM.replace('#%%OPTS', arg_str)
         if six.PY2:
@@ -1331,10 +1548,15 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
         else:
             # RSTR was found in stdout but not stderr - which means there
             # is a SHIM command for the master.
-            shim_command = re.split(r'\r?\n', stdout, 1)[0].strip()
+            shim_lines = re.split(r'\r?\n', stdout, 2)
+            shim_command = shim_lines[0].strip()
+            # What the target has, with incremental deployment
+            shim_arg = shim_lines[1].strip() if len(shim_lines) > 1 else ''
             log.debug('SHIM retcode(%s) and command: %s', retcode, shim_command)
             if 'deploy' == shim_command and retcode == salt.defaults.exitcodes.EX_THIN_DEPLOY:
-                self.deploy()
+                self.deploy(shim_arg)
+                # The checksum to expect changes when a delta was sent
+                cmd_str = self._cmd_str()
                 stdout, stderr, retcode = self.shim_cmd(cmd_str)
                 if not re.search(RSTR_RE, stdout) or not re.search(RSTR_RE, stderr):
                     if not self.tty:
@@ -1354,7 +1576,7 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
                     while re.search(RSTR_RE, stderr):
                         stderr = re.split(RSTR_RE, stderr, 1)[1].strip()
             elif 'ext_mods' == shim_command:
-                self.deploy_ext()
+                self.deploy_ext(shim_arg)
                 stdout, stderr, retcode = self.shim_cmd(cmd_str)
                 if not re.search(RSTR_RE, stdout) or not re.search(RSTR_RE, stderr):
                     # If RSTR is not seen in both stdout and stderr then there
@@ -1567,6 +1789,27 @@ def mod_data(fsclient):
     return mods
 
 
+def ext_mods_delta(mods, version):
+    '''
+    Return the path of a tarball which brings the ext_mods of the given
+    version up to the current ones, or None if that version is unknown
+    '''
+    if not mods.get('file') or not version or version == mods['version'] \
+            or not re.match(r'^[0-9a-f]+$', version):
+        return None
+    cachedir = os.path.dirname(mods['file'])
+    old_path = os.path.join(cachedir, 'ext_mods.{0}.tgz'.format(version))
+    if not os.path.isfile(old_path):
+        return None
+    delta_path = os.path.join(
+        cachedir, 'ext_mods.{0}-{1}.tgz'.format(version, mods['version']))
+    if not os.path.isfile(delta_path):
+        salt.utils.thin.gen_delta(
+            mods['file'], salt.utils.thin.tar_manifest(old_path), delta_path,
+            EXT_DELTA, always=('ext_version',))
+    return delta_path
+
+
 def ssh_version():
     '''
     Returns the version of the installed ssh command
@@ -9,13 +9,18 @@ import re
 import os
 import sys
 import time
+import hashlib
 import logging
+import select
+import tempfile
 import subprocess
 
 # Import salt libs
 import salt.defaults.exitcodes
 import salt.utils.json
+import salt.utils.files
 import salt.utils.nb_popen
+import salt.utils.stringutils
 import salt.utils.vt
 
 from salt.ext import six
@@ -29,6 +34,15 @@ KEY_VALID_RE = re.compile(r'.*\(yes\/no\).*')
 RSTR = '_edbc7885e4f9aac9b83b35999b68d015148caf467b78fa39c05f669c0ff89878'
 RSTR_RE = re.compile(r'(?:^|\r?\n)' + RSTR + r'(?:\r?\n|$)')
 
+# Seconds a multiplexed master connection which should be closed at the end
+# of the salt-ssh run stays open once idle, in case salt-ssh does not get to
+# close it itself
+MULTIPLEX_IDLE_TIMEOUT = 60
+# Unix socket paths are limited to 104 (BSD) or 108 (Linux) bytes, ssh
+# creates the control socket under a name 17 characters longer than the
+# ControlPath before moving it in place
+MAX_CONTROL_PATH = 104 - 17
+
 
 class NoPasswdError(Exception):
     pass
@@ -64,6 +78,33 @@ def gen_shell(opts, **kwargs):
     return shell
 
 
+def control_path(opts, host, user=None, port=None):
+    '''
+    Return the path of the control socket of the multiplexed master connection
+    to the target. The name is a hash of the target so that it stays short.
+    '''
+    target = '{0}@{1}:{2}'.format(user or '', host.strip('[]'), port or '')
+    name = hashlib.sha1(salt.utils.stringutils.to_bytes(target)).hexdigest()[:20]
+    path = os.path.join(opts.get('cachedir', ''), 'ssh_mux', name)
+    if len(path) > MAX_CONTROL_PATH:
+        path = os.path.join(
+            tempfile.gettempdir(),
+            'salt-ssh-mux-{0}'.format(getattr(os, 'getuid', lambda: '')()),
+            name)
+    return path
+
+
+def close_master(path, host):
+    '''
+    Ask the multiplexed master connection listening on path to exit
+    '''
+    if not os.path.exists(path):
+        return False
+    cmd = ['ssh', '-O', 'exit', '-o', 'ControlPath={0}'.format(path), host.strip('[]')]
+    with salt.utils.files.fopen(os.devnull, 'w') as devnull:
+        return subprocess.call(cmd, stdout=devnull, stderr=devnull) == 0
+
+
 class Shell(object):
     '''
     Create a shell connection object to encapsulate ssh executions
@@ -99,6 +140,11 @@ class Shell(object):
         self.identities_only = identities_only
         self.remote_port_forwards = remote_port_forwards
         self.ssh_options = '' if ssh_options is None else ssh_options
+        self.control_path = None
+        if opts.get('ssh_multiplex'):
+            self.control_path = control_path(opts, self.host, user, port)
+        # (duration, reused the master connection) of every ssh and scp run
+        self.timings = []
 
     def get_error(self, errstr):
         '''
@@ -190,6 +236,24 @@ class Shell(object):
             ret.append('-o {0} '.format(option))
         return ''.join(ret)
 
+    def _mux_opts(self):
+        '''
+        Return the options to share a single master connection to the target
+        between all ssh and scp commands
+        '''
+        control_dir = os.path.dirname(self.control_path)
+        if not os.path.isdir(control_dir):
+            try:
+                os.makedirs(control_dir, 0o700)
+            except OSError:
+                # Created in the meantime by the process of another target
+                pass
+        persist = self.opts.get('ssh_multiplex_persist') or MULTIPLEX_IDLE_TIMEOUT
+        options = ['ControlMaster=auto',
+                   'ControlPath={0}'.format(self.control_path),
+                   'ControlPersist={0}'.format(int(persist))]
+        return ' '.join(['-o {0}'.format(opt) for opt in options])
+
     def _ssh_opts(self):
         return ' '.join(['-o {0}'.format(opt)
                           for opt in self.ssh_options])
@@ -258,6 +322,9 @@ class Shell(object):
                                       for item in self.remote_port_forwards.split(',')]))
         if self.ssh_options:
             command.append(self._ssh_opts())
+        if self.control_path:
+            # After ssh_options, ssh uses the first value given for an option
+            command.append(self._mux_opts())
 
         command.append(cmd)
 
@@ -341,7 +408,7 @@ class Shell(object):
         else:
             log.debug(logmsg)
 
-        ret = self._run_cmd(cmd)
+        ret = self._run_timed_cmd(cmd)
         return ret
 
     def send(self, local, remote, makedirs=False):
@@ -364,7 +431,62 @@ class Shell(object):
             logmsg = logmsg.replace(self.passwd, ('*' * 6))
         log.debug(logmsg)
 
-        return self._run_cmd(cmd)
+        return self._run_timed_cmd(cmd)
+
+    def _run_timed_cmd(self, cmd):
+        '''
+        Run an ssh or scp command and record how long it took and whether it
+        could reuse the multiplexed master connection
+        '''
+        reused = self.control_path is not None and os.path.exists(self.control_path)
+        start = time.time()
+        try:
+            return self._run_cmd(cmd)
+        finally:
+            self.timings.append((time.time() - start, reused))
+
+    def connection_stats(self):
+        '''
+        Return how many ssh and scp commands were run against the target, how
+        many of them reused the multiplexed master connection, how long they
+        took and about how much time was saved by not opening a new connection
+        for every one of them
+        '''
+        fresh = [duration for duration, reused in self.timings if not reused]
+        reused = [duration for duration, reused in self.timings if reused]
+        saved = 0.0
+        if fresh and reused:
+            handshake = sum(fresh) / len(fresh) - sum(reused) / len(reused)
+            saved = max(handshake, 0.0) * len(reused)
+        return {'commands': len(self.timings),
+                'reused': len(reused),
+                'time': sum(fresh) + sum(reused),
+                'saved': saved}
+
+    def close_master(self):
+        '''
+        Close the multiplexed master connection to the target
+        '''
+        if self.control_path is None:
+            return False
+        return close_master(self.control_path, self.host)
+
+    def _wait_for_output(self, term, timeout=1):
+        '''
+        Block until the command run in the terminal has more output for us, so
+        that many commands can run at once without polling each of them
+        '''
+        fds = [fd for fd in (getattr(term, 'child_fd', None),
+                             getattr(term, 'child_fde', None))
+               if fd is not None]
+        if not fds:
+            time.sleep(0.01)
+            return
+        try:
+            select.select(fds, [], [], timeout)
+        except (select.error, OSError, ValueError):
+            # Closed under us, the next recv notices
+            pass
 
     def _run_cmd(self, cmd, key_accept=False, passwd_retries=3):
         '''
@@ -424,7 +546,8 @@ class Shell(object):
                     term.sendline(mods_raw)
                 if stdout:
                     old_stdout = stdout
-                time.sleep(0.01)
+                if not stdout and not stderr:
+                    self._wait_for_output(term)
             return ret_stdout, ret_stderr, term.exitstatus
         finally:
             term.close(terminate=True, kill=True)
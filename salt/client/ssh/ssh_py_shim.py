@@ -10,6 +10,7 @@ separate file, for convenience of development.
 from __future__ import absolute_import, print_function
 
 import hashlib
+import json
 import tarfile
 import shutil
 import sys
@@ -20,6 +21,9 @@ import time
 
 THIN_ARCHIVE = 'salt-thin.tgz'
 EXT_ARCHIVE = 'salt-ext_mods.tgz'
+# Keep these in sync with salt/utils/thin.py and ./__init__.py
+THIN_DELTA = 'thin-delta'
+EXT_DELTA = 'ext-delta'
 
 # Keep these in sync with salt/defaults/exitcodes.py
 EX_THIN_PYTHON_INVALID = 10
@@ -100,11 +104,42 @@ def is_windows():
     return sys.platform.startswith('win')
 
 
+def saltdir_is_safe():
+    '''
+    Return True if the thin directory can be kept for an incremental
+    deployment
+    '''
+    if is_windows():
+        return os.path.isdir(OPTIONS.saltdir)
+    try:
+        dstat = os.lstat(OPTIONS.saltdir)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(dstat.st_mode) and dstat.st_uid == os.geteuid() and
+            not dstat.st_mode & stat.S_IRWXO)
+
+
+def get_code_checksum():
+    '''
+    Return the code checksum of the thin in place, or an empty string
+    '''
+    try:
+        with open(os.path.join(OPTIONS.saltdir, 'code-checksum'), 'r') as vpo:
+            return vpo.readline().strip()
+    except (IOError, OSError):
+        return ''
+
+
 def need_deployment():
     '''
     Salt thin needs to be deployed - prep the target directory and emit the
-    delimiter and exit code that signals a required deployment.
+    delimiter and exit code that signals a required deployment. With
+    incremental deployment the thin in place is kept and its code checksum is
+    passed on, for the master to only send what changed since.
     '''
+    if OPTIONS.incremental and saltdir_is_safe():
+        sys.stdout.write("{0}\ndeploy\n{1}\n".format(OPTIONS.delimiter, get_code_checksum()))
+        sys.exit(EX_THIN_DEPLOY)
     if os.path.exists(OPTIONS.saltdir):
         shutil.rmtree(OPTIONS.saltdir)
     old_umask = os.umask(0o077)  # pylint: disable=blacklisted-function
@@ -156,13 +191,42 @@ def get_hash(path, form='sha1', chunk_size=4096):
         return hash_obj.hexdigest()
 
 
+def remove_gone(tfile, path, delta_name):
+    '''
+    Remove the files a delta archive lists as gone from path, and return the
+    members to extract, or None if the archive is not a delta
+    '''
+    members = tfile.getmembers()
+    if delta_name not in [member.name for member in members]:
+        return None
+    gone = json.loads(tfile.extractfile(delta_name).read().decode('utf-8'))
+    for name in gone:
+        fpath = os.path.normpath(os.path.join(path, name))
+        if fpath.startswith(os.path.join(path, '')) and os.path.isfile(fpath):
+            os.remove(fpath)
+    return [member for member in members if member.name != delta_name]
+
+
 def unpack_thin(thin_path):
     '''
-    Unpack the Salt thin archive.
+    Unpack the Salt thin archive. With incremental deployment it is either a
+    delta applied to the thin in place, or a full thin replacing it.
     '''
     tfile = tarfile.TarFile.gzopen(thin_path)
     old_umask = os.umask(0o077)  # pylint: disable=blacklisted-function
-    tfile.extractall(path=OPTIONS.saltdir)
+    members = None
+    if OPTIONS.incremental:
+        members = remove_gone(tfile, OPTIONS.saltdir, THIN_DELTA)
+        if members is None:
+            for name in os.listdir(OPTIONS.saltdir):
+                fpath = os.path.join(OPTIONS.saltdir, name)
+                if fpath == thin_path:
+                    continue
+                if os.path.isdir(fpath) and not os.path.islink(fpath):
+                    shutil.rmtree(fpath)
+                else:
+                    os.remove(fpath)
+    tfile.extractall(path=OPTIONS.saltdir, members=members)
     tfile.close()
     os.umask(old_umask)  # pylint: disable=blacklisted-function
     try:
@@ -172,11 +236,14 @@ def unpack_thin(thin_path):
     reset_time(OPTIONS.saltdir)
 
 
-def need_ext():
+def need_ext(version=''):
     '''
-    Signal that external modules need to be deployed.
+    Signal that external modules need to be deployed. With incremental
+    deployment the version in place is passed on.
     '''
-    sys.stdout.write("{0}\next_mods\n".format(OPTIONS.delimiter))
+    if not OPTIONS.incremental:
+        version = ''
+    sys.stdout.write("{0}\next_mods\n{1}\n".format(OPTIONS.delimiter, version))
     sys.exit(EX_MOD_DEPLOY)
 
 
@@ -194,7 +261,10 @@ def unpack_ext(ext_path):
             'extmods')
     tfile = tarfile.TarFile.gzopen(ext_path)
     old_umask = os.umask(0o077)  # pylint: disable=blacklisted-function
-    tfile.extractall(path=modcache)
+    members = None
+    if OPTIONS.incremental:
+        members = remove_gone(tfile, modcache, EXT_DELTA)
+    tfile.extractall(path=modcache, members=members)
     tfile.close()
     os.umask(old_umask)  # pylint: disable=blacklisted-function
     os.unlink(ext_path)
@@ -300,7 +370,7 @@ def main(argv):  # pylint: disable=W0613
             with open(version_path, 'r') as vpo:
                 cur_version = vpo.readline().strip()
             if cur_version != OPTIONS.ext_mods:
-                need_ext()
+                need_ext(cur_version)
     # Fix parameter passing issue
     if len(ARGS) == 1:
         argv_prepared = ARGS[0].split()
@@ -357,6 +357,18 @@ VALID_OPTS = {
     # Maximum number of concurrently active processes at any given point in time
     'process_count_max': int,
 
+    # The priorities of the jobs queued when process_count_max is reached, by
+    # function name or glob
+    'job_queue_priorities': dict,
+
+    # The number of worker processes started in advance to run jobs, 0 starts
+    # a new process for every job
+    'job_worker_pool': int,
+
+    # The number of jobs after which a job worker process is replaced, 0
+    # keeps them as long as possible
+    'job_worker_pool_max_jobs': int,
+
     # Whether or not the salt minion should run scheduled mine updates
     'mine_enabled': bool,
 
@@ -375,6 +387,23 @@ VALID_OPTS = {
     # The chunk size to use when streaming files with the file server
     'file_buffer_size': int,
 
+    # The number of file server chunks a minion asks for in a single request
+    'file_transfer_window': int,
+
+    # The number of files a minion asks for in a single batched request
+    'file_fetch_batch_size': int,
+
+    # The largest amount of file data the file server sends in a single reply
+    # to a batched request
+    'file_serve_batch_max_size': int,
+
+    # The largest number of chunks the file server sends in a single reply
+    'file_serve_window_max': int,
+
+    # The number of open file handles each file server process keeps around
+    # between chunk requests
+    'file_serve_handle_cache_size': int,
+
     # The TCP port on which minion events should be published if ipc_mode is TCP
     'tcp_pub_port': int,
 
@@ -394,6 +423,13 @@ VALID_OPTS = {
     # The TCP port for mworkers to connect to on the master
     'tcp_master_workers': int,
 
+    # The number of processes the TCP publisher is sharded over
+    'tcp_pub_workers': int,
+
+    # The maximum number of bytes queued for a TCP publish subscriber before
+    # publishes to it are dropped. 0 means unbounded.
+    'tcp_pub_max_client_buffer': int,
+
     # The file to send logging data to
     'log_file': six.string_types,
 
@@ -445,6 +481,10 @@ VALID_OPTS = {
     # Tell the loader to attempt to import *.zip archives
     'enable_zip_modules': bool,
 
+    # Keep an index of the module directories and of the outcome of the
+    # __virtual__ functions of the modules in the cachedir
+    'loader_index': bool,
+
     # Tell the client to show minions that have timed out
     'show_timeout': bool,
 
@@ -472,6 +512,9 @@ VALID_OPTS = {
     # Fire events as state chunks are processed by the state compiler
     'state_events': bool,
 
+    # Reuse the return codes of identical onlyif and unless commands within a state run
+    'state_guard_cache': bool,
+
     # The number of seconds a minion should wait before retry when attempting authentication
     'acceptance_wait_time': float,
 
@@ -660,6 +703,8 @@ VALID_OPTS = {
     # could be, we'll just skip type-checking.
     'git_pillar_ssl_verify': bool,
     'git_pillar_global_lock': bool,
+    # The number of threads to fetch the git_pillar remotes with
+    'git_pillar_fetch_workers': int,
     'git_pillar_user': six.string_types,
     'git_pillar_password': six.string_types,
     'git_pillar_insecure_auth': bool,
@@ -684,6 +729,8 @@ VALID_OPTS = {
     'gitfs_saltenv_blacklist': list,
     'gitfs_ssl_verify': bool,
     'gitfs_global_lock': bool,
+    # The number of threads to fetch the gitfs remotes with
+    'gitfs_fetch_workers': int,
     'gitfs_saltenv': list,
     'gitfs_ref_types': list,
     'gitfs_refspecs': list,
@@ -715,6 +762,12 @@ VALID_OPTS = {
     # Specify a list of external pillar systems to use
     'ext_pillar': list,
 
+    # The number of ext_pillars to run at the same time, 0 or 1 runs them one after the other
+    'ext_pillar_workers': int,
+
+    # How long to wait for an ext_pillar run concurrently, in seconds, 0 waits forever
+    'ext_pillar_timeout': float,
+
     # Reserved for future use to version the pillar structure
     'pillar_version': int,
 
@@ -730,6 +783,9 @@ VALID_OPTS = {
     # Pillar cache backend. Defaults to `disk` which stores caches in the master cache
     'pillar_cache_backend': six.string_types,
 
+    # Serve cached pillars older than `pillar_cache_ttl` while refreshing them in the background
+    'pillar_cache_background_refresh': bool,
+
     'pillar_safe_render_error': bool,
 
     # When creating a pillar, there are several strategies to choose from when
@@ -831,12 +887,26 @@ VALID_OPTS = {
     # Specify whether the master should store end times for jobs as returns come in
     'job_cache_store_endtime': bool,
 
+    # Store the job returns in the master job cache from a dedicated process
+    # rather than in the master workers, in batches of up to
+    # job_cache_writer_batch returns flushed at least every
+    # job_cache_writer_interval seconds. At most job_cache_writer_queue returns
+    # are queued, the workers store the returns themselves when it is full.
+    'job_cache_writer': bool,
+    'job_cache_writer_batch': int,
+    'job_cache_writer_interval': float,
+    'job_cache_writer_queue': int,
+
     # The minion data cache is a cache of information about the minions stored on the master.
     # This information is primarily the pillar and grains data. The data is cached in the master
     # cachedir under the name of the minion and used to predetermine what minions are expected to
     # reply from executions.
     'minion_data_cache': bool,
 
+    # Keep an in-memory index of the minion data cache in the master processes
+    # to answer grain and pillar targets without reading every minion's data
+    'minion_data_index': bool,
+
     # The number of seconds between AES key rotations on the master
     'publish_session': int,
 
@@ -914,6 +984,17 @@ VALID_OPTS = {
     # The number of minutes between the minion refreshing its cache of grains
     'grains_refresh_every': int,
 
+    # Cache the results of the grain functions for as long as their grain
+    # modules declare, or as long as given by module or function name
+    'grains_function_cache': bool,
+    'grains_function_cache_ttls': dict,
+
+    # The number of grain functions to run at the same time, 0 or 1 runs them one after the other
+    'grains_workers': int,
+
+    # How long to wait for a grain function run concurrently, in seconds, 0 waits forever
+    'grains_timeout': float,
+
     # Use lspci to gather system data for grains on a minion
     'enable_lspci': bool,
 
@@ -934,6 +1015,19 @@ VALID_OPTS = {
     # If this is set to True the first newline after a Jinja block is removed
     'jinja_trim_blocks': bool,
 
+    # The number of compiled Jinja templates to keep in memory, 0 disables the cache
+    'jinja_cache_size': int,
+
+    # Also store compiled Jinja templates on disk, under the cachedir
+    'jinja_bytecode_cache': bool,
+
+    # Render pillar and state SLS files which do not depend on the minion once,
+    # and share the result between all minions
+    'shared_render_cache': bool,
+
+    # The number of shared renderings to keep in memory in each process
+    'shared_render_cache_size': int,
+
     # Cache minion ID to file
     'minion_id_caching': bool,
 
@@ -993,6 +1087,18 @@ VALID_OPTS = {
     'ssh_log_file': six.string_types,
     'ssh_config_file': six.string_types,
 
+    # Share a single master connection to every salt-ssh target between all
+    # the ssh and scp commands run against it
+    'ssh_multiplex': bool,
+
+    # Seconds an idle multiplexed master connection is kept open for later
+    # salt-ssh runs, 0 closes it at the end of the run
+    'ssh_multiplex_persist': int,
+
+    # Number of worker processes running the salt-ssh targets from threads, 0
+    # runs every target in a process of its own
+    'ssh_workers': int,
+
     # Enable ioflo verbose logging. Warning! Very verbose!
     'ioflo_verbose': int,
 
@@ -1110,6 +1216,10 @@ VALID_OPTS = {
     'thin_extra_mods': six.string_types,
     'min_extra_mods': six.string_types,
 
+    # Only send salt-ssh targets the files of the thin and of the extension
+    # modules which changed since what they have
+    'thin_incremental': bool,
+
     # Default returners minion should use. List or comma-delimited string
     'return': (six.string_types, list),
 
@@ -1184,6 +1294,10 @@ VALID_OPTS = {
     # Scheduler should be a dictionary
     'schedule': dict,
 
+    # Keep the next fire time of the scheduled jobs in a priority queue and
+    # only evaluate the jobs which are due
+    'schedule_queue': bool,
+
     # Whether to fire auth events
     'auth_events': bool,
 
@@ -1231,6 +1345,10 @@ DEFAULT_MINION_OPTS = {
     'cache_jobs': False,
     'grains_cache': False,
     'grains_cache_expiration': 300,
+    'grains_function_cache': False,
+    'grains_function_cache_ttls': {},
+    'grains_workers': 0,
+    'grains_timeout': 0,
     'grains_deep_merge': False,
     'conf_file': os.path.join(salt.syspaths.CONFIG_DIR, 'minion'),
     'sock_dir': os.path.join(salt.syspaths.SOCK_DIR, 'minion'),
@@ -1239,6 +1357,8 @@ DEFAULT_MINION_OPTS = {
     'renderer': 'jinja|yaml',
     'renderer_whitelist': [],
     'renderer_blacklist': [],
+    'jinja_cache_size': 500,
+    'jinja_bytecode_cache': False,
     'random_startup_delay': 0,
     'failhard': False,
     'autoload_dynamic_modules': True,
@@ -1255,6 +1375,7 @@ DEFAULT_MINION_OPTS = {
     'pillar_cache': False,
     'pillar_cache_ttl': 3600,
     'pillar_cache_backend': 'disk',
+    'pillar_cache_background_refresh': True,
     'extension_modules': os.path.join(salt.syspaths.CACHE_DIR, 'minion', 'extmods'),
     'state_top': 'top.sls',
     'state_top_saltenv': None,
@@ -1268,6 +1389,8 @@ DEFAULT_MINION_OPTS = {
         'base': [salt.syspaths.BASE_THORIUM_ROOTS_DIR],
         },
     'file_client': 'remote',
+    'file_transfer_window': 16,
+    'file_fetch_batch_size': 100,
     'local': False,
     'use_master_when_local': False,
     'file_roots': {
@@ -1310,6 +1433,7 @@ DEFAULT_MINION_OPTS = {
     'git_pillar_root': '',
     'git_pillar_ssl_verify': True,
     'git_pillar_global_lock': True,
+    'git_pillar_fetch_workers': 1,
     'git_pillar_user': '',
     'git_pillar_password': '',
     'git_pillar_insecure_auth': False,
@@ -1333,6 +1457,7 @@ DEFAULT_MINION_OPTS = {
     'gitfs_saltenv_whitelist': [],
     'gitfs_saltenv_blacklist': [],
     'gitfs_global_lock': True,
+    'gitfs_fetch_workers': 1,
     'gitfs_ssl_verify': True,
     'gitfs_saltenv': [],
     'gitfs_ref_types': ['branch', 'tag', 'sha'],
@@ -1359,6 +1484,9 @@ DEFAULT_MINION_OPTS = {
     'autosign_timeout': 120,
     'multiprocessing': True,
     'process_count_max': -1,
+    'job_queue_priorities': {},
+    'job_worker_pool': 0,
+    'job_worker_pool_max_jobs': 100,
     'mine_enabled': True,
     'mine_return_job': False,
     'mine_interval': 60,
@@ -1385,12 +1513,14 @@ DEFAULT_MINION_OPTS = {
     'ext_job_cache': '',
     'cython_enable': False,
     'enable_zip_modules': False,
+    'loader_index': False,
     'state_verbose': True,
     'state_output': 'full',
     'state_output_diff': False,
     'state_auto_order': True,
     'state_events': False,
     'state_aggregate': False,
+    'state_guard_cache': False,
     'snapper_states': False,
     'snapper_states_config': 'root',
     'acceptance_wait_time': 10,
@@ -1502,6 +1632,7 @@ DEFAULT_MINION_OPTS = {
     },
     'discovery': False,
     'schedule': {},
+    'schedule_queue': False,
 }
 
 DEFAULT_MASTER_OPTS = {
@@ -1568,6 +1699,7 @@ DEFAULT_MASTER_OPTS = {
     'git_pillar_root': '',
     'git_pillar_ssl_verify': True,
     'git_pillar_global_lock': True,
+    'git_pillar_fetch_workers': 1,
     'git_pillar_user': '',
     'git_pillar_password': '',
     'git_pillar_insecure_auth': False,
@@ -1592,6 +1724,7 @@ DEFAULT_MASTER_OPTS = {
     'gitfs_saltenv_whitelist': [],
     'gitfs_saltenv_blacklist': [],
     'gitfs_global_lock': True,
+    'gitfs_fetch_workers': 1,
     'gitfs_ssl_verify': True,
     'gitfs_saltenv': [],
     'gitfs_ref_types': ['branch', 'tag', 'sha'],
@@ -1627,6 +1760,8 @@ DEFAULT_MASTER_OPTS = {
     'minionfs_whitelist': [],
     'minionfs_blacklist': [],
     'ext_pillar': [],
+    'ext_pillar_workers': 0,
+    'ext_pillar_timeout': 0,
     'pillar_version': 2,
     'pillar_opts': False,
     'pillar_safe_render_error': True,
@@ -1636,6 +1771,7 @@ DEFAULT_MASTER_OPTS = {
     'pillar_cache': False,
     'pillar_cache_ttl': 3600,
     'pillar_cache_backend': 'disk',
+    'pillar_cache_background_refresh': True,
     'ping_on_rotate': False,
     'peer': {},
     'preserve_minion_cache': False,
@@ -1663,6 +1799,9 @@ DEFAULT_MASTER_OPTS = {
     'file_recv': False,
     'file_recv_max_size': 100,
     'file_buffer_size': 1048576,
+    'file_serve_window_max': 16,
+    'file_serve_handle_cache_size': 32,
+    'file_serve_batch_max_size': 1048576,
     'file_ignore_regex': [],
     'file_ignore_glob': [],
     'fileserver_backend': ['roots'],
@@ -1688,7 +1827,12 @@ DEFAULT_MASTER_OPTS = {
     'ext_job_cache': '',
     'master_job_cache': 'local_cache',
     'job_cache_store_endtime': False,
+    'job_cache_writer': False,
+    'job_cache_writer_batch': 500,
+    'job_cache_writer_interval': 1.0,
+    'job_cache_writer_queue': 10000,
     'minion_data_cache': True,
+    'minion_data_index': False,
     'enforce_mine_cache': False,
     'ipc_mode': _DFLT_IPC_MODE,
     'ipc_write_buffer': _DFLT_IPC_WBUFFER,
@@ -1697,6 +1841,8 @@ DEFAULT_MASTER_OPTS = {
     'tcp_master_pull_port': 4513,
     'tcp_master_publish_pull': 4514,
     'tcp_master_workers': 4515,
+    'tcp_pub_workers': 1,
+    'tcp_pub_max_client_buffer': 0,
     'log_file': os.path.join(salt.syspaths.LOGS_DIR, 'master'),
     'log_level': 'warning',
     'log_level_logfile': None,
@@ -1735,6 +1881,7 @@ DEFAULT_MASTER_OPTS = {
     'ssh_list_nodegroups': {},
     'ssh_use_home_key': False,
     'cython_enable': False,
+    'loader_index': False,
     'enable_gpu_grains': False,
     # XXX: Remove 'key_logfile' support in 2014.1.0
     'key_logfile': os.path.join(salt.syspaths.LOGS_DIR, 'key'),
@@ -1762,6 +1909,10 @@ DEFAULT_MASTER_OPTS = {
     'jinja_sls_env': {},
     'jinja_lstrip_blocks': False,
     'jinja_trim_blocks': False,
+    'jinja_cache_size': 500,
+    'jinja_bytecode_cache': False,
+    'shared_render_cache': False,
+    'shared_render_cache_size': 1000,
     'tcp_keepalive': True,
     'tcp_keepalive_idle': 300,
     'tcp_keepalive_cnt': -1,
@@ -1784,6 +1935,9 @@ DEFAULT_MASTER_OPTS = {
     'ssh_identities_only': False,
     'ssh_log_file': os.path.join(salt.syspaths.LOGS_DIR, 'ssh'),
     'ssh_config_file': os.path.join(salt.syspaths.HOME_DIR, '.ssh', 'config'),
+    'ssh_multiplex': False,
+    'ssh_multiplex_persist': 0,
+    'ssh_workers': 0,
     'master_floscript': os.path.join(FLO_DIR, 'master.flo'),
     'worker_floscript': os.path.join(FLO_DIR, 'worker.flo'),
     'maintenance_floscript': os.path.join(FLO_DIR, 'maint.flo'),
@@ -1827,6 +1981,7 @@ DEFAULT_MASTER_OPTS = {
     'memcache_debug': False,
     'thin_extra_mods': '',
     'min_extra_mods': '',
+    'thin_incremental': False,
     'ssl': None,
     'extmod_whitelist': {},
     'extmod_blacklist': {},
@@ -1839,6 +1994,7 @@ DEFAULT_MASTER_OPTS = {
     'drop_messages_signature_fail': False,
     'discovery': False,
     'schedule': {},
+    'schedule_queue': False,
     'auth_events': True,
     'minion_data_cache_events': True,
     'enable_ssh_minions': False,
@@ -21,6 +21,7 @@ import traceback
 import binascii
 import weakref
 import getpass
+import threading
 import tornado.gen
 
 # Import third party libs
@@ -1325,6 +1326,21 @@ class SAuth(AsyncAuth):
         return auth
 
 
+def _compare_digest(mac_bytes, sig):
+    '''
+    Compare two digests in constant time
+    '''
+    if hasattr(hmac, 'compare_digest'):
+        return hmac.compare_digest(mac_bytes, sig)
+    # Python < 2.7.7
+    if len(mac_bytes) != len(sig):
+        return False
+    result = 0
+    for zipped_x, zipped_y in zip(mac_bytes, sig):
+        result |= ord(zipped_x) ^ ord(zipped_y)
+    return result == 0
+
+
 class Crypticle(object):
     '''
     Authenticated encryption class
@@ -1342,6 +1358,26 @@ class Crypticle(object):
         self.keys = self.extract_keys(self.key_string, key_size)
         self.key_size = key_size
         self.serial = salt.payload.Serial(opts)
+        self._init_contexts()
+
+    def _init_contexts(self):
+        '''
+        Set up the HMAC and cipher contexts which are reused for every message
+        '''
+        self._hmac = hmac.new(self.keys[1], digestmod=hashlib.sha256)
+        # The cipher contexts carry state from one message to the next, so
+        # every thread gets its own
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_hmac']
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_contexts()
 
     @classmethod
     def generate_key_string(cls, key_size=192):
@@ -1361,65 +1397,70 @@ class Crypticle(object):
         assert len(key) == key_size / 8 + cls.SIG_SIZE, 'invalid key'
         return key[:-cls.SIG_SIZE], key[-cls.SIG_SIZE:]
 
+    def _cipher(self, op):
+        '''
+        Return the AES-CBC context of this thread to encrypt (op=1) or decrypt
+        (op=0) with.
+
+        Creating a cipher context for every message is the main cost of
+        encrypting small messages, so the contexts are kept and CBC just
+        chains on from the previous message. To encrypt, a random block is
+        fed in before the message, its encryption is the IV of the message.
+        To decrypt, the IV is fed in before the message and the first block
+        of the output, which depends on the previous message, is dropped.
+        '''
+        ciphers = getattr(self._local, 'ciphers', None)
+        if ciphers is None:
+            ciphers = self._local.ciphers = {}
+        if op not in ciphers:
+            iv_bytes = os.urandom(self.AES_BLOCK_SIZE)
+            if HAS_M2:
+                cypher = EVP.Cipher(alg='aes_192_cbc', key=self.keys[0], iv=iv_bytes, op=op, padding=False)
+                ciphers[op] = cypher.update
+            else:
+                cypher = AES.new(self.keys[0], AES.MODE_CBC, iv_bytes)
+                ciphers[op] = cypher.encrypt if op else cypher.decrypt
+        return ciphers[op]
+
     def encrypt(self, data):
         '''
         encrypt data with AES-CBC and sign it with HMAC-SHA256
         '''
-        aes_key, hmac_key = self.keys
         pad = self.AES_BLOCK_SIZE - len(data) % self.AES_BLOCK_SIZE
         if six.PY2:
             data = data + pad * chr(pad)
         else:
             data = data + salt.utils.stringutils.to_bytes(pad * chr(pad))
-        iv_bytes = os.urandom(self.AES_BLOCK_SIZE)
-        if HAS_M2:
-            cypher = EVP.Cipher(alg='aes_192_cbc', key=aes_key, iv=iv_bytes, op=1, padding=False)
-            encr = cypher.update(data)
-            encr += cypher.final()
-        else:
-            cypher = AES.new(aes_key, AES.MODE_CBC, iv_bytes)
-            encr = cypher.encrypt(data)
-        data = iv_bytes + encr
-        sig = hmac.new(hmac_key, data, hashlib.sha256).digest()
-        return data + sig
+        cypher = self._cipher(1)
+        iv_bytes = cypher(os.urandom(self.AES_BLOCK_SIZE))
+        encr = cypher(data)
+        mac = self._hmac.copy()
+        mac.update(iv_bytes)
+        mac.update(encr)
+        return b''.join((iv_bytes, encr, mac.digest()))
 
     def decrypt(self, data):
         '''
         verify HMAC-SHA256 signature and decrypt data with AES-CBC
         '''
-        aes_key, hmac_key = self.keys
-        sig = data[-self.SIG_SIZE:]
-        data = data[:-self.SIG_SIZE]
         if six.PY3 and not isinstance(data, bytes):
             data = salt.utils.stringutils.to_bytes(data)
-        mac_bytes = hmac.new(hmac_key, data, hashlib.sha256).digest()
-        if len(mac_bytes) != len(sig):
+        sig = data[-self.SIG_SIZE:]
+        # Slice the payload without copying it where the libraries allow
+        data = memoryview(data)[:-self.SIG_SIZE] if six.PY3 else data[:-self.SIG_SIZE]
+        mac = self._hmac.copy()
+        mac.update(data)
+        if not _compare_digest(mac.digest(), sig):
             log.debug('Failed to authenticate message')
             raise AuthenticationError('message authentication failed')
-        result = 0
-
-        if six.PY2:
-            for zipped_x, zipped_y in zip(mac_bytes, sig):
-                result |= ord(zipped_x) ^ ord(zipped_y)
-        else:
-            for zipped_x, zipped_y in zip(mac_bytes, sig):
-                result |= zipped_x ^ zipped_y
-        if result != 0:
-            log.debug('Failed to authenticate message')
+        if len(data) < self.AES_BLOCK_SIZE * 2 or len(data) % self.AES_BLOCK_SIZE:
+            log.debug('Failed to decrypt message')
             raise AuthenticationError('message authentication failed')
-        iv_bytes = data[:self.AES_BLOCK_SIZE]
-        data = data[self.AES_BLOCK_SIZE:]
-        if HAS_M2:
-            cypher = EVP.Cipher(alg='aes_192_cbc', key=aes_key, iv=iv_bytes, op=0, padding=False)
-            encr = cypher.update(data)
-            data = encr + cypher.final()
-        else:
-            cypher = AES.new(aes_key, AES.MODE_CBC, iv_bytes)
-            data = cypher.decrypt(data)
+        data = self._cipher(0)(data)
         if six.PY2:
-            return data[:-ord(data[-1])]
+            return data[self.AES_BLOCK_SIZE:-ord(data[-1])]
         else:
-            return data[:-data[-1]]
+            return data[self.AES_BLOCK_SIZE:-data[-1]]
 
     def dumps(self, obj):
         '''
@@ -200,10 +200,22 @@ class Client(object):
         ret = []
         if isinstance(paths, six.string_types):
             paths = paths.split(',')
+        cached = self.get_files(paths, saltenv, cachedir=cachedir)
         for path in paths:
-            ret.append(self.cache_file(path, saltenv, cachedir=cachedir))
+            if path in cached:
+                ret.append(cached[path])
+            else:
+                ret.append(self.cache_file(path, saltenv, cachedir=cachedir))
         return ret
 
+    def get_files(self, paths, saltenv='base', cachedir=None):
+        '''
+        Cache several salt:// files using as few requests as possible. Returns
+        a dict mapping the paths which were cached to their location in the
+        minion cache, any other path has to be fetched on its own.
+        '''
+        return {}
+
     def cache_master(self, saltenv='base', cachedir=None):
         '''
         Download and cache all files on a master in a specified environment
@@ -235,15 +247,16 @@ class Client(object):
         )
         # go through the list of all files finding ones that are in
         # the target directory and caching them
+        files = []
         for fn_ in self.file_list(saltenv):
             fn_ = sdecode(fn_)
             if fn_.strip() and fn_.startswith(path):
                 if salt.utils.stringutils.check_include_exclude(
                         fn_, include_pat, exclude_pat):
-                    fn_ = self.cache_file(
-                        salt.utils.url.create(fn_), saltenv, cachedir=cachedir)
-                    if fn_:
-                        ret.append(fn_)
+                    files.append(salt.utils.url.create(fn_))
+        for fn_ in self.cache_files(files, saltenv, cachedir=cachedir):
+            if fn_:
+                ret.append(fn_)
 
         if include_empty:
             # Break up the path into a list containing the bottom-level
@@ -1050,6 +1063,7 @@ class RemoteClient(Client):
             self.auth = self.channel.auth
         else:
             self.auth = ''
+        self.batch_supported = True
 
     def _refresh_channel(self):
         '''
@@ -1150,6 +1164,11 @@ class RemoteClient(Client):
         if gzip:
             gzip = int(gzip)
             load['gzip'] = gzip
+        window = self.opts.get('file_transfer_window', 1)
+        if window > 1:
+            # Ask for several chunks per round trip, masters which do not
+            # know about windows just keep sending one chunk at a time
+            load['window'] = window
 
         fn_ = None
         if dest:
@@ -1254,6 +1273,93 @@ class RemoteClient(Client):
 
         return dest
 
+    def get_files(self, paths, saltenv='base', cachedir=None):
+        '''
+        Cache several salt:// files from the master, asking for up to
+        ``file_fetch_batch_size`` files per request. Small files come back
+        with their contents and files which are already cached and unchanged
+        are not transferred at all, anything else is left to ``get_file``.
+        '''
+        ret = {}
+        batch_size = self.opts.get('file_fetch_batch_size', 100)
+        if not self.batch_supported or batch_size < 1:
+            return ret
+
+        # Group the paths by the environment they are served from
+        envs = {}
+        for path in paths:
+            if not isinstance(path, six.string_types) \
+                    or not path.startswith('salt://'):
+                continue
+            rel_path, senv = salt.utils.url.parse(path)
+            envs.setdefault(senv or saltenv, {}).setdefault(
+                rel_path, []).append(path)
+
+        for env, rel_paths in six.iteritems(envs):
+            rel_paths = sorted(rel_paths.items())
+            for ind in range(0, len(rel_paths), batch_size):
+                batch = dict(rel_paths[ind:ind + batch_size])
+                cached = self._get_files_batch(list(batch), env, cachedir)
+                if cached is None:
+                    # The master does not know about batched requests
+                    self.batch_supported = False
+                    return ret
+                for rel_path, dest in six.iteritems(cached):
+                    for path in batch[rel_path]:
+                        ret[path] = dest
+        return ret
+
+    def _get_files_batch(self, rel_paths, saltenv, cachedir=None):
+        '''
+        Send a single ``_serve_files`` request and write out the files that
+        came back. Returns a dict mapping relative paths to their cache
+        location, or None if the master does not support the request.
+        '''
+        hashes = {}
+        for rel_path in rel_paths:
+            with self._cache_loc(rel_path, saltenv, cachedir=cachedir) as dest:
+                if os.path.isfile(dest):
+                    hashes[rel_path] = self.hash_file(dest, saltenv)
+        load = {'paths': rel_paths,
+                'saltenv': saltenv,
+                'hashes': hashes,
+                'cmd': '_serve_files'}
+        data = self.channel.send(load)
+        if not isinstance(data, dict):
+            return None
+
+        ret = {}
+        for rel_path, item in six.iteritems(data):
+            if not isinstance(item, dict) or not item.get('hash'):
+                continue
+            if 'data' not in item:
+                if rel_path in hashes and hashes[rel_path] == item['hash']:
+                    with self._cache_loc(
+                            rel_path, saltenv, cachedir=cachedir) as dest:
+                        ret[rel_path] = dest
+                continue
+            contents = item['data']
+            if six.PY3 and isinstance(contents, str):
+                contents = contents.encode()
+            if item.get('gzip', None):
+                contents = salt.utils.gzip_util.uncompress(contents)
+            with self._cache_loc(
+                    item['dest'] or rel_path,
+                    saltenv,
+                    cachedir=cachedir) as dest:
+                # If a directory was formerly cached at this path, then
+                # remove it to avoid a traceback trying to write the file
+                if os.path.isdir(dest):
+                    salt.utils.files.rm_rf(dest)
+                with salt.utils.files.fopen(dest, 'wb+') as ofile:
+                    ofile.write(contents)
+            ret[rel_path] = dest
+        log.debug(
+            'Fetched %d of %d files from saltenv \'%s\' in a single request',
+            len(ret), len(rel_paths), saltenv
+        )
+        return ret
+
     def file_list(self, saltenv='base', prefix=''):
         '''
         List the files on the master
@@ -1399,6 +1505,7 @@ class FSClient(RemoteClient):
         Client.__init__(self, opts)  # pylint: disable=W0233
         self.channel = salt.fileserver.FSChan(opts)
         self.auth = DumbAuth()
+        self.batch_supported = True
 
 
 class DumbAuth(object):
@@ -11,13 +11,16 @@ import fnmatch
 import logging
 import os
 import re
+import threading
 import time
 
 # Import salt libs
 import salt.loader
 import salt.utils.data
 import salt.utils.files
+import salt.utils.gzip_util
 import salt.utils.path
+import salt.utils.stringutils
 import salt.utils.url
 import salt.utils.versions
 from salt.utils.args import get_function_argspec as _argspec
@@ -286,6 +289,106 @@ def is_file_ignored(opts, fname):
     return False
 
 
+class FileHandleCache(object):
+    '''
+    Keep the most recently served files open between ``_serve_file``
+    requests, so that a transfer does not reopen the file and sniff it for
+    binary content on every chunk.
+
+    Entries are validated against the file's mtime, size and inode on each
+    use, a file which has been replaced or modified on disk is reopened.
+    '''
+    def __init__(self, size=32):
+        self.size = size
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.handles = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def _open(self, fpath):
+        '''
+        Return a ``(file object, is_binary)`` tuple for ``fpath``, reusing
+        a cached handle if the file has not changed
+        '''
+        fstat = os.stat(fpath)
+        key = (fstat.st_mtime, fstat.st_size, fstat.st_ino)
+        entry = self.handles.pop(fpath, None)
+        if entry is not None and entry[0] != key:
+            entry[1].close()
+            entry = None
+        if entry is None:
+            # Closed when evicted from the cache or when it goes stale
+            fp_ = salt.utils.files.fopen(fpath, 'rb')  # pylint: disable=resource-leakage
+            entry = (key, fp_, salt.utils.files.is_binary(fpath))
+        # Re-insert to mark as most recently used
+        self.handles[fpath] = entry
+        while len(self.handles) > self.size:
+            self.handles.popitem(last=False)[1][1].close()
+        return entry[1], entry[2]
+
+    def read(self, fpath, loc, size):
+        '''
+        Read ``size`` bytes from ``fpath`` starting at ``loc``. Returns the
+        data and whether or not the file is binary.
+        '''
+        if self.size < 1:
+            with salt.utils.files.fopen(fpath, 'rb') as fp_:
+                fp_.seek(loc)
+                return fp_.read(size), salt.utils.files.is_binary(fpath)
+        if self.pid != os.getpid():
+            # File offsets are shared with the process we were forked from,
+            # drop the inherited handles rather than seeking on them
+            for entry in six.itervalues(self.handles):
+                entry[1].close()
+            self._reset()
+        with self.lock:
+            fp_, binary = self._open(fpath)
+            fp_.seek(loc)
+            return fp_.read(size), binary
+
+    def clear(self):
+        '''
+        Close all cached file handles
+        '''
+        with self.lock:
+            while self.handles:
+                self.handles.popitem()[1][1].close()
+
+
+_FILE_HANDLES = None
+
+
+def read_file_chunk(opts, fpath, load):
+    '''
+    Read the part of ``fpath`` requested by a ``_serve_file`` load, decoding
+    it if the file is not binary.
+
+    Older clients get a single chunk of ``file_buffer_size`` bytes. Clients
+    which pass a ``window`` in the load are sent up to that many chunks at
+    once, capped by ``file_serve_window_max``, which lets a large file be
+    transferred in a handful of round trips. Old masters ignore the
+    ``window`` and keep serving single chunks, which the clients handle
+    transparently since they always ask for the data after what they have
+    already written.
+    '''
+    global _FILE_HANDLES
+    if _FILE_HANDLES is None:
+        _FILE_HANDLES = FileHandleCache(
+            opts.get('file_serve_handle_cache_size', 32))
+    try:
+        window = int(load.get('window', 1))
+    except (TypeError, ValueError):
+        window = 1
+    window = max(1, min(window, opts.get('file_serve_window_max', 16)))
+    data, binary = _FILE_HANDLES.read(
+        fpath, load['loc'], opts['file_buffer_size'] * window)
+    if data and six.PY3 and not binary:
+        data = data.decode(__salt_system_encoding__)
+    return data
+
+
 def clear_lock(clear_func, role, remote=None, lock_type='update'):
     '''
     Function to allow non-fileserver functions to clear update locks
@@ -474,6 +577,19 @@ class Fileserver(object):
                 log.debug('Updating %s fileserver cache', fsb)
                 self.servers[fstr]()
 
+    def fetch_durations(self, back=None):
+        '''
+        Return how long the last fetch of each remote took for all of the
+        enabled fileserver backends which fetch remotes.
+        '''
+        back = self.backends(back)
+        ret = {}
+        for fsb in back:
+            fstr = '{0}.fetch_durations'.format(fsb)
+            if fstr in self.servers:
+                ret[fsb] = self.servers[fstr]()
+        return ret
+
     def update_intervals(self, back=None):
         '''
         Return the update intervals for all of the enabled fileserver backends
@@ -613,6 +729,75 @@ class Fileserver(object):
             return self.servers[fstr](load, fnd)
         return ret
 
+    def serve_files(self, load):
+        '''
+        Find, hash and serve several files in a single request
+
+        ``load['paths']`` is a list of paths in ``load['saltenv']``. The
+        optional ``load['hashes']`` maps paths to the hash (as returned by
+        ``file_hash``) of the copy the client already has, the contents of
+        those files are not sent again if they have not changed.
+
+        Returns a dict keyed by path, holding the ``hash``, ``stat`` and
+        ``dest`` of each file that was found. Small files also have their
+        contents in ``data`` (and ``gzip`` if the contents were compressed)
+        until ``file_serve_batch_max_size`` bytes have been added to the
+        reply, the client fetches any file without ``data`` on its own.
+        '''
+        ret = {}
+        if 'env' in load:
+            # "env" is not supported; Use "saltenv".
+            load.pop('env')
+
+        if 'paths' not in load or 'saltenv' not in load:
+            return ret
+        if not isinstance(load['saltenv'], six.string_types):
+            load['saltenv'] = six.text_type(load['saltenv'])
+        hashes = load.get('hashes') or {}
+        gzip = load.get('gzip', None)
+        budget = self.opts.get('file_serve_batch_max_size', 1048576)
+        buffer_size = self.opts['file_buffer_size']
+
+        for path in load['paths']:
+            path = salt.utils.stringutils.to_unicode(path)
+            fnd = self.find_file(path, load['saltenv'])
+            if not fnd.get('back'):
+                continue
+            hash_fun = '{0}.file_hash'.format(fnd['back'])
+            serve_fun = '{0}.serve_file'.format(fnd['back'])
+            if hash_fun not in self.servers or serve_fun not in self.servers:
+                continue
+            file_load = {'path': path, 'saltenv': load['saltenv']}
+            item = {'hash': self.servers[hash_fun](file_load, fnd),
+                    'stat': fnd.get('stat'),
+                    'dest': fnd.get('rel', '')}
+            ret[path] = item
+            if not item['hash'] or hashes.get(path) == item['hash']:
+                continue
+            try:
+                size = fnd['stat'][6]
+            except (KeyError, IndexError, TypeError):
+                # Without a size we cannot tell if the file fits
+                continue
+            if size > budget:
+                continue
+            file_load['loc'] = 0
+            file_load['window'] = max(1, -(-size // buffer_size))
+            data = self.servers[serve_fun](file_load, fnd).get('data', '')
+            if isinstance(data, six.text_type):
+                raw_size = len(data.encode(__salt_system_encoding__))
+            else:
+                raw_size = len(data)
+            if raw_size != size:
+                # Changed since it was stat'ed or larger than one reply
+                continue
+            budget -= size
+            if gzip and data:
+                data = salt.utils.gzip_util.compress(data, gzip)
+                item['gzip'] = gzip
+            item['data'] = data
+        return ret
+
     def __file_hash_and_stat(self, load):
         '''
         Common code for hashing and stating files
@@ -133,6 +133,13 @@ def update(remotes=None):
     _gitfs().update(remotes)
 
 
+def fetch_durations():
+    '''
+    Return how long the last fetch of each remote took
+    '''
+    return _gitfs().fetch_durations()
+
+
 def update_intervals():
     '''
     Returns the update intervals for each configured remote
@@ -33,6 +33,10 @@ except ImportError:
 __proxyenabled__ = ['*']
 __FQDN__ = None
 
+# With grains_function_cache enabled these grains are only collected again
+# when the Salt version, the minion id or the minion config change
+__grains_ttl__ = {'get_machine_id': 'static', 'get_server_id': 'static'}
+
 # Extend the default list of supported distros. This will be used for the
 # /etc/DISTRO-release checking that is part of linux_distribution()
 from platform import _supported_dists
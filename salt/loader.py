@@ -9,28 +9,35 @@ plugin interfaces used by Salt.
 from __future__ import absolute_import, print_function, unicode_literals
 import os
 import sys
+import copy
 import time
+import hashlib
 import logging
 import inspect
 import tempfile
 import functools
 import threading
 import types
+import collections
 from collections import MutableMapping
 from zipimport import zipimporter
 
 # Import salt libs
 import salt.config
 import salt.syspaths
+import salt.utils.atomicfile
 import salt.utils.context
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.event
 import salt.utils.files
+import salt.utils.json
 import salt.utils.lazy
 import salt.utils.odict
 import salt.utils.platform
+import salt.utils.stringutils
 import salt.utils.versions
+import salt.version
 from salt.exceptions import LoaderError
 from salt.template import check_render_pipe_str
 from salt.utils.decorators import Depends
@@ -97,6 +104,14 @@ LIBCLOUD_FUNCS_NOT_SUPPORTED = (
 # Will be set to pyximport module at runtime if cython is enabled in config.
 pyximport = None
 
+# Directory listings are only kept in the loader index once the directory has
+# not been modified for this many seconds, a directory modified twice within
+# the timestamp granularity of the filesystem would otherwise go unnoticed
+LOADER_INDEX_SETTLE_TIME = 2
+
+# Loader indexes of this process, by path
+_LOADER_INDEXES = {}
+
 
 def static_loader(
         opts,
@@ -663,6 +678,262 @@ def _load_cached_grains(opts, cfn):
         return None
 
 
+class GrainFunctionCache(object):
+    '''
+    The results and run times of the grain functions, kept in
+    ``grains.functions.p`` in the cachedir.
+
+    A grain module declares how long the results of its functions stay valid
+    with ``__grains_ttl__``, either a number of seconds or ``static`` for the
+    whole module, or a dict of them by function name. The
+    ``grains_function_cache_ttls`` option overrides them by module or
+    function. Static results are valid until the grain module, the Salt
+    version, the minion id or the minion config file change.
+    '''
+    def __init__(self, opts):
+        self.opts = opts
+        self.path = os.path.join(opts['cachedir'], 'grains.functions.p')
+        self.ttls = opts.get('grains_function_cache_ttls') or {}
+        self.refresh = opts.get('refresh_grains_cache', False)
+        self.serial = salt.payload.Serial(opts)
+        self.header = {'version': salt.version.__version__,
+                       'id': opts.get('id'),
+                       'config': self._mtime(opts.get('conf_file'))}
+        self.functions = {}
+        self.seen = {}
+        self.read()
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except (OSError, TypeError):
+            return None
+
+    def read(self):
+        '''
+        Read the cache, it is dropped when the minion changed
+        '''
+        try:
+            with salt.utils.files.fopen(self.path, 'rb') as fp_:
+                data = salt.utils.data.decode(self.serial.load(fp_),
+                                              preserve_tuples=True)
+            if data['header'] == self.header:
+                self.functions = data['functions']
+        except Exception:
+            self.functions = {}
+
+    def write(self):
+        '''
+        Write the results and run times of the grain functions called
+        '''
+        data = {'header': self.header, 'functions': self.seen}
+        try:
+            with salt.utils.files.set_umask(0o077):
+                with salt.utils.atomicfile.atomic_open(self.path, 'wb') as fp_:
+                    self.serial.dump(data, fp_)
+        except Exception as exc:
+            log.error('Unable to write the grain function cache %s: %s',
+                      self.path, exc)
+
+    def ttl(self, key, func):
+        '''
+        Return the number of seconds the result of a grain function stays
+        valid, ``static`` or 0 if it is not cached
+        '''
+        mod_name, fun_name = key.split('.', 1)
+        for name in (key, mod_name):
+            if name in self.ttls:
+                ttl = self.ttls[name]
+                break
+        else:
+            ttl = getattr(sys.modules.get(func.__module__), '__grains_ttl__', 0)
+            if isinstance(ttl, dict):
+                ttl = ttl.get(fun_name, 0)
+        if ttl == 'static' or isinstance(ttl, (int, float)) and ttl > 0:
+            return ttl
+        return 0
+
+    def _module_mtime(self, func):
+        return self._mtime(getattr(sys.modules.get(func.__module__), '__file__', None))
+
+    def get(self, key, func):
+        '''
+        Return the cached result of a grain function, None if there is none
+        or it expired
+        '''
+        entry = self.functions.get(key)
+        if self.refresh or entry is None or entry['ret'] is None:
+            return None
+        ttl = self.ttl(key, func)
+        if not ttl or entry['mtime'] != self._module_mtime(func):
+            return None
+        if ttl != 'static' and time.time() - entry['time'] > ttl:
+            return None
+        log.trace('Using the cached result of the %s grain', key)
+        self.seen[key] = entry
+        # Merging the grains must not change the cached results
+        return copy.deepcopy(entry['ret'])
+
+    def set(self, key, func, ret, duration):
+        '''
+        Record the result and the run time of a grain function
+        '''
+        ttl = self.ttl(key, func)
+        self.seen[key] = {
+            'time': time.time(),
+            'duration': duration,
+            'ttl': ttl,
+            'mtime': self._module_mtime(func),
+            'ret': copy.deepcopy(ret) if ttl and isinstance(ret, dict) else None}
+
+    def info(self):
+        '''
+        Return the run times of the grain functions, how long ago they ran
+        and whether their result is cached
+        '''
+        now = time.time()
+        return dict(
+            (key, {'duration': entry['duration'],
+                   'age': now - entry['time'],
+                   'ttl': entry['ttl'],
+                   'cached': entry['ret'] is not None})
+            for key, entry in six.iteritems(self.functions))
+
+
+def _call_grain_function(key, func, args, function_cache):
+    '''
+    Call a grain function, unless its result is in the grain function cache
+    '''
+    if function_cache is not None:
+        ret = function_cache.get(key, func)
+        if ret is not None:
+            return ret
+    start = time.time()
+    ret = func(*args)
+    if function_cache is not None:
+        function_cache.set(key, func, ret, time.time() - start)
+    return ret
+
+
+def _grain_function_args(key, func, proxy):
+    '''
+    Return the arguments to call a grain function with
+    '''
+    # Grains are loaded too early to take advantage of the injected
+    # __proxy__ variable.  Pass an instance of that LazyLoader
+    # here instead to grains functions if the grains functions take
+    # one parameter.  Then the grains can have access to the
+    # proxymodule for retrieving information from the connected
+    # device.
+    if not key.startswith('core.') and func.__code__.co_argcount == 1:
+        return (proxy,)
+    return ()
+
+
+def _log_grain_function_error(key, func, exc_info=True):
+    if salt.utils.platform.is_proxy():
+        log.info('The following CRITICAL message may not be an error; the proxy may not be completely established yet.')
+    log.critical(
+        'Failed to load grains defined in grain file %s in '
+        'function %s, error:\n', key, func,
+        exc_info=exc_info
+    )
+
+
+def _run_grain_functions(calls, proxy, function_cache):
+    '''
+    Run the grain functions one after the other and yield their results. An
+    exception raised by a core grain function is raised, the other grain
+    functions which fail are skipped.
+    '''
+    for key, func in calls:
+        log.trace('Loading %s grain', key)
+        if key.startswith('core.'):
+            yield _call_grain_function(key, func, (), function_cache)
+            continue
+        try:
+            ret = _call_grain_function(
+                key, func, _grain_function_args(key, func, proxy),
+                function_cache)
+        except Exception:
+            _log_grain_function_error(key, func)
+            continue
+        yield ret
+
+
+def _run_grain_functions_concurrently(calls, proxy, function_cache, workers,
+                                      timeout=None):
+    '''
+    Run the grain functions in up to ``workers`` threads and yield their
+    results in the order of the calls, like _run_grain_functions. A grain
+    function which does not return within ``timeout`` seconds is skipped,
+    its thread is left to finish in the background.
+    '''
+    results = [{} for _ in calls]
+    finished = six.moves.queue.Queue()
+
+    def _run(index, key, func):
+        result = results[index]
+        try:
+            result['ret'] = func(*_grain_function_args(key, func, proxy))
+        except Exception:
+            result['exc_info'] = sys.exc_info()
+        finally:
+            finished.put(index)
+
+    pending = collections.deque()
+    for index, (key, func) in enumerate(calls):
+        if function_cache is not None:
+            ret = function_cache.get(key, func)
+            if ret is not None:
+                results[index]['ret'] = ret
+                continue
+        pending.append(index)
+    running = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            index = pending.popleft()
+            key, func = calls[index]
+            log.trace('Loading %s grain', key)
+            thread = threading.Thread(target=_run, args=(index, key, func),
+                                      name='grains-{0}'.format(key))
+            # A hung grain function must not keep the process from exiting
+            thread.daemon = True
+            running[index] = time.time()
+            thread.start()
+        wait = None
+        if timeout is not None:
+            wait = max(min(running.values()) + timeout - time.time(), 0)
+        try:
+            index = finished.get(timeout=wait)
+        except six.moves.queue.Empty:
+            now = time.time()
+            for index, started in list(running.items()):
+                if now - started >= timeout:
+                    results[index]['timeout'] = True
+                    del running[index]
+            continue
+        if index in running:
+            results[index]['duration'] = time.time() - running.pop(index)
+
+    for (key, func), result in zip(calls, results):
+        if 'timeout' in result:
+            log.error(
+                'Grain function %s did not return within %s seconds, its '
+                'grains are left out', key, timeout
+            )
+            continue
+        if 'exc_info' in result:
+            if key.startswith('core.'):
+                six.reraise(*result['exc_info'])
+            _log_grain_function_error(key, func, result['exc_info'])
+            continue
+        if function_cache is not None and 'duration' in result:
+            function_cache.set(key, func, result['ret'], result['duration'])
+        yield result['ret']
+
+
 def grains(opts, force_refresh=False, proxy=None):
     '''
     Return the functions for the dynamic grains and the values for the static
@@ -726,44 +997,20 @@ def grains(opts, force_refresh=False, proxy=None):
     funcs = grain_funcs(opts, proxy=proxy)
     if force_refresh:  # if we refresh, lets reload grain modules
         funcs.clear()
-    # Run core grains
-    for key in funcs:
-        if not key.startswith('core.'):
-            continue
-        log.trace('Loading %s grain', key)
-        ret = funcs[key]()
-        if not isinstance(ret, dict):
-            continue
-        if grains_deep_merge:
-            salt.utils.dictupdate.update(grains_data, ret)
-        else:
-            grains_data.update(ret)
-
-    # Run the rest of the grains
-    for key in funcs:
-        if key.startswith('core.') or key == '_errors':
-            continue
-        try:
-            # Grains are loaded too early to take advantage of the injected
-            # __proxy__ variable.  Pass an instance of that LazyLoader
-            # here instead to grains functions if the grains functions take
-            # one parameter.  Then the grains can have access to the
-            # proxymodule for retrieving information from the connected
-            # device.
-            log.trace('Loading %s grain', key)
-            if funcs[key].__code__.co_argcount == 1:
-                ret = funcs[key](proxy)
-            else:
-                ret = funcs[key]()
-        except Exception:
-            if salt.utils.platform.is_proxy():
-                log.info('The following CRITICAL message may not be an error; the proxy may not be completely established yet.')
-            log.critical(
-                'Failed to load grains defined in grain file %s in '
-                'function %s, error:\n', key, funcs[key],
-                exc_info=True
-            )
-            continue
+    function_cache = None
+    if opts.get('grains_function_cache', False):
+        function_cache = GrainFunctionCache(opts)
+    # Run core grains first, then the rest of the grains
+    calls = [(key, funcs[key]) for key in funcs if key.startswith('core.')]
+    calls.extend((key, funcs[key]) for key in funcs
+                 if not key.startswith('core.') and key != '_errors')
+    if opts.get('grains_workers', 0) > 1:
+        results = _run_grain_functions_concurrently(
+            calls, proxy, function_cache, opts['grains_workers'],
+            opts.get('grains_timeout') or None)
+    else:
+        results = _run_grain_functions(calls, proxy, function_cache)
+    for ret in results:
         if not isinstance(ret, dict):
             continue
         if grains_deep_merge:
@@ -790,6 +1037,9 @@ def grains(opts, force_refresh=False, proxy=None):
         except KeyError:
             pass
 
+    if function_cache is not None:
+        function_cache.write()
+
     grains_data.update(opts['grains'])
     # Write cache if enabled
     if opts.get('grains_cache', False):
@@ -1033,6 +1283,210 @@ class FilterDictWrapper(MutableMapping):
                 yield key.replace(self.suffix, '')
 
 
+class LoaderIndex(object):
+    '''
+    A persistent index of the module directories scanned by the loaders of
+    one tag, of the file mappings built from them and of the outcome of the
+    ``__virtual__`` functions of their modules.
+
+    Directory listings and file mappings are validated against the mtime of
+    the directories they were built from. The virtual names of the modules
+    only decide in which order the loader tries the files for a name, a
+    module returning False from ``__virtual__`` is only skipped without
+    importing it when it sets ``__virtual_cache__`` to True, its file is
+    unchanged and the grains hash is the same.
+    '''
+    def __init__(self, path=None):
+        self.path = path
+        self.dirs = {}
+        self.mappings = {}
+        self.virtuals = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if path is not None:
+            self.read()
+
+    def read(self):
+        '''
+        Read the index from disk
+        '''
+        try:
+            with salt.utils.files.fopen(self.path, 'r') as fp_:
+                data = salt.utils.json.load(fp_)
+            self.dirs = data['dirs']
+            self.mappings = data['mappings']
+            self.virtuals = data['virtuals']
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            self.dirs = {}
+            self.mappings = {}
+            self.virtuals = {}
+
+    def write(self):
+        '''
+        Write the index to disk if it changed
+        '''
+        if not self.dirty or self.path is None:
+            return
+        with self._lock:
+            self.dirty = False
+            data = salt.utils.json.dumps({'dirs': self.dirs,
+                                          'mappings': self.mappings,
+                                          'virtuals': self.virtuals})
+        try:
+            cache_dir = os.path.dirname(self.path)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            with salt.utils.atomicfile.atomic_open(self.path, 'w') as fp_:
+                fp_.write(data)
+        except (IOError, OSError) as exc:
+            log.debug('Unable to write the loader index %s: %s', self.path, exc)
+
+    def listdir(self, path, listed=None):
+        '''
+        Return the sorted listing of a directory, from the index if the
+        directory was not modified since it was indexed. The mtime of the
+        directory, None if it does not exist, is recorded in listed.
+        '''
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            if listed is not None:
+                listed[path] = None
+            raise
+        if listed is not None:
+            listed[path] = mtime
+        entry = self.dirs.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        files = sorted(os.listdir(path))
+        if time.time() - mtime > LOADER_INDEX_SETTLE_TIME:
+            with self._lock:
+                self.dirs[path] = [mtime, files]
+                self.dirty = True
+        return files
+
+    @staticmethod
+    def mapping_key(*args):
+        '''
+        Return the key of the file mapping built with the given arguments
+        '''
+        data = salt.utils.json.dumps(args, sort_keys=True)
+        return hashlib.sha1(salt.utils.stringutils.to_bytes(data)).hexdigest()
+
+    def get_mapping(self, key):
+        '''
+        Return the file mapping for the key as a list of names, paths and
+        suffixes, None if it is not indexed or one of the directories it was
+        built from changed
+        '''
+        entry = self.mappings.get(key)
+        if entry is None:
+            return None
+        for path, mtime in six.iteritems(entry[0]):
+            try:
+                current = os.stat(path).st_mtime
+            except OSError:
+                current = None
+            if current != mtime:
+                return None
+        return entry[1]
+
+    def set_mapping(self, key, listed, mapping):
+        '''
+        Index a file mapping built from the directories listed
+        '''
+        now = time.time()
+        for mtime in six.itervalues(listed):
+            if mtime is not None and now - mtime <= LOADER_INDEX_SETTLE_TIME:
+                return
+        with self._lock:
+            self.mappings[key] = [listed, mapping]
+            self.dirty = True
+
+    @staticmethod
+    def _source(fpath):
+        '''
+        Return the path of the source of a module compiled in __pycache__,
+        the modules are indexed by it as the loader picks the compiled module
+        once there is one
+        '''
+        dirname, basename = os.path.split(fpath)
+        if os.path.basename(dirname) != '__pycache__':
+            return fpath
+        return os.path.join(os.path.dirname(dirname),
+                            '{0}.py'.format(basename.split('.', 1)[0]))
+
+    @classmethod
+    def _stat(cls, fpath):
+        '''
+        Return the mtime and size of the source of a module
+        '''
+        try:
+            stat = os.stat(cls._source(fpath))
+        except OSError:
+            stat = os.stat(fpath)
+        return [stat.st_mtime, stat.st_size]
+
+    def virtual_names(self, fpath):
+        '''
+        Return the names the module in fpath was last loaded as, an empty
+        list if its __virtual__ function returned False and None if it is
+        not known
+        '''
+        entry = self.virtuals.get(self._source(fpath))
+        if entry is None:
+            return None
+        return entry[3]
+
+    def virtual_failure(self, fpath, grains_hash):
+        '''
+        Return a tuple of True and the reason if the module in fpath can be
+        skipped because its __virtual__ function returned False for the same
+        grains, (False, None) otherwise
+        '''
+        entry = self.virtuals.get(self._source(fpath))
+        if entry is None or entry[3] or not entry[5] or entry[2] != grains_hash:
+            return False, None
+        try:
+            stat = self._stat(fpath)
+        except OSError:
+            return False, None
+        if stat != entry[:2]:
+            return False, None
+        return True, entry[4]
+
+    def set_virtual(self, fpath, grains_hash, names, reason=None, cache=False):
+        '''
+        Record the names a module was loaded as, an empty list of names if
+        its __virtual__ function returned False for the reason given
+        '''
+        try:
+            stat = self._stat(fpath)
+        except OSError:
+            return
+        if reason is not None:
+            reason = six.text_type(reason)
+        entry = stat + [grains_hash, list(names), reason, bool(cache)]
+        fpath = self._source(fpath)
+        with self._lock:
+            if self.virtuals.get(fpath) != entry:
+                self.virtuals[fpath] = entry
+                self.dirty = True
+
+
+def loader_index(opts, tag):
+    '''
+    Return the loader index of a tag shared by the loaders of this process,
+    None if the loader index is disabled
+    '''
+    if not opts.get('loader_index') or not opts.get('cachedir'):
+        return None
+    path = os.path.join(opts['cachedir'], 'loader', '{0}.index'.format(tag))
+    if path not in _LOADER_INDEXES:
+        _LOADER_INDEXES[path] = LoaderIndex(path)
+    return _LOADER_INDEXES[path]
+
+
 class LazyLoader(salt.utils.lazy.LazyDict):
     '''
     A pseduo-dictionary which has a set of keys which are the
@@ -1126,7 +1580,11 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         )
 
         self._lock = threading.RLock()
+        self.index = loader_index(self.opts, self.tag)
+        self._grains_hash = None
+        self._listed = None
         self._refresh_file_mapping()
+        self._write_index()
 
         super(LazyLoader, self).__init__()  # late init the lazy loader
         # create all of the import namespaces
@@ -1168,6 +1626,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                 # if we got what we wanted, we are done
                 if self._load_module(name) and mod_name in self.loaded_modules:
                     break
+            self._write_index()
         if mod_name in self.loaded_modules:
             return self.loaded_modules[mod_name]
         else:
@@ -1193,6 +1652,37 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                 else:
                     return '\'{0}\' __virtual__ returned False'.format(mod_name)
 
+    def _listdir(self, path):
+        '''
+        Return the sorted listing of a directory, through the loader index
+        if it is enabled
+        '''
+        if self.index is None:
+            return sorted(os.listdir(path))
+        return self.index.listdir(path, self._listed)
+
+    def _write_index(self):
+        '''
+        Write the loader index if it is enabled
+        '''
+        if self.index is not None:
+            self.index.write()
+
+    @property
+    def grains_hash(self):
+        '''
+        The hash of the grains and proxy type the __virtual__ functions of the
+        modules are run with, for the loader index
+        '''
+        if self._grains_hash is None:
+            proxytype = (self.opts.get('proxy') or {}).get('proxytype')
+            data = salt.utils.json.dumps(
+                [self.opts.get('grains', {}), proxytype, self.virtual_funcs],
+                sort_keys=True, default=repr)
+            self._grains_hash = hashlib.sha1(
+                salt.utils.stringutils.to_bytes(data)).hexdigest()
+        return self._grains_hash
+
     def _refresh_file_mapping(self):
         '''
         refresh the mapping of the FS on disk
@@ -1229,18 +1719,45 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         # The files are added in order of priority, so order *must* be retained.
         self.file_mapping = salt.utils.odict.OrderedDict()
 
+        if self.index is None:
+            self._scan_module_dirs(suffix_order)
+        else:
+            key = self.index.mapping_key(self.module_dirs,
+                                         sorted(self.suffix_map),
+                                         sorted(self.disabled))
+            mapping = self.index.get_mapping(key)
+            if mapping is None:
+                self._listed = {}
+                self._scan_module_dirs(suffix_order)
+                self.index.set_mapping(
+                    key, self._listed,
+                    [[f_noext, fpath, ext] for f_noext, (fpath, ext)
+                     in six.iteritems(self.file_mapping)])
+                self._listed = None
+            else:
+                for f_noext, fpath, ext in mapping:
+                    self.file_mapping[f_noext] = (fpath, ext)
+
+        for smod in self.static_modules:
+            f_noext = smod.split('.')[-1]
+            self.file_mapping[f_noext] = (smod, '.o')
+
+    def _scan_module_dirs(self, suffix_order):
+        '''
+        Add the modules found in the module directories to the file mapping
+        '''
         for mod_dir in self.module_dirs:
             try:
                 # Make sure we have a sorted listdir in order to have
                 # expectable override results
-                files = sorted(os.listdir(mod_dir))
+                files = self._listdir(mod_dir)
             except OSError:
                 continue  # Next mod_dir
             if six.PY3:
                 try:
                     pycache_files = [
                         os.path.join('__pycache__', x) for x in
-                        sorted(os.listdir(os.path.join(mod_dir, '__pycache__')))
+                        self._listdir(os.path.join(mod_dir, '__pycache__'))
                     ]
                 except OSError:
                     pass
@@ -1269,7 +1786,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                     # if its a directory, lets allow us to load that
                     if ext == '':
                         # is there something __init__?
-                        subfiles = os.listdir(fpath)
+                        subfiles = self._listdir(fpath)
                         for suffix in suffix_order:
                             if '' == suffix:
                                 continue  # Next suffix (__init__ must have a suffix)
@@ -1302,9 +1819,6 @@ class LazyLoader(salt.utils.lazy.LazyDict):
 
                 except OSError:
                     continue
-        for smod in self.static_modules:
-            f_noext = smod.split('.')[-1]
-            self.file_mapping[f_noext] = (smod, '.o')
 
     def clear(self):
         '''
@@ -1315,6 +1829,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
             self.loaded_files = set()
             self.missing_modules = {}
             self.loaded_modules = {}
+            self._grains_hash = None
             # if we have been loaded before, lets clear the file mapping since
             # we obviously want a re-do
             if hasattr(self, 'opts'):
@@ -1341,6 +1856,25 @@ class LazyLoader(salt.utils.lazy.LazyDict):
         return mod_opts
 
     def _iter_files(self, mod_name):
+        '''
+        Iterate over all file_mapping files in order of closeness to mod_name,
+        the files the loader index knows to be loaded under other names last
+        '''
+        if self.index is None:
+            for name in self._iter_closest_files(mod_name):
+                yield name
+            return
+        deferred = []
+        for name in self._iter_closest_files(mod_name):
+            names = self.index.virtual_names(self.file_mapping[name][0])
+            if names is not None and mod_name not in names:
+                deferred.append(name)
+                continue
+            yield name
+        for name in deferred:
+            yield name
+
+    def _iter_closest_files(self, mod_name):
         '''
         Iterate over all file_mapping files in order of closeness to mod_name
         '''
@@ -1371,10 +1905,27 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                 reload_module(submodule)
                 self._reload_submodules(submodule)
 
+    def _indexed(self, suffix):
+        '''
+        Whether the __virtual__ outcome of modules with the given suffix is
+        kept in the loader index
+        '''
+        return (self.index is not None and self.virtual_enable and
+                suffix in self.suffix_map and suffix not in ('', '.zip', '.pyx'))
+
     def _load_module(self, name):
         mod = None
         fpath, suffix = self.file_mapping[name]
         self.loaded_files.add(name)
+        if self._indexed(suffix):
+            skip, reason = self.index.virtual_failure(fpath, self.grains_hash)
+            if skip:
+                log.trace(
+                    'Skipping %s.%s, its __virtual__ function returned False '
+                    'according to the loader index', self.tag, name
+                )
+                self.missing_modules[name] = reason
+                return False
         fpath_dirname = os.path.dirname(fpath)
         try:
             sys.path.append(fpath_dirname)
@@ -1536,6 +2087,10 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                     # If a module has information about why it could not be loaded, record it
                     self.missing_modules[module_name] = virtual_err
                     self.missing_modules[name] = virtual_err
+                    if self._indexed(suffix):
+                        self.index.set_virtual(
+                            fpath, self.grains_hash, [], virtual_err,
+                            cache=getattr(mod, '__virtual_cache__', False))
                     return False
         else:
             virtual_aliases = ()
@@ -1610,6 +2165,8 @@ class LazyLoader(salt.utils.lazy.LazyDict):
 
         for tgt_mod in mod_names:
             self.loaded_modules[tgt_mod] = mod_dict[tgt_mod]
+        if self._indexed(suffix):
+            self.index.set_virtual(fpath, self.grains_hash, mod_names)
         return True
 
     def _load(self, key):
@@ -1658,6 +2215,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                         self._refresh_file_mapping()
                         reloaded = True
                     continue
+            self._write_index()
 
         return ret
 
@@ -1672,6 +2230,7 @@ class LazyLoader(salt.utils.lazy.LazyDict):
                 self._load_module(name)
 
             self.loaded = True
+            self._write_index()
 
     def reload_modules(self):
         with self._lock:
@@ -202,9 +202,10 @@ class Maintenance(salt.utils.process.SignalHandlingMultiprocessingProcess):
             for transport, _ in iter_transport_opts(self.opts):
                 if transport != 'tcp':
                     tcp_only = False
-            if not tcp_only:
+            if not tcp_only or self.opts.get('tcp_pub_workers', 1) > 1:
                 # For a TCP only transport, the presence events will be
-                # handled in the transport code.
+                # handled in the transport code, unless the publisher is
+                # sharded over several processes.
                 self.presence_events = True
 
     def run(self):
@@ -230,14 +231,24 @@ class Maintenance(salt.utils.process.SignalHandlingMultiprocessingProcess):
                 salt.daemons.masterapi.clean_old_jobs(self.opts)
                 salt.daemons.masterapi.clean_expired_tokens(self.opts)
                 salt.daemons.masterapi.clean_pub_auth(self.opts)
+                last = now
             self.handle_git_pillar()
             self.handle_schedule()
             self.handle_key_cache()
             self.handle_presence(old_present)
             self.handle_key_rotate(now)
             salt.utils.verify.check_max_open_files(self.opts)
-            last = now
-            time.sleep(self.loop_interval)
+            time.sleep(self.sleep_interval())
+
+    def sleep_interval(self):
+        '''
+        Return the seconds to sleep until the next check cycle, which is
+        earlier than the loop_interval when a scheduled job is due before
+        '''
+        next_fire = self.schedule.time_to_next_fire()
+        if next_fire is None:
+            return self.loop_interval
+        return min(self.loop_interval, next_fire)
 
     def handle_key_cache(self):
         '''
@@ -318,8 +329,10 @@ class Maintenance(salt.utils.process.SignalHandlingMultiprocessingProcess):
         try:
             self.schedule.eval()
             # Check if scheduler requires lower loop interval than
-            # the loop_interval setting
-            if self.schedule.loop_interval < self.loop_interval:
+            # the loop_interval setting, the scheduler with a queue tells
+            # when its next job is due instead
+            if not self.schedule.queue and \
+                    self.schedule.loop_interval < self.loop_interval:
                 self.loop_interval = self.schedule.loop_interval
         except Exception as exc:
             log.error('Exception %s occurred in scheduled job', exc)
@@ -483,6 +496,128 @@ class FileserverUpdate(salt.utils.process.SignalHandlingMultiprocessingProcess):
             time.sleep(60)
 
 
+class JobCacheWriter(salt.utils.process.SignalHandlingMultiprocessingProcess):
+    '''
+    Store the job returns queued by the master workers in the job cache, in
+    batches flushed by size or time.
+    '''
+    def __init__(self, opts, return_queue, **kwargs):
+        '''
+        Create a job cache writer instance
+
+        :param dict opts: The salt options
+        :param ReturnQueue return_queue: The queue the master workers put
+                                         the returns in
+        '''
+        super(JobCacheWriter, self).__init__(**kwargs)
+        self.opts = opts
+        self.return_queue = return_queue
+        self.batch_size = max(int(self.opts['job_cache_writer_batch']), 1)
+        self.interval = float(self.opts['job_cache_writer_interval'])
+        self.running = True
+        self._reset_stats()
+
+    # __setstate__ and __getstate__ are only used on Windows.
+    # We do this so that __init__ will be invoked on Windows in the child
+    # process so that a register_after_fork() equivalent will work on Windows.
+    def __setstate__(self, state):
+        self._is_child = True
+        self.__init__(
+            state['opts'],
+            state['return_queue'],
+            log_queue=state['log_queue'],
+            log_queue_level=state['log_queue_level']
+        )
+
+    def __getstate__(self):
+        return {
+            'opts': self.opts,
+            'return_queue': self.return_queue,
+            'log_queue': self.log_queue,
+            'log_queue_level': self.log_queue_level
+        }
+
+    def _handle_signals(self, signum, sigframe):  # pylint: disable=unused-argument
+        # Stop after the current batch, the queue is drained before exiting
+        self.running = False
+
+    def _reset_stats(self):
+        self.stats = {'returns': 0,
+                      'batches': 0,
+                      'errors': 0,
+                      'overflows': 0,
+                      'mean_batch': 0,
+                      'max_batch': 0,
+                      'mean_flush': 0,
+                      'max_flush': 0}
+        self.stat_clock = time.time()
+
+    def _post_stats(self):
+        '''
+        Fire an event with the writer stats and reset them
+        '''
+        end = time.time()
+        if end - self.stat_clock > self.opts['master_stats_event_iter']:
+            self.stats['queue'] = self.return_queue.qsize()
+            self.event.fire_event(
+                {'time': end - self.stat_clock, 'stats': self.stats},
+                tagify(self.__class__.__name__, 'stats'))
+            self._reset_stats()
+
+    def flush(self, batch):
+        '''
+        Store a batch of returns in the job cache
+        '''
+        if not batch:
+            return
+        start = time.time()
+        try:
+            errors = salt.utils.job.store_job_batch(
+                self.opts, batch, mminion=self.mminion)
+        except KeyError:
+            # The job cache does not have the needed functions, this has
+            # already been logged
+            errors = len(batch)
+        duration = time.time() - start
+        stats = self.stats
+        stats['batches'] += 1
+        stats['returns'] += len(batch)
+        stats['errors'] += errors
+        stats['mean_batch'] += (len(batch) - stats['mean_batch']) / float(stats['batches'])
+        stats['max_batch'] = max(stats['max_batch'], len(batch))
+        stats['mean_flush'] += (duration - stats['mean_flush']) / stats['batches']
+        stats['max_flush'] = max(stats['max_flush'], duration)
+
+    def run(self):
+        '''
+        Store the queued returns until the master shuts down
+        '''
+        salt.utils.process.appendproctitle(self.__class__.__name__)
+        self.mminion = salt.minion.MasterMinion(
+            self.opts,
+            states=False,
+            rend=False,
+            ignore_config_errors=True
+        )
+        self.event = None
+        if self.opts['master_stats']:
+            self.event = salt.utils.event.get_master_event(
+                self.opts, self.opts['sock_dir'], listen=False)
+
+        while self.running:
+            self.flush(self.return_queue.get_batch(self.batch_size, self.interval))
+            overflows = self.return_queue.pop_overflows()
+            if overflows:
+                log.warning(
+                    'The job cache writer is falling behind, %s returns did '
+                    'not fit in the queue and were stored by the master '
+                    'workers', overflows)
+                self.stats['overflows'] += overflows
+            if self.event is not None:
+                self._post_stats()
+        self.flush(self.return_queue.drain())
+
+
 class Master(SMaster):
     '''
     The salt master server
@@ -711,8 +846,16 @@ class Master(SMaster):
                 log.debug('Sleeping for two seconds to let concache rest')
                 time.sleep(2)
 
+            return_queue = None
+            if self.opts['job_cache_writer']:
+                log.info('Creating master job cache writer process')
+                return_queue = salt.utils.job.ReturnQueue(
+                    int(self.opts['job_cache_writer_queue']))
+                self.process_manager.add_process(
+                    JobCacheWriter, args=(self.opts, return_queue))
+
             log.info('Creating master request server process')
-            kwargs = {}
+            kwargs = {'return_queue': return_queue}
             if salt.utils.platform.is_windows():
                 kwargs['log_queue'] = salt.log.setup.get_multiprocessing_logging_queue()
                 kwargs['log_queue_level'] = salt.log.setup.get_multiprocessing_logging_level()
@@ -805,13 +948,14 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
     Starts up the master request server, minions send results to this
     interface.
     '''
-    def __init__(self, opts, key, mkey, secrets=None, **kwargs):
+    def __init__(self, opts, key, mkey, secrets=None, return_queue=None, **kwargs):
         '''
         Create a request server
 
         :param dict opts: The salt options dictionary
         :key dict: The user starting the server and the AES key
         :mkey dict: The user starting the server and the RSA key
+        :return_queue ReturnQueue: The queue of the job cache writer, if any
 
         :rtype: ReqServer
         :returns: Request server
@@ -822,6 +966,7 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
         # Prepare the AES key
         self.key = key
         self.secrets = secrets
+        self.return_queue = return_queue
 
     # __setstate__ and __getstate__ are only used on Windows.
     # We do this so that __init__ will be invoked on Windows in the child
@@ -833,6 +978,7 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
             state['key'],
             state['mkey'],
             secrets=state['secrets'],
+            return_queue=state['return_queue'],
             log_queue=state['log_queue'],
             log_queue_level=state['log_queue_level']
         )
@@ -843,6 +989,7 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
             'key': self.key,
             'mkey': self.master_key,
             'secrets': self.secrets,
+            'return_queue': self.return_queue,
             'log_queue': self.log_queue,
             'log_queue_level': self.log_queue_level
         }
@@ -886,7 +1033,7 @@ class ReqServer(salt.utils.process.SignalHandlingMultiprocessingProcess):
             if transport != 'tcp':
                 tcp_only = False
 
-        kwargs = {}
+        kwargs = {'return_queue': self.return_queue}
         if salt.utils.platform.is_windows():
             kwargs['log_queue'] = self.log_queue
             kwargs['log_queue_level'] = self.log_queue_level
@@ -941,6 +1088,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
                  key,
                  req_channels,
                  name,
+                 return_queue=None,
                  **kwargs):
         '''
         Create a salt master worker process
@@ -948,6 +1096,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
         :param dict opts: The salt options
         :param dict mkey: The user running the salt master and the AES key
         :param dict key: The user running the salt master and the RSA key
+        :param ReturnQueue return_queue: The queue of the job cache writer, if any
 
         :rtype: MWorker
         :return: Master worker
@@ -957,6 +1106,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
         super(MWorker, self).__init__(**kwargs)
         self.opts = opts
         self.req_channels = req_channels
+        self.return_queue = return_queue
 
         self.mkey = mkey
         self.key = key
@@ -977,6 +1127,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
         )
         self.opts = state['opts']
         self.req_channels = state['req_channels']
+        self.return_queue = state['return_queue']
         self.mkey = state['mkey']
         self.key = state['key']
         self.k_mtime = state['k_mtime']
@@ -986,6 +1137,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
         return {
             'opts': self.opts,
             'req_channels': self.req_channels,
+            'return_queue': self.return_queue,
             'mkey': self.mkey,
             'key': self.key,
             'k_mtime': self.k_mtime,
@@ -1108,7 +1260,7 @@ class MWorker(salt.utils.process.SignalHandlingMultiprocessingProcess):
            self.opts,
            self.key,
            )
-        self.aes_funcs = AESFuncs(self.opts)
+        self.aes_funcs = AESFuncs(self.opts, return_queue=self.return_queue)
         salt.utils.crypt.reinit_crypto()
         self.__bind()
 
@@ -1120,16 +1272,20 @@ class AESFuncs(object):
     '''
     # The AES Functions:
     #
-    def __init__(self, opts):
+    def __init__(self, opts, return_queue=None):
         '''
         Create a new AESFuncs
 
         :param dict opts: The salt options
+        :param ReturnQueue return_queue: The queue of the job cache writer,
+                                         returns are stored synchronously
+                                         when it is None
 
         :rtype: AESFuncs
         :returns: Instance for handling AES operations
         '''
         self.opts = opts
+        self.return_queue = return_queue
         self.event = salt.utils.event.get_master_event(self.opts, self.opts['sock_dir'], listen=False)
         self.serial = salt.payload.Serial(opts)
         self.ckminions = salt.utils.minions.CkMinions(opts)
@@ -1153,6 +1309,7 @@ class AESFuncs(object):
         import salt.fileserver
         self.fs_ = salt.fileserver.Fileserver(self.opts)
         self._serve_file = self.fs_.serve_file
+        self._serve_files = self.fs_.serve_files
         self._file_find = self.fs_._find_file
         self._file_hash = self.fs_.file_hash
         self._file_hash_and_stat = self.fs_.file_hash_and_stat
@@ -1518,6 +1675,9 @@ class AESFuncs(object):
                                        'data',
                                        {'grains': load['grains'],
                                         'pillar': data})
+            self.ckminions.update_data_index(load['id'],
+                                             {'grains': load['grains'],
+                                              'pillar': data})
             if self.opts.get('minion_data_cache_events') is True:
                 self.event.fire_event({'Minion data cache refresh': load['id']}, tagify(load['id'], 'refresh', 'minion'))
         return data
@@ -1605,7 +1765,8 @@ class AESFuncs(object):
 
         try:
             salt.utils.job.store_job(
-                self.opts, load, event=self.event, mminion=self.mminion)
+                self.opts, load, event=self.event, mminion=self.mminion,
+                return_queue=self.return_queue)
         except salt.exceptions.SaltCacheError:
             log.error('Could not store job information for load: %s', load)
 
@@ -921,7 +921,11 @@ class MinionManager(MinionBase):
         self.auth_wait = self.opts['acceptance_wait_time']
         self.max_auth_wait = self.opts['acceptance_wait_time_max']
         self.minions = []
-        self.jid_queue = []
+        # Shared by the minions of all the masters, so that a job published
+        # by several masters only runs once, and process_count_max applies
+        # to all of them together
+        self.jid_queue = salt.utils.minion.JidQueue(self.opts['minion_jid_queue_hwm'])
+        self.job_queue = salt.utils.minion.new_job_queue(self.opts)
 
         install_zmq()
         self.io_loop = ZMQDefaultLoop.current()
@@ -947,7 +951,7 @@ class MinionManager(MinionBase):
 
     def _create_minion_object(self, opts, timeout, safe,
                               io_loop=None, loaded_base_name=None,
-                              jid_queue=None):
+                              jid_queue=None, job_queue=None):
         '''
         Helper function to return the correct type of object
         '''
@@ -956,7 +960,8 @@ class MinionManager(MinionBase):
                       safe,
                       io_loop=io_loop,
                       loaded_base_name=loaded_base_name,
-                      jid_queue=jid_queue)
+                      jid_queue=jid_queue,
+                      job_queue=job_queue)
 
     def _spawn_minions(self):
         '''
@@ -976,6 +981,7 @@ class MinionManager(MinionBase):
                                                 io_loop=self.io_loop,
                                                 loaded_base_name='salt.loader.{0}'.format(s_opts['master']),
                                                 jid_queue=self.jid_queue,
+                                                job_queue=self.job_queue,
                                                )
             self.minions.append(minion)
             self.io_loop.spawn_callback(self._connect_minion, minion)
@@ -1051,12 +1057,127 @@ class MinionManager(MinionBase):
             minion.destroy()
 
 
+class JobWorker(object):
+    '''
+    A process of the JobWorkerPool, and the end of the pipe to talk to it
+    '''
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        # The JID of the job the worker is running, None while it is idle
+        self.jid = None
+        self.jobs = 0
+        self.retire = False
+
+
+class JobWorkerPool(object):
+    '''
+    A pool of processes started with the modules of the minion loaded, which
+    run jobs one after the other, so that a job does not have to pay for
+    starting a new process.
+
+    Jobs are only handed to idle workers, ``submit`` returns False when all
+    of them are busy, so that the job is run in a new process instead and no
+    job waits for another one. A worker is replaced after it has run
+    ``max_jobs`` jobs (if set), when it dies, e.g. because its job was
+    killed, and when the minion reloads its modules.
+
+    ``target`` is run in the workers with the arguments ``args`` and the end
+    of the pipe to receive the jobs over.
+    '''
+    def __init__(self, size, max_jobs, target, args):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.target = target
+        self.args = args
+        self.workers = [self._spawn() for _ in range(size)]
+
+    def _spawn(self):
+        '''
+        Start a new worker
+        '''
+        conn, child_conn = multiprocessing.Pipe()
+        with default_signals(signal.SIGINT, signal.SIGTERM):
+            process = SignalHandlingMultiprocessingProcess(
+                target=self.target, args=tuple(self.args) + (child_conn,))
+            process.start()
+        child_conn.close()
+        log.debug('Started job worker with PID %s', process.pid)
+        return JobWorker(process, conn)
+
+    def _retire(self, worker):
+        '''
+        Tell a worker to exit once it is done with its job
+        '''
+        try:
+            worker.conn.send(None)
+        except (EOFError, IOError, OSError):
+            pass
+        worker.conn.close()
+
+    def collect(self):
+        '''
+        Take note of the jobs the workers finished, and replace the workers
+        which died or are due for replacement
+        '''
+        for idx, worker in enumerate(self.workers):
+            alive = True
+            try:
+                while worker.jid is not None and worker.conn.poll():
+                    worker.conn.recv()
+                    worker.jid = None
+                    worker.jobs += 1
+            except (EOFError, IOError, OSError):
+                alive = False
+            if not alive or not worker.process.is_alive():
+                log.debug('Job worker with PID %s is gone, replacing it',
+                          worker.process.pid)
+                worker.conn.close()
+                self.workers[idx] = self._spawn()
+            elif worker.jid is None and (
+                    worker.retire or 0 < self.max_jobs <= worker.jobs):
+                self._retire(worker)
+                self.workers[idx] = self._spawn()
+
+    def submit(self, data):
+        '''
+        Hand a job to an idle worker, returns False if there is none
+        '''
+        self.collect()
+        for worker in self.workers:
+            if worker.jid is not None or worker.retire:
+                continue
+            try:
+                worker.conn.send(data)
+            except (EOFError, IOError, OSError):
+                continue
+            worker.jid = data['jid']
+            return True
+        return False
+
+    def recycle(self):
+        '''
+        Replace every worker once it is done with its job
+        '''
+        for worker in self.workers:
+            worker.retire = True
+        self.collect()
+
+    def stop(self):
+        '''
+        Tell every worker to exit once it is done with its job
+        '''
+        for worker in self.workers:
+            self._retire(worker)
+        self.workers = []
+
+
 class Minion(MinionBase):
     '''
     This class instantiates a minion, runs connections for a minion,
     and loads all of the functions into the minion
     '''
-    def __init__(self, opts, timeout=60, safe=True, loaded_base_name=None, io_loop=None, jid_queue=None):  # pylint: disable=W0231
+    def __init__(self, opts, timeout=60, safe=True, loaded_base_name=None, io_loop=None, jid_queue=None, job_queue=None):  # pylint: disable=W0231
         '''
         Pass in the options dict
         '''
@@ -1073,7 +1194,14 @@ class Minion(MinionBase):
         # Flag meaning minion has finished initialization including first connect to the master.
         # True means the Minion is fully functional and ready to handle events.
         self.ready = False
-        self.jid_queue = jid_queue or []
+        if jid_queue is None or isinstance(jid_queue, list):
+            jid_queue = salt.utils.minion.JidQueue(
+                self.opts['minion_jid_queue_hwm'], jid_queue or [])
+        self.jid_queue = jid_queue
+        self.worker_pool = None
+        if job_queue is None:
+            job_queue = salt.utils.minion.new_job_queue(self.opts)
+        self.job_queue = job_queue
         self.periodic_callbacks = {}
 
         if io_loop is None:
@@ -1436,27 +1564,65 @@ class Minion(MinionBase):
 
         # Don't duplicate jobs
         log.trace('Started JIDs: %s', self.jid_queue)
-        if self.jid_queue is not None:
-            if data['jid'] in self.jid_queue:
-                return
-            else:
-                self.jid_queue.append(data['jid'])
-                if len(self.jid_queue) > self.opts['minion_jid_queue_hwm']:
-                    self.jid_queue.pop(0)
+        if data['jid'] in self.jid_queue:
+            return
+        self.jid_queue.append(data['jid'])
 
         if isinstance(data['fun'], six.string_types):
             if data['fun'] == 'sys.reload_modules':
                 self.functions, self.returners, self.function_errors, self.executors = self._load_modules()
                 self.schedule.functions = self.functions
                 self.schedule.returners = self.returners
+                if self.worker_pool is not None:
+                    self.worker_pool.recycle()
+
+        if self.job_queue.limit > 0:
+            if self.job_queue.full():
+                log.warning(
+                    'Maximum number of processes reached while executing '
+                    'jid %s, queueing it', data['jid'])
+            self.job_queue.put(data, self._start_job)
+            self._start_queued_jobs()
+        else:
+            self._start_job(data)
+
+    def _start_queued_jobs(self):
+        '''
+        Start queued jobs while fewer than process_count_max jobs are running
+        '''
+        while True:
+            job = self.job_queue.pop()
+            if job is None:
+                break
+            start, data = job
+            start(data)
+        salt.utils.minion.write_job_queue(self.opts, self.job_queue)
+
+    def _job_done(self, jid):
+        '''
+        Free the process slot of a job which has ended
+        '''
+        if self.job_queue.finished(jid):
+            self._start_queued_jobs()
 
-        process_count_max = self.opts.get('process_count_max')
-        if process_count_max > 0:
-            process_count = len(salt.utils.minion.running(self.opts))
-            while process_count >= process_count_max:
-                log.warn("Maximum number of processes reached while executing jid {0}, waiting...".format(data['jid']))
-                yield tornado.gen.sleep(10)
-                process_count = len(salt.utils.minion.running(self.opts))
+    def _check_queued_jobs(self):
+        '''
+        Free the process slots of jobs which ended without telling the minion,
+        e.g. because they were killed, while jobs are waiting for a slot
+        '''
+        if not len(self.job_queue):
+            return
+        for jid in salt.utils.minion.ended_jobs(self.opts, self.job_queue.running):
+            log.debug('Job %s ended, freeing its process slot', jid)
+            self.job_queue.finished(jid)
+        self._start_queued_jobs()
+
+    def _start_job(self, data):
+        '''
+        Start the process or thread running a job
+        '''
+        if self._get_worker_pool() is not None and self.worker_pool.submit(data):
+            return
 
         # We stash an instance references to allow for the socket
         # communication in Windows. You can't pickle functions, and thus
@@ -1495,6 +1661,25 @@ class Minion(MinionBase):
         else:
             self.win_proc.append(process)
 
+    def _get_worker_pool(self):
+        '''
+        Return the JobWorkerPool, starting it if job_worker_pool is set, or
+        None if jobs are not run by a pool
+        '''
+        if self.worker_pool is None \
+                and self.opts.get('job_worker_pool', 0) > 0 \
+                and self.opts.get('multiprocessing', True) \
+                and not salt.utils.platform.is_proxy():
+            # Like for single jobs, the minion has to be rebuilt in the
+            # workers on Windows
+            instance = None if salt.utils.platform.is_windows() else self
+            self.worker_pool = JobWorkerPool(
+                self.opts['job_worker_pool'],
+                self.opts.get('job_worker_pool_max_jobs', 0),
+                self._pool_worker,
+                (instance, self.opts, self.connected))
+        return self.worker_pool
+
     def ctx(self):
         '''
         Return a single context manager for the minion's data
@@ -1514,6 +1699,52 @@ class Minion(MinionBase):
 
     @classmethod
     def _target(cls, minion_instance, opts, data, connected):
+        minion_instance = cls._job_instance(minion_instance, opts, connected)
+        cls._run_job(minion_instance, opts, data)
+
+    @classmethod
+    def _pool_worker(cls, minion_instance, opts, connected, conn):
+        '''
+        The target of the JobWorkerPool processes: run the jobs received over
+        ``conn`` one after the other, sending back the JID of every finished
+        job, until None is received
+        '''
+        minion_instance = cls._job_instance(minion_instance, opts, connected)
+        salt.utils.process.appendproctitle('{0}._pool_worker'.format(cls.__name__))
+        title = None
+        if salt.utils.process.HAS_SETPROCTITLE:
+            title = salt.utils.process.setproctitle.getproctitle()
+        while True:
+            try:
+                data = conn.recv()
+            except (EOFError, IOError, OSError):
+                break
+            if data is None:
+                break
+            cls._run_job(minion_instance, opts, data, daemonize=False)
+            if title is not None:
+                # Do not keep appending the JIDs of the jobs
+                salt.utils.process.setproctitle.setproctitle(title)
+            conn.send(data['jid'])
+
+    @staticmethod
+    def _run_job(minion_instance, opts, data, daemonize=True):
+        '''
+        Run a job in the current process or thread
+        '''
+        with tornado.stack_context.StackContext(minion_instance.ctx):
+            if isinstance(data['fun'], tuple) or isinstance(data['fun'], list):
+                Minion._thread_multi_return(minion_instance, opts, data, daemonize=daemonize)
+            else:
+                Minion._thread_return(minion_instance, opts, data, daemonize=daemonize)
+        Minion._fire_job_done(opts, data)
+
+    @classmethod
+    def _job_instance(cls, minion_instance, opts, connected):
+        '''
+        Return the minion to run jobs with, rebuilding it if it could not be
+        passed to the process (on Windows)
+        '''
         if not minion_instance:
             minion_instance = cls(opts)
             minion_instance.connected = connected
@@ -1532,22 +1763,32 @@ class Minion(MinionBase):
                 minion_instance.proc_dir = (
                     get_proc_dir(opts['cachedir'], uid=uid)
                     )
+        return minion_instance
 
-        with tornado.stack_context.StackContext(minion_instance.ctx):
-            if isinstance(data['fun'], tuple) or isinstance(data['fun'], list):
-                Minion._thread_multi_return(minion_instance, opts, data)
-            else:
-                Minion._thread_return(minion_instance, opts, data)
+    @staticmethod
+    def _fire_job_done(opts, data):
+        '''
+        Let the minion know that a job has ended, so that it can start the
+        next queued job
+        '''
+        if opts.get('process_count_max', -1) <= 0:
+            return
+        try:
+            event = salt.utils.event.get_event('minion', opts=opts, listen=False)
+            event.fire_event({'jid': data['jid']}, '__job_done')
+            event.destroy()
+        except Exception as exc:
+            log.debug('Failed to fire the end of job %s: %s', data['jid'], exc)
 
     @classmethod
-    def _thread_return(cls, minion_instance, opts, data):
+    def _thread_return(cls, minion_instance, opts, data, daemonize=True):
         '''
         This method should be used as a threading target, start the actual
         minion side execution.
         '''
         fn_ = os.path.join(minion_instance.proc_dir, data['jid'])
 
-        if opts['multiprocessing'] and not salt.utils.platform.is_windows():
+        if daemonize and opts['multiprocessing'] and not salt.utils.platform.is_windows():
             # Shutdown the multiprocessing before daemonizing
             salt.log.setup.shutdown_multiprocessing_logging()
 
@@ -1731,14 +1972,14 @@ class Minion(MinionBase):
                     )
 
     @classmethod
-    def _thread_multi_return(cls, minion_instance, opts, data):
+    def _thread_multi_return(cls, minion_instance, opts, data, daemonize=True):
         '''
         This method should be used as a threading target, start the actual
         minion side execution.
         '''
         fn_ = os.path.join(minion_instance.proc_dir, data['jid'])
 
-        if opts['multiprocessing'] and not salt.utils.platform.is_windows():
+        if daemonize and opts['multiprocessing'] and not salt.utils.platform.is_windows():
             # Shutdown the multiprocessing before daemonizing
             salt.log.setup.shutdown_multiprocessing_logging()
 
@@ -2088,6 +2329,10 @@ class Minion(MinionBase):
         self.schedule.functions = self.functions
         self.schedule.returners = self.returners
 
+        if self.worker_pool is not None:
+            # The workers were forked with the old modules, pillar and grains
+            self.worker_pool.recycle()
+
     def beacons_refresh(self):
         '''
         Refresh the functions and returners.
@@ -2418,6 +2663,8 @@ class Minion(MinionBase):
 
                     self.schedule.modify_job(name=master_event(type='alive', master=self.opts['master']),
                                              schedule=schedule)
+        elif tag.startswith('__job_done'):
+            self._job_done(data['jid'])
         elif tag.startswith('__schedule_return'):
             # reporting current connection with master
             if data['schedule'].startswith(master_event(type='alive', master='')):
@@ -2446,6 +2693,13 @@ class Minion(MinionBase):
         # Add an extra fallback in case a forked process leaks through
         multiprocessing.active_children()
 
+        # Free the process slots of jobs which were killed
+        self._check_queued_jobs()
+
+        # Replace the job workers which died
+        if self.worker_pool is not None:
+            self.worker_pool.collect()
+
         # Cleanup Windows threads
         if not salt.utils.platform.is_windows():
             return
@@ -2688,6 +2942,9 @@ class Minion(MinionBase):
         self._running = False
         if hasattr(self, 'schedule'):
             del self.schedule
+        if getattr(self, 'worker_pool', None) is not None:
+            self.worker_pool.stop()
+            self.worker_pool = None
         if hasattr(self, 'pub_channel') and self.pub_channel is not None:
             self.pub_channel.on_recv(None)
             if hasattr(self.pub_channel, 'close'):
@@ -3466,7 +3723,7 @@ class ProxyMinionManager(MinionManager):
     '''
     def _create_minion_object(self, opts, timeout, safe,
                               io_loop=None, loaded_base_name=None,
-                              jid_queue=None):
+                              jid_queue=None, job_queue=None):
         '''
         Helper function to return the correct type of object
         '''
@@ -3475,7 +3732,8 @@ class ProxyMinionManager(MinionManager):
                            safe,
                            io_loop=io_loop,
                            loaded_base_name=loaded_base_name,
-                           jid_queue=jid_queue)
+                           jid_queue=jid_queue,
+                           job_queue=job_queue)
 
 
 class ProxyMinion(Minion):
@@ -3752,3 +4010,4 @@ class ProxyMinion(Minion):
                 Minion._thread_multi_return(minion_instance, opts, data)
             else:
                 Minion._thread_return(minion_instance, opts, data)
+        Minion._fire_job_done(opts, data)
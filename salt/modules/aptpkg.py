@@ -99,6 +99,9 @@ if six.PY2:
 # Define the module's virtual name
 __virtualname__ = 'pkg'
 
+# The outcome of __virtual__ only depends on the grains
+__virtual_cache__ = True
+
 
 def __virtual__():
     '''
@@ -22,6 +22,7 @@ from functools import reduce  # pylint: disable=redefined-builtin
 
 # Import Salt libs
 from salt.ext import six
+import salt.loader
 import salt.utils.compat
 import salt.utils.data
 import salt.utils.files
@@ -489,6 +490,25 @@ def ls():  # pylint: disable=C0103
     return sorted(__grains__)
 
 
+def timings():
+    '''
+    .. versionadded:: Fluorine
+
+    Return how long each grain function took the last time the grains were
+    collected, how many seconds ago that was and whether its result is
+    cached. Requires :conf_minion:`grains_function_cache` to be enabled.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' grains.timings
+    '''
+    if not __opts__.get('grains_function_cache', False):
+        return {}
+    return salt.loader.GrainFunctionCache(__opts__).info()
+
+
 def filter_by(lookup_dict, grain='os_family', merge=None, default='default', base=None):
     '''
     .. versionadded:: 0.17.0
@@ -1052,6 +1052,27 @@ def running():
     return salt.utils.minion.running(__opts__)
 
 
+def job_queue():
+    '''
+    .. versionadded:: Fluorine
+
+    Return the jobs waiting for a process slot on the minion because
+    :conf_minion:`process_count_max` is reached, in the order they will be
+    started, the number of queued jobs as ``depth``, and the JIDs of the
+    running jobs.
+
+    A job sent from the master to a minion which has reached the limit is
+    itself queued, call it with ``salt-call`` on the minion in that case.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' saltutil.job_queue
+    '''
+    return salt.utils.minion.read_job_queue(__opts__)
+
+
 def clear_cache():
     '''
     Forcibly removes all caches on a minion.
@@ -75,6 +75,9 @@ log = logging.getLogger(__name__)
 # Define the module's virtual name
 __virtualname__ = 'pkg'
 
+# The outcome of __virtual__ only depends on the grains
+__virtual_cache__ = True
+
 
 def __virtual__():
     '''
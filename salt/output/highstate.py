@@ -170,6 +170,7 @@ def _format_host(host, data, indent_level=1):
     tabular = __opts__.get('state_tabular', False)
     rcounts = {}
     rdurations = []
+    guard_hits = guard_runs = 0
     hcolor = colors['GREEN']
     hstrs = []
     nchanges = 0
@@ -224,6 +225,9 @@ def _format_host(host, data, indent_level=1):
                     rdurations.append(float(rduration))
                 except ValueError:
                     log.error('Cannot parse a float from duration %s', ret.get('duration', 0))
+            if isinstance(ret.get('guard_cache'), dict):
+                guard_hits += ret['guard_cache'].get('hits', 0)
+                guard_runs += ret['guard_cache'].get('hits', 0) + ret['guard_cache'].get('misses', 0)
 
             tcolor = colors['GREEN']
             if ret.get('name') in ['state.orch', 'state.orchestrate', 'state.sls']:
@@ -478,6 +482,10 @@ def _format_host(host, data, indent_level=1):
                 '{0:.3f}'.format(sum_duration).rjust(line_max_len - 5),
                 duration_unit)
             hstrs.append(colorfmt.format(colors['CYAN'], total_duration, colors))
+            if guard_runs:
+                guard_cache = 'Guard cache hits: {0}'.format(
+                    '{0} of {1}'.format(guard_hits, guard_runs).rjust(line_max_len - 17))
+                hstrs.append(colorfmt.format(colors['CYAN'], guard_cache, colors))
 
     if strip_colors:
         host = salt.output.strip_esc_sequence(host)
@@ -12,6 +12,8 @@ import collections
 import logging
 import tornado.gen
 import sys
+import threading
+import time
 import traceback
 import inspect
 
@@ -24,11 +26,15 @@ import salt.transport
 import salt.utils.args
 import salt.utils.cache
 import salt.utils.crypt
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.dictupdate
+import salt.utils.files
+import salt.utils.hashutils
+import salt.utils.json
 import salt.utils.url
 from salt.exceptions import SaltClientError
-from salt.template import compile_template
+from salt.template import compile_template, get_shared_render_cache
 from salt.utils.odict import OrderedDict
 from salt.version import __version__
 # Even though dictupdate is imported, invoking salt.utils.dictupdate.merge here
@@ -273,17 +279,38 @@ class PillarCache(object):
         self.functions = functions
         self.pillar_override = pillar_override
         self.pillarenv = pillarenv
+        self.rendered_files = set()
 
         if saltenv is None:
             self.saltenv = 'base'
         else:
             self.saltenv = saltenv
 
-        # Determine caching backend
-        self.cache = salt.utils.cache.CacheFactory.factory(
+        # Entries older than the TTL are still served while they are being
+        # refreshed in the background, for up to another TTL
+        self.ttl = self.opts['pillar_cache_ttl']
+        self.retention = self.ttl
+        if self.opts.get('pillar_cache_background_refresh', False):
+            self.retention *= 2
+        self.cache = self._open_cache()
+
+    def _open_cache(self):
+        '''
+        Return the cache of the configured backend for the minion
+        '''
+        if self.opts['pillar_cache_backend'] == 'memory':
+            # Every master worker keeps its own in-memory cache
+            with _REFRESH_LOCK:
+                cache = _MEMORY_CACHES.get(self.minion_id)
+                if cache is None:
+                    cache = _MEMORY_CACHES[self.minion_id] = \
+                        salt.utils.cache.CacheFactory.factory(
+                            'memory', self.retention)
+            return cache
+        return salt.utils.cache.CacheFactory.factory(
                 self.opts['pillar_cache_backend'],
-                self.opts['pillar_cache_ttl'],
-                minion_cache_path=self._minion_cache_path(minion_id))
+                self.retention,
+                minion_cache_path=self._minion_cache_path(self.minion_id))
 
     def _minion_cache_path(self, minion_id):
         '''
@@ -293,13 +320,51 @@ class PillarCache(object):
         '''
         return os.path.join(self.opts['cachedir'], 'pillar_cache', minion_id)
 
-    def fetch_pillar(self):
+    def fingerprint(self):
+        '''
+        Return a hash of everything a cached pillar was compiled from, apart
+        from the pillar files themselves: the grains, the environments, the
+        on-demand ext_pillar and the pillar override
+        '''
+        return salt.utils.hashutils.sha256_digest(salt.utils.json.dumps(
+            [self.grains, self.saltenv, self.pillarenv, self.ext,
+             self.pillar_override],
+            sort_keys=True,
+            default=repr))
+
+    def _roots(self):
+        '''
+        Return the pillar_roots directories of the environments the pillar
+        may be compiled from. Their mtimes change when files are added to or
+        removed from them.
+        '''
+        pillar_roots = self.opts.get('pillar_roots', {})
+        if not isinstance(pillar_roots, dict):
+            return []
+        if self.pillarenv:
+            return list(pillar_roots.get(self.pillarenv, []))
+        return [root for roots in six.itervalues(pillar_roots) for root in roots]
+
+    @staticmethod
+    def _mtimes(paths):
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def fetch_pillar(self, opts=None):
         '''
         In the event of a cache miss, we need to incur the overhead of caching
         a new pillar.
+
+        The pillar is compiled with ``opts`` if they are passed, else with the
+        opts of the cache.
         '''
         log.debug('Pillar cache getting external pillar with ext: %s', self.ext)
-        fresh_pillar = Pillar(self.opts,
+        fresh_pillar = Pillar(self.opts if opts is None else opts,
                               self.grains,
                               self.minion_id,
                               self.saltenv,
@@ -307,31 +372,164 @@ class PillarCache(object):
                               functions=self.functions,
                               pillar_override=self.pillar_override,
                               pillarenv=self.pillarenv)
-        return fresh_pillar.compile_pillar()
+        ret = fresh_pillar.compile_pillar()
+        self.rendered_files = fresh_pillar.rendered_files
+        return ret
+
+    def _store(self, fingerprint, opts=None):
+        '''
+        Compile the pillar, with ``opts`` if they are passed, and store it in
+        the cache, together with what it was compiled from
+        '''
+        # Take the mtimes before compiling, so that files changed while the
+        # pillar is compiled invalidate the entry
+        roots = self._mtimes(self._roots())
+        start = time.time()
+        fresh_pillar = self.fetch_pillar(opts)
+        files = self._mtimes(self.rendered_files)
+        files.update(roots)
+        entry = {'fingerprint': fingerprint,
+                 'files': files,
+                 'time': start,
+                 'pillar': fresh_pillar}
+        # The background refresh and the requests of this process may store
+        # the pillars of other pillarenvs of the minion at the same time
+        with _minion_lock(self.minion_id):
+            if self.opts['pillar_cache_backend'] != 'memory':
+                # Read what was stored since the cache was opened
+                self.cache = self._open_cache()
+            try:
+                envs = dict(self.cache[self.minion_id])
+            except KeyError:
+                envs = {}
+            envs[self.pillarenv] = entry
+            # Assign the whole dict so that the disk backend writes it out
+            self.cache[self.minion_id] = envs
+        return fresh_pillar
+
+    def _refresh(self, fingerprint):
+        '''
+        Refresh a stale cache entry in a background thread
+        '''
+        key = (self.minion_id, self.pillarenv)
+        with _REFRESH_LOCK:
+            if key in _REFRESHING:
+                return
+            _REFRESHING.add(key)
+        # Pillar writes the grains of the minion into the opts it is passed on
+        # the master, give the thread its own copy of the opts the requests of
+        # this process use
+        opts = dict(self.opts)
+
+        def _run():
+            try:
+                self._store(fingerprint, opts)
+                _count_pillar_cache(self.opts, 'refreshes')
+            except Exception:
+                log.exception(
+                    'Failed to refresh the cached pillar for minion %s',
+                    self.minion_id)
+            finally:
+                with _REFRESH_LOCK:
+                    _REFRESHING.discard(key)
+
+        thread = threading.Thread(
+            target=_run,
+            name='pillar-cache-refresh-{0}'.format(self.minion_id))
+        thread.daemon = True
+        thread.start()
 
     def compile_pillar(self, *args, **kwargs):  # Will likely just be pillar_dirs
         log.debug('Scanning pillar cache for information about minion %s and pillarenv %s', self.minion_id, self.pillarenv)
-        log.debug('Scanning cache: %s', self.cache._dict)
-        # Check the cache!
+        fingerprint = self.fingerprint()
+        entry = None
         if self.minion_id in self.cache:  # Keyed by minion_id
-            # TODO Compare grains, etc?
-            if self.pillarenv in self.cache[self.minion_id]:
-                # We have a cache hit! Send it back.
-                log.debug('Pillar cache hit for minion %s and pillarenv %s', self.minion_id, self.pillarenv)
-                return self.cache[self.minion_id][self.pillarenv]
-            else:
-                # We found the minion but not the env. Store it.
-                fresh_pillar = self.fetch_pillar()
-                self.cache[self.minion_id][self.pillarenv] = fresh_pillar
-                log.debug('Pillar cache miss for pillarenv %s for minion %s', self.pillarenv, self.minion_id)
-                return fresh_pillar
-        else:
-            # We haven't seen this minion yet in the cache. Store it.
-            fresh_pillar = self.fetch_pillar()
-            self.cache[self.minion_id] = {self.pillarenv: fresh_pillar}
-            log.debug('Pillar cache miss for minion %s', self.minion_id)
-            log.debug('Current pillar cache: %s', self.cache._dict)  # FIXME hack!
-            return fresh_pillar
+            entry = self.cache[self.minion_id].get(self.pillarenv)
+        if not isinstance(entry, dict) or 'fingerprint' not in entry:
+            # We haven't seen this minion and pillarenv yet, or only in the
+            # format of an older release. Store it.
+            log.debug('Pillar cache miss for minion %s and pillarenv %s', self.minion_id, self.pillarenv)
+            _count_pillar_cache(self.opts, 'misses')
+            return self._store(fingerprint)
+        if entry['fingerprint'] != fingerprint \
+                or self._mtimes(entry['files']) != entry['files']:
+            # The grains or pillar files changed since it was cached
+            log.debug('Pillar cache for minion %s and pillarenv %s is out of date', self.minion_id, self.pillarenv)
+            _count_pillar_cache(self.opts, 'invalidated')
+            return self._store(fingerprint)
+        if time.time() - entry['time'] > self.ttl:
+            if not self.opts.get('pillar_cache_background_refresh', False):
+                log.debug('Pillar cache for minion %s and pillarenv %s expired', self.minion_id, self.pillarenv)
+                _count_pillar_cache(self.opts, 'misses')
+                return self._store(fingerprint)
+            # Send back the cached pillar while refreshing it
+            log.debug('Pillar cache for minion %s and pillarenv %s is stale, refreshing it', self.minion_id, self.pillarenv)
+            _count_pillar_cache(self.opts, 'stale')
+            self._refresh(fingerprint)
+            return entry['pillar']
+        # We have a cache hit! Send it back.
+        log.debug('Pillar cache hit for minion %s and pillarenv %s', self.minion_id, self.pillarenv)
+        _count_pillar_cache(self.opts, 'hits')
+        return entry['pillar']
+
+
+# The in-memory pillar caches of this process, by minion id
+_MEMORY_CACHES = {}
+
+# The cache entries being refreshed by this process
+_REFRESHING = set()
+_REFRESH_LOCK = threading.Lock()
+
+# The locks around storing the cached pillars of a minion, by minion id
+_MINION_LOCKS = {}
+
+
+def _minion_lock(minion_id):
+    '''
+    Return the lock around storing the cached pillars of the minion
+    '''
+    with _REFRESH_LOCK:
+        lock = _MINION_LOCKS.get(minion_id)
+        if lock is None:
+            lock = _MINION_LOCKS[minion_id] = threading.Lock()
+    return lock
+
+# The pillar cache usage counters of this process, since they were last
+# written out
+PILLAR_CACHE_STATS = ('hits', 'stale', 'misses', 'invalidated', 'refreshes')
+_CACHE_STATS = dict((stat, 0) for stat in PILLAR_CACHE_STATS)
+_CACHE_STATS_WRITTEN = [0]
+
+
+def _count_pillar_cache(opts, stat):
+    '''
+    Count a pillar cache lookup. The counters are added to the stats file of
+    this process, for the pillar.cache_stats runner, at most once a second.
+    '''
+    with _REFRESH_LOCK:
+        _CACHE_STATS[stat] += 1
+        if time.time() - _CACHE_STATS_WRITTEN[0] < 1:
+            return
+        _CACHE_STATS_WRITTEN[0] = time.time()
+        counts = dict(_CACHE_STATS)
+        for key in _CACHE_STATS:
+            _CACHE_STATS[key] = 0
+    stats_dir = os.path.join(opts['cachedir'], 'pillar_cache_stats')
+    path = os.path.join(stats_dir, '{0}.json'.format(os.getpid()))
+    try:
+        if not os.path.isdir(stats_dir):
+            os.makedirs(stats_dir)
+        stats = {}
+        if os.path.isfile(path):
+            # The runner removes the file to reset the stats
+            with salt.utils.files.fopen(path, 'r') as fp_:
+                stats = salt.utils.json.load(fp_)
+        for key, count in six.iteritems(counts):
+            stats[key] = stats.get(key, 0) + count
+        with salt.utils.atomicfile.atomic_open(path, 'w') as fp_:
+            salt.utils.json.dump(stats, fp_)
+    except (IOError, OSError, ValueError) as exc:
+        log.debug('Failed to write the pillar cache stats: %s', exc)
 
 
 class Pillar(object):
@@ -368,6 +566,7 @@ class Pillar(object):
 
         self.matcher = salt.minion.Matcher(self.opts, self.functions)
         self.rend = salt.loader.render(self.opts, self.functions)
+        self.shared_render_cache = get_shared_render_cache(self.opts)
         ext_pillar_opts = copy.deepcopy(self.opts)
         # Fix self.opts['file_roots'] so that ext_pillars know the real
         # location of file_roots. Issue 5951
@@ -389,6 +588,11 @@ class Pillar(object):
         if not isinstance(self.extra_minion_data, dict):
             self.extra_minion_data = {}
             log.error('Extra minion data must be a dictionary')
+        # How long each ext_pillar took in the last ext_pillar run, in the
+        # configured order
+        self.ext_pillar_timings = []
+        # The top and SLS files the pillar was rendered from
+        self.rendered_files = set()
 
     def __valid_on_demand_ext_pillar(self, opts):
         '''
@@ -510,6 +714,7 @@ class Pillar(object):
             for saltenv in saltenvs:
                 top = self.client.cache_file(self.opts['state_top'], saltenv)
                 if top:
+                    self.rendered_files.add(top)
                     tops[saltenv].append(compile_template(
                         top,
                         self.rend,
@@ -544,12 +749,12 @@ class Pillar(object):
                     if sls in done[saltenv]:
                         continue
                     try:
+                        fn_ = self.client.get_state(sls, saltenv).get('dest', False)
+                        if fn_:
+                            self.rendered_files.add(fn_)
                         tops[saltenv].append(
                                 compile_template(
-                                    self.client.get_state(
-                                        sls,
-                                        saltenv
-                                        ).get('dest', False),
+                                    fn_,
                                     self.rend,
                                     self.opts['renderer'],
                                     self.opts['renderer_blacklist'],
@@ -703,6 +908,8 @@ class Pillar(object):
                 log.debug(msg)
                 # return state, mods, errors
                 return None, mods, errors
+        if fn_:
+            self.rendered_files.add(fn_)
         state = None
         try:
             state = compile_template(fn_,
@@ -712,6 +919,7 @@ class Pillar(object):
                                      self.opts['renderer_whitelist'],
                                      saltenv,
                                      sls,
+                                     shared_cache=self.shared_render_cache,
                                      _pillar_rend=True,
                                      **defaults)
         except Exception as exc:
@@ -893,6 +1101,121 @@ class Pillar(object):
                                             val)
         return ext
 
+    def _timed_external_pillar_data(self, pillar, val, key):
+        '''
+        Run an ext_pillar, record how long it took and return its data
+        '''
+        start = time.time()
+        try:
+            return self._external_pillar_data(pillar, val, key)
+        finally:
+            duration = time.time() - start
+            self.ext_pillar_timings.append((key, duration))
+            log.debug('ext_pillar %s took %.3f seconds', key, duration)
+
+    def _concurrent_ext_pillar(self, pillar, errors):
+        '''
+        Run the ext_pillars in a pool of ``ext_pillar_workers`` threads, every
+        one of them with the same pillar data to start from, and merge their
+        data in the configured order. An ext_pillar which does not return
+        within ``ext_pillar_timeout`` seconds is reported as failed, its data
+        is ignored.
+        '''
+        sources = []
+        for run in self.opts['ext_pillar']:
+            if not isinstance(run, dict):
+                errors.append('The "ext_pillar" option is malformed')
+                log.critical(errors[-1])
+                return {}, errors
+            if next(six.iterkeys(run)) in self.opts.get('exclude_ext_pillar', []):
+                continue
+            for key, val in six.iteritems(run):
+                if key not in self.ext_pillars:
+                    log.critical(
+                        'Specified ext_pillar interface %s is unavailable',
+                        key
+                    )
+                    continue
+                sources.append((key, val))
+
+        workers = self.opts['ext_pillar_workers']
+        timeout = self.opts.get('ext_pillar_timeout') or None
+        results = [{} for _ in sources]
+        finished = six.moves.queue.Queue()
+
+        def _run(index, key, val):
+            result = results[index]
+            try:
+                # Every ext_pillar gets its own copy, as they may modify it
+                result['ext'] = self._external_pillar_data(
+                    copy.deepcopy(pillar), val, key)
+            except Exception as exc:
+                result['error'] = exc
+                result['trace'] = ''.join(traceback.format_tb(sys.exc_info()[2]))
+            finally:
+                finished.put(index)
+
+        pending = collections.deque(enumerate(sources))
+        running = {}
+        while pending or running:
+            while pending and len(running) < workers:
+                index, (key, val) = pending.popleft()
+                thread = threading.Thread(
+                    target=_run, args=(index, key, val),
+                    name='ext_pillar-{0}'.format(key))
+                # A hung ext_pillar must not keep the process from exiting
+                thread.daemon = True
+                running[index] = time.time()
+                thread.start()
+            wait = None
+            if timeout is not None:
+                wait = max(min(running.values()) + timeout - time.time(), 0)
+            try:
+                index = finished.get(timeout=wait)
+            except six.moves.queue.Empty:
+                now = time.time()
+                for index, started in list(running.items()):
+                    if now - started >= timeout:
+                        results[index]['timeout'] = now - started
+                        del running[index]
+                continue
+            if index in running:
+                results[index]['duration'] = time.time() - running.pop(index)
+
+        self.ext_pillar_timings = []
+        for (key, val), result in zip(sources, results):
+            if 'timeout' in result:
+                self.ext_pillar_timings.append((key, result['timeout']))
+                errors.append(
+                    'Failed to load ext_pillar {0}: timed out after {1} '
+                    'seconds'.format(key, timeout))
+                log.error(
+                    'ext_pillar \'%s\' did not return within %s seconds',
+                    key, timeout
+                )
+                continue
+            self.ext_pillar_timings.append((key, result['duration']))
+            log.debug('ext_pillar %s took %.3f seconds', key, result['duration'])
+            if 'error' in result:
+                errors.append(
+                    'Failed to load ext_pillar {0}: {1}'.format(
+                        key,
+                        result['error'].__str__(),
+                    )
+                )
+                log.error(
+                    'Execption caught loading ext_pillar \'%s\':\n%s',
+                    key, result['trace']
+                )
+            elif result['ext']:
+                pillar = merge(
+                    pillar,
+                    result['ext'],
+                    self.merge_strategy,
+                    self.opts.get('renderer', 'yaml'),
+                    self.opts.get('pillar_merge_lists', False))
+        return pillar, errors
+
     def ext_pillar(self, pillar, errors=None):
         '''
         Render the external pillar data
@@ -934,6 +1257,10 @@ class Pillar(object):
                 self.opts.get('renderer', 'yaml'),
                 self.opts.get('pillar_merge_lists', False))
 
+        if self.opts.get('ext_pillar_workers', 0) > 1:
+            return self._concurrent_ext_pillar(pillar, errors)
+
+        self.ext_pillar_timings = []
         for run in self.opts['ext_pillar']:
             if not isinstance(run, dict):
                 errors.append('The "ext_pillar" option is malformed')
@@ -949,9 +1276,9 @@ class Pillar(object):
                     )
                     continue
                 try:
-                    ext = self._external_pillar_data(pillar,
-                                                     val,
-                                                     key)
+                    ext = self._timed_external_pillar_data(pillar,
+                                                           val,
+                                                           key)
                 except Exception as exc:
                     errors.append(
                         'Failed to load ext_pillar {0}: {1}'.format(
@@ -16,7 +16,7 @@ from yaml.constructor import ConstructorError
 
 # Import salt libs
 import salt.utils.url
-from salt.utils.yamlloader import SaltYamlSafeLoader, load
+from salt.utils.yamlloader import FastSaltYamlSafeLoader, load
 from salt.utils.odict import OrderedDict
 from salt.exceptions import SaltRenderError
 from salt.ext import six
@@ -35,7 +35,7 @@ def get_yaml_loader(argline):
     Return the ordered dict yaml loader
     '''
     def yaml_loader(*args):
-        return SaltYamlSafeLoader(*args, dictclass=OrderedDict)
+        return FastSaltYamlSafeLoader(*args, dictclass=OrderedDict)
     return yaml_loader
 
 
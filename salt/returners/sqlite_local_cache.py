@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+'''
+Use a local SQLite database for the master job cache.
+
+.. versionadded:: Fluorine
+
+:maturity:      New
+:depends:       sqlite3
+:platform:      all
+
+The default :mod:`local_cache <salt.returners.local_cache>` keeps a directory
+per job and a directory plus a file per minion return, which means listing,
+looking up and expiring jobs walks the whole tree and large jobs use up a lot
+of inodes. This returner implements the same job cache API on top of a single
+SQLite database in WAL mode, so that the job listing and the expiry of old
+jobs are indexed queries, and every return is a single row.
+
+To use it, set the following in the master config:
+
+.. code-block:: yaml
+
+    master_job_cache: sqlite_local_cache
+
+The database is kept in ``<cachedir>/jobs.sqlite`` by default, the location
+can be changed with:
+
+.. code-block:: yaml
+
+    sqlite_local_cache.database: /var/cache/salt/master/jobs.sqlite
+
+The master job cache is written to by every worker process of the master;
+concurrent writers wait up to ``sqlite_local_cache.timeout`` seconds (30 by
+default) for the database lock.
+'''
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import python libs
+import logging
+import os
+import threading
+import time
+
+# Import salt libs
+import salt.payload
+import salt.utils.jid
+import salt.utils.minions
+import salt.exceptions
+
+# Import 3rd-party libs
+try:
+    import sqlite3
+    HAS_SQLITE3 = True
+except ImportError:
+    HAS_SQLITE3 = False
+
+log = logging.getLogger(__name__)
+
+# Define the module's virtual name
+__virtualname__ = 'sqlite_local_cache'
+
+SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS jids (
+           jid TEXT NOT NULL PRIMARY KEY,
+           started REAL NOT NULL,
+           nocache INTEGER NOT NULL DEFAULT 0,
+           fun TEXT,
+           load BLOB,
+           endtime TEXT)''',
+    '''CREATE INDEX IF NOT EXISTS jids_started ON jids (started)''',
+    '''CREATE TABLE IF NOT EXISTS minions (
+           jid TEXT NOT NULL,
+           syndic TEXT NOT NULL,
+           minions BLOB NOT NULL,
+           PRIMARY KEY (jid, syndic))''',
+    '''CREATE TABLE IF NOT EXISTS returns (
+           jid TEXT NOT NULL,
+           id TEXT NOT NULL,
+           ret BLOB NOT NULL,
+           out BLOB,
+           PRIMARY KEY (jid, id))''',
+)
+
+# Connections are not shared between threads, and must not be inherited by
+# forked processes
+_LOCAL = threading.local()
+
+
+def __virtual__():
+    if not HAS_SQLITE3:
+        return False, 'Could not import sqlite_local_cache returner; sqlite3 is not installed.'
+    return __virtualname__
+
+
+def _db_path():
+    '''
+    Return the path of the job cache database
+    '''
+    return __opts__.get(
+        'sqlite_local_cache.database',
+        os.path.join(__opts__['cachedir'], 'jobs.sqlite'))
+
+
+def _get_conn():
+    '''
+    Return the connection to the job cache database for this thread, creating
+    the database if needed
+    '''
+    path = _db_path()
+    if getattr(_LOCAL, 'pid', None) != os.getpid():
+        # Never reuse the connections of the parent process
+        _LOCAL.pid = os.getpid()
+        _LOCAL.conns = {}
+    conn = _LOCAL.conns.get(path)
+    if conn is not None:
+        return conn
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            pass
+    conn = sqlite3.connect(
+        path, timeout=__opts__.get('sqlite_local_cache.timeout', 30))
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    with conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+    _LOCAL.conns[path] = conn
+    return conn
+
+
+def _dumps(data):
+    return sqlite3.Binary(salt.payload.Serial(__opts__).dumps(data))
+
+
+def _loads(data):
+    return salt.payload.Serial(__opts__).loads(bytes(data))
+
+
+def _add_jid(conn, jid, nocache=False):
+    '''
+    Make sure a row exists for the jid, returns False if it already did
+    '''
+    cur = conn.execute(
+        'INSERT OR IGNORE INTO jids (jid, started, nocache) VALUES (?, ?, ?)',
+        (jid, time.time(), int(bool(nocache))))
+    return cur.rowcount == 1
+
+
+def prep_jid(nocache=False, passed_jid=None, recurse_count=0):
+    '''
+    Return a job id and prepare the job id row.
+
+    This is the function responsible for making sure jids don't collide (unless
+    it is passed a jid).
+    '''
+    if recurse_count >= 5:
+        err = 'prep_jid could not store a jid after {0} tries.'.format(recurse_count)
+        log.error(err)
+        raise salt.exceptions.SaltCacheError(err)
+    if passed_jid is None:  # this can be a None or an empty string.
+        jid = salt.utils.jid.gen_jid(__opts__)
+    else:
+        jid = passed_jid
+
+    try:
+        conn = _get_conn()
+        with conn:
+            added = _add_jid(conn, jid, nocache)
+            if not added and passed_jid is not None and nocache:
+                conn.execute('UPDATE jids SET nocache = 1 WHERE jid = ?', (jid,))
+    except sqlite3.Error as exc:
+        log.warning('Could not store jid %s: %s. Retrying.', jid, exc)
+        time.sleep(0.1)
+        return prep_jid(passed_jid=jid, nocache=nocache,
+                        recurse_count=recurse_count+1)
+
+    if not added and passed_jid is None:
+        # Someone else is using this jid, we need a new one
+        time.sleep(0.1)
+        return prep_jid(nocache=nocache, recurse_count=recurse_count+1)
+    return jid
+
+
+def returner(load):
+    '''
+    Return data to the local job cache
+    '''
+    # if a minion is returning a standalone job, get a jobid
+    if load['jid'] == 'req':
+        load['jid'] = prep_jid(nocache=load.get('nocache', False))
+
+    ret = _dumps(dict((key, load[key]) for key in ['return', 'retcode', 'success'] if key in load))
+    out = _dumps(load['out']) if 'out' in load else None
+    conn = _get_conn()
+    with conn:
+        _add_jid(conn, load['jid'])
+        row = conn.execute(
+            'SELECT nocache FROM jids WHERE jid = ?', (load['jid'],)).fetchone()
+        if row[0]:
+            return
+        try:
+            conn.execute(
+                'INSERT INTO returns (jid, id, ret, out) VALUES (?, ?, ?, ?)',
+                (load['jid'], load['id'], ret, out))
+        except sqlite3.IntegrityError:
+            # Minion has already returned this jid and it should be dropped
+            log.error(
+                'An extra return was detected from minion %s, please verify '
+                'the minion, this could be a replay attack', load['id']
+            )
+            return False
+
+
+def save_load(jid, clear_load, minions=None):
+    '''
+    Save the load to the specified jid
+
+    minions argument is to provide a pre-computed list of matched minions for
+    the job, for cases when this function can't compute that list itself (such
+    as for salt-ssh)
+    '''
+    conn = _get_conn()
+    with conn:
+        _add_jid(conn, jid)
+        conn.execute(
+            'UPDATE jids SET fun = ?, load = ? WHERE jid = ?',
+            (clear_load.get('fun'), _dumps(clear_load), jid))
+
+    # if you have a tgt, save that for the UI etc
+    if 'tgt' in clear_load and clear_load['tgt'] != '':
+        if minions is None:
+            ckminions = salt.utils.minions.CkMinions(__opts__)
+            # Retrieve the minions list
+            _res = ckminions.check_minions(
+                    clear_load['tgt'],
+                    clear_load.get('tgt_type', 'glob')
+                    )
+            minions = _res['minions']
+        # save the minions to a cache so we can see in the UI
+        save_minions(jid, minions)
+
+
+def save_minions(jid, minions, syndic_id=None):
+    '''
+    Save/update the serialized list of minions for a given job
+    '''
+    # Ensure we have a list for Python 3 compatability
+    minions = list(minions)
+
+    log.debug(
+        'Adding minions for job %s%s: %s',
+        jid,
+        ' from syndic master \'{0}\''.format(syndic_id) if syndic_id else '',
+        minions
+    )
+    conn = _get_conn()
+    with conn:
+        _add_jid(conn, jid)
+        conn.execute(
+            'INSERT OR REPLACE INTO minions (jid, syndic, minions) VALUES (?, ?, ?)',
+            (jid, syndic_id or '', _dumps(minions)))
+
+
+def get_load(jid):
+    '''
+    Return the load data that marks a specified jid
+    '''
+    conn = _get_conn()
+    row = conn.execute('SELECT load FROM jids WHERE jid = ?', (jid,)).fetchone()
+    if row is None or row[0] is None:
+        return {}
+    ret = _loads(row[0]) or {}
+    all_minions = set()
+    for minions, in conn.execute('SELECT minions FROM minions WHERE jid = ?', (jid,)):
+        all_minions.update(_loads(minions))
+    if all_minions:
+        ret['Minions'] = sorted(all_minions)
+    return ret
+
+
+def get_jid(jid):
+    '''
+    Return the information returned when the specified job id was executed
+    '''
+    ret = {}
+    conn = _get_conn()
+    for minion, ret_data, out in conn.execute(
+            'SELECT id, ret, out FROM returns WHERE jid = ?', (jid,)):
+        ret[minion] = _loads(ret_data)
+        if out is not None:
+            ret[minion]['out'] = _loads(out)
+    return ret
+
+
+def get_jids():
+    '''
+    Return a dict mapping all job ids to job information
+    '''
+    ret = {}
+    conn = _get_conn()
+    for jid, load, endtime in conn.execute(
+            'SELECT jid, load, endtime FROM jids WHERE load IS NOT NULL'):
+        ret[jid] = salt.utils.jid.format_jid_instance(jid, _loads(load))
+        if __opts__.get('job_cache_store_endtime') and endtime:
+            ret[jid]['EndTime'] = endtime
+    return ret
+
+
+def get_jids_filter(count, filter_find_job=True):
+    '''
+    Return a list of all jobs information filtered by the given criteria.
+    :param int count: show not more than the count of most recent jobs
+    :param bool filter_find_jobs: filter out 'saltutil.find_job' jobs
+    '''
+    query = 'SELECT jid, load FROM jids WHERE load IS NOT NULL'
+    if filter_find_job:
+        query += " AND fun IS NOT 'saltutil.find_job'"
+    query += ' ORDER BY jid DESC LIMIT ?'
+    conn = _get_conn()
+    ret = [salt.utils.jid.format_jid_instance_ext(jid, _loads(load))
+           for jid, load in conn.execute(query, (count,))]
+    ret.reverse()
+    return ret
+
+
+def clean_old_jobs():
+    '''
+    Clean out the old jobs from the job cache
+    '''
+    if __opts__['keep_jobs'] == 0:
+        return
+    cutoff = time.time() - __opts__['keep_jobs'] * 3600.0
+    conn = _get_conn()
+    with conn:
+        for table in ('returns', 'minions'):
+            conn.execute(
+                'DELETE FROM {0} WHERE jid IN '
+                '(SELECT jid FROM jids WHERE started < ?)'.format(table),
+                (cutoff,))
+        cur = conn.execute('DELETE FROM jids WHERE started < ?', (cutoff,))
+    if cur.rowcount:
+        log.debug('Removed %s old jobs from the job cache', cur.rowcount)
+
+
+def update_endtime(jid, time):
+    '''
+    Update (or store) the end time for a given job
+    '''
+    conn = _get_conn()
+    with conn:
+        _add_jid(conn, jid)
+        conn.execute('UPDATE jids SET endtime = ? WHERE jid = ?', (time, jid))
+
+
+def get_endtime(jid):
+    '''
+    Retrieve the stored endtime for a given job
+
+    Returns False if no endtime is present
+    '''
+    conn = _get_conn()
+    row = conn.execute('SELECT endtime FROM jids WHERE jid = ?', (jid,)).fetchone()
+    if row is None or row[0] is None:
+        return False
+    return row[0]
@@ -14,6 +14,7 @@ from salt.ext import six
 import salt.log
 import salt.utils.args
 import salt.utils.gitfs
+import salt.utils.jinja
 import salt.utils.master
 import salt.payload
 import salt.cache
@@ -214,6 +215,35 @@ def clear_all(tgt=None, tgt_type='glob'):
                         clear_mine_flag=True)
 
 
+def jinja_stats(reset=False):
+    '''
+    .. versionadded:: Fluorine
+
+    Report how the compiled Jinja template cache (see
+    :conf_master:`jinja_cache_size`) was used by the master processes, since
+    the master cache was cleared or the stats were last reset:
+
+    hits
+        Templates whose compiled code was found in the cache
+
+    misses
+        Templates which had to be parsed and compiled
+
+    hit_ratio
+        The share of the templates found in the cache
+
+    reset : False
+        Set to ``True`` to start counting from zero again
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run cache.jinja_stats
+    '''
+    return salt.utils.jinja.read_cache_stats(__opts__['cachedir'], reset=reset)
+
+
 def clear_git_lock(role, remote=None, **kwargs):
     '''
     .. versionadded:: 2015.8.2
@@ -353,6 +353,35 @@ def update(backend=None):
     return True
 
 
+def fetch_durations(backend=None):
+    '''
+    .. versionadded:: Fluorine
+
+    Return how long the last fetch of each remote of the fileserver backends
+    which fetch remotes (currently only :mod:`git <salt.fileserver.gitfs>`)
+    took in seconds, when it finished and whether it fetched changes. The
+    remotes are fetched by the master's fileserver update process and by
+    :py:func:`fileserver.update <salt.runners.fileserver.update>`.
+
+    backend
+        Narrow fileserver backends to a subset of the enabled ones. If all
+        passed backends start with a minus sign (``-``), then these backends
+        will be excluded from the enabled backends. However, if there is a mix
+        of backends with and without a minus sign (ex:
+        ``backend=-roots,git``) then the ones starting with a minus sign will
+        be disregarded.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run fileserver.fetch_durations
+        salt-run fileserver.fetch_durations backend=git
+    '''
+    fileserver = salt.fileserver.Fileserver(__opts__)
+    return fileserver.fetch_durations(back=backend)
+
+
 def clear_cache(backend=None):
     '''
     .. versionadded:: 2015.5.0
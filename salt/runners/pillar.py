@@ -4,10 +4,18 @@ Functions to interact with the pillar compiler on the master
 '''
 from __future__ import absolute_import, print_function, unicode_literals
 
+# Import python libs
+import logging
+import os
+
 # Import salt libs
 import salt.pillar
+import salt.utils.files
+import salt.utils.json
 import salt.utils.minions
 
+log = logging.getLogger(__name__)
+
 
 def show_top(minion=None, saltenv='base'):
     '''
@@ -106,3 +114,66 @@ def show_pillar(minion='*', **kwargs):
 
     compiled_pillar = pillar.compile_pillar()
     return compiled_pillar
+
+
+def cache_stats(reset=False):
+    '''
+    .. versionadded:: Fluorine
+
+    Report how the master pillar cache (see :conf_master:`pillar_cache`) was
+    used by the master workers, since the master cache was cleared or the
+    stats were last reset:
+
+    hits
+        Pillar requests answered from the cache
+
+    stale
+        Pillar requests answered from the cache while refreshing the cached
+        pillar in the background, because it was older than
+        :conf_master:`pillar_cache_ttl`
+
+    misses
+        Pillar requests for a minion and pillarenv not in the cache
+
+    invalidated
+        Pillar requests for which the cached pillar was compiled again because
+        the grains of the minion or the pillar files changed
+
+    refreshes
+        Cached pillars refreshed in the background
+
+    hit_ratio
+        The share of the pillar requests answered from the cache
+
+    reset : False
+        Set to ``True`` to start counting from zero again
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt-run pillar.cache_stats
+    '''
+    ret = dict((stat, 0) for stat in salt.pillar.PILLAR_CACHE_STATS)
+    stats_dir = os.path.join(__opts__['cachedir'], 'pillar_cache_stats')
+    try:
+        filenames = os.listdir(stats_dir)
+    except OSError:
+        filenames = []
+    for filename in filenames:
+        path = os.path.join(stats_dir, filename)
+        try:
+            with salt.utils.files.fopen(path, 'r') as fp_:
+                stats = salt.utils.json.load(fp_)
+            if reset:
+                os.remove(path)
+        except (IOError, OSError, ValueError) as exc:
+            log.warning('Failed to read pillar cache stats from %s: %s', path, exc)
+            continue
+        for stat in ret:
+            ret[stat] += stats.get(stat, 0)
+    requests = ret['hits'] + ret['stale'] + ret['misses'] + ret['invalidated']
+    ret['hit_ratio'] = (
+        round(float(ret['hits'] + ret['stale']) / requests, 4) if requests else 0.0
+    )
+    return ret
@@ -43,7 +43,11 @@ import salt.utils.process
 import salt.utils.url
 import salt.syspaths as syspaths
 from salt.serializers.msgpack import serialize as msgpack_serialize, deserialize as msgpack_deserialize
-from salt.template import compile_template, compile_template_str
+from salt.template import (
+    compile_template,
+    compile_template_str,
+    get_shared_render_cache
+)
 from salt.exceptions import (
     SaltRenderError,
     SaltReqTimeoutError
@@ -346,6 +350,157 @@ def mock_ret(cdata):
             'result': True}
 
 
+def req_matches(chunk, req_key, req_val):
+    '''
+    Return True if the low chunk is matched by the requisite ``req_key``
+    (a state module name, ``id`` or ``sls``) and glob ``req_val``
+    '''
+    if req_key == 'sls':
+        # Allow requisite tracking of entire sls files
+        return fnmatch.fnmatch(chunk['__sls__'], req_val)
+    if (fnmatch.fnmatch(chunk['name'], req_val) or
+            fnmatch.fnmatch(chunk['__id__'], req_val)):
+        return req_key == 'id' or chunk['state'] == req_key
+    return False
+
+
+class ChunkIndex(object):
+    '''
+    Index a list of low chunks by ``__id__``, ``name``, ``__sls__`` and state
+    module, so that requisites can be resolved without walking every chunk
+    for every requisite of every chunk.
+
+    Lookups return the matching chunks in the order they appear in the
+    chunk list, exactly as a linear scan with ``req_matches`` would.
+    '''
+    _glob_chars = re.compile(r'[*?[]')
+    # fnmatch normalizes case on case-insensitive platforms, in which case
+    # plain names have to be compared through fnmatch as well
+    _case_sensitive = os.path.normcase('A') == 'A'
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.size = len(chunks)
+        self.ids = {}
+        self.names = {}
+        self.sls = {}
+        self.states = {}
+        self.indexed = True
+        self._globs = {}
+        for pos, chunk in enumerate(chunks):
+            for table, field in ((self.ids, '__id__'),
+                                 (self.names, 'name'),
+                                 (self.sls, '__sls__'),
+                                 (self.states, 'state')):
+                val = chunk.get(field)
+                if not isinstance(val, six.string_types):
+                    # Leave odd data to the linear scan so that errors are
+                    # raised the same way they always have been
+                    self.indexed = False
+                    return
+                table.setdefault(val, []).append(pos)
+
+    def covers(self, chunks):
+        '''
+        Return True if this index is still valid for the given chunk list
+        '''
+        return chunks is self.chunks and len(chunks) == self.size
+
+    def _lookup(self, table, pattern):
+        '''
+        Return the set of chunk positions whose ``table`` key matches the
+        given glob pattern
+        '''
+        if self._case_sensitive and not self._glob_chars.search(pattern):
+            return set(table.get(pattern, ()))
+        cache_key = (id(table), pattern)
+        if cache_key not in self._globs:
+            ret = set()
+            for key, positions in six.iteritems(table):
+                if fnmatch.fnmatch(key, pattern):
+                    ret.update(positions)
+            self._globs[cache_key] = ret
+        return self._globs[cache_key]
+
+    def match(self, req_key, req_val):
+        '''
+        Return the list of chunks matched by a single requisite
+        '''
+        if req_val is None:
+            return []
+        if not self.indexed or not isinstance(req_val, six.string_types):
+            return [chunk for chunk in self.chunks
+                    if req_matches(chunk, req_key, req_val)]
+        if req_key == 'sls':
+            positions = self._lookup(self.sls, req_val)
+        else:
+            positions = self._lookup(self.names, req_val) | \
+                self._lookup(self.ids, req_val)
+            if req_key != 'id':
+                positions = positions.intersection(self.states.get(req_key, ()))
+        return [self.chunks[pos] for pos in sorted(positions)]
+
+    def find(self, value):
+        '''
+        Return the last chunk whose ``__id__`` or ``name`` is exactly
+        ``value``, or None
+        '''
+        if not self.indexed or not ishashable(value):
+            ret = None
+            for chunk in self.chunks:
+                if chunk['__id__'] == value or chunk['name'] == value:
+                    ret = chunk
+            return ret
+        positions = self.ids.get(value, []) + self.names.get(value, [])
+        if not positions:
+            return None
+        return self.chunks[max(positions)]
+
+
+class GuardCache(object):
+    '''
+    Cache the return codes of the onlyif and unless commands of a state run,
+    so that a guard command shared by many states only runs once.
+
+    The cache key is the command together with every argument it is run
+    with (shell, cwd, env, runas, ...). The state run clears the cache
+    whenever a state reports changes, since those may change the outcome of
+    the guards.
+    '''
+    def __init__(self):
+        self.retcodes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def retcode(self, func, cmd, scope=None, **kwargs):
+        '''
+        Return the return code of ``func(cmd, **kwargs)``, only calling it if
+        the same command was not run since the cache was last cleared.
+        ``scope`` goes in the cache key for settings which reach the command
+        other than through its arguments.
+        '''
+        key = (cmd, repr(scope), repr(sorted(six.iteritems(kwargs))))
+        if key in self.retcodes:
+            self.hits += 1
+            log.debug('Using the cached return code of guard command: %s', cmd)
+            return self.retcodes[key]
+        self.misses += 1
+        ret = self.retcodes[key] = func(cmd, **kwargs)
+        return ret
+
+    def clear(self):
+        '''
+        Forget the cached return codes
+        '''
+        self.retcodes.clear()
+
+    def stats(self):
+        '''
+        Return the number of cache hits and misses so far
+        '''
+        return {'hits': self.hits, 'misses': self.misses}
+
+
 class StateError(Exception):
     '''
     Custom exception class.
@@ -740,6 +895,9 @@ class State(object):
         self.mod_init = set()
         self.pre = {}
         self.__run_num = 0
+        self.__chunk_index = None
+        self.__parallel_started = False
+        self.guard_cache = GuardCache() if self.opts.get('state_guard_cache') else None
         self.jid = jid
         self.instance_id = six.text_type(id(self))
         self.inject_globals = {}
@@ -870,8 +1028,7 @@ class State(object):
             if not isinstance(entry, six.string_types):
                 ret.update({'comment': 'onlyif execution failed, bad type passed', 'result': False})
                 return ret
-            cmd = self.functions['cmd.retcode'](
-                entry, ignore_retcode=True, python_shell=True, **cmd_opts)
+            cmd = self._run_guard(entry, cmd_opts)
             log.debug('Last command return code: %s', cmd)
             if cmd != 0 and ret['result'] is False:
                 ret.update({'comment': 'onlyif condition is false',
@@ -896,8 +1053,7 @@ class State(object):
             if not isinstance(entry, six.string_types):
                 ret.update({'comment': 'unless condition is false, bad type passed', 'result': False})
                 return ret
-            cmd = self.functions['cmd.retcode'](
-                entry, ignore_retcode=True, python_shell=True, **cmd_opts)
+            cmd = self._run_guard(entry, cmd_opts)
             log.debug('Last command return code: %s', cmd)
             if cmd == 0 and ret['result'] is False:
                 ret.update({'comment': 'unless condition is true',
@@ -910,6 +1066,20 @@ class State(object):
         # No reason to stop, return ret
         return ret
 
+    def _run_guard(self, cmd, cmd_opts):
+        '''
+        Run an onlyif or unless command and return its return code, from the
+        guard cache if it is enabled
+        '''
+        if self.guard_cache is None:
+            return self.functions['cmd.retcode'](
+                cmd, ignore_retcode=True, python_shell=True, **cmd_opts)
+        # The runas of the state reaches cmd.retcode through the context
+        return self.guard_cache.retcode(
+            self.functions['cmd.retcode'], cmd,
+            scope=self.state_con.get('runas'),
+            ignore_retcode=True, python_shell=True, **cmd_opts)
+
     def _run_check_cmd(self, low_data):
         '''
         Alter the way a successful state run is determined
@@ -929,6 +1099,15 @@ class State(object):
                 return ret
         return ret
 
+    def _get_chunk_index(self, chunks):
+        '''
+        Return the requisite index for the given chunk list, building it
+        only when the list it was built for has been replaced or resized
+        '''
+        if self.__chunk_index is None or not self.__chunk_index.covers(chunks):
+            self.__chunk_index = ChunkIndex(chunks)
+        return self.__chunk_index
+
     def reset_run_num(self):
         '''
         Rest the run_num value to 0
@@ -1503,6 +1682,22 @@ class State(object):
                 high.pop(id_)
         return high
 
+    def _index_high_names(self, high):
+        '''
+        Map every ``name`` argument in the high data to the first
+        ``{state: id}`` that declares it
+        '''
+        names = {}
+        for _id in iter(high):
+            for state in [state for state
+                          in iter(high[_id])
+                          if not state.startswith('__')]:
+                for j in iter(high[_id][state]):
+                    if isinstance(j, dict) and 'name' in j:
+                        if ishashable(j['name']) and j['name'] not in names:
+                            names[j['name']] = {state: _id}
+        return names
+
     def requisite_in(self, high):
         '''
         Extend the data reference with requisite_in arguments
@@ -1511,6 +1706,8 @@ class State(object):
         req_in_all = req_in.union({'require', 'watch', 'onfail', 'onfail_stop', 'onchanges'})
         extend = {}
         errors = []
+        # Built on first use, most highstates never need to look up names
+        names = None
         for id_, body in six.iteritems(high):
             if not isinstance(body, dict):
                 continue
@@ -1584,18 +1781,11 @@ class State(object):
                                                      if not x.startswith('__')]
                                         ind = {_ind_high[0]: ind}
                                     else:
-                                        found = False
-                                        for _id in iter(high):
-                                            for state in [state for state
-                                                          in iter(high[_id])
-                                                          if not state.startswith('__')]:
-                                                for j in iter(high[_id][state]):
-                                                    if isinstance(j, dict) and 'name' in j:
-                                                        if j['name'] == ind:
-                                                            ind = {state: _id}
-                                                            found = True
-                                        if not found:
+                                        if names is None:
+                                            names = self._index_high_names(high)
+                                        if not ishashable(ind) or ind not in names:
                                             continue
+                                        ind = names[ind]
                                 if len(ind) < 1:
                                     continue
                                 pstate = next(iter(ind))
@@ -1781,6 +1971,7 @@ class State(object):
                 target=self._call_parallel_target,
                 args=(name, cdata, low))
         proc.start()
+        self.__parallel_started = True
         ret = {'name': name,
                 'result': None,
                 'changes': {},
@@ -1796,6 +1987,8 @@ class State(object):
         '''
         utc_start_time = datetime.datetime.utcnow()
         local_start_time = utc_start_time - (datetime.datetime.utcnow() - datetime.datetime.now())
+        if self.guard_cache is not None:
+            guard_stats = self.guard_cache.stats()
         log.info('Running state [%s] at time %s',
             low['name'].strip() if isinstance(low['name'], six.string_types)
                 else low['name'],
@@ -1853,7 +2046,8 @@ class State(object):
             '__low__': immutabletypes.freeze(low),
             '__running__': immutabletypes.freeze(running) if running else {},
             '__instance_id__': self.instance_id,
-            '__lowstate__': immutabletypes.freeze(chunks) if chunks else {}
+            '__lowstate__': immutabletypes.freeze(chunks) if chunks else {},
+            '__guard_cache__': self.guard_cache
         }
 
         if self.inject_globals:
@@ -1958,6 +2152,15 @@ class State(object):
             low['__prereq__'] = False
             return ret
 
+        if self.guard_cache is not None:
+            if ret.get('changes'):
+                # The changes may affect the outcome of the guard commands
+                self.guard_cache.clear()
+            hits = self.guard_cache.hits - guard_stats['hits']
+            misses = self.guard_cache.misses - guard_stats['misses']
+            if hits or misses:
+                ret['guard_cache'] = {'hits': hits, 'misses': misses}
+
         ret['__sls__'] = low.get('__sls__')
         ret['__run_num__'] = self.__run_num
         self.__run_num += 1
@@ -2097,6 +2300,9 @@ class State(object):
         '''
         Iterate over a list of chunks and call them, checking for requires.
         '''
+        if self.guard_cache is not None:
+            # Guard results are only reused within a state run
+            self.guard_cache = GuardCache()
         # Check for any disabled states
         disabled = {}
         if 'state_runs_disabled' in self.opts['grains']:
@@ -2120,6 +2326,9 @@ class State(object):
                         self.__run_num += 1
                         chunks.remove(low)
                         break
+        # Index the final chunk list once so that requisite lookups for the
+        # run do not have to walk every chunk
+        self._get_chunk_index(chunks)
         running = {}
         for low in chunks:
             if '__FAILHARD__' in running:
@@ -2204,6 +2413,9 @@ class State(object):
         '''
         Check the running dict for processes and resolve them
         '''
+        if not self.__parallel_started:
+            # Nothing can be pending, skip walking the running dict
+            return True
         retset = set()
         for tag in running:
             proc = running[tag].get('proc')
@@ -2283,46 +2495,29 @@ class State(object):
                 'onchanges_any': []}
         if pre:
             reqs['prerequired'] = []
+        index = self._get_chunk_index(chunks)
         for r_state in reqs:
             if r_state in low and low[r_state] is not None:
                 for req in low[r_state]:
                     if isinstance(req, six.string_types):
                         req = {'id': req}
                     req = trim_req(req)
-                    found = False
-                    for chunk in chunks:
-                        req_key = next(iter(req))
-                        req_val = req[req_key]
-                        if req_val is None:
-                            continue
-                        if req_key == 'sls':
-                            # Allow requisite tracking of entire sls files
-                            if fnmatch.fnmatch(chunk['__sls__'], req_val):
-                                found = True
-                                reqs[r_state].append(chunk)
-                            continue
-                        try:
-                            if isinstance(req_val, six.string_types):
-                                if (fnmatch.fnmatch(chunk['name'], req_val) or
-                                    fnmatch.fnmatch(chunk['__id__'], req_val)):
-                                    if req_key == 'id' or chunk['state'] == req_key:
-                                        found = True
-                                        reqs[r_state].append(chunk)
-                            else:
-                                raise KeyError
-                        except KeyError as exc:
-                            raise SaltRenderError(
-                                'Could not locate requisite of [{0}] present in state with name [{1}]'.format(
-                                    req_key, chunk['name']))
-                        except TypeError:
-                            # On Python 2, the above req_val, being an OrderedDict, will raise a KeyError,
-                            # however on Python 3 it will raise a TypeError
-                            # This was found when running tests.unit.test_state.StateCompilerTestCase.test_render_error_on_invalid_requisite
-                            raise SaltRenderError(
-                                'Could not locate requisite of [{0}] present in state with name [{1}]'.format(
-                                    req_key, chunk['name']))
+                    req_key = next(iter(req))
+                    req_val = req[req_key]
+                    if chunks and req_key != 'sls' and req_val is not None \
+                            and not isinstance(req_val, six.string_types):
+                        raise SaltRenderError(
+                            'Could not locate requisite of [{0}] present in state with name [{1}]'.format(
+                                req_key, chunks[0]['name']))
+                    try:
+                        found = index.match(req_key, req_val)
+                    except KeyError:
+                        raise SaltRenderError(
+                            'Could not locate requisite of [{0}] present in state with name [{1}]'.format(
+                                req_key, chunks[0]['name']))
                     if not found:
                         return 'unmet', ()
+                    reqs[r_state].extend(found)
         fun_stats = set()
         for r_state, chunks in six.iteritems(reqs):
             req_stats = set()
@@ -2478,26 +2673,13 @@ class State(object):
                     found = False
                     req_key = next(iter(req))
                     req_val = req[req_key]
-                    for chunk in chunks:
-                        if req_val is None:
-                            continue
-                        if req_key == 'sls':
-                            # Allow requisite tracking of entire sls files
-                            if fnmatch.fnmatch(chunk['__sls__'], req_val):
-                                if requisite == 'prereq':
-                                    chunk['__prereq__'] = True
-                                reqs.append(chunk)
-                                found = True
-                            continue
-                        if (fnmatch.fnmatch(chunk['name'], req_val) or
-                            fnmatch.fnmatch(chunk['__id__'], req_val)):
-                            if req_key == 'id' or chunk['state'] == req_key:
-                                if requisite == 'prereq':
-                                    chunk['__prereq__'] = True
-                                elif requisite == 'prerequired':
-                                    chunk['__prerequired__'] = True
-                                reqs.append(chunk)
-                                found = True
+                    for chunk in self._get_chunk_index(chunks).match(req_key, req_val):
+                        if requisite == 'prereq':
+                            chunk['__prereq__'] = True
+                        elif requisite == 'prerequired' and req_key != 'sls':
+                            chunk['__prerequired__'] = True
+                        reqs.append(chunk)
+                        found = True
                     if not found:
                         lost[requisite].append(req)
             if lost['require'] or lost['watch'] or lost['prereq'] \
@@ -2683,22 +2865,29 @@ class State(object):
                 for l_in in chunk['listen_in']:
                     for key, val in six.iteritems(l_in):
                         listeners.append({(key, val, 'lookup'): [{chunk['state']: chunk['__id__']}]})
+        # Map (state, id/name) pairs to the chunk references they select
+        cref_index = {}
+        for cref in crefs:
+            for val in cref:
+                if not ishashable(val):
+                    continue
+                refs = cref_index.setdefault((cref[0], val), [])
+                if cref not in refs:
+                    refs.append(cref)
+        index = self._get_chunk_index(chunks)
         mod_watchers = []
         errors = {}
         for l_dict in listeners:
             for key, val in six.iteritems(l_dict):
                 for listen_to in val:
                     if not isinstance(listen_to, dict):
-                        found = False
-                        for chunk in chunks:
-                            if chunk['__id__'] == listen_to or \
-                               chunk['name'] == listen_to:
-                                listen_to = {chunk['state']: chunk['__id__']}
-                                found = True
-                        if not found:
+                        chunk = index.find(listen_to)
+                        if chunk is None:
                             continue
+                        listen_to = {chunk['state']: chunk['__id__']}
                     for lkey, lval in six.iteritems(listen_to):
-                        if not any(lkey == cref[0] and lval in cref for cref in crefs):
+                        to_crefs = cref_index.get((lkey, lval), []) if ishashable(lval) else []
+                        if not to_crefs:
                             rerror = {_l_tag(lkey, lval):
                                       {
                                           'comment': 'Referenced state {0}: {1} does not exist'.format(lkey, lval),
@@ -2709,13 +2898,13 @@ class State(object):
                             errors.update(rerror)
                             continue
                         to_tags = [
-                            _gen_tag(data) for cref, data in six.iteritems(crefs) if lkey == cref[0] and lval in cref
+                            _gen_tag(crefs[cref]) for cref in to_crefs
                         ]
                         for to_tag in to_tags:
                             if to_tag not in running:
                                 continue
                             if running[to_tag]['changes']:
-                                if not any(key[0] == cref[0] and key[1] in cref for cref in crefs):
+                                if (key[0], key[1]) not in cref_index:
                                     rerror = {_l_tag(key[0], key[1]):
                                                  {'comment': 'Referenced state {0}: {1} does not exist'.format(key[0], key[1]),
                                                   'name': 'listen_{0}:{1}'.format(key[0], key[1]),
@@ -2724,7 +2913,7 @@ class State(object):
                                     errors.update(rerror)
                                     continue
 
-                                new_chunks = [data for cref, data in six.iteritems(crefs) if key[0] == cref[0] and key[1] in cref]
+                                new_chunks = [crefs[cref] for cref in cref_index[(key[0], key[1])]]
                                 for chunk in new_chunks:
                                     low = chunk.copy()
                                     low['sfun'] = chunk['fun']
@@ -2917,6 +3106,7 @@ class BaseHighState(object):
         self.avail = self.__gather_avail()
         self.serial = salt.payload.Serial(self.opts)
         self.building_highstate = OrderedDict()
+        self.shared_render_cache = get_shared_render_cache(self.opts)
 
     def __gather_avail(self):
         '''
@@ -3458,6 +3648,7 @@ class BaseHighState(object):
                                      self.state.opts['renderer_whitelist'],
                                      saltenv,
                                      sls,
+                                     shared_cache=self.shared_render_cache,
                                      rendered_sls=mods
                                      )
         except SaltRenderError as exc:
@@ -323,6 +323,18 @@ def _is_true(val):
     raise ValueError('Failed parsing boolean value: {0}'.format(val))
 
 
+def _run_guard(cmd, cmd_kwargs):
+    '''
+    Run an onlyif or unless command and return its return code, reusing the
+    result of an identical guard command if the state run has a guard cache
+    '''
+    guard_cache = globals().get('__guard_cache__')
+    if guard_cache is None:
+        return __salt__['cmd.retcode'](cmd, ignore_retcode=True, python_shell=True, **cmd_kwargs)
+    return guard_cache.retcode(__salt__['cmd.retcode'], cmd,
+                               ignore_retcode=True, python_shell=True, **cmd_kwargs)
+
+
 def mod_run_check(cmd_kwargs, onlyif, unless, creates):
     '''
     Execute the onlyif and unless logic.
@@ -339,7 +351,7 @@ def mod_run_check(cmd_kwargs, onlyif, unless, creates):
 
     if onlyif is not None:
         if isinstance(onlyif, six.string_types):
-            cmd = __salt__['cmd.retcode'](onlyif, ignore_retcode=True, python_shell=True, **cmd_kwargs)
+            cmd = _run_guard(onlyif, cmd_kwargs)
             log.debug('Last command return code: {0}'.format(cmd))
             if cmd != 0:
                 return {'comment': 'onlyif condition is false',
@@ -347,7 +359,7 @@ def mod_run_check(cmd_kwargs, onlyif, unless, creates):
                         'result': True}
         elif isinstance(onlyif, list):
             for entry in onlyif:
-                cmd = __salt__['cmd.retcode'](entry, ignore_retcode=True, python_shell=True, **cmd_kwargs)
+                cmd = _run_guard(entry, cmd_kwargs)
                 log.debug('Last command \'{0}\' return code: {1}'.format(entry, cmd))
                 if cmd != 0:
                     return {'comment': 'onlyif condition is false: {0}'.format(entry),
@@ -362,7 +374,7 @@ def mod_run_check(cmd_kwargs, onlyif, unless, creates):
 
     if unless is not None:
         if isinstance(unless, six.string_types):
-            cmd = __salt__['cmd.retcode'](unless, ignore_retcode=True, python_shell=True, **cmd_kwargs)
+            cmd = _run_guard(unless, cmd_kwargs)
             log.debug('Last command return code: {0}'.format(cmd))
             if cmd == 0:
                 return {'comment': 'unless condition is true',
@@ -371,7 +383,7 @@ def mod_run_check(cmd_kwargs, onlyif, unless, creates):
         elif isinstance(unless, list):
             cmd = []
             for entry in unless:
-                cmd.append(__salt__['cmd.retcode'](entry, ignore_retcode=True, python_shell=True, **cmd_kwargs))
+                cmd.append(_run_guard(entry, cmd_kwargs))
                 log.debug('Last command return code: {0}'.format(cmd))
             if all([c == 0 for c in cmd]):
                 return {'comment': 'unless condition is true',
@@ -8,18 +8,27 @@ from __future__ import absolute_import, print_function, unicode_literals
 # Import Python libs
 import time
 import os
+import re
 import codecs
+import copy
+import hashlib
 import logging
+import threading
 
 # Import Salt libs
+import salt.utils.atomicfile
 import salt.utils.files
+import salt.utils.json
 import salt.utils.locales
 import salt.utils.stringio
+import salt.utils.stringutils
 import salt.utils.versions
+import salt.version
 
 # Import 3rd-party libs
 from salt.ext import six
 from salt.ext.six.moves import StringIO
+from salt.utils.odict import OrderedDict
 
 log = logging.getLogger(__name__)
 
@@ -39,10 +48,14 @@ def compile_template(template,
                      saltenv='base',
                      sls='',
                      input_data='',
+                     shared_cache=None,
                      **kwargs):
     '''
     Take the path to a template and return the high data structure
     derived from the template.
+
+    If a :class:`SharedRenderCache` is passed as ``shared_cache``, templates
+    which render to the same data for every minion are only rendered once.
     '''
 
     # if any error occurs, we return an empty dictionary
@@ -79,6 +92,16 @@ def compile_template(template,
     # Get the list of render funcs in the render pipe line.
     render_pipe = template_shebang(template, renderers, default, blacklist, whitelist, input_data)
 
+    cache_key = None
+    if shared_cache is not None and template != ':string:':
+        cache_key = shared_cache.key(
+            template, render_pipe, input_data, saltenv, sls, kwargs)
+        if cache_key is not None:
+            cached = shared_cache.get(cache_key)
+            if cached is not None:
+                log.debug('Using the shared rendering of template: %s', template)
+                return cached
+
     windows_newline = '\r\n' in input_data
 
     input_data = StringIO(input_data)
@@ -129,6 +152,9 @@ def compile_template(template,
             else:
                 if is_stringio:
                     ret.seek(0)
+
+    if cache_key is not None:
+        shared_cache.set(cache_key, ret)
     return ret
 
 
@@ -228,3 +254,320 @@ def check_render_pipe_str(pipestr, renderers, blacklist, whitelist):
     except KeyError:
         log.error('The renderer "%s" is not available', pipestr)
         return []
+
+
+# The renderers whose output only depends on the template and on the
+# variables passed to it, not on the minion it is rendered for
+SHAREABLE_RENDERERS = ('jinja', 'yaml', 'yamlex', 'json')
+
+# The variables a Jinja template gets which are the same for every minion
+# rendering the same file
+SHAREABLE_VARIABLES = frozenset((
+    'saltenv', 'sls', 'slspath', 'sls_path', 'slsdotpath', 'slscolonpath',
+    'tplpath', 'tplfile', 'tpldir', 'tpldot'))
+
+# The Jinja globals a shareable template may use
+SHAREABLE_JINJA_GLOBALS = frozenset((
+    'range', 'dict', 'cycler', 'joiner', 'namespace', 'raise', 'odict'))
+
+# The Salt and serializer Jinja filters whose output only depends on their
+# input. Jinja's own filters may be used too, apart from ``random``. Filters
+# which are random, depend on the time or look at the master (files, DNS,
+# HTTP, users) make a template unshareable.
+SHAREABLE_JINJA_FILTERS = frozenset((
+    'avg', 'base64_decode', 'base64_encode', 'check_whitelist_blacklist',
+    'compare_dicts', 'compare_lists', 'contains_whitespace', 'difference',
+    'exactly_n_true', 'exactly_one_true', 'hmac', 'intersect', 'ip_host',
+    'ipaddr', 'ipv4', 'ipv6', 'is_hex', 'is_ip', 'is_ipv4', 'is_ipv6',
+    'is_iter', 'is_list', 'json_decode_dict', 'json_decode_list',
+    'json_encode_dict', 'json_encode_list', 'mac_str_to_bytes', 'max', 'md5',
+    'min', 'mysql_to_dict', 'network_hosts', 'network_size', 'path_join',
+    'quote', 'regex_escape', 'regex_match', 'regex_replace', 'regex_search',
+    'sequence', 'sha256', 'sha512', 'skip', 'sorted_ignorecase', 'str_to_num',
+    'substring_in_list', 'symmetric_difference', 'to_bool', 'to_bytes',
+    'to_num', 'union', 'unique', 'yaml_dquote', 'yaml_encode', 'yaml_squote',
+    'yaml', 'json', 'xml', 'python', 'load_yaml', 'load_json', 'load_text'))
+
+# Keyword arguments of compile_template which differ between renderings of
+# the same file; a template using them is never shared
+UNSHAREABLE_KWARGS = ('rendered_sls',)
+
+# The options which change the output of the shareable renderers, a change to
+# them renders the shared templates again
+SHARED_RENDER_SETTINGS = ('renderer', 'allow_undefined', 'jinja_env',
+                          'jinja_sls_env', 'jinja_trim_blocks',
+                          'jinja_lstrip_blocks')
+
+# The comment in the header of a template declaring whether its rendering may
+# be shared, e.g. "# shared_render: True"
+SHARED_RENDER_DECLARATION = re.compile(r'^#\s*shared_render\s*:\s*(\w+)\s*$')
+
+
+def shared_render_declaration(input_data):
+    '''
+    Return True or False if the comment lines at the top of the template
+    declare whether its rendering may be shared between minions, or None if
+    they do not
+    '''
+    for line in input_data.splitlines():
+        if not line.startswith('#'):
+            break
+        match = SHARED_RENDER_DECLARATION.match(line.strip())
+        if match:
+            return match.group(1).lower() in ('true', 'yes', '1')
+    return None
+
+
+def jinja_is_shareable(input_data, variables):
+    '''
+    Return True if the Jinja template only uses the given variables, the
+    globals in ``SHAREABLE_JINJA_GLOBALS`` and deterministic filters, and
+    does not include, import or extend other templates
+    '''
+    import jinja2
+    import jinja2.ext
+    import jinja2.filters
+    import jinja2.meta
+    import jinja2.nodes
+    import salt.utils.jinja
+    # Registers the Salt filters and tests
+    import salt.utils.templates  # pylint: disable=unused-import
+    from salt.utils.decorators.jinja import JinjaFilter, JinjaTest
+    extensions = ['jinja2.ext.{0}'.format(ext)
+                  for ext in ('with_', 'do', 'loopcontrols')
+                  if hasattr(jinja2.ext, ext)]
+    extensions.append(salt.utils.jinja.SerializerExtension)
+    env = jinja2.Environment(extensions=extensions)
+    env.filters.update(JinjaFilter.salt_jinja_filters)
+    env.tests.update(JinjaTest.salt_jinja_tests)
+    # Have the globals counted as undeclared, to only allow shareable ones
+    env.globals.clear()
+    try:
+        ast = env.parse(input_data)
+        if list(jinja2.meta.find_referenced_templates(ast)):
+            return False
+        for node in ast.find_all(jinja2.nodes.Filter):
+            if node.name not in SHAREABLE_JINJA_FILTERS and \
+                    (node.name not in jinja2.filters.FILTERS
+                     or node.name == 'random'):
+                return False
+        undeclared = jinja2.meta.find_undeclared_variables(ast)
+    except jinja2.exceptions.TemplateError:
+        return False
+    return not undeclared - variables - SHAREABLE_JINJA_GLOBALS
+
+
+class SharedRenderCache(object):
+    '''
+    Keep the data structures rendered from templates whose output is the same
+    for every minion rendering them, so that e.g. a pillar SLS file matched by
+    thousands of minions is only rendered once.
+
+    A template is shared if it declares so with a ``# shared_render: True``
+    comment at its top, or if it is rendered only by renderers from
+    ``SHAREABLE_RENDERERS`` and, if Jinja is one of them, only uses the
+    variables in ``SHAREABLE_VARIABLES`` and the keyword arguments it is
+    compiled with. Renderings are keyed by the path, contents, saltenv, sls,
+    render pipe and keyword arguments of the template, the Salt version and
+    the renderer ``settings``, so a changed file is rendered again.
+
+    Up to ``size`` renderings are kept in memory, the least recently used
+    ones are dropped first. Renderings which survive a round trip through JSON
+    are kept as JSON, and if ``directory`` is set also stored there, so that
+    they are shared by all the processes using the same directory. The files
+    in ``directory`` are pruned to the ``size`` most recently used ones.
+    '''
+    def __init__(self, size=1000, directory=None, settings=None):
+        self.size = size
+        self.directory = directory
+        self.settings = settings or {}
+        self.hits = 0
+        self.misses = 0
+        self._stored = 0
+        self._data = OrderedDict()
+        self._shareable = {}
+        self._lock = threading.Lock()
+
+    def _shareable_source(self, digest, input_data, names, variables):
+        '''
+        Return whether a template may be shared, remembering the answer for
+        its contents
+        '''
+        check = (digest, tuple(names), tuple(sorted(variables)))
+        shareable = self._shareable.get(check)
+        if shareable is None:
+            shareable = shared_render_declaration(input_data)
+            if shareable is None:
+                shareable = all(name in SHAREABLE_RENDERERS for name in names)
+                if shareable and 'jinja' in names:
+                    shareable = jinja_is_shareable(
+                        input_data, SHAREABLE_VARIABLES | set(variables))
+            with self._lock:
+                if len(self._shareable) >= self.size:
+                    self._shareable.clear()
+                self._shareable[check] = shareable
+        return shareable
+
+    def key(self, template, render_pipe, input_data, saltenv, sls, kwargs):
+        '''
+        Return the cache key of a template, or None if its rendering may not
+        be shared
+        '''
+        if not render_pipe:
+            return None
+        names = [getattr(render, '__module__', '').split('.')[-1]
+                 for render, _ in render_pipe]
+        variables = dict((key, value) for key, value in six.iteritems(kwargs)
+                         if key not in UNSHAREABLE_KWARGS)
+        digest = hashlib.sha256(
+            salt.utils.stringutils.to_bytes(input_data)).hexdigest()
+        if not self._shareable_source(digest, input_data, names, variables):
+            return None
+        try:
+            key = salt.utils.json.dumps(
+                [template, digest, saltenv, sls,
+                 [[name, argline] for name, (_, argline) in zip(names, render_pipe)],
+                 variables, salt.version.__version__, self.settings],
+                sort_keys=True)
+        except (TypeError, ValueError):
+            # The keyword arguments cannot be compared
+            return None
+        return hashlib.sha256(salt.utils.stringutils.to_bytes(key)).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, '{0}.json'.format(key))
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = data
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def get(self, key):
+        '''
+        Return a copy of the rendering stored under ``key``, or None
+        '''
+        with self._lock:
+            data = self._data.pop(key, None)
+            if data is not None:
+                # Move it to the most recently used end
+                self._data[key] = data
+        if data is None and self.directory:
+            try:
+                with salt.utils.files.fopen(self._path(key), 'r') as ifile:
+                    data = ifile.read()
+                # Mark it as recently used for _prune
+                os.utime(self._path(key), None)
+            except (IOError, OSError):
+                pass
+            if data is not None:
+                self._remember(key, data)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if isinstance(data, six.string_types):
+            # Loading the JSON is a lot faster than a deep copy
+            return salt.utils.json.loads(data, object_pairs_hook=OrderedDict)
+        return copy.deepcopy(data)
+
+    def set(self, key, data):
+        '''
+        Store a rendering under ``key``, if it is a data structure
+        '''
+        if not isinstance(data, dict):
+            return
+        try:
+            serialized = salt.utils.json.dumps(data)
+            if salt.utils.json.loads(serialized, object_pairs_hook=OrderedDict) != data:
+                # e.g. keys which are not strings
+                serialized = None
+        except (TypeError, ValueError):
+            serialized = None
+        if serialized is None:
+            # Only kept in memory
+            self._remember(key, copy.deepcopy(data))
+            return
+        self._remember(key, serialized)
+        if not self.directory:
+            return
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            with salt.utils.atomicfile.atomic_open(self._path(key), 'w') as ofile:
+                ofile.write(serialized)
+        except (IOError, OSError) as exc:
+            log.debug('Failed to store shared rendering in %s: %s',
+                      self.directory, exc)
+            return
+        # Prune on the first store and after every size stores, so that the
+        # directory holds at most about twice size files
+        if self._stored % max(self.size, 1) == 0:
+            self._prune()
+        self._stored += 1
+
+    def _prune(self):
+        '''
+        Remove all but the ``size`` most recently used renderings from
+        ``directory``
+        '''
+        files = []
+        try:
+            for name in os.listdir(self.directory):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    # Removed by another process
+                    pass
+        except OSError:
+            return
+        files.sort(reverse=True)
+        for _, path in files[self.size:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        '''
+        Forget the renderings kept in memory
+        '''
+        with self._lock:
+            self._data.clear()
+            self._shareable.clear()
+
+    def stats(self):
+        '''
+        Return the number of cache hits and misses so far
+        '''
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data)}
+
+
+_SHARED_RENDER_CACHE = None
+
+
+def get_shared_render_cache(opts):
+    '''
+    Return the shared render cache configured by the ``shared_render_cache``
+    and ``shared_render_cache_size`` options, or None if it is disabled
+    '''
+    global _SHARED_RENDER_CACHE
+    if not opts.get('shared_render_cache', False):
+        return None
+    size = opts.get('shared_render_cache_size', 1000)
+    directory = None
+    if opts.get('cachedir'):
+        directory = os.path.join(opts['cachedir'], 'shared_render')
+    settings = dict((name, opts.get(name)) for name in SHARED_RENDER_SETTINGS)
+    cache = _SHARED_RENDER_CACHE
+    if cache is None or cache.size != size or cache.directory != directory \
+            or cache.settings != settings:
+        cache = _SHARED_RENDER_CACHE = SharedRenderCache(
+            size, directory, settings)
+    return cache
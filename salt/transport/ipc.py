@@ -24,6 +24,7 @@ from tornado.iostream import IOStream
 # Import Salt libs
 import salt.transport.client
 import salt.transport.frame
+import salt.utils.stringutils
 from salt.ext import six
 
 log = logging.getLogger(__name__)
@@ -491,6 +492,9 @@ class IPCMessagePublisher(object):
         self.io_loop = io_loop or IOLoop.current()
         self._closing = False
         self.streams = set()
+        # Tag prefixes registered by subscribers, keyed by stream. Streams
+        # which never registered any prefix receive every message.
+        self.tag_filters = {}
 
     def start(self):
         '''
@@ -523,23 +527,84 @@ class IPCMessagePublisher(object):
             yield stream.write(pack)
         except tornado.iostream.StreamClosedError:
             log.trace('Client disconnected from IPC %s', self.socket_path)
-            self.streams.discard(stream)
+            self._discard(stream)
         except Exception as exc:
             log.error('Exception occurred while handling stream: %s', exc)
             if not stream.closed():
                 stream.close()
-            self.streams.discard(stream)
+            self._discard(stream)
 
-    def publish(self, msg):
+    def _discard(self, stream):
+        self.streams.discard(stream)
+        self.tag_filters.pop(stream, None)
+
+    @tornado.gen.coroutine
+    def _read_subscriptions(self, stream):
+        '''
+        Read the tag prefixes a subscriber registers on its stream
+        '''
+        if six.PY2:
+            encoding = None
+        else:
+            encoding = 'utf-8'
+        unpacker = msgpack.Unpacker(encoding=encoding)
+        while not stream.closed():
+            try:
+                wire_bytes = yield stream.read_bytes(4096, partial=True)
+                unpacker.feed(wire_bytes)
+                for framed_msg in unpacker:
+                    try:
+                        if framed_msg['head'].get('cmd') != 'subscribe':
+                            continue
+                        tags = framed_msg['body']
+                        if tags:
+                            self.tag_filters[stream] = tuple(
+                                salt.utils.stringutils.to_bytes(tag)
+                                for tag in tags
+                            )
+                        else:
+                            self.tag_filters.pop(stream, None)
+                    except Exception as exc:
+                        # Keep the subscriber connected, with the tag
+                        # prefixes it registered last
+                        log.error('Ignoring bad subscription message on IPC %s: %s',
+                                  self.socket_path, exc)
+            except tornado.iostream.StreamClosedError:
+                log.trace('Client disconnected from IPC %s', self.socket_path)
+                break
+            except Exception as exc:
+                # The stream cannot be read any further, close it so that the
+                # subscriber reconnects rather than silently missing events
+                log.error('Exception occurred while reading subscriptions: %s', exc)
+                if not stream.closed():
+                    stream.close()
+                break
+        self._discard(stream)
+
+    def publish(self, msg, tag=None):
         '''
         Send message to all connected sockets
+
+        When the message ``tag`` is passed, streams which registered tag
+        prefixes only receive the message if the tag starts with one of them.
         '''
         if not len(self.streams):
             return
 
+        streams = self.streams
+        if tag is not None and self.tag_filters:
+            tag = salt.utils.stringutils.to_bytes(tag)
+            streams = [
+                stream for stream in self.streams
+                if stream not in self.tag_filters
+                or tag.startswith(self.tag_filters[stream])
+            ]
+            if not streams:
+                return
+
         pack = salt.transport.frame.frame_msg_ipc(msg, raw_body=True)
 
-        for stream in self.streams:
+        for stream in streams:
             self.io_loop.spawn_callback(self._write, stream, pack)
 
     def handle_connection(self, connection, address):
@@ -560,9 +625,10 @@ class IPCMessagePublisher(object):
             self.streams.add(stream)
 
             def discard_after_closed():
-                self.streams.discard(stream)
+                self._discard(stream)
 
             stream.set_close_callback(discard_after_closed)
+            self.io_loop.spawn_callback(self._read_subscriptions, stream)
         except Exception as exc:
             log.error('IPC streaming error: %s', exc)
 
@@ -578,6 +644,7 @@ class IPCMessagePublisher(object):
         for stream in self.streams:
             stream.close()
         self.streams.clear()
+        self.tag_filters.clear()
         if hasattr(self.sock, 'close'):
             self.sock.close()
 
@@ -708,6 +775,25 @@ class IPCMessageSubscriber(IPCClient):
         self._read_sync_future = None
         return ret_future.result()
 
+    @tornado.gen.coroutine
+    def subscribe_tags(self, tags):
+        '''
+        Ask the publisher to only send messages whose tag starts with one of
+        the given prefixes. An empty list asks for every message again.
+
+        The socket must already be connected. Publishers which do not know
+        about tag subscriptions ignore the request and keep sending every
+        message.
+
+        :param list tags: Tag prefixes to subscribe to
+        '''
+        pack = salt.transport.frame.frame_msg_ipc(
+            list(tags),
+            header={'cmd': 'subscribe'},
+            raw_body=True,
+        )
+        yield self.stream.write(pack)
+
     @tornado.gen.coroutine
     def _read_async(self, callback):
         while not self.stream.closed():
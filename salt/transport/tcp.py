@@ -1162,11 +1162,36 @@ class Subscriber(object):
         self.close()
 
 
+def _get_pub_workers(opts):
+    '''
+    Return the number of publisher processes sharing the publish port
+    '''
+    workers = max(1, int(opts.get('tcp_pub_workers', 1)))
+    if not hasattr(socket, 'SO_REUSEPORT') or opts.get('ipc_mode', '') == 'tcp':
+        # Sharding needs the kernel to balance connections on a shared port
+        # and one pull socket per publisher
+        return 1
+    return workers
+
+
+def _get_pub_pull_uri(opts, worker_id=0):
+    '''
+    Return the IPC URI a publisher process pulls its payloads from
+    '''
+    if opts.get('ipc_mode', '') == 'tcp':
+        return int(opts.get('tcp_master_publish_pull', 4514))
+    if worker_id:
+        return os.path.join(
+            opts['sock_dir'], 'publish_pull_{0}.ipc'.format(worker_id)
+        )
+    return os.path.join(opts['sock_dir'], 'publish_pull.ipc')
+
+
 class PubServer(tornado.tcpserver.TCPServer, object):
     '''
     TCP publisher
     '''
-    def __init__(self, opts, io_loop=None):
+    def __init__(self, opts, io_loop=None, worker_id=0):
         super(PubServer, self).__init__(io_loop=io_loop, ssl_options=opts.get('ssl'))
         self.opts = opts
         self._closing = False
@@ -1174,23 +1199,64 @@ class PubServer(tornado.tcpserver.TCPServer, object):
         self.aes_funcs = salt.master.AESFuncs(self.opts)
         self.present = {}
         self.presence_events = False
+        self.name = 'TCPPubServer-{0}'.format(worker_id)
+        self.max_client_buffer = self.opts.get('tcp_pub_max_client_buffer', 0)
         if self.opts.get('presence_events', False):
             tcp_only = True
             for transport, _ in iter_transport_opts(self.opts):
                 if transport != 'tcp':
                     tcp_only = False
-            if tcp_only:
+            if tcp_only and self.opts.get('tcp_pub_workers', 1) <= 1:
                 # Only when the transport is TCP only, the presence events will
                 # be handled here. Otherwise, it will be handled in the
-                # 'Maintenance' process.
+                # 'Maintenance' process. The same goes for sharded publishers,
+                # none of which sees every connected minion.
                 self.presence_events = True
 
-        if self.presence_events:
+        if self.presence_events or self.opts.get('master_stats', False):
             self.event = salt.utils.event.get_event(
                 'master',
                 opts=self.opts,
                 listen=False
             )
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.stats = {'runs': 0,
+                      'mean': 0,
+                      'max': 0,
+                      'mean_clients': 0,
+                      'dropped': 0}
+        self.stat_clock = time.time()
+
+    def _post_stats(self, start, clients, dropped):
+        '''
+        Track publish latency against the number of subscribers written to
+        and fire it as a stats event when master_stats is enabled
+        '''
+        end = time.time()
+        duration = end - start
+        stats = self.stats
+        stats['runs'] += 1
+        stats['mean'] += (duration - stats['mean']) / stats['runs']
+        stats['max'] = max(stats['max'], duration)
+        stats['mean_clients'] += (clients - stats['mean_clients']) / float(stats['runs'])
+        stats['dropped'] += dropped
+        log.debug(
+            'TCP PubServer published to %s subscribers in %.4fs',
+            clients, duration
+        )
+        if not self.opts.get('master_stats', False):
+            return
+        if end - self.stat_clock > self.opts['master_stats_event_iter']:
+            self.event.fire_event(
+                {'time': end - self.stat_clock,
+                 'worker': self.name,
+                 'clients': len(self.clients),
+                 'stats': {'publish': self.stats}},
+                salt.utils.event.tagify(self.name, 'stats')
+            )
+            self._reset_stats()
 
     def close(self):
         if self._closing:
@@ -1288,6 +1354,10 @@ class PubServer(tornado.tcpserver.TCPServer, object):
 
     def handle_stream(self, stream, address):
         log.trace('Subscriber at %s connected', address)
+        if self.max_client_buffer > 0:
+            # Bound the data queued for a subscriber which does not read
+            # fast enough, see publish_payload()
+            stream.max_write_buffer_size = self.max_client_buffer
         client = Subscriber(stream, address)
         self.clients.add(client)
         self.io_loop.spawn_callback(self._stream_read, client)
@@ -1296,40 +1366,51 @@ class PubServer(tornado.tcpserver.TCPServer, object):
     @tornado.gen.coroutine
     def publish_payload(self, package, _):
         log.debug('TCP PubServer sending payload: %s', package)
+        start = time.time()
+        # Frame the payload once, every subscriber is sent the same buffer
         payload = salt.transport.frame.frame_msg(package['payload'])
 
-        to_remove = []
         if 'topic_lst' in package:
-            topic_lst = package['topic_lst']
-            for topic in topic_lst:
+            clients = []
+            for topic in package['topic_lst']:
                 if topic in self.present:
                     # This will rarely be a list of more than 1 item. It will
                     # be more than 1 item if the minion disconnects from the
                     # master in an unclean manner (eg cable yank), then
                     # restarts and the master is yet to detect the disconnect
                     # via TCP keep-alive.
-                    for client in self.present[topic]:
-                        try:
-                            # Write the packed str
-                            f = client.stream.write(payload)
-                            self.io_loop.add_future(f, lambda f: True)
-                        except tornado.iostream.StreamClosedError:
-                            to_remove.append(client)
+                    clients.extend(self.present[topic])
                 else:
                     log.debug('Publish target %s not connected', topic)
         else:
-            for client in self.clients:
-                try:
-                    # Write the packed str
-                    f = client.stream.write(payload)
-                    self.io_loop.add_future(f, lambda f: True)
-                except tornado.iostream.StreamClosedError:
-                    to_remove.append(client)
+            clients = self.clients
+
+        count = len(clients)
+        to_remove = []
+        dropped = 0
+        for client in clients:
+            try:
+                # Write the packed str. The returned future already consumes
+                # its own exception, so it is not tracked on the io_loop.
+                client.stream.write(payload)
+            except tornado.iostream.StreamBufferFullError:
+                # Slow consumer: drop this publish for it rather than let its
+                # write queue grow without bounds
+                log.trace('Subscriber at %s is too slow, dropping publish', client.address)
+                dropped += 1
+            except tornado.iostream.StreamClosedError:
+                to_remove.append(client)
+        if dropped:
+            log.warning(
+                'Dropped publish for %s subscribers exceeding '
+                'tcp_pub_max_client_buffer', dropped
+            )
         for client in to_remove:
             log.debug('Subscriber at %s has disconnected from publisher', client.address)
             client.close()
             self._remove_client_present(client)
             self.clients.discard(client)
+        self._post_stats(start, count, dropped)
         log.trace('TCP PubServer finished publishing payload')
 
 
@@ -1352,7 +1433,7 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
         return {'opts': self.opts,
                 'secrets': salt.master.SMaster.secrets}
 
-    def _publish_daemon(self, **kwargs):
+    def _publish_daemon(self, worker_id=0, **kwargs):
         '''
         Bind to the interface specified in the configuration file
         '''
@@ -1371,9 +1452,12 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
             self.io_loop = tornado.ioloop.IOLoop.current()
 
         # Spin up the publisher
-        pub_server = PubServer(self.opts, io_loop=self.io_loop)
+        pub_server = PubServer(self.opts, io_loop=self.io_loop, worker_id=worker_id)
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if _get_pub_workers(self.opts) > 1:
+            # Let the kernel spread the subscribers over the publishers
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         _set_tcp_keepalive(sock, self.opts)
         sock.setblocking(0)
         sock.bind((self.opts['interface'], int(self.opts['publish_port'])))
@@ -1382,10 +1466,7 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
         pub_server.add_socket(sock)
 
         # Set up Salt IPC server
-        if self.opts.get('ipc_mode', '') == 'tcp':
-            pull_uri = int(self.opts.get('tcp_master_publish_pull', 4514))
-        else:
-            pull_uri = os.path.join(self.opts['sock_dir'], 'publish_pull.ipc')
+        pull_uri = _get_pub_pull_uri(self.opts, worker_id)
 
         pull_sock = salt.transport.ipc.IPCMessageServer(
             pull_uri,
@@ -1419,7 +1500,17 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
                 salt.log.setup.get_multiprocessing_logging_level()
             )
 
-        process_manager.add_process(self._publish_daemon, kwargs=kwargs)
+        workers = _get_pub_workers(self.opts)
+        if workers < self.opts.get('tcp_pub_workers', 1):
+            log.warning(
+                'tcp_pub_workers is not supported with ipc_mode tcp or '
+                'without SO_REUSEPORT, starting a single publisher'
+            )
+        for worker_id in range(workers):
+            process_manager.add_process(
+                self._publish_daemon,
+                kwargs=dict(kwargs, worker_id=worker_id)
+            )
 
     def publish(self, load):
         '''
@@ -1433,19 +1524,6 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
             master_pem_path = os.path.join(self.opts['pki_dir'], 'master.pem')
             log.debug("Signing data packet")
             payload['sig'] = salt.crypt.sign_message(master_pem_path, payload['load'])
-        # Use the Salt IPC server
-        if self.opts.get('ipc_mode', '') == 'tcp':
-            pull_uri = int(self.opts.get('tcp_master_publish_pull', 4514))
-        else:
-            pull_uri = os.path.join(self.opts['sock_dir'], 'publish_pull.ipc')
-        # TODO: switch to the actual async interface
-        #pub_sock = salt.transport.ipc.IPCMessageClient(self.opts, io_loop=self.io_loop)
-        pub_sock = salt.utils.async.SyncWrapper(
-            salt.transport.ipc.IPCMessageClient,
-            (pull_uri,)
-        )
-        pub_sock.connect()
-
         int_payload = {'payload': self.serial.dumps(payload)}
 
         # add some targeting stuff for lists only (for now)
@@ -1461,5 +1539,13 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
                 int_payload['topic_lst'] = match_ids
             else:
                 int_payload['topic_lst'] = load['tgt']
-        # Send it over IPC!
-        pub_sock.send(int_payload)
+        # Send it over IPC to every publisher process!
+        for worker_id in range(_get_pub_workers(self.opts)):
+            # TODO: switch to the actual async interface
+            #pub_sock = salt.transport.ipc.IPCMessageClient(self.opts, io_loop=self.io_loop)
+            pub_sock = salt.utils.async.SyncWrapper(
+                salt.transport.ipc.IPCMessageClient,
+                (_get_pub_pull_uri(self.opts, worker_id),)
+            )
+            pub_sock.connect()
+            pub_sock.send(int_payload)
@@ -17,6 +17,7 @@ except ImportError:
 # Import salt libs
 import salt.config
 import salt.payload
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.files
@@ -159,7 +160,9 @@ class CacheDisk(CacheDict):
             return
         # TODO Add check into preflight to ensure dir exists
         # TODO Dir hashing?
-        with salt.utils.files.fopen(self._path, 'wb+') as fp_:
+        # Write to a temporary file and move it over, so that a concurrent
+        # _read never sees a partly written cache
+        with salt.utils.atomicfile.atomic_open(self._path, 'wb+') as fp_:
             cache = {
                 "CacheDisk_data": self._dict,
                 "CacheDisk_cachetime": self._key_cache_time
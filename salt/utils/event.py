@@ -110,6 +110,19 @@ TAGS = {
 }
 
 
+def _package_tag(package):
+    '''
+    Return the tag of a packed event, or None if it cannot be found without
+    unpacking the event
+    '''
+    if not isinstance(package, six.binary_type):
+        return None
+    tag, sep, _ = package.partition(salt.utils.stringutils.to_bytes(TAGEND))
+    if not sep:
+        return None
+    return tag
+
+
 def get_event(
         node, sock_dir=None, transport='zeromq',
         opts=None, listen=True, io_loop=None, keep_loop=False, raise_errors=False):
@@ -259,6 +272,7 @@ class SaltEvent(object):
         self.puburi, self.pulluri = self.__load_uri(sock_dir, node)
         self.pending_tags = []
         self.pending_events = []
+        self.publish_filter = []
         self.__load_cache_regex()
         if listen and not self.cpub:
             # Only connect to the publisher at initialization time if
@@ -353,6 +367,27 @@ class SaltEvent(object):
             if any(pmatch_func(evt['tag'], ptag) for ptag, pmatch_func in self.pending_tags):
                 self.pending_events.append(evt)
 
+    def set_publish_filter(self, tags=None):
+        '''
+        Ask the event publisher to only forward events whose tag starts with
+        one of the passed prefixes, so that unrelated events are never sent
+        to, nor unpacked by, this listener. Passing nothing lifts the filter.
+
+        Unlike subscribe(), which only decides which of the received events
+        are kept, events filtered out here are never received at all, so the
+        prefixes must cover every tag later passed to get_event().
+
+        Only synchronous listeners are filtered: asynchronous ones share their
+        IPC subscriber with every other listener on the same io_loop.
+        '''
+        self.publish_filter = list(tags or [])
+        if not self._run_io_loop_sync:
+            return
+        if self.cpub:
+            with salt.utils.async.current_ioloop(self.io_loop):
+                self.io_loop.run_sync(
+                    lambda: self.subscriber.subscribe_tags(self.publish_filter))
+
     def connect_pub(self, timeout=None):
         '''
         Establish the publish connection
@@ -373,6 +408,9 @@ class SaltEvent(object):
                     self.cpub = True
                 except Exception:
                     pass
+                if self.cpub and self.publish_filter:
+                    self.io_loop.run_sync(
+                        lambda: self.subscriber.subscribe_tags(self.publish_filter))
         else:
             if self.subscriber is None:
                 self.subscriber = salt.transport.ipc.IPCMessageSubscriber(
@@ -1031,7 +1069,7 @@ class AsyncEventPublisher(object):
         Get something from epull, publish it out epub, and return the package (or None)
         '''
         try:
-            self.publisher.publish(package)
+            self.publisher.publish(package, tag=_package_tag(package))
             return package
         # Add an extra fallback in case a forked process leeks through
         except Exception:
@@ -1134,7 +1172,7 @@ class EventPublisher(salt.utils.process.SignalHandlingMultiprocessingProcess):
         Get something from epull, publish it out epub, and return the package (or None)
         '''
         try:
-            self.publisher.publish(package)
+            self.publisher.publish(package, tag=_package_tag(package))
             return package
         # Add an extra fallback in case a forked process leeks through
         except Exception:
@@ -17,12 +17,15 @@ import shlex
 import shutil
 import stat
 import subprocess
+import threading
 import time
 import tornado.ioloop
 import weakref
 from datetime import datetime
 
 # Import salt libs
+import salt.payload
+import salt.utils.atomicfile
 import salt.utils.configparser
 import salt.utils.data
 import salt.utils.files
@@ -49,6 +52,7 @@ from salt.utils.versions import LooseVersion as _LooseVersion
 
 # Import third party libs
 from salt.ext import six
+from salt.ext.six.moves import queue
 
 VALID_REF_TYPES = _DEFAULT_MASTER_OPTS['gitfs_ref_types']
 
@@ -2308,27 +2312,90 @@ class GitBase(object):
             )
             remotes = []
 
+        repos = [repo for repo in self.remotes
+                 if not remotes
+                 or (repo.id, getattr(repo, 'name', None)) in remotes]
+        workers = min(self.opts.get('{0}_fetch_workers'.format(self.role), 1),
+                      len(repos))
+        if workers > 1:
+            # Each remote is fetched by one thread only, the update lock of
+            # the remote still keeps other processes from fetching it
+            pending = queue.Queue()
+            for repo in repos:
+                pending.put(repo)
+            results = []
+
+            def _fetch_pending():
+                while True:
+                    try:
+                        repo = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    results.append(self._fetch_remote(repo))
+
+            threads = []
+            for _ in range(workers):
+                thread = threading.Thread(target=_fetch_pending)
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+        else:
+            results = [self._fetch_remote(repo) for repo in repos]
+        # We can't just use the return value from repo.fetch() because the
+        # data could still have changed if old remotes were cleared above.
+        # Additionally, later remotes without changes would override this
+        # value and make it incorrect.
+        return any(results)
+
+    def _fetch_remote(self, repo):
+        '''
+        Fetch a remote, record how long it took and return whether it was
+        updated
+        '''
+        start = time.time()
         changed = False
-        for repo in self.remotes:
-            name = getattr(repo, 'name', None)
-            if not remotes or (repo.id, name) in remotes:
-                try:
-                    if repo.fetch():
-                        # We can't just use the return value from repo.fetch()
-                        # because the data could still have changed if old
-                        # remotes were cleared above. Additionally, we're
-                        # running this in a loop and later remotes without
-                        # changes would override this value and make it
-                        # incorrect.
-                        changed = True
-                except Exception as exc:
-                    log.error(
-                        'Exception caught while fetching %s remote \'%s\': %s',
-                        self.role, repo.id, exc,
-                        exc_info=True
-                    )
+        try:
+            changed = bool(repo.fetch())
+        except Exception as exc:
+            log.error(
+                'Exception caught while fetching %s remote \'%s\': %s',
+                self.role, repo.id, exc,
+                exc_info=True
+            )
+        duration = time.time() - start
+        log.debug('Fetched %s remote \'%s\' in %.3f seconds',
+                  self.role, repo.id, duration)
+        try:
+            with salt.utils.atomicfile.atomic_open(
+                    salt.utils.path.join(repo.gitdir, 'fetch.p'), 'wb') as fp_:
+                fp_.write(salt.payload.Serial(self.opts).dumps({
+                    'duration': round(duration, 3),
+                    'finished': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+                    'changed': changed}))
+        except (IOError, OSError) as exc:
+            log.debug('Unable to record the fetch of %s remote \'%s\': %s',
+                      self.role, repo.id, exc)
         return changed
 
+    def fetch_durations(self):
+        '''
+        Return how long the last fetch of each remote took in seconds, when it
+        finished and whether it fetched changes. Remotes which were not
+        fetched yet are left out.
+        '''
+        ret = {}
+        serial = salt.payload.Serial(self.opts)
+        for repo in self.remotes:
+            try:
+                with salt.utils.files.fopen(
+                        salt.utils.path.join(repo.gitdir, 'fetch.p'), 'rb') as fp_:
+                    ret[repo.id] = serial.load(fp_)
+            except (IOError, OSError):
+                continue
+        return ret
+
     def lock(self, remote=None):
         '''
         Place an update.lk
@@ -2822,15 +2889,11 @@ class GitFS(GitBase):
         ret['dest'] = fnd['rel']
         gzip = load.get('gzip', None)
         fpath = os.path.normpath(fnd['path'])
-        with salt.utils.files.fopen(fpath, 'rb') as fp_:
-            fp_.seek(load['loc'])
-            data = fp_.read(self.opts['file_buffer_size'])
-            if data and six.PY3 and not salt.utils.files.is_binary(fpath):
-                data = data.decode(__salt_system_encoding__)
-            if gzip and data:
-                data = salt.utils.gzip_util.compress(data, gzip)
-                ret['gzip'] = gzip
-            ret['data'] = data
+        data = salt.fileserver.read_file_chunk(self.opts, fpath, load)
+        if gzip and data:
+            data = salt.utils.gzip_util.compress(data, gzip)
+            ret['gzip'] = gzip
+        ret['data'] = data
         return ret
 
     def file_hash(self, load, fnd):
@@ -6,11 +6,14 @@ Jinja loading utils to enable a more powerful backend for jinja templates
 # Import python libs
 from __future__ import absolute_import, unicode_literals
 import collections
+import hashlib
 import logging
 import os.path
 import pipes
 import pprint
 import re
+import threading
+import time
 import uuid
 from functools import wraps
 from xml.dom import minidom
@@ -27,6 +30,7 @@ from jinja2.ext import Extension
 # Import salt libs
 from salt.exceptions import TemplateError
 import salt.fileclient
+import salt.utils.atomicfile
 import salt.utils.data
 import salt.utils.files
 import salt.utils.json
@@ -39,6 +43,7 @@ from salt.utils.odict import OrderedDict
 log = logging.getLogger(__name__)
 
 __all__ = [
+    'CompiledTemplateCache',
     'SaltCacheLoader',
     'SerializerExtension'
 ]
@@ -140,6 +145,249 @@ class SaltCacheLoader(BaseLoader):
         raise TemplateNotFound(template)
 
 
+class CompiledTemplateCache(jinja2.BytecodeCache):
+    '''
+    Cache the code Jinja compiles templates to, so that a template is only
+    parsed and compiled again when its source, its name or the options of the
+    environment it is compiled in change.
+
+    Up to ``size`` compiled templates are kept in memory, the least recently
+    used ones are dropped first. If ``directory`` is set, compiled templates
+    are also stored there, so that they outlive the process. The files in
+    ``directory`` are pruned to the ``size`` most recently used ones.
+
+    If ``stats_dir`` is set, the hits and misses are added to the stats file
+    of this process there at most once a second, for the
+    ``cache.jinja_stats`` runner.
+
+    This is used as the bytecode cache of the environments which render the
+    templates, so templates pulled in with include, import or extends are
+    covered too.
+    '''
+    # The environment options which change the code a template compiles to
+    ENV_ATTRS = ('block_start_string', 'block_end_string',
+                 'variable_start_string', 'variable_end_string',
+                 'comment_start_string', 'comment_end_string',
+                 'line_statement_prefix', 'line_comment_prefix',
+                 'trim_blocks', 'lstrip_blocks', 'newline_sequence',
+                 'keep_trailing_newline', 'optimized', 'autoescape')
+
+    def __init__(self, size=500, directory=None, stats_dir=None):
+        self.size = size
+        self.directory = directory
+        self.stats_dir = stats_dir
+        self.hits = 0
+        self.misses = 0
+        self._code = OrderedDict()
+        self._lock = threading.Lock()
+        self._stored = 0
+        # The hits and misses last added to the stats file, and when
+        self._written = {'hits': 0, 'misses': 0}
+        self._written_at = 0
+
+    def _env_key(self, environment):
+        '''
+        Return a string identifying the compile time options of an environment
+        '''
+        env_opts = [repr(getattr(environment, attr, None)) for attr in self.ENV_ATTRS]
+        env_opts.extend(sorted(environment.extensions))
+        return '|'.join(env_opts)
+
+    def _path(self, key):
+        return os.path.join(
+            self.directory,
+            '{0}.cache'.format(hashlib.sha1(
+                salt.utils.stringutils.to_bytes('|'.join(key))).hexdigest()))
+
+    def _remember(self, key, code):
+        with self._lock:
+            self._code.pop(key, None)
+            self._code[key] = code
+            while len(self._code) > self.size:
+                self._code.popitem(last=False)
+
+    def load_bytecode(self, bucket):
+        key = (self._env_key(bucket.environment), bucket.key, bucket.checksum)
+        with self._lock:
+            code = self._code.pop(key, None)
+            if code is not None:
+                # Move it to the most recently used end
+                self._code[key] = code
+                self.hits += 1
+                bucket.code = code
+        if bucket.code is None and self.directory:
+            try:
+                with salt.utils.files.fopen(self._path(key), 'rb') as ifile:
+                    bucket.load_bytecode(ifile)
+                # Mark it as recently used for _prune
+                os.utime(self._path(key), None)
+            except (IOError, OSError):
+                pass
+            if bucket.code is not None:
+                self._remember(key, bucket.code)
+                self.hits += 1
+        if bucket.code is None:
+            self.misses += 1
+        if self.stats_dir:
+            self._write_stats()
+
+    def dump_bytecode(self, bucket):
+        key = (self._env_key(bucket.environment), bucket.key, bucket.checksum)
+        self._remember(key, bucket.code)
+        if self.directory:
+            try:
+                if not os.path.isdir(self.directory):
+                    os.makedirs(self.directory)
+                with salt.utils.atomicfile.atomic_open(self._path(key), 'wb') as ofile:
+                    bucket.write_bytecode(ofile)
+            except (IOError, OSError) as exc:
+                log.debug('Failed to store compiled template in %s: %s',
+                          self.directory, exc)
+                return
+            # Prune on the first store and after every size stores, so that
+            # the directory holds at most about twice size files
+            if self._stored % max(self.size, 1) == 0:
+                self._prune()
+            self._stored += 1
+
+    def _prune(self):
+        '''
+        Remove all but the ``size`` most recently used compiled templates from
+        ``directory``
+        '''
+        files = []
+        try:
+            for name in os.listdir(self.directory):
+                if not name.endswith('.cache'):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    # Removed by another process
+                    pass
+        except OSError:
+            return
+        files.sort(reverse=True)
+        for _, path in files[self.size:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _write_stats(self):
+        '''
+        Add the hits and misses since they were last written to the stats file
+        of this process, at most once a second
+        '''
+        with self._lock:
+            if time.time() - self._written_at < 1:
+                return
+            self._written_at = time.time()
+            counts = {'hits': self.hits - self._written['hits'],
+                      'misses': self.misses - self._written['misses']}
+            self._written = {'hits': self.hits, 'misses': self.misses}
+        path = os.path.join(self.stats_dir, '{0}.json'.format(os.getpid()))
+        try:
+            if not os.path.isdir(self.stats_dir):
+                os.makedirs(self.stats_dir)
+            stats = {}
+            if os.path.isfile(path):
+                # The runner removes the file to reset the stats
+                with salt.utils.files.fopen(path, 'r') as fp_:
+                    stats = salt.utils.json.load(fp_)
+            for key, count in six.iteritems(counts):
+                stats[key] = stats.get(key, 0) + count
+            with salt.utils.atomicfile.atomic_open(path, 'w') as fp_:
+                salt.utils.json.dump(stats, fp_)
+        except (IOError, OSError, ValueError) as exc:
+            log.debug('Failed to write the Jinja template cache stats: %s', exc)
+
+    def clear(self):
+        '''
+        Forget the compiled templates kept in memory
+        '''
+        with self._lock:
+            self._code.clear()
+
+    def stats(self):
+        '''
+        Return the number of cache hits and misses so far
+        '''
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._code)}
+
+    def from_string(self, environment, source):
+        '''
+        Load a template from a string, like ``environment.from_string``, only
+        compiling it if it is not in the cache
+        '''
+        bucket = self.get_bucket(environment, '<template>', None, source)
+        if bucket.code is None:
+            bucket.code = environment.compile(source)
+            self.set_bucket(bucket)
+        return environment.template_class.from_code(
+            environment, bucket.code, environment.make_globals(None), None)
+
+
+_TEMPLATE_CACHE = None
+
+
+def get_template_cache(opts):
+    '''
+    Return the compiled template cache configured by the ``jinja_cache_size``
+    and ``jinja_bytecode_cache`` options, or None if it is disabled
+    '''
+    global _TEMPLATE_CACHE
+    size = opts.get('jinja_cache_size', 0)
+    if not size:
+        return None
+    directory = stats_dir = None
+    if opts.get('cachedir'):
+        if opts.get('jinja_bytecode_cache', False):
+            directory = os.path.join(opts['cachedir'], 'jinja')
+        stats_dir = os.path.join(opts['cachedir'], 'jinja_cache_stats')
+    cache = _TEMPLATE_CACHE
+    if cache is None or cache.size != size or cache.directory != directory \
+            or cache.stats_dir != stats_dir:
+        cache = _TEMPLATE_CACHE = CompiledTemplateCache(
+            size, directory, stats_dir)
+    return cache
+
+
+def read_cache_stats(cachedir, reset=False):
+    '''
+    Return the hits and misses of the compiled template caches of all the
+    processes using ``cachedir``, and the share of hits. Pass ``reset=True``
+    to start counting from zero again.
+    '''
+    ret = {'hits': 0, 'misses': 0}
+    stats_dir = os.path.join(cachedir, 'jinja_cache_stats')
+    try:
+        filenames = os.listdir(stats_dir)
+    except OSError:
+        filenames = []
+    for filename in filenames:
+        path = os.path.join(stats_dir, filename)
+        try:
+            with salt.utils.files.fopen(path, 'r') as fp_:
+                stats = salt.utils.json.load(fp_)
+            if reset:
+                os.remove(path)
+        except (IOError, OSError, ValueError) as exc:
+            log.warning('Failed to read Jinja template cache stats from %s: %s',
+                        path, exc)
+            continue
+        for stat in ret:
+            ret[stat] += stats.get(stat, 0)
+    lookups = ret['hits'] + ret['misses']
+    ret['hit_ratio'] = (
+        round(float(ret['hits']) / lookups, 4) if lookups else 0.0
+    )
+    return ret
+
+
 class PrintableDict(OrderedDict):
     '''
     Ensures that dict str() and repr() are YAML friendly.
@@ -5,7 +5,11 @@ Functions for interacting with the job cache
 
 # Import Python libs
 from __future__ import absolute_import, unicode_literals
+import collections
+import errno
 import logging
+import multiprocessing
+import time
 
 # Import Salt libs
 import salt.minion
@@ -13,12 +17,19 @@ import salt.utils.jid
 import salt.utils.event
 import salt.utils.verify
 
+# Import 3rd-party libs
+from salt.ext import six
+from salt.ext.six.moves import queue
+
 log = logging.getLogger(__name__)
 
 
-def store_job(opts, load, event=None, mminion=None):
+def store_job(opts, load, event=None, mminion=None, return_queue=None):
     '''
     Store job information using the configured master_job_cache
+
+    If a :class:`ReturnQueue` is passed, the return is only fired on the event
+    bus here and then queued for the job cache writer process to store it.
     '''
     # Generate EndTime
     endtime = salt.utils.jid.jid_to_time(salt.utils.jid.gen_jid(opts))
@@ -53,7 +64,7 @@ def store_job(opts, load, event=None, mminion=None):
             emsg = "Returner '{0}' does not support function save_load".format(job_cache)
             log.error(emsg)
             raise KeyError(emsg)
-    elif salt.utils.jid.is_jid(load['jid']):
+    elif return_queue is None and salt.utils.jid.is_jid(load['jid']):
         # Store the jid
         jidstore_fstr = '{0}.prep_jid'.format(job_cache)
         try:
@@ -70,6 +81,16 @@ def store_job(opts, load, event=None, mminion=None):
                          salt.utils.event.tagify([load['jid'], 'ret', load['id']], 'job'))
         event.fire_ret_load(load)
 
+    if return_queue is not None:
+        if return_queue.put(load, endtime):
+            return
+        # The writer is falling behind, store the return here rather than
+        # letting the queue grow without bounds
+        log.debug(
+            'The job cache writer queue is full, storing the return from %s '
+            'for job %s directly', load['id'], load['jid'])
+        return store_job_batch(opts, [(load, endtime)], mminion=mminion)
+
     # if you have a job_cache, or an ext_job_cache, don't write to
     # the regular master cache
     if not opts['job_cache'] or opts.get('ext_job_cache'):
@@ -114,6 +135,153 @@ def store_job(opts, load, event=None, mminion=None):
         mminion.returners[updateetfstr](load['jid'], endtime)
 
 
+def store_job_batch(opts, jobs, mminion=None):
+    '''
+    Store a batch of job returns queued by :func:`store_job`, using the
+    configured master_job_cache.
+
+    ``jobs`` is a list of ``(load, endtime)`` tuples. The returns are stored
+    with the ``returner`` function one by one, while ``prep_jid``,
+    ``save_load`` and ``update_endtime``, which each overwrite the previous
+    call for the same job, are only called once per job in the batch.
+
+    Returns the number of returns which could not be stored.
+    '''
+    if mminion is None:
+        mminion = salt.minion.MasterMinion(opts, states=False, rend=False)
+    job_cache = opts['master_job_cache']
+    # if you have a job_cache, or an ext_job_cache, don't write to
+    # the regular master cache
+    cache = opts['job_cache'] and not opts.get('ext_job_cache')
+    store_endtime = opts.get('job_cache_store_endtime')
+
+    try:
+        prep_jid = mminion.returners['{0}.prep_jid'.format(job_cache)]
+        save_load = mminion.returners['{0}.save_load'.format(job_cache)]
+        returner = mminion.returners['{0}.returner'.format(job_cache)]
+    except KeyError as error:
+        emsg = "Returner '{0}' does not support function {1}".format(job_cache, error)
+        log.error(emsg)
+        raise KeyError(emsg)
+    update_endtime = mminion.returners.get('{0}.update_endtime'.format(job_cache))
+
+    by_jid = collections.OrderedDict()
+    for load, endtime in jobs:
+        by_jid.setdefault(load['jid'], []).append((load, endtime))
+
+    errors = 0
+    for jid, returns in six.iteritems(by_jid):
+        try:
+            if salt.utils.jid.is_jid(jid):
+                prep_jid(False, passed_jid=jid)
+            # do not cache job results if explicitly requested
+            if not cache or jid == 'nocache':
+                continue
+            load = returns[-1][0]
+            if 'fun' not in load and load.get('return', {}):
+                ret_ = load.get('return', {})
+                if 'fun' in ret_:
+                    load.update({'fun': ret_['fun']})
+                if 'user' in ret_:
+                    load.update({'user': ret_['user']})
+            save_load(jid, load)
+        except Exception as exc:
+            log.error('Could not store job %s in the job cache: %s', jid, exc)
+            errors += len(returns)
+            continue
+        for load, endtime in returns:
+            try:
+                returner(load)
+            except Exception as exc:
+                log.error(
+                    'Could not store the return from %s for job %s in the '
+                    'job cache: %s', load['id'], jid, exc)
+                errors += 1
+        if store_endtime and update_endtime is not None:
+            try:
+                update_endtime(jid, returns[-1][1])
+            except Exception as exc:
+                log.error('Could not store the end time of job %s: %s', jid, exc)
+    return errors
+
+
+class ReturnQueue(object):
+    '''
+    A bounded queue handing job returns from the master workers over to the
+    job cache writer process. Returns which do not fit in the queue are
+    counted, so that the writer can report them.
+    '''
+    def __init__(self, maxsize=0):
+        self.queue = multiprocessing.Queue(maxsize)
+        self.overflows = multiprocessing.Value('i', 0)
+
+    def put(self, load, endtime):
+        '''
+        Queue a return, returns False if the queue is full
+        '''
+        try:
+            self.queue.put_nowait((load, endtime))
+        except queue.Full:
+            with self.overflows.get_lock():
+                self.overflows.value += 1
+            return False
+        return True
+
+    def get_batch(self, size, timeout):
+        '''
+        Return up to ``size`` queued returns, waiting at most ``timeout``
+        seconds for the batch to fill up
+        '''
+        batch = []
+        deadline = time.time() + timeout
+        while len(batch) < size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+            except (IOError, OSError) as exc:
+                # Interrupted by a signal
+                if exc.errno != errno.EINTR:
+                    raise
+                break
+        return batch
+
+    def drain(self, timeout=0.1):
+        '''
+        Return everything left in the queue. The returns are handed over by a
+        background thread of the putting process, so wait up to ``timeout``
+        seconds for the ones which are still on their way.
+        '''
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                return batch
+
+    def qsize(self):
+        '''
+        Return the approximate number of queued returns, or None where the
+        platform can not tell
+        '''
+        try:
+            return self.queue.qsize()
+        except NotImplementedError:
+            return None
+
+    def pop_overflows(self):
+        '''
+        Return and reset the number of returns which did not fit in the queue
+        '''
+        with self.overflows.get_lock():
+            count = self.overflows.value
+            self.overflows.value = 0
+        return count
+
+
 def store_minions(opts, jid, minions, mminion=None, syndic_id=None):
     '''
     Store additional minions matched on lower-level masters using the configured
@@ -5,18 +5,31 @@ Utility functions for minions
 
 # Import Python Libs
 from __future__ import absolute_import, unicode_literals
+import collections
+import fnmatch
+import heapq
+import itertools
 import os
 import logging
 import threading
+import time
 
 # Import Salt Libs
 import salt.payload
+import salt.utils.atomicfile
 import salt.utils.files
 import salt.utils.platform
 import salt.utils.process
 
+# Import 3rd-party libs
+from salt.ext import six
+
 log = logging.getLogger(__name__)
 
+# How long a job started through the JobQueue may take to write its proc
+# file before it is considered gone
+JOB_START_TIMEOUT = 30
+
 
 def running(opts):
     '''
@@ -41,6 +54,202 @@ def running(opts):
     return ret
 
 
+class JidQueue(object):
+    '''
+    The JIDs of the jobs most recently received by the minion, used to not
+    run a job twice.
+
+    Up to ``hwm`` JIDs are kept, the oldest ones are dropped first. Checking
+    for and adding a JID take constant time.
+    '''
+    def __init__(self, hwm, jids=()):
+        self.hwm = hwm
+        self._order = collections.deque()
+        self._jids = set()
+        for jid in jids:
+            self.append(jid)
+
+    def append(self, jid):
+        '''
+        Add a JID, dropping the oldest ones beyond the high water mark
+        '''
+        if jid in self._jids:
+            return
+        self._order.append(jid)
+        self._jids.add(jid)
+        while len(self._order) > self.hwm:
+            self._jids.discard(self._order.popleft())
+
+    def __contains__(self, jid):
+        return jid in self._jids
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, list(self))
+
+
+class JobQueue(object):
+    '''
+    Admit jobs to run while fewer than ``limit`` of them are running, and
+    queue the others until a running job ends.
+
+    Queued jobs are started highest priority first, and in the order they
+    were queued among jobs of the same priority. ``priorities`` maps function
+    names, or globs matching them, to priorities; jobs of other functions have
+    priority 0.
+    '''
+    def __init__(self, limit, priorities=None):
+        self.limit = limit
+        self.priorities = priorities or {}
+        # The JIDs of the running jobs, mapped to when they were started
+        self.running = {}
+        self._queue = []
+        self._counter = itertools.count()
+
+    def priority(self, fun):
+        '''
+        Return the priority of a job running the function ``fun``, or the
+        functions in the list ``fun``
+        '''
+        funs = fun if isinstance(fun, (list, tuple)) else [fun]
+        ret = None
+        for name in funs:
+            if name in self.priorities:
+                prio = self.priorities[name]
+            else:
+                matches = [prio for pattern, prio in six.iteritems(self.priorities)
+                           if fnmatch.fnmatch(name, pattern)]
+                prio = max(matches) if matches else 0
+            ret = prio if ret is None else max(ret, prio)
+        return ret or 0
+
+    def full(self):
+        '''
+        Return True if no more jobs may be started
+        '''
+        return len(self.running) >= self.limit
+
+    def put(self, data, start):
+        '''
+        Queue the job described by the publication ``data``, ``start`` is
+        the function to call with ``data`` to start it
+        '''
+        heapq.heappush(
+            self._queue,
+            (-self.priority(data['fun']), next(self._counter), data, start))
+
+    def pop(self):
+        '''
+        Return the next job to start as a tuple of its start function and its
+        data, marking it as running, or None if no job may be started
+        '''
+        if not self._queue or self.full():
+            return None
+        _, _, data, start = heapq.heappop(self._queue)
+        self.started(data['jid'])
+        return start, data
+
+    def started(self, jid):
+        '''
+        Count the job ``jid`` as running
+        '''
+        self.running[jid] = time.time()
+
+    def finished(self, jid):
+        '''
+        Free the slot of the job ``jid``, returns False if it was not running
+        '''
+        return self.running.pop(jid, None) is not None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def info(self):
+        '''
+        Return the running and the queued jobs, in the order they will start
+        '''
+        return {'limit': self.limit,
+                'running': sorted(self.running),
+                'queued': [{'jid': data['jid'],
+                            'fun': data['fun'],
+                            'priority': -prio}
+                           for prio, _, data, _ in sorted(self._queue, key=lambda item: item[:2])],
+                'depth': len(self._queue)}
+
+
+def new_job_queue(opts):
+    '''
+    Return a JobQueue for the minion, counting the jobs still running from
+    before a restart as running
+    '''
+    job_queue = JobQueue(opts.get('process_count_max', -1),
+                         opts.get('job_queue_priorities'))
+    if job_queue.limit > 0:
+        for job in running(opts):
+            job_queue.started(job['jid'])
+    return job_queue
+
+
+def write_job_queue(opts, job_queue):
+    '''
+    Store the state of the JobQueue, for saltutil.job_queue
+    '''
+    serial = salt.payload.Serial(opts=opts)
+    path = os.path.join(opts['cachedir'], 'job_queue.p')
+    try:
+        with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+            fp_.write(serial.dumps(job_queue.info()))
+    except (IOError, OSError) as exc:
+        log.debug('Failed to store the job queue in %s: %s', path, exc)
+
+
+def read_job_queue(opts):
+    '''
+    Return the state of the JobQueue of the minion
+    '''
+    serial = salt.payload.Serial(opts=opts)
+    path = os.path.join(opts['cachedir'], 'job_queue.p')
+    try:
+        with salt.utils.files.fopen(path, 'rb') as fp_:
+            return serial.loads(fp_.read())
+    except (IOError, OSError):
+        return {'limit': opts.get('process_count_max', -1),
+                'running': [],
+                'queued': [],
+                'depth': 0}
+
+
+def ended_jobs(opts, running, timeout=JOB_START_TIMEOUT):
+    '''
+    Return the JIDs from ``running``, a dict mapping JIDs to when their job
+    was started, whose job is no longer running. A job which has not written
+    its proc file within ``timeout`` seconds is considered gone.
+    '''
+    proc_dir = os.path.join(opts['cachedir'], 'proc')
+    now = time.time()
+    ret = []
+    for jid, started in six.iteritems(running):
+        try:
+            if _read_proc_file(os.path.join(proc_dir, six.text_type(jid)), opts) is None:
+                ret.append(jid)
+        except (IOError, OSError):
+            # The proc file is not there, yet or any more
+            if now - started > timeout:
+                ret.append(jid)
+    return ret
+
+
 def cache_jobs(opts, jid, ret):
     serial = salt.payload.Serial(opts=opts)
 
@@ -9,6 +9,7 @@ from __future__ import absolute_import, unicode_literals
 import os
 import fnmatch
 import re
+import time
 import logging
 
 # Import salt libs
@@ -39,6 +40,11 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Per process state shared by every CkMinions instance, see
+# CkMinions._get_data_index() and _list_pki_dir()
+_DATA_INDEXES = {}
+_PKI_DIR_CACHE = {}
+
 TARGET_REX = re.compile(
         r'''(?x)
         (
@@ -182,6 +188,154 @@ def nodegroup_comp(nodegroup, nodegroups, skip=None, first_call=True):
         return ret
 
 
+def _list_pki_dir(path):
+    '''
+    Return the sorted minion IDs with a key in the passed directory
+
+    The listing is reused for as long as the mtime of the directory does not
+    change, as accepting, rejecting or deleting a key always changes it. A
+    listing taken less than a second after the last change is not reused, in
+    case another change happened within the resolution of the mtime.
+    '''
+    mtime = os.stat(path).st_mtime
+    cached = _PKI_DIR_CACHE.get(path)
+    if cached is not None and cached[0] == mtime and cached[1] > mtime + 1:
+        return list(cached[2])
+    listed_at = time.time()
+    minions = []
+    for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(path)):
+        if not fn_.startswith('.') and os.path.isfile(os.path.join(path, fn_)):
+            minions.append(fn_)
+    _PKI_DIR_CACHE[path] = (mtime, listed_at, minions)
+    return list(minions)
+
+
+class MinionDataIndex(object):
+    '''
+    In memory copy of the minion data cache, indexed by the top level keys and
+    values of the grains and pillar of every minion
+
+    Grain and pillar targets are answered by only matching the minions the
+    index says can possibly match, without fetching and deserializing the
+    data of every minion on every publish. The index is synced with the cache
+    by comparing the update time of every minion's data, so data written by
+    other master processes is picked up.
+    '''
+    SEARCH_TYPES = ('grains', 'pillar')
+
+    def __init__(self):
+        # {<minion_id>: <data or None>}
+        self.minions = {}
+        # {<minion_id>: <update time of the data>}
+        self.updated = {}
+        # {<search_type>: {<top level key>: set(<minion_id>, ...)}}
+        self.keys = dict((search, {}) for search in self.SEARCH_TYPES)
+        # {<search_type>: {(<top level key>, <lowered value>): set(<minion_id>, ...)}}
+        self.values = dict((search, {}) for search in self.SEARCH_TYPES)
+        # {<search_type>: {<top level key>: set(<minion_id>, ...)}} of the
+        # minions whose value for the key cannot be matched from self.values
+        self.nested = dict((search, {}) for search in self.SEARCH_TYPES)
+
+    @staticmethod
+    def _entries(data):
+        '''
+        Yield the (table, key) pairs a minion's search data is indexed under
+        '''
+        for key, value in six.iteritems(data):
+            yield 'keys', key
+            if isinstance(value, dict):
+                yield 'nested', key
+                continue
+            if not isinstance(value, (list, tuple)):
+                value = [value]
+            for member in value:
+                if isinstance(member, (dict, list, tuple)):
+                    yield 'nested', key
+                else:
+                    yield 'values', (key, six.text_type(member).lower())
+
+    def _tables(self, minion_id):
+        data = self.minions.get(minion_id)
+        if not isinstance(data, dict):
+            return
+        for search in self.SEARCH_TYPES:
+            if isinstance(data.get(search), dict):
+                for table, key in self._entries(data[search]):
+                    yield getattr(self, table)[search], key
+
+    def remove(self, minion_id):
+        '''
+        Drop a minion from the index
+        '''
+        for table, key in self._tables(minion_id):
+            ids = table.get(key)
+            if ids is not None:
+                ids.discard(minion_id)
+                if not ids:
+                    del table[key]
+        self.minions.pop(minion_id, None)
+        self.updated.pop(minion_id, None)
+
+    def update(self, minion_id, data, updated=None):
+        '''
+        Replace the indexed data of a minion. A minion without an update time
+        is fetched again on the next refresh.
+        '''
+        self.remove(minion_id)
+        self.minions[minion_id] = data
+        self.updated[minion_id] = updated
+        for table, key in self._tables(minion_id):
+            table.setdefault(key, set()).add(minion_id)
+
+    def refresh(self, cache):
+        '''
+        Sync the index with the minion data cache
+        '''
+        start = int(time.time())
+        cached = set(cache.list('minions') or [])
+        for minion_id in set(self.minions).difference(cached):
+            self.remove(minion_id)
+        for minion_id in cached:
+            bank = 'minions/{0}'.format(minion_id)
+            stamp = cache.updated(bank, 'data')
+            if minion_id in self.minions and stamp == self.updated[minion_id]:
+                continue
+            data = cache.fetch(bank, 'data') if stamp is not None else None
+            if stamp is not None and stamp >= start - 1:
+                # The data could change again within the resolution of the
+                # update time, fetch it again next time
+                stamp = -1
+            self.update(minion_id, data, stamp)
+
+    def match(self, search_type, expr, delimiter, regex_match=False, exact_match=False):
+        '''
+        Return the set of minions whose grains or pillar match the expression,
+        as salt.utils.data.subdict_match() would
+        '''
+        if delimiter not in expr:
+            return set()
+        key, matchstr = expr.split(delimiter, 1)
+        if (delimiter not in matchstr and not regex_match and
+                (exact_match or not re.search(r'[*?[]', matchstr))):
+            # A plain key:value target is a case insensitive comparison with
+            # the value, or the members of a list value, under the key. Only
+            # nested structures under the key need to be matched.
+            ret = set(self.values[search_type].get((key, matchstr.lower()), ()))
+            candidates = self.nested[search_type].get(key, ())
+        else:
+            ret = set()
+            candidates = self.keys[search_type].get(key, ())
+        return ret.union(
+            minion_id for minion_id in candidates
+            if salt.utils.data.subdict_match(
+                self.minions[minion_id].get(search_type),
+                expr,
+                delimiter=delimiter,
+                regex_match=regex_match,
+                exact_match=exact_match)
+        )
+
+
 class CkMinions(object):
     '''
     Used to check what minions should respond from a target
@@ -251,9 +405,7 @@ class CkMinions(object):
                 with salt.utils.files.fopen(pki_cache_fn) as fn_:
                     return self.serial.load(fn_)
             else:
-                for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(os.path.join(self.opts['pki_dir'], self.acc))):
-                    if not fn_.startswith('.') and os.path.isfile(os.path.join(self.opts['pki_dir'], self.acc, fn_)):
-                        minions.append(fn_)
+                minions = _list_pki_dir(os.path.join(self.opts['pki_dir'], self.acc))
             return minions
         except OSError as exc:
             log.error(
@@ -275,15 +427,15 @@ class CkMinions(object):
         If not 'greedy' return the only minions have cache data and matched by the condition.
         '''
         cache_enabled = self.opts.get('minion_data_cache', False)
+        index = self._get_data_index() if cache_enabled else None
 
         def list_cached_minions():
+            if index is not None:
+                return list(index.minions)
             return self.cache.list('minions')
 
         if greedy:
-            minions = []
-            for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(os.path.join(self.opts['pki_dir'], self.acc))):
-                if not fn_.startswith('.') and os.path.isfile(os.path.join(self.opts['pki_dir'], self.acc, fn_)):
-                    minions.append(fn_)
+            minions = _list_pki_dir(os.path.join(self.opts['pki_dir'], self.acc))
         elif cache_enabled:
             minions = list_cached_minions()
         else:
@@ -298,10 +450,23 @@ class CkMinions(object):
             if not cminions:
                 return {'minions': minions,
                         'missing': []}
+            if index is not None:
+                matched = index.match(search_type,
+                                      expr,
+                                      delimiter,
+                                      regex_match=regex_match,
+                                      exact_match=exact_match)
             minions = set(minions)
             for id_ in cminions:
                 if greedy and id_ not in minions:
                     continue
+                if index is not None:
+                    if index.minions[id_] is None:
+                        if not greedy:
+                            minions.remove(id_)
+                    elif id_ not in matched:
+                        minions.remove(id_)
+                    continue
                 mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
                 if mdata is None:
                     if not greedy:
@@ -318,6 +483,44 @@ class CkMinions(object):
         return {'minions': minions,
                 'missing': []}
 
+    def _get_data_index(self):
+        '''
+        Return this process' MinionDataIndex, synced with the minion data
+        cache, or None if the index is disabled or the cache driver cannot
+        report when a minion's data was updated
+        '''
+        if not self.opts.get('minion_data_index', False):
+            return None
+        if '{0}.updated'.format(self.cache.driver) not in self.cache.modules:
+            return None
+        key = (self.cache.driver, self.cache.cachedir)
+        index = _DATA_INDEXES.get(key)
+        if index is None:
+            index = _DATA_INDEXES[key] = MinionDataIndex()
+        index.refresh(self.cache)
+        return index
+
+    def update_data_index(self, minion_id, data):
+        '''
+        Update the index with minion data this process just wrote to the cache
+        '''
+        if not self.opts.get('minion_data_index', False):
+            return
+        key = (self.cache.driver, self.cache.cachedir)
+        index = _DATA_INDEXES.get(key)
+        if index is not None:
+            # No update time: picked up again on the next refresh in case the
+            # cache holds something else by then
+            index.update(minion_id, data)
+
+    def _fetch_minion_data(self, minion_id, index=None):
+        '''
+        Return the cached data of a minion, from the index when it is used
+        '''
+        if index is not None:
+            return index.minions.get(minion_id)
+        return self.cache.fetch('minions/{0}'.format(minion_id), 'data')
+
     def _check_grain_minions(self, expr, delimiter, greedy):
         '''
         Return the minions found by looking via grains
@@ -375,6 +578,7 @@ class CkMinions(object):
                     'missing': []}
 
         if cache_enabled:
+            index = self._get_data_index()
             if greedy:
                 cminions = self.cache.list('minions')
             else:
@@ -399,7 +603,7 @@ class CkMinions(object):
 
             minions = set(minions)
             for id_ in cminions:
-                mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
+                mdata = self._fetch_minion_data(id_, index)
                 if mdata is None:
                     if not greedy:
                         minions.remove(id_)
@@ -622,9 +826,10 @@ class CkMinions(object):
                 addrs.update(set(salt.utils.network.ip_addrs(include_loopback=include_localhost)))
             if subset:
                 search = subset
+            index = self._get_data_index()
             for id_ in search:
                 try:
-                    mdata = self.cache.fetch('minions/{0}'.format(id_), 'data')
+                    mdata = self._fetch_minion_data(id_, index)
                 except SaltCacheError:
                     # If a SaltCacheError is explicitly raised during the fetch operation,
                     # permission was denied to open the cached data.p file. Continue on as
@@ -651,10 +856,7 @@ class CkMinions(object):
         '''
         Return a list of all minions that have auth'd
         '''
-        mlist = []
-        for fn_ in salt.utils.data.sorted_ignorecase(os.listdir(os.path.join(self.opts['pki_dir'], self.acc))):
-            if not fn_.startswith('.') and os.path.isfile(os.path.join(self.opts['pki_dir'], self.acc, fn_)):
-                mlist.append(fn_)
+        mlist = _list_pki_dir(os.path.join(self.opts['pki_dir'], self.acc))
         return {'minions': mlist, 'missing': []}
 
     def check_minions(self,
@@ -2928,6 +2928,14 @@ class SaltSSHOptionParser(six.with_metaclass(OptionParserMeta,
                  'time to manage connections, the more running processes the '
                  'faster communication should be. Default: %default.'
         )
+        self.add_option(
+            '--multiplex',
+            dest='ssh_multiplex',
+            default=False,
+            action='store_true',
+            help='Open a single master connection to every target and run '
+                 'all the ssh and scp commands of the run over it.'
+        )
         self.add_option(
             '--extra-filerefs',
             dest='extra_filerefs',
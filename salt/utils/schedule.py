@@ -22,6 +22,7 @@ import itertools
 import threading
 import logging
 import errno
+import heapq
 import random
 import weakref
 
@@ -68,6 +69,12 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The keys of the schedule which are settings for all of the jobs
+SCHEDULE_SETTINGS = ('enabled',
+                     'skip_function',
+                     'skip_during_range',
+                     'splay')
+
 
 class Schedule(object):
     '''
@@ -137,6 +144,11 @@ class Schedule(object):
         self.schedule_returner = self.option('schedule_returner')
         # Keep track of the lowest loop interval needed in this variable
         self.loop_interval = six.MAXSIZE
+        # The next fire times of the jobs, see _due_jobs
+        self.queue = self.opts.get('schedule_queue', False)
+        self._queue = []
+        self._queued = {}
+        self._queue_context = None
         if not self.standalone:
             clean_proc_dir(opts)
         if cleanup:
@@ -291,6 +303,7 @@ class Schedule(object):
         self.enabled = True
         self.splay = None
         self.opts['schedule'] = {}
+        self._unqueue()
 
     def delete_job_prefix(self, name, persist=True):
         '''
@@ -367,6 +380,7 @@ class Schedule(object):
         # ensure job exists, then enable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = True
+            self._unqueue(name)
             log.info('Enabling job %s in scheduler', name)
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -387,6 +401,7 @@ class Schedule(object):
         # ensure job exists, then disable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = False
+            self._unqueue(name)
             log.info('Disabling job %s in scheduler', name)
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -531,6 +546,7 @@ class Schedule(object):
                 self.opts['schedule'][name]['run_explicit'] = []
             self.opts['schedule'][name]['run_explicit'].append({'time': new_time,
                                                                 'time_fmt': time_fmt})
+            self._unqueue(name)
 
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -555,6 +571,7 @@ class Schedule(object):
                 self.opts['schedule'][name]['skip_explicit'] = []
             self.opts['schedule'][name]['skip_explicit'].append({'time': time,
                                                                  'time_fmt': time_fmt})
+            self._unqueue(name)
 
         elif name in self._get_schedule(include_opts=False):
             log.warning("Cannot modify job %s, it's in the pillar!", name)
@@ -812,6 +829,80 @@ class Schedule(object):
                         # Let's make sure we exit the process!
                         sys.exit(salt.defaults.exitcodes.EX_GENERIC)
 
+    def _unqueue(self, name=None):
+        '''
+        Have the next eval evaluate the named job, or all of the jobs, whatever
+        their next fire time
+        '''
+        if name is None:
+            self._queue = []
+            self._queued = {}
+        else:
+            self._queued.pop(name, None)
+
+    def _due_jobs(self, schedule, now):
+        '''
+        Return the names of the jobs to evaluate at now: the jobs whose next
+        fire time has come and the jobs not in the queue. A job is not in the
+        queue when it is new, when it was replaced or modified, or when its
+        next fire time is not known in advance.
+        '''
+        context = (self.opts.get('pillar'),
+                   self.opts.get('grains'),
+                   [schedule.get(item) for item in SCHEDULE_SETTINGS])
+        # The whens and the settings for all of the jobs may have changed
+        if self._queue_context is None or \
+                context[0] is not self._queue_context[0] or \
+                context[1] is not self._queue_context[1] or \
+                context[2] != self._queue_context[2]:
+            self._unqueue()
+            self._queue_context = context
+
+        while self._queue and self._queue[0][0] <= now:
+            fire_time, name = heapq.heappop(self._queue)
+            if self._queued.get(name, (None,))[0] == fire_time:
+                del self._queued[name]
+
+        due = set()
+        for job, data in six.iteritems(schedule):
+            if job in SCHEDULE_SETTINGS:
+                continue
+            queued = self._queued.get(job)
+            if queued is None or queued[1] is not data:
+                self._queued.pop(job, None)
+                due.add(job)
+        return due
+
+    def _queue_jobs(self, schedule, jobs, now):
+        '''
+        Put the evaluated jobs in the queue by their next fire time. A job
+        which has to be evaluated at the next eval again is left out.
+        '''
+        for job in jobs:
+            data = schedule[job]
+            if not isinstance(data, dict) or \
+                    data.get('_error') or \
+                    data.get('_run_on_start') or \
+                    'run_explicit' in data:
+                continue
+            fire_times = [data[item] for item in ('_next_fire_time', '_splay')
+                          if isinstance(data.get(item), datetime.datetime)]
+            if not fire_times or min(fire_times) <= now:
+                continue
+            self._queued[job] = (min(fire_times), data)
+            heapq.heappush(self._queue, (min(fire_times), job))
+
+    def time_to_next_fire(self, now=None):
+        '''
+        Return the seconds until the earliest next fire time in the queue, or
+        None when there is no queue or it is empty
+        '''
+        if not self.queue or not self._queue:
+            return None
+        if now is None:
+            now = datetime.datetime.now()
+        return max(0, (self._queue[0][0] - now).total_seconds())
+
     def eval(self, now=None):
         '''
         Evaluate and execute the schedule
@@ -1309,14 +1400,19 @@ class Schedule(object):
         if 'splay' in schedule:
             self.splay = schedule['splay']
 
-        _hidden = ['enabled',
-                   'skip_function',
-                   'skip_during_range',
-                   'splay']
+        if self.queue:
+            if not now:
+                now = datetime.datetime.now()
+            due = self._due_jobs(schedule, now)
+
         for job, data in six.iteritems(schedule):
 
             # Skip anything that is a global setting
-            if job in _hidden:
+            if job in SCHEDULE_SETTINGS:
+                continue
+
+            # Skip the jobs waiting in the queue for their next fire time
+            if self.queue and job not in due:
                 continue
 
             # Clear these out between runs
@@ -1587,9 +1683,14 @@ class Schedule(object):
                 if run:
                     data['_last_run'] = now
                     data['_splay'] = None
-                if '_seconds' in data:
+                # Only move the next fire time on once it has come or the
+                # job ran
+                if '_seconds' in data and (run or seconds <= 0):
                     data['_next_fire_time'] = now + datetime.timedelta(seconds=data['_seconds'])
 
+        if self.queue:
+            self._queue_jobs(schedule, due, now)
+
     def _run_job(self, func, data):
         job_dry_run = data.get('dry_run', False)
         if job_dry_run:
@@ -309,6 +309,10 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
 
     env_args = {'extensions': [], 'loader': loader}
 
+    template_cache = salt.utils.jinja.get_template_cache(opts)
+    if template_cache is not None:
+        env_args['bytecode_cache'] = template_cache
+
     if hasattr(jinja2.ext, 'with_'):
         env_args['extensions'].append('jinja2.ext.with_')
     if hasattr(jinja2.ext, 'do'):
@@ -384,7 +388,10 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
             decoded_context[key] = salt.utils.locales.sdecode(value)
 
     try:
-        template = jinja_env.from_string(tmplstr)
+        if template_cache is not None:
+            template = template_cache.from_string(jinja_env, tmplstr)
+        else:
+            template = jinja_env.from_string(tmplstr)
         template.globals.update(decoded_context)
         output = template.render(**decoded_context)
     except jinja2.exceptions.UndefinedError as exc:
@@ -6,13 +6,17 @@ Generate the salt thin tarball from the installed python files
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
 
+import io
 import os
+import re
 import sys
 import copy
+import hashlib
 import shutil
 import tarfile
 import zipfile
 import tempfile
+import threading
 import subprocess
 import salt.utils.stringutils
 import logging
@@ -80,6 +84,48 @@ import salt.version
 
 log = logging.getLogger(__name__)
 
+# Tarball member listing the files a thin delta removes
+THIN_DELTA = 'thin-delta'
+# Sent with every thin delta, as they are not part of the code checksum a
+# delta is built from. The code checksum goes last, so that a target which
+# did not get all of the delta asks for it again.
+THIN_DELTA_ALWAYS = ('version', '.thin-gen-py-version', 'salt-call',
+                     'supported-versions', 'code-checksum')
+# How many manifests of past thin tarballs are kept to build deltas from
+THIN_MANIFESTS = 10
+
+# (path, form, mtime, size) -> checksum of the thin tarball
+_THIN_SUMS = {}
+
+# The locks around building the deltas and manifests, by path, so that the
+# threads of a process deploying to several targets build each only once
+_BUILD_LOCKS = {}
+_BUILD_LOCK = threading.Lock()
+
+
+def _build_lock(path):
+    '''
+    Return the lock around building the file at path
+    '''
+    with _BUILD_LOCK:
+        lock = _BUILD_LOCKS.get(path)
+        if lock is None:
+            lock = _BUILD_LOCKS[path] = threading.Lock()
+    return lock
+
+
+def _tmp_path(path):
+    '''
+    Return the path of a new temporary file next to path, to be renamed to it
+    once written
+    '''
+    fd_, tmp_path = tempfile.mkstemp(
+        prefix='.{0}.'.format(os.path.basename(path)),
+        suffix='.tmp',
+        dir=os.path.dirname(path))
+    os.close(fd_)
+    return tmp_path
+
 
 def _get_salt_call(*dirs, **namespaces):
     '''
@@ -551,7 +597,164 @@ def thin_sum(cachedir, form='sha1'):
     else:
         code_checksum = "'0'"
 
-    return code_checksum, salt.utils.hashutils.get_hash(thintar, form)
+    try:
+        stat = os.stat(thintar)
+    except OSError:
+        return code_checksum, salt.utils.hashutils.get_hash(thintar, form)
+    key = (thintar, form, stat.st_mtime, stat.st_size)
+    if key not in _THIN_SUMS:
+        _THIN_SUMS.clear()
+        _THIN_SUMS[key] = salt.utils.hashutils.get_hash(thintar, form)
+    return code_checksum, _THIN_SUMS[key]
+
+
+def tar_manifest(tarpath):
+    '''
+    Return the sha1 of the content of every file in a tarball, by name
+    '''
+    manifest = {}
+    tfp = tarfile.open(tarpath, 'r:*')
+    try:
+        for member in tfp:
+            if not member.isfile():
+                continue
+            hash_obj = hashlib.sha1()
+            fp_ = tfp.extractfile(member)
+            for chunk in iter(lambda: fp_.read(65536), b''):
+                hash_obj.update(chunk)
+            manifest[member.name] = hash_obj.hexdigest()
+    finally:
+        tfp.close()
+    return manifest
+
+
+def gen_delta(tarpath, old_manifest, delta_path, delta_name, always=()):
+    '''
+    Write to delta_path, unless it exists, a tarball with the files of the
+    tarball at tarpath which are not in old_manifest with the same content,
+    along with the ones listed in always, in that order. The names of the
+    files of old_manifest which are no longer there are listed as JSON in the
+    delta_name member.
+    '''
+    delta_dir = os.path.dirname(delta_path)
+    if not os.path.isdir(delta_dir):
+        os.makedirs(delta_dir)
+    with _build_lock(delta_path):
+        if os.path.isfile(delta_path):
+            # Built by another thread meanwhile
+            return delta_path
+        tmp_path = _tmp_path(delta_path)
+        try:
+            names = set()
+            src = tarfile.open(tarpath, 'r:*')
+            dst = tarfile.open(tmp_path, 'w:gz')
+            try:
+                deferred = []
+                for member in src:
+                    if not member.isfile():
+                        continue
+                    data = src.extractfile(member).read()
+                    names.add(member.name)
+                    if member.name in always:
+                        deferred.append((member, data))
+                    elif old_manifest.get(member.name) != hashlib.sha1(data).hexdigest():
+                        dst.addfile(member, io.BytesIO(data))
+                for member, data in sorted(deferred, key=lambda item: always.index(item[0].name)):
+                    dst.addfile(member, io.BytesIO(data))
+                gone = salt.utils.stringutils.to_bytes(
+                    salt.utils.json.dumps(sorted(set(old_manifest) - names)))
+                info = tarfile.TarInfo(delta_name)
+                info.size = len(gone)
+                dst.addfile(info, io.BytesIO(gone))
+            finally:
+                src.close()
+                dst.close()
+            os.rename(tmp_path, delta_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return delta_path
+
+
+def _valid_digest(digest):
+    return bool(digest) and re.match(r'^[0-9a-f]+$', digest) is not None
+
+
+def thin_manifest(cachedir):
+    '''
+    Record the manifest of the current thin tarball under its code checksum,
+    so that deltas from it can be built once the thin changes, and return that
+    code checksum
+    '''
+    thindir = os.path.join(cachedir, 'thin')
+    thintar = os.path.join(thindir, 'thin.tgz')
+    code_checksum_path = os.path.join(thindir, 'code-checksum')
+    if not os.path.isfile(thintar) or not os.path.isfile(code_checksum_path):
+        return None
+    with salt.utils.files.fopen(code_checksum_path, 'r') as fh_:
+        code_checksum = fh_.read().strip()
+    if not _valid_digest(code_checksum):
+        return None
+    manifest_dir = os.path.join(thindir, 'manifests')
+    manifest_path = os.path.join(manifest_dir, '{0}.json'.format(code_checksum))
+    if os.path.isfile(manifest_path):
+        return code_checksum
+    if not os.path.isdir(manifest_dir):
+        os.makedirs(manifest_dir)
+    with _build_lock(manifest_path):
+        if os.path.isfile(manifest_path):
+            # Recorded by another thread meanwhile
+            return code_checksum
+        tmp_path = _tmp_path(manifest_path)
+        try:
+            with salt.utils.files.fopen(tmp_path, 'w') as fp_:
+                salt.utils.json.dump(tar_manifest(thintar), fp_)
+            os.rename(tmp_path, manifest_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    manifests = sorted(
+        (os.path.join(manifest_dir, name) for name in os.listdir(manifest_dir)
+         if name.endswith('.json')),
+        key=os.path.getmtime)
+    for path in manifests[:-THIN_MANIFESTS]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return code_checksum
+
+
+def gen_thin_delta(cachedir, code_checksum):
+    '''
+    Return the path of a tarball which brings a thin with the given code
+    checksum up to the current thin tarball, or None if that thin is unknown
+    '''
+    if not _valid_digest(code_checksum):
+        return None
+    current = thin_manifest(cachedir)
+    if current is None or current == code_checksum:
+        return None
+    thindir = os.path.join(cachedir, 'thin')
+    manifest_path = os.path.join(thindir, 'manifests', '{0}.json'.format(code_checksum))
+    if not os.path.isfile(manifest_path):
+        return None
+    delta_dir = os.path.join(thindir, 'delta')
+    delta_path = os.path.join(delta_dir, '{0}-{1}.tgz'.format(code_checksum, current))
+    if os.path.isfile(delta_path):
+        return delta_path
+    with salt.utils.files.fopen(manifest_path, 'r') as fh_:
+        old_manifest = salt.utils.json.load(fh_)
+    if os.path.isdir(delta_dir):
+        # Deltas to older thin tarballs are of no use anymore
+        for name in os.listdir(delta_dir):
+            if name.endswith('.tgz') and not name.endswith('-{0}.tgz'.format(current)):
+                try:
+                    os.remove(os.path.join(delta_dir, name))
+                except OSError:
+                    pass
+    return gen_delta(os.path.join(thindir, 'thin.tgz'), old_manifest, delta_path,
+                     THIN_DELTA, always=THIN_DELTA_ALWAYS)
 
 
 def gen_min(cachedir, extra_mods='', overwrite=False, so_mods='',
@@ -10,14 +10,21 @@ import warnings
 
 import yaml  # pylint: disable=blacklisted-import
 from yaml.nodes import MappingNode, SequenceNode
-from yaml.constructor import ConstructorError
+from yaml.constructor import ConstructorError, SafeConstructor
+from yaml.resolver import Resolver
 try:
     yaml.Loader = yaml.CLoader
     yaml.Dumper = yaml.CDumper
 except Exception:
     pass
+try:
+    from yaml.cyaml import CParser
+    HAS_LIBYAML = True
+except ImportError:
+    HAS_LIBYAML = False
 
 import salt.utils.stringutils
+from salt.ext import six
 
 __all__ = ['SaltYamlSafeLoader', 'load', 'safe_load']
 
@@ -39,6 +46,9 @@ class SaltYamlSafeLoader(yaml.SafeLoader):
     '''
     def __init__(self, stream, dictclass=dict):
         super(SaltYamlSafeLoader, self).__init__(stream)
+        self._add_salt_constructors(dictclass)
+
+    def _add_salt_constructors(self, dictclass):
         if dictclass is not dict:
             # then assume ordered dict and use it for both !map and !omap
             self.add_constructor(
@@ -210,11 +220,53 @@ class SaltYamlSafeLoader(yaml.SafeLoader):
             node.value = mergeable_items + node.value
 
 
-def load(stream, Loader=SaltYamlSafeLoader):
+if HAS_LIBYAML:
+    class SaltYamlSafeCLoader(CParser, SaltYamlSafeLoader):
+        '''
+        The SaltYamlSafeLoader, with the YAML scanned and parsed by libyaml.
+
+        Only the scanner and parser are replaced, the documents are still
+        built by the SaltYamlSafeLoader constructors. Since the scanner of the
+        SaltYamlSafeLoader also accepts some unicode literal strings which
+        libyaml does not, and reports errors in more detail, YAML which fails
+        to load with libyaml is loaded again with the SaltYamlSafeLoader.
+        '''
+        def __init__(self, stream, dictclass=dict):
+            if not isinstance(stream, (six.text_type, six.binary_type)):
+                # Keep the document to load it again if libyaml fails. Like
+                # with the SaltYamlSafeLoader, anything else than a string
+                # must be a stream.
+                stream = stream.read()
+            self.stream_data = stream
+            CParser.__init__(self, stream)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+            self._add_salt_constructors(dictclass)
+
+        def get_single_data(self):
+            try:
+                return super(SaltYamlSafeCLoader, self).get_single_data()
+            except yaml.YAMLError:
+                loader = SaltYamlSafeLoader(self.stream_data, dictclass=self.dictclass)
+                try:
+                    return loader.get_single_data()
+                finally:
+                    loader.dispose()
+
+    __all__.append('SaltYamlSafeCLoader')
+
+    # The loader used to load SLS and pillar files, and by default by load and
+    # safe_load
+    FastSaltYamlSafeLoader = SaltYamlSafeCLoader
+else:
+    FastSaltYamlSafeLoader = SaltYamlSafeLoader
+
+
+def load(stream, Loader=FastSaltYamlSafeLoader):
     return yaml.load(stream, Loader=Loader)
 
 
-def safe_load(stream, Loader=SaltYamlSafeLoader):
+def safe_load(stream, Loader=FastSaltYamlSafeLoader):
     '''
     .. versionadded:: 2018.3.0
 
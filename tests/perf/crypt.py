@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+'''
+Micro-benchmark the symmetric crypt layer used for every AES request and
+publish: Crypticle.encrypt, decrypt, dumps and loads, across payload sizes.
+
+    python tests/perf/crypt.py 64 1024 65536 1048576
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import sys
+import timeit
+
+# Import salt libs
+import salt.crypt
+
+# Aim for roughly this much data per measurement
+TOTAL = 64 * 1024 * 1024
+
+
+def bench(func, size):
+    number = max(TOTAL // max(size, 1024), 5)
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    return best / number
+
+
+def main(sizes):
+    crypticle = salt.crypt.Crypticle(
+        {'serial': 'msgpack'}, salt.crypt.Crypticle.generate_key_string())
+    print('backend: {0}'.format('M2Crypto' if salt.crypt.HAS_M2 else salt.crypt.AES.__name__))
+    print('{0:>9} {1:>12} {2:>12} {3:>12} {4:>12} {5:>10} {6:>10}'.format(
+        'size', 'encrypt', 'decrypt', 'dumps', 'loads', 'enc MB/s', 'dec MB/s'))
+    for size in sizes:
+        data = os.urandom(size)
+        payload = {'load': data, 'enc': 'aes'}
+        encrypted = crypticle.encrypt(data)
+        dumped = crypticle.dumps(payload)
+        assert crypticle.decrypt(encrypted) == data
+        assert crypticle.loads(dumped) == payload
+        enc = bench(lambda: crypticle.encrypt(data), size)
+        dec = bench(lambda: crypticle.decrypt(encrypted), size)
+        dumps = bench(lambda: crypticle.dumps(payload), size)
+        loads = bench(lambda: crypticle.loads(dumped), size)
+        print('{0:>9} {1:>10.2f}us {2:>10.2f}us {3:>10.2f}us {4:>10.2f}us '
+              '{5:>10.1f} {6:>10.1f}'.format(
+                  size, enc * 1e6, dec * 1e6, dumps * 1e6, loads * 1e6,
+                  size / enc / 1e6, size / dec / 1e6))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [64, 1024, 16384, 262144, 4194304])
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+'''
+Measure the cost of fanning master events out to a growing number of
+listeners on the event bus.
+
+Each listener only cares about the returns of its own job, which is what a
+LocalClient waiting on a job does, while the bus carries the returns of every
+other job too. The listeners are run with and without a publisher side tag
+filter; the table shows how many events every listener had to receive and
+unpack, and the CPU time all listeners spent doing so.
+
+    python tests/perf/event_fanout.py 1 10 50
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.utils.event
+import salt.utils.process
+
+EVENTS = 5000
+# One in every JOBS events belongs to a given listener's job
+JOBS = 50
+
+
+def listen(sock_dir, job, use_filter, ready, results):
+    '''
+    Read events until the stop event, reporting the count and CPU time used
+    '''
+    event = salt.utils.event.MasterEvent(sock_dir, listen=True)
+    if use_filter:
+        event.set_publish_filter(['salt/job/{0}/'.format(job), 'bench/'])
+    ready.put(True)
+    received = 0
+    start = time.process_time() if hasattr(time, 'process_time') else time.clock()
+    while True:
+        ret = event.get_event(wait=30, full=True)
+        if ret is None or ret['tag'] == 'bench/stop':
+            break
+        received += 1
+    end = time.process_time() if hasattr(time, 'process_time') else time.clock()
+    results.put((received, end - start))
+    event.destroy()
+
+
+def run(sock_dir, count, use_filter):
+    ready = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    procs = []
+    for num in range(count):
+        proc = multiprocessing.Process(
+            target=listen,
+            args=(sock_dir, num % JOBS, use_filter, ready, results))
+        proc.start()
+        procs.append(proc)
+    for _ in procs:
+        ready.get()
+    # Give the subscriptions time to reach the publisher
+    time.sleep(1)
+
+    sender = salt.utils.event.MasterEvent(sock_dir, listen=False)
+    payload = {'return': 'x' * 512, 'retcode': 0, 'success': True}
+    start = time.time()
+    for num in range(EVENTS):
+        sender.fire_event(
+            dict(payload, id='minion{0}'.format(num)),
+            'salt/job/{0}/ret/minion{1}'.format(num % JOBS, num))
+    sender.fire_event({}, 'bench/stop')
+    received = 0
+    cpu = 0.0
+    for _ in procs:
+        count_, cpu_ = results.get()
+        received += count_
+        cpu += cpu_
+    elapsed = time.time() - start
+    for proc in procs:
+        proc.join()
+    sender.destroy()
+    return received // len(procs), cpu, elapsed
+
+
+def main(sizes):
+    sock_dir = tempfile.mkdtemp()
+    publisher = salt.utils.event.EventPublisher({'sock_dir': sock_dir})
+    publisher.start()
+    time.sleep(2)
+    try:
+        print('{0:>10} {1:>8} {2:>16} {3:>14} {4:>10}'.format(
+            'listeners', 'filter', 'events/listener', 'listener cpu', 'wall'))
+        for size in sizes:
+            for use_filter in (False, True):
+                received, cpu, elapsed = run(sock_dir, size, use_filter)
+                print('{0:>10} {1:>8} {2:>16} {3:>13.3f}s {4:>9.3f}s'.format(
+                    size, 'yes' if use_filter else 'no', received, cpu, elapsed))
+    finally:
+        salt.utils.process.clean_proc(publisher)
+        shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 50])
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long it takes to fetch a number of gitfs remotes with the remotes
+fetched one after the other and from a number of threads, and how long the
+slowest remote took. Without remote URLs the given number of local bare
+repositories is created and fetched. Needs GitPython or pygit2.
+
+    python tests/perf/gitfs_fetch.py 20 [-w 8] [url ...]
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.config
+import salt.utils.gitfs
+import salt.fileserver.gitfs
+
+
+def make_remotes(tmpdir, count):
+    remotes = []
+    for num in range(count):
+        path = os.path.join(tmpdir, 'repo{0}'.format(num))
+        subprocess.check_call(['git', 'init', '-q', path])
+        with open(os.path.join(path, 'top.sls'), 'w') as fp_:
+            fp_.write('base: {}\n')
+        subprocess.check_call(['git', '-C', path, 'add', 'top.sls'])
+        subprocess.check_call(['git', '-C', path, '-c', 'user.name=perf',
+                               '-c', 'user.email=perf@localhost',
+                               'commit', '-q', '-m', 'top'])
+        remotes.append('file://{0}'.format(path))
+    return remotes
+
+
+def run(remotes, workers):
+    cachedir = tempfile.mkdtemp()
+    opts = salt.config.master_config(None)
+    opts.update({'cachedir': cachedir, 'gitfs_remotes': remotes,
+                 'gitfs_fetch_workers': workers, '__role': 'master'})
+    try:
+        gitfs = salt.utils.gitfs.GitFS(
+            opts, remotes,
+            per_remote_overrides=salt.fileserver.gitfs.PER_REMOTE_OVERRIDES,
+            per_remote_only=salt.fileserver.gitfs.PER_REMOTE_ONLY)
+        start = time.time()
+        gitfs.fetch_remotes()
+        elapsed = time.time() - start
+        slowest = max(fetch['duration']
+                      for fetch in gitfs.fetch_durations().values())
+        return elapsed, slowest
+    finally:
+        shutil.rmtree(cachedir, ignore_errors=True)
+
+
+def main(count, workers, remotes):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        remotes = remotes or make_remotes(tmpdir, count)
+        print('{0:>8} {1:>12} {2:>12} {3:>12}'.format(
+            'remotes', 'one by one', 'workers', 'slowest'))
+        serial = run(remotes, 1)
+        threaded = run(remotes, workers)
+        print('{0:>8} {1:>11.3f}s {2:>11.3f}s {3:>11.3f}s'.format(
+            len(remotes), serial[0], threaded[0], threaded[1]))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    workers = 8
+    if '-w' in args:
+        index = args.index('-w')
+        workers = int(args[index + 1])
+        del args[index:index + 2]
+    count = int(args.pop(0)) if args and args[0].isdigit() else 20
+    main(count, workers, args)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long the minion takes to collect its grains, without the grain
+function cache and with the results of the core grains cached for an hour,
+and list the slowest grain functions.
+
+    python tests/perf/grains_function_cache.py 10
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.config
+import salt.loader
+
+
+def run(root, count, cache):
+    opts = salt.config.minion_config(None)
+    opts.pop('conf_file', None)
+    opts['cachedir'] = os.path.join(root, 'cache')
+    opts['extension_modules'] = os.path.join(root, 'extmods')
+    opts['grains_function_cache'] = cache
+    opts['grains_function_cache_ttls'] = {'core': 3600}
+    # Fill the cache
+    salt.loader.grains(opts)
+    start = time.time()
+    for _ in range(count):
+        salt.loader.grains(opts, force_refresh=True)
+    return time.time() - start, opts
+
+
+def main(sizes):
+    root = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(root, 'cache'))
+        print('{0:>8} {1:>12} {2:>12}'.format('refresh', 'no cache', 'cache'))
+        for size in sizes:
+            uncached, _ = run(root, size, False)
+            cached, opts = run(root, size, True)
+            print('{0:>8} {1:>11.3f}s {2:>11.3f}s'.format(size, uncached, cached))
+        opts['grains_function_cache_ttls'] = {}
+        salt.loader.grains(opts)
+        info = salt.loader.GrainFunctionCache(opts).info()
+        print('\nslowest grain functions:')
+        for key in sorted(info, key=lambda key: -info[key]['duration'])[:5]:
+            print('{0:>40} {1:>9.4f}s'.format(key, info[key]['duration']))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10])
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long the minion takes to collect its grains with the grain
+functions run one after the other and with them run concurrently.
+
+    python tests/perf/grains_workers.py 4 8 16
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.config
+import salt.loader
+
+RUNS = 5
+
+
+def run(root, workers):
+    opts = salt.config.minion_config(None)
+    opts.pop('conf_file', None)
+    opts['cachedir'] = os.path.join(root, 'cache')
+    opts['extension_modules'] = os.path.join(root, 'extmods')
+    opts['grains_workers'] = workers
+    salt.loader.grains(opts)
+    start = time.time()
+    for _ in range(RUNS):
+        salt.loader.grains(opts, force_refresh=True)
+    return (time.time() - start) / RUNS
+
+
+def main(sizes):
+    root = tempfile.mkdtemp()
+    try:
+        print('{0:>8} {1:>12}'.format('workers', 'grains'))
+        for size in [0] + sizes:
+            print('{0:>8} {1:>11.3f}s'.format(size, run(root, size)))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [4, 8, 16])
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long render_jinja_tmpl takes to render an SLS-like template,
+with and without the compiled template cache.
+
+    python tests/perf/jinja_render.py 10 100 250
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import sys
+import timeit
+
+# Import salt libs
+import salt.utils.jinja
+import salt.utils.templates
+
+RENDERS = 50
+
+STATE = '''
+{%- for num in range(count) %}
+package_{{ num }}:
+  pkg.installed:
+    - name: {{ prefix }}{{ num }}
+    {%- if num is even %}
+    - require:
+      - file: config_{{ num }}
+    {%- endif %}
+
+config_{{ num }}:
+  file.managed:
+    - name: /etc/{{ prefix }}{{ num }}.conf
+    - contents: {{ {'id': num, 'prefix': prefix}|json }}
+{%- endfor %}
+'''
+
+
+def make_template(states):
+    # Unroll the template, so that its size grows with the number of states
+    return ''.join(STATE.replace('range(count)', 'range({0}, {1})'.format(num, num + 1))
+                   for num in range(states))
+
+
+def bench(template, cache_size):
+    opts = {'jinja_cache_size': cache_size}
+    context = {'opts': opts, 'saltenv': None, 'prefix': 'pkg', 'sls': 'bench'}
+    salt.utils.jinja._TEMPLATE_CACHE = None
+    render = lambda: salt.utils.templates.render_jinja_tmpl(template, context)
+    return min(timeit.repeat(render, number=RENDERS, repeat=3)) / RENDERS
+
+
+def main(sizes):
+    print('{0:>8} {1:>12} {2:>12}'.format('states', 'uncached', 'cached'))
+    for size in sizes:
+        template = make_template(size)
+        print('{0:>8} {1:>10.2f}ms {2:>10.2f}ms'.format(
+            size, bench(template, 0) * 1e3, bench(template, 500) * 1e3))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 250])
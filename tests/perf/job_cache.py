@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+'''
+Compare the local_cache and sqlite_local_cache master job caches.
+
+A job with a growing number of minion returns is stored, read back, listed
+among a number of other jobs and then expired; the table shows the time
+each step took with either job cache.
+
+    python tests/perf/job_cache.py 1000 10000 50000
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.returners.local_cache
+import salt.returners.sqlite_local_cache
+import salt.utils.jid
+
+# Number of other jobs in the cache while listing
+JOBS = 500
+
+
+def timed(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def run(module, cachedir, returns):
+    module.__opts__ = {'cachedir': cachedir, 'keep_jobs': 24,
+                       'hash_type': 'sha256', 'serial': 'msgpack',
+                       'job_cache_store_endtime': False}
+    for num in range(JOBS):
+        jid = module.prep_jid(passed_jid='2018010100{0:010d}'.format(num))
+        module.save_load(jid, {'jid': jid, 'fun': 'test.ping', 'arg': [],
+                               'tgt': '', 'user': 'root'})
+
+    jid = module.prep_jid()
+    minions = ['minion{0}'.format(num) for num in range(returns)]
+
+    def store():
+        module.save_load(jid, {'jid': jid, 'fun': 'test.ping', 'arg': [],
+                               'tgt': '*', 'user': 'root'}, minions=minions)
+        for minion in minions:
+            module.returner({'jid': jid, 'id': minion, 'return': True,
+                             'retcode': 0, 'success': True})
+
+    def expire():
+        module.__opts__['keep_jobs'] = 1e-9
+        module.clean_old_jobs()
+
+    return (timed(store),
+            timed(module.get_jid, jid),
+            timed(module.get_jids),
+            timed(expire))
+
+
+def main(sizes):
+    print('{0:>20} {1:>8} {2:>10} {3:>10} {4:>10} {5:>10}'.format(
+        'job cache', 'returns', 'store', 'get_jid', 'get_jids', 'clean'))
+    for size in sizes:
+        for module in (salt.returners.local_cache,
+                       salt.returners.sqlite_local_cache):
+            cachedir = tempfile.mkdtemp()
+            try:
+                times = run(module, cachedir, size)
+            finally:
+                shutil.rmtree(cachedir, ignore_errors=True)
+            print('{0:>20} {1:>8} {2:>9.3f}s {3:>9.3f}s {4:>9.3f}s {5:>9.3f}s'.format(
+                module.__name__.rpartition('.')[2], size, *times))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long a master worker spends in storing job returns, with the
+returns stored synchronously and with them handed to the job cache writer
+process, and how long it takes for the writer to store them all.
+
+    python tests/perf/job_cache_writer.py 1000 10000 [local_cache|sqlite_local_cache]
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.config
+import salt.master
+import salt.minion
+import salt.utils.job
+
+JOBS = 10
+
+
+def make_opts(root, job_cache):
+    opts = salt.config.master_config(None)
+    opts['cachedir'] = os.path.join(root, 'cache')
+    opts['pki_dir'] = os.path.join(root, 'pki')
+    opts['sock_dir'] = os.path.join(root, 'sock')
+    opts['master_job_cache'] = job_cache
+    opts['job_cache_writer'] = True
+    return opts
+
+
+def loads(count):
+    jids = ['2018010100000000000{0}'.format(num) for num in range(JOBS)]
+    for num in range(count):
+        yield {'jid': jids[num % JOBS],
+               'id': 'minion{0}'.format(num),
+               'fun': 'test.ping',
+               'return': True}
+
+
+def count_returns(opts, mminion):
+    get_jid = mminion.returners['{0}.get_jid'.format(opts['master_job_cache'])]
+    jids = set(load['jid'] for load in loads(JOBS))
+    return sum(len(get_jid(jid)) for jid in jids)
+
+
+def run(count, job_cache, queued):
+    root = tempfile.mkdtemp()
+    try:
+        opts = make_opts(root, job_cache)
+        mminion = salt.minion.MasterMinion(opts, states=False, rend=False)
+        return_queue = writer = None
+        if queued:
+            return_queue = salt.utils.job.ReturnQueue(opts['job_cache_writer_queue'])
+            writer = salt.master.JobCacheWriter(opts, return_queue)
+            writer.start()
+        start = time.time()
+        for load in loads(count):
+            salt.utils.job.store_job(opts, load, mminion=mminion,
+                                     return_queue=return_queue)
+        worker = time.time() - start
+        if writer is not None:
+            # The writer stores what is left in the queue before exiting
+            os.kill(writer.pid, signal.SIGTERM)
+            writer.join()
+        stored = time.time() - start
+        assert count_returns(opts, mminion) == count
+        return worker, stored
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(sizes, job_cache):
+    print('{0:>8} {1:>8} {2:>12} {3:>12}'.format(
+        'returns', 'writer', 'worker', 'stored'))
+    for size in sizes:
+        for queued in (False, True):
+            worker, stored = run(size, job_cache, queued)
+            print('{0:>8} {1:>8} {2:>11.3f}s {3:>11.3f}s'.format(
+                size, 'yes' if queued else 'no', worker, stored))
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    job_cache = 'local_cache'
+    if args and not args[-1].isdigit():
+        job_cache = args.pop()
+    main([int(arg) for arg in args] or [1000, 10000], job_cache)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long it takes to run a number of trivial jobs one after the
+other, with a new process started for every job and with the JobWorkerPool
+of the minion. Only the cost of getting the job into a process is measured,
+the jobs do not run any minion function.
+
+    python tests/perf/job_worker_pool.py 100 1000
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import signal
+import sys
+import time
+
+# Import salt libs
+import salt.minion
+from salt.utils.process import default_signals, SignalHandlingMultiprocessingProcess
+
+
+def job(data):
+    return data['jid']
+
+
+def worker(conn):
+    while True:
+        data = conn.recv()
+        if data is None:
+            break
+        conn.send(job(data))
+
+
+def run_forked(count):
+    start = time.time()
+    for num in range(count):
+        with default_signals(signal.SIGINT, signal.SIGTERM):
+            process = SignalHandlingMultiprocessingProcess(
+                target=job, args=({'jid': num},))
+            process.start()
+        process.join()
+    return time.time() - start
+
+
+def run_pool(count, size):
+    pool = salt.minion.JobWorkerPool(size, 0, worker, ())
+    try:
+        start = time.time()
+        for num in range(count):
+            while not pool.submit({'jid': num}):
+                time.sleep(0.0001)
+        # Wait for the last jobs
+        while any(worker.jid is not None for worker in pool.workers):
+            pool.collect()
+            time.sleep(0.0001)
+        return time.time() - start
+    finally:
+        pool.stop()
+
+
+def main(sizes):
+    print('{0:>8} {1:>12} {2:>12} {3:>12}'.format(
+        'jobs', 'forked', 'pool of 1', 'pool of 4'))
+    for size in sizes:
+        print('{0:>8} {1:>11.3f}s {2:>11.3f}s {3:>11.3f}s'.format(
+            size, run_forked(size), run_pool(size, 1), run_pool(size, 4)))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000])
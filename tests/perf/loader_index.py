@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long it takes to create the execution module loader of a minion
+and to look up functions of virtual modules in it, with and without the
+loader index.
+
+    python tests/perf/loader_index.py 10 50
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.config
+import salt.loader
+
+FUNCTIONS = ('test.ping', 'pkg.version', 'service.status')
+
+
+def run(root, count, index):
+    opts = salt.config.minion_config(None)
+    opts['cachedir'] = os.path.join(root, 'cache')
+    opts['extension_modules'] = os.path.join(root, 'extmods')
+    opts['file_client'] = 'local'
+    opts['loader_index'] = index
+    opts['grains'] = salt.loader.grains(opts)
+    # Fill the index
+    mods = salt.loader.minion_mods(opts)
+    for fun in FUNCTIONS:
+        assert callable(mods[fun])
+    salt.loader._LOADER_INDEXES.clear()
+    create = lookup = 0
+    for _ in range(count):
+        start = time.time()
+        mods = salt.loader.minion_mods(opts)
+        create += time.time() - start
+        start = time.time()
+        for fun in FUNCTIONS:
+            assert callable(mods[fun])
+        lookup += time.time() - start
+    return create, lookup
+
+
+def main(sizes):
+    print('{0:>8} {1:>8} {2:>12} {3:>12}'.format(
+        'loaders', 'index', 'create', 'lookup'))
+    for size in sizes:
+        root = tempfile.mkdtemp()
+        try:
+            for index in (False, True):
+                create, lookup = run(root, size, index)
+                print('{0:>8} {1:>8} {2:>11.3f}s {3:>11.3f}s'.format(
+                    size, 'yes' if index else 'no', create, lookup))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50])
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long the scheduler takes to evaluate a number of jobs every
+second for ten minutes of simulated time, evaluating every job at every tick
+and with the queue of next fire times. The jobs run every one to thirty
+minutes and do not run any function.
+
+    python tests/perf/schedule_eval.py 100 1000
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import datetime
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.config
+import salt.utils.schedule
+
+TICKS = 600
+
+
+def run(count, queue):
+    tmpdir = tempfile.mkdtemp()
+    opts = salt.config.minion_config(None)
+    opts.update({'conf_dir': tmpdir, 'root_dir': tmpdir, 'sock_dir': tmpdir,
+                 'pki_dir': tmpdir, 'cachedir': tmpdir, 'pillar': {},
+                 'schedule_queue': queue,
+                 'schedule': dict(
+                     ('job{0}'.format(num),
+                      {'function': 'test.true', 'minutes': 1 + num % 30})
+                     for num in range(count))})
+    runs = []
+    try:
+        schedule = salt.utils.schedule.Schedule(opts, {}, returners={},
+                                                standalone=True,
+                                                new_instance=True)
+        schedule._run_job = lambda func, data: runs.append(data['name'])
+        now = datetime.datetime(2018, 1, 1)
+        start = time.time()
+        for tick in range(TICKS):
+            schedule.eval(now=now + datetime.timedelta(seconds=tick))
+        return time.time() - start, len(runs)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(sizes):
+    print('{0:>8} {1:>8} {2:>12} {3:>12}'.format(
+        'jobs', 'runs', 'every job', 'queue'))
+    for size in sizes:
+        every, runs = run(size, False)
+        queue, queue_runs = run(size, True)
+        assert runs == queue_runs
+        print('{0:>8} {1:>8} {2:>11.3f}s {3:>11.3f}s'.format(
+            size, runs, every, queue))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000])
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long the master takes to compile the pillar of a number of
+minions which all match the same grain independent pillar SLS files, with
+and without the shared render cache.
+
+    python tests/perf/shared_render.py 10 100
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.config
+import salt.pillar
+import salt.utils.files
+
+FILES = 10
+
+SLS = '''{{% set ports = [80, 443, 8080, 8443] %}}
+app{num}:
+{{% for i in range(50) %}}
+  service{{{{ i }}}}:
+    name: svc{num}-{{{{ i }}}}
+    ports: {{{{ ports | json }}}}
+    enabled: {{{{ i % 2 == 0 }}}}
+{{% endfor %}}
+'''
+
+
+def make_roots(root):
+    pillar_root = os.path.join(root, 'pillar')
+    os.makedirs(pillar_root)
+    with salt.utils.files.fopen(os.path.join(pillar_root, 'top.sls'), 'w') as fp_:
+        fp_.write('base:\n  \'*\':\n')
+        for num in range(FILES):
+            fp_.write('    - app{0}\n'.format(num))
+    for num in range(FILES):
+        with salt.utils.files.fopen(os.path.join(pillar_root, 'app{0}.sls'.format(num)), 'w') as fp_:
+            fp_.write(SLS.format(num=num))
+    return pillar_root
+
+
+def run(root, count, shared):
+    opts = salt.config.master_config(None)
+    opts['cachedir'] = os.path.join(root, 'cache')
+    opts['pki_dir'] = os.path.join(root, 'pki')
+    opts['pillar_roots'] = {'base': [os.path.join(root, 'pillar')]}
+    opts['file_client'] = 'local'
+    opts['shared_render_cache'] = shared
+    elapsed = 0
+    for num in range(count):
+        minion_id = 'minion{0}'.format(num)
+        pillar = salt.pillar.Pillar(opts, {'id': minion_id}, minion_id, 'base')
+        start = time.time()
+        ret = pillar.compile_pillar()
+        elapsed += time.time() - start
+        assert len(ret) == FILES, ret
+    return elapsed
+
+
+def main(sizes):
+    print('{0:>8} {1:>12} {2:>12}'.format('minions', 'unshared', 'shared'))
+    for size in sizes:
+        root = tempfile.mkdtemp()
+        try:
+            make_roots(root)
+            print('{0:>8} {1:>11.3f}s {2:>11.3f}s'.format(
+                size, run(root, size, False), run(root, size, True)))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100])
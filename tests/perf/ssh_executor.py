@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long salt-ssh takes to get through a number of targets, and how
+much CPU the master process spends waiting for them, with a process per
+target and with a few worker processes running the targets from threads. The
+targets run a local `sleep` through the salt-ssh shell in place of ssh.
+
+    python tests/perf/ssh_executor.py 100 1000
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import resource
+import sys
+import time
+
+# Import salt libs
+import salt.client.ssh
+import salt.client.ssh.shell
+
+SLEEP = 0.5
+WORKERS = 4
+MAX_PROCS = 200
+
+
+def routine(que, opts, host, target, mine=False):
+    shell = salt.client.ssh.shell.Shell(opts, host)
+    stdout, stderr, retcode = shell._run_cmd('sleep {0}'.format(SLEEP))
+    que.put({'id': host, 'ret': retcode})
+
+
+def run(count, workers):
+    client = salt.client.ssh.SSH.__new__(salt.client.ssh.SSH)
+    client.opts = {'ssh_max_procs': MAX_PROCS, 'ssh_workers': workers,
+                   'raw_shell': True, 'argv': ['true'], '_ssh_version': (7,)}
+    client.targets = dict(('host{0}'.format(num), {}) for num in range(count))
+    client.defaults = {}
+    client.handle_routine = routine
+    start = time.time()
+    cpu = resource.getrusage(resource.RUSAGE_SELF)
+    rets = list(client.handle_ssh())
+    end = resource.getrusage(resource.RUSAGE_SELF)
+    assert len(rets) == count
+    return (time.time() - start,
+            end.ru_utime - cpu.ru_utime + end.ru_stime - cpu.ru_stime)
+
+
+def main(sizes):
+    print('{0:>8} {1:>14} {2:>14} {3:>14} {4:>14}'.format(
+        'targets', 'processes', 'master cpu', 'workers', 'master cpu'))
+    for size in sizes:
+        procs = run(size, 0)
+        workers = run(size, WORKERS)
+        print('{0:>8} {1:>13.3f}s {2:>13.3f}s {3:>13.3f}s {4:>13.3f}s'.format(
+            size, procs[0], procs[1], workers[0], workers[1]))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000])
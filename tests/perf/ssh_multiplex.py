@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long it takes to run a number of trivial commands over ssh
+against each of the given hosts, with a new connection for every command and
+with the commands sharing a multiplexed master connection. The hosts have to
+accept the key in ~/.ssh/id_rsa.
+
+    python tests/perf/ssh_multiplex.py [user@]host[:port] ... [-n 20]
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import sys
+import tempfile
+
+# Import salt libs
+import salt.client.ssh
+import salt.client.ssh.shell
+
+
+def run(host, count, multiplex):
+    user, _, host = host.rpartition('@')
+    host, _, port = host.partition(':')
+    cachedir = tempfile.mkdtemp(dir='/tmp')
+    opts = {'cachedir': cachedir,
+            '_ssh_version': salt.client.ssh.ssh_version(),
+            'ssh_multiplex': multiplex}
+    shell = salt.client.ssh.shell.Shell(
+        opts, host, user=user or None, port=port or None, timeout=60,
+        priv=os.path.expanduser('~/.ssh/id_rsa'))
+    try:
+        for _ in range(count):
+            stdout, stderr, retcode = shell.exec_cmd('true')
+            assert retcode == 0, stderr
+        return shell.connection_stats()
+    finally:
+        shell.close_master()
+        shutil.rmtree(cachedir, ignore_errors=True)
+
+
+def main(hosts, count):
+    print('{0:>24} {1:>8} {2:>12} {3:>12} {4:>8} {5:>12}'.format(
+        'host', 'commands', 'new conns', 'multiplexed', 'reused', 'est. saved'))
+    for host in hosts:
+        plain = run(host, count, False)
+        mux = run(host, count, True)
+        print('{0:>24} {1:>8} {2:>11.3f}s {3:>11.3f}s {4:>8} {5:>11.3f}s'.format(
+            host, count, plain['time'], mux['time'], mux['reused'], mux['saved']))
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    count = 20
+    if '-n' in args:
+        index = args.index('-n')
+        count = int(args[index + 1])
+        del args[index:index + 2]
+    main(args or ['localhost'], count)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+'''
+Measure the cost of requisite resolution in ``State.check_requisite`` on
+synthetic highstates.
+
+Every generated chunk requires the chunk before it by ID, requires a package
+by name and requires the whole SLS file of another chunk, which is how large
+highstates tend to be wired together. The indexed lookup is compared with the
+old linear walk of the chunk list, the latter being timed on a sample of
+chunks and extrapolated so that the 50k run does not take hours.
+
+    python tests/perf/state_requisites.py 1000 10000 50000
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import sys
+import time
+
+# Import salt libs
+import salt.state
+
+
+def make_chunks(count):
+    '''
+    Generate ``count`` low chunks spread across SLS files of 50 states each
+    '''
+    chunks = []
+    for num in range(count):
+        chunk = {'state': 'file' if num % 2 else 'pkg',
+                 'fun': 'managed' if num % 2 else 'installed',
+                 '__id__': 'state_{0}'.format(num),
+                 'name': 'name_{0}'.format(num),
+                 '__sls__': 'sls_{0}'.format(num // 50),
+                 '__env__': 'base',
+                 'order': num}
+        if num:
+            chunk['require'] = [{'id': 'state_{0}'.format(num - 1)},
+                                {'pkg': 'name_{0}'.format(num - num % 2)},
+                                {'sls': 'sls_{0}'.format(num // 100)}]
+        chunks.append(chunk)
+    return chunks
+
+
+def make_state(chunks):
+    '''
+    Build a bare State with every chunk already in the running dict
+    '''
+    state = salt.state.State.__new__(salt.state.State)
+    state.opts = {}
+    state.states = {}
+    state.pre = {}
+    state.jid = None
+    state._State__chunk_index = None
+    state._State__parallel_started = False
+    running = {}
+    for chunk in chunks:
+        running[salt.state._gen_tag(chunk)] = {'result': True, 'changes': {}}
+    return state, running
+
+
+def run(state, running, chunks, sample):
+    start = time.time()
+    for chunk in sample:
+        status, _ = state.check_requisite(chunk, running, chunks)
+        assert status == 'met', status
+    return time.time() - start
+
+
+def main(sizes):
+    print('{0:>8} {1:>12} {2:>14} {3:>14}'.format(
+        'chunks', 'index build', 'indexed', 'linear (est)'))
+    for size in sizes:
+        chunks = make_chunks(size)
+        state, running = make_state(chunks)
+
+        start = time.time()
+        index = state._get_chunk_index(chunks)
+        build = time.time() - start
+        indexed = run(state, running, chunks, chunks)
+
+        # Force the linear scan on a sample of chunks
+        index.indexed = False
+        step = max(1, size // 200)
+        sample = chunks[::step]
+        linear = run(state, running, chunks, sample) * len(chunks) / len(sample)
+
+        print('{0:>8} {1:>11.3f}s {2:>13.3f}s {3:>13.3f}s'.format(
+            size, build, indexed, linear))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
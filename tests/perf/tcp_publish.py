@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long the TCP transport publisher blocks its io_loop while
+broadcasting a publish, against the number of connected subscribers.
+
+Subscribers are local socket pairs, so the numbers cover the publisher side
+of the fan-out only: framing the payload and queueing it on every stream.
+
+    python tests/perf/tcp_publish.py 1000 2500 5000
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import resource
+import socket
+import sys
+
+# Import third party libs
+import tornado.ioloop
+import tornado.iostream
+
+# Import salt libs
+import salt.transport.tcp
+
+PUBLISHES = 20
+
+
+def make_server(io_loop, count):
+    '''
+    Build a bare PubServer with ``count`` connected subscribers
+    '''
+    server = salt.transport.tcp.PubServer.__new__(salt.transport.tcp.PubServer)
+    server.opts = {}
+    server._closing = False
+    server.io_loop = io_loop
+    server.clients = set()
+    server.present = {}
+    server.max_client_buffer = 0
+    server._reset_stats()
+    peers = []
+    for _ in range(count):
+        left, right = socket.socketpair()
+        stream = tornado.iostream.IOStream(left, io_loop=io_loop)
+        server.clients.add(salt.transport.tcp.Subscriber(stream, None))
+        peers.append(right)
+    return server, peers
+
+
+def main(sizes):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    payload = {'payload': b'x' * 1024}
+    print('{0:>8} {1:>12} {2:>12}'.format('clients', 'mean', 'max'))
+    for size in sizes:
+        io_loop = tornado.ioloop.IOLoop()
+        server, peers = make_server(io_loop, size)
+        for _ in range(PUBLISHES):
+            io_loop.run_sync(lambda: server.publish_payload(payload, None))
+            # Drain the subscribers so that their buffers do not fill up
+            for peer in peers:
+                peer.setblocking(0)
+                try:
+                    while peer.recv(65536):
+                        pass
+                except socket.error:
+                    pass
+        print('{0:>8} {1:>11.4f}s {2:>11.4f}s'.format(
+            size, server.stats['mean'], server.stats['max']))
+        for client in server.clients:
+            client.close()
+        for peer in peers:
+            peer.close()
+        io_loop.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 2500, 5000])
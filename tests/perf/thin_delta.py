@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how much salt-ssh sends a target to update its thin after a change
+to a number of the files in it, with the whole thin tarball and with a thin
+delta, and how long the delta takes to build. The change is simulated by
+rewriting the thin tarball of the running Salt with that many files altered.
+
+    python tests/perf/thin_delta.py 1 10 100
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+
+# Import salt libs
+import salt.utils.files
+import salt.utils.thin
+
+
+def change(thintar, count, code_checksum):
+    '''
+    Rewrite the thin tarball with count of its python files altered
+    '''
+    tmp = thintar + '.tmp'
+    src = tarfile.open(thintar)
+    dst = tarfile.open(tmp, 'w:gz')
+    changed = 0
+    for member in src:
+        data = src.extractfile(member).read() if member.isfile() else None
+        if member.name == 'code-checksum':
+            data = code_checksum.encode()
+            member.size = len(data)
+        elif data is not None and changed < count and member.name.endswith('.py'):
+            data += b'\n# changed\n'
+            member.size = len(data)
+            changed += 1
+        dst.addfile(member, io.BytesIO(data) if data is not None else None)
+    src.close()
+    dst.close()
+    os.rename(tmp, thintar)
+    with salt.utils.files.fopen(os.path.join(os.path.dirname(thintar), 'code-checksum'), 'w') as fp_:
+        fp_.write(code_checksum)
+
+
+def main(sizes):
+    cachedir = tempfile.mkdtemp()
+    try:
+        thintar = salt.utils.thin.gen_thin(cachedir)
+        base = os.path.join(cachedir, 'base.tgz')
+        shutil.copy(thintar, base)
+        print('{0:>8} {1:>12} {2:>12} {3:>12}'.format(
+            'changed', 'full', 'delta', 'build'))
+        for num, size in enumerate(sizes):
+            old, new = '{0:040x}'.format(2 * num), '{0:040x}'.format(2 * num + 1)
+            shutil.copy(base, thintar)
+            change(thintar, 0, old)
+            salt.utils.thin.thin_manifest(cachedir)
+            change(thintar, size, new)
+            start = time.time()
+            delta = salt.utils.thin.gen_thin_delta(cachedir, old)
+            elapsed = time.time() - start
+            print('{0:>8} {1:>10.0f}kB {2:>10.1f}kB {3:>11.3f}s'.format(
+                size, os.path.getsize(thintar) / 1024.0,
+                os.path.getsize(delta) / 1024.0, elapsed))
+    finally:
+        shutil.rmtree(cachedir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+'''
+Measure how long the yaml renderer takes to load a tree of SLS files, with
+the pure Python SaltYamlSafeLoader and with the libyaml based loader.
+
+    python tests/perf/yaml_render.py 10 100 500
+'''
+
+from __future__ import absolute_import, print_function
+# Import system libs
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Import salt libs
+import salt.renderers.yaml
+import salt.utils.files
+import salt.utils.yamlloader
+
+STATES = 20
+
+STATE = '''package_{num}:
+  pkg.installed:
+    - name: pkg{num}
+    - version: 1.0.{num}
+    - require:
+      - file: config_{num}
+
+config_{num}:
+  file.managed:
+    - name: /etc/pkg{num}.conf
+    - mode: 0644
+    - contents: |
+        id: {num}
+        enabled: True
+    - context: {{name: pkg{num}, ports: [80, 443], timestamp: 2018-01-01}}
+
+'''
+
+
+def make_tree(root, count):
+    '''
+    Write ``count`` SLS files of STATES states each, spread over directories
+    '''
+    for num in range(count):
+        dirname = os.path.join(root, 'formula{0}'.format(num // 50))
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with salt.utils.files.fopen(os.path.join(dirname, '{0}.sls'.format(num)), 'w') as fp_:
+            for state in range(STATES):
+                fp_.write(STATE.format(num=num * STATES + state))
+
+
+def render_tree(root):
+    start = time.time()
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            with salt.utils.files.fopen(os.path.join(dirpath, filename)) as fp_:
+                salt.renderers.yaml.render(fp_.read())
+    return time.time() - start
+
+
+def bench(root, loader):
+    salt.renderers.yaml.FastSaltYamlSafeLoader = loader
+    return min(render_tree(root) for _ in range(3))
+
+
+def main(sizes):
+    loaders = [salt.utils.yamlloader.SaltYamlSafeLoader]
+    if salt.utils.yamlloader.HAS_LIBYAML:
+        loaders.append(salt.utils.yamlloader.SaltYamlSafeCLoader)
+    print('{0:>8} '.format('files') + ' '.join('{0:>22}'.format(loader.__name__) for loader in loaders))
+    for size in sizes:
+        root = tempfile.mkdtemp()
+        try:
+            make_tree(root, size)
+            print('{0:>8} '.format(size) + ' '.join(
+                '{0:>21.3f}s'.format(bench(root, loader)) for loader in loaders))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 500])
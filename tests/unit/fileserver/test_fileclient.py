@@ -359,3 +359,36 @@ class FileclientCacheTest(TestCase, AdaptedConfigurationTestCaseMixin, LoaderMod
                 log.debug('cache_loc = %s', cache_loc)
                 log.debug('content = %s', content)
                 self.assertTrue(saltenv in content)
+
+    def test_cache_files_batched(self):
+        '''
+        Ensure that small files are cached with a single batched request and
+        that unchanged files are not transferred again
+        '''
+        patched_opts = dict((x, y) for x, y in six.iteritems(self.minion_opts))
+        patched_opts.update(MOCKED_OPTS)
+        paths = ['salt://{0}/{1}'.format(SUBDIR, x) for x in SUBDIR_FILES]
+
+        with patch.dict(fileclient.__opts__, patched_opts):
+            client = fileclient.get_file_client(fileclient.__opts__, pillar=False)
+            serve_files = MagicMock(wraps=client.channel.fs.serve_files)
+            serve_file = MagicMock(wraps=client.channel.fs.serve_file)
+            with patch.object(client.channel.fs, 'serve_files', serve_files), \
+                    patch.object(client.channel.fs, 'serve_file', serve_file):
+                for _ in range(2):
+                    ret = client.cache_files(paths, 'base')
+                    self.assertEqual(
+                        ret,
+                        [os.path.join(fileclient.__opts__['cachedir'], 'files',
+                                      'base', SUBDIR, x) for x in SUBDIR_FILES])
+                self.assertEqual(serve_files.call_count, 2)
+                serve_file.assert_not_called()
+            # The second request carried the hashes of the cached copies, so
+            # none of the contents were sent again
+            load = serve_files.call_args_list[1][0][0]
+            self.assertEqual(len(load['hashes']), len(SUBDIR_FILES))
+            for item in six.itervalues(client.channel.fs.serve_files(load)):
+                self.assertNotIn('data', item)
+            for subdir_file in ret:
+                with salt.utils.files.fopen(subdir_file) as fp_:
+                    self.assertIn(os.path.basename(subdir_file), fp_.read())
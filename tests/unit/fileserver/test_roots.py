@@ -142,6 +142,30 @@ class RootsTest(TestCase, AdaptedConfigurationTestCaseMixin, LoaderModuleMockMix
                 {'data': data,
                  'dest': 'testfile'})
 
+    def test_serve_file_window(self):
+        '''
+        Test that a client asking for a window gets several chunks at once,
+        capped by file_serve_window_max
+        '''
+        path = os.path.join(self.tmp_dir, 'windowfile')
+        with salt.utils.files.fopen(path, 'w') as fp_:
+            fp_.write('0123456789' * 10)
+        fnd = {'path': path, 'rel': 'windowfile'}
+        load = {'saltenv': 'base', 'path': path, 'loc': 5}
+        with patch.dict(roots.__opts__, {'file_buffer_size': 10,
+                                         'file_serve_window_max': 4}):
+            self.assertEqual(roots.serve_file(load, fnd)['data'], '5678901234')
+            load['window'] = 3
+            self.assertEqual(roots.serve_file(load, fnd)['data'],
+                             '567890123456789012345678901234')
+            load['window'] = 100
+            self.assertEqual(len(roots.serve_file(load, fnd)['data']), 40)
+
+            # A file replaced on disk must not be served from a stale handle
+            with salt.utils.files.fopen(path, 'w') as fp_:
+                fp_.write('abcdefghij' * 20)
+            self.assertEqual(roots.serve_file(load, fnd)['data'][:5], 'fghij')
+
     def test_envs(self):
         opts = {'file_roots': copy.copy(self.opts['file_roots'])}
         opts['file_roots'][UNICODE_ENVNAME] = opts['file_roots']['base']
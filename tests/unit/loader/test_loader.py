@@ -17,6 +17,7 @@ import collections
 import sys
 import imp
 import copy
+import time
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase
@@ -25,6 +26,7 @@ from tests.support.paths import TMP
 
 # Import Salt libs
 import salt.config
+import salt.loader
 import salt.utils.files
 import salt.utils.stringutils
 # pylint: disable=import-error,no-name-in-module,redefined-builtin
@@ -955,3 +957,316 @@ class LazyLoaderDeepSubmodReloadingTest(TestCase):
                 self.update_lib(lib)
                 self.loader.clear()
                 self._verify_libs()
+
+
+index_skipped_template = '''
+import sys
+sys.modules.setdefault('loaderindextest_imports', []).append(__name__)
+
+__virtual_cache__ = {cache}
+
+
+def __virtual__():
+    if __grains__.get('os') == 'Salt':
+        return True
+    return False, 'Not on Salt'
+
+
+def test():
+    return True
+'''
+
+index_provider_template = '''
+__virtualname__ = 'indexvirt'
+
+
+def __virtual__():
+    return __virtualname__
+
+
+def test():
+    return True
+'''
+
+
+class LoaderIndexTest(TestCase):
+    '''
+    Test the loader with the loader index enabled
+    '''
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(dir=TMP)
+        self.module_dir = os.path.join(self.tmp_dir, 'modules')
+        os.makedirs(self.module_dir)
+        self.opts = {'loader_index': True,
+                     'cachedir': os.path.join(self.tmp_dir, 'cache'),
+                     'grains': {'os': 'Other'}}
+        sys.modules['loaderindextest_imports'] = []
+        self.addCleanup(sys.modules.pop, 'loaderindextest_imports', None)
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.addCleanup(salt.loader._LOADER_INDEXES.clear)
+
+    def write_module(self, name, contents):
+        with salt.utils.files.fopen(os.path.join(self.module_dir, name + '.py'), 'w') as fh:
+            fh.write(salt.utils.stringutils.to_str(contents))
+        self.settle()
+
+    def settle(self):
+        '''
+        Recently modified directories are not indexed
+        '''
+        past = time.time() - 10
+        for path in (self.module_dir, os.path.join(self.module_dir, '__pycache__')):
+            if os.path.isdir(path):
+                os.utime(path, (past, past))
+
+    def loader(self):
+        return LazyLoader([self.module_dir], copy.deepcopy(self.opts), tag='module')
+
+    def imports(self):
+        return [name.rsplit('.', 1)[-1] for name in sys.modules['loaderindextest_imports']]
+
+    def test_listdir(self):
+        '''
+        Directory listings are only used while the directory is unchanged
+        '''
+        self.write_module('foo', mod_template.format(val=1))
+        self.assertIn('foo.test', self.loader())
+        self.settle()
+        self.assertIn('foo.test', self.loader())
+        salt.loader._LOADER_INDEXES.clear()
+        index = salt.loader.loader_index(self.opts, 'module')
+        self.assertIn('foo.py', index.dirs[self.module_dir][1])
+
+        with patch('os.listdir', side_effect=AssertionError):
+            self.assertIn('foo.test', self.loader())
+        self.write_module('bar', mod_template.format(val=2))
+        self.assertIn('bar.test', self.loader())
+        self.assertIn('bar.py', index.dirs[self.module_dir][1])
+
+        # A directory modified during the settle time is listed every time
+        with salt.utils.files.fopen(os.path.join(self.module_dir, 'baz.py'), 'w') as fh:
+            fh.write(salt.utils.stringutils.to_str(mod_template.format(val=3)))
+        self.assertIn('baz.test', self.loader())
+        self.assertNotIn('baz.py', index.dirs[self.module_dir][1])
+
+    def test_virtual_cache(self):
+        '''
+        Modules opting in are not imported again while their __virtual__
+        function returned False for the same grains
+        '''
+        self.write_module('cached', index_skipped_template.format(cache=True))
+        self.write_module('uncached', index_skipped_template.format(cache=False))
+        loader = self.loader()
+        loader._load_all()
+        self.assertEqual(sorted(self.imports()), ['cached', 'uncached'])
+        self.assertEqual(loader.missing_modules['cached'], 'Not on Salt')
+
+        del sys.modules['loaderindextest_imports'][:]
+        loader = self.loader()
+        loader._load_all()
+        self.assertEqual(self.imports(), ['uncached'])
+        self.assertEqual(loader.missing_modules['cached'], 'Not on Salt')
+        self.assertNotIn('cached.test', loader)
+
+        del sys.modules['loaderindextest_imports'][:]
+        self.opts['grains']['os'] = 'Salt'
+        loader = self.loader()
+        self.assertIn('cached.test', loader)
+        self.assertIn('uncached.test', loader)
+        self.assertEqual(sorted(self.imports()), ['cached', 'uncached'])
+
+    def test_virtual_names(self):
+        '''
+        The modules providing a virtual name are tried first
+        '''
+        self.write_module('aaa', mod_template.format(val=1))
+        self.write_module('zzz', index_provider_template)
+        loader = self.loader()
+        self.assertEqual(list(loader._iter_files('indexvirt')), ['aaa', 'zzz'])
+        self.assertIn('indexvirt.test', loader)
+        self.assertIn('aaa.test', loader)
+
+        loader = self.loader()
+        self.assertEqual(list(loader._iter_files('indexvirt')), ['zzz', 'aaa'])
+        self.assertTrue(loader['indexvirt.test']())
+        self.assertEqual(loader.loaded_files, set(['zzz']))
+
+
+grain_function_cache_template = '''
+import sys
+
+__grains_ttl__ = {ttl}
+
+
+def _called(name):
+    sys.modules['grainfunctioncachetest_calls'].append(name)
+
+
+def static_grain():
+    _called('static_grain')
+    return {{'cachetest_static': {{'key': 'static'}}}}
+
+
+def ttl_grain():
+    _called('ttl_grain')
+    return {{'cachetest_ttl': 1}}
+
+
+def uncached_grain():
+    _called('uncached_grain')
+    return {{'cachetest_uncached': 1}}
+'''
+
+
+class GrainFunctionCacheTest(TestCase):
+    '''
+    Test the grain function cache
+    '''
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(dir=TMP)
+        self.opts = salt.config.minion_config(None)
+        self.opts.pop('conf_file', None)
+        self.opts['cachedir'] = os.path.join(self.tmp_dir, 'cache')
+        self.opts['extension_modules'] = os.path.join(self.tmp_dir, 'extmods')
+        self.opts['grains_function_cache'] = True
+        self.opts['grains_deep_merge'] = True
+        os.makedirs(self.opts['cachedir'])
+        os.makedirs(os.path.join(self.opts['extension_modules'], 'grains'))
+        self.write_module("{'static_grain': 'static', 'ttl_grain': 60}")
+        sys.modules['grainfunctioncachetest_calls'] = []
+        self.addCleanup(sys.modules.pop, 'grainfunctioncachetest_calls', None)
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def write_module(self, ttl):
+        path = os.path.join(self.opts['extension_modules'], 'grains', 'cachetest.py')
+        with salt.utils.files.fopen(path, 'w') as fh:
+            fh.write(salt.utils.stringutils.to_str(
+                grain_function_cache_template.format(ttl=ttl)))
+        remove_bytecode(path)
+
+    def grains(self, **kwargs):
+        del sys.modules['grainfunctioncachetest_calls'][:]
+        ret = grains(copy.deepcopy(self.opts), **kwargs)
+        return ret, sorted(sys.modules['grainfunctioncachetest_calls'])
+
+    def test_cache(self):
+        '''
+        Only the grain functions without a valid cached result run
+        '''
+        ret, calls = self.grains()
+        self.assertEqual(calls, ['static_grain', 'ttl_grain', 'uncached_grain'])
+        self.assertEqual(ret['cachetest_static'], {'key': 'static'})
+
+        cached, calls = self.grains(force_refresh=True)
+        self.assertEqual(calls, ['uncached_grain'])
+        self.assertEqual(cached['cachetest_static'], {'key': 'static'})
+        self.assertEqual(cached['cachetest_ttl'], 1)
+
+        with patch('time.time', return_value=time.time() + 120):
+            _, calls = self.grains()
+        self.assertEqual(calls, ['ttl_grain', 'uncached_grain'])
+
+        self.opts['grains_function_cache_ttls'] = {'cachetest.static_grain': 0}
+        _, calls = self.grains()
+        self.assertEqual(calls, ['static_grain', 'uncached_grain'])
+
+    def test_invalidation(self):
+        '''
+        Changing the grain module or the minion id drops the cached results
+        '''
+        self.grains()
+        self.write_module("'static'")
+        # Make sure the mtime of the module changes
+        path = os.path.join(self.opts['extension_modules'], 'grains', 'cachetest.py')
+        os.utime(path, (time.time() + 10, time.time() + 10))
+        _, calls = self.grains()
+        self.assertEqual(calls, ['static_grain', 'ttl_grain', 'uncached_grain'])
+        _, calls = self.grains()
+        self.assertEqual(calls, [])
+
+        self.opts['id'] = 'othername'
+        _, calls = self.grains()
+        self.assertEqual(calls, ['static_grain', 'ttl_grain', 'uncached_grain'])
+
+    def test_timings(self):
+        '''
+        The run time of every grain function is recorded
+        '''
+        self.grains()
+        info = salt.loader.GrainFunctionCache(self.opts).info()
+        self.assertTrue(info['cachetest.static_grain']['cached'])
+        self.assertEqual(info['cachetest.ttl_grain']['ttl'], 60)
+        self.assertFalse(info['cachetest.uncached_grain']['cached'])
+        self.assertIn('core.os_data', info)
+        self.assertGreaterEqual(info['core.os_data']['duration'], 0)
+
+
+grain_workers_template = '''
+import time
+
+
+def a_slow():
+    time.sleep(0.5)
+    return {'concurrenttest': 'a', 'concurrenttest_a': True}
+
+
+def b_fast():
+    return {'concurrenttest': 'b'}
+
+
+def c_hang():
+    time.sleep({hang})
+    return {'concurrenttest_hang': True}
+
+
+def d_fail():
+    raise RuntimeError('d_fail')
+'''
+
+
+class GrainWorkersTest(TestCase):
+    '''
+    Test running the grain functions concurrently
+    '''
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(dir=TMP)
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.opts = salt.config.minion_config(None)
+        self.opts.pop('conf_file', None)
+        self.opts['cachedir'] = os.path.join(self.tmp_dir, 'cache')
+        self.opts['extension_modules'] = os.path.join(self.tmp_dir, 'extmods')
+        self.opts['grains_workers'] = 8
+        os.makedirs(os.path.join(self.opts['extension_modules'], 'grains'))
+
+    def write_module(self, hang):
+        path = os.path.join(self.opts['extension_modules'], 'grains', 'concurrenttest.py')
+        with salt.utils.files.fopen(path, 'w') as fh:
+            fh.write(salt.utils.stringutils.to_str(
+                grain_workers_template.replace('{hang}', str(hang))))
+
+    def test_order(self):
+        '''
+        The grains are merged in the same order as when run one by one
+        '''
+        self.write_module(0.5)
+        serial = grains(dict(self.opts, grains_workers=0))
+        start = time.time()
+        concurrent = grains(copy.deepcopy(self.opts))
+        self.assertLess(time.time() - start, 0.95)
+        self.assertEqual(concurrent, serial)
+        self.assertEqual(concurrent['concurrenttest'], 'b')
+        self.assertTrue(concurrent['concurrenttest_a'])
+        self.assertTrue(concurrent['concurrenttest_hang'])
+        self.assertIn('os_family', concurrent)
+
+    def test_timeout(self):
+        '''
+        The grains of a function which does not return in time are left out
+        '''
+        self.write_module(5)
+        self.opts['grains_timeout'] = 1
+        start = time.time()
+        ret = grains(copy.deepcopy(self.opts))
+        self.assertLess(time.time() - start, 4)
+        self.assertNotIn('concurrenttest_hang', ret)
+        self.assertEqual(ret['concurrenttest'], 'b')
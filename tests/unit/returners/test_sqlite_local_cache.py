@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for the SQLite job cache (sqlite_local_cache).
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import os
+import shutil
+
+# Import Salt Testing libs
+from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.paths import TMP
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import (
+    NO_MOCK,
+    NO_MOCK_REASON,
+    patch
+)
+
+# Import Salt libs
+import salt.returners.sqlite_local_cache as sqlite_local_cache
+
+TMP_CACHE_DIR = os.path.join(TMP, 'salt_test_sqlite_job_cache')
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+@skipIf(not sqlite_local_cache.HAS_SQLITE3, 'sqlite3 is not available')
+class SqliteLocalCacheTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Tests for the sqlite_local_cache returner
+    '''
+    def setup_loader_modules(self):
+        return {sqlite_local_cache: {'__opts__': {'cachedir': TMP_CACHE_DIR,
+                                                  'keep_jobs': 1,
+                                                  'hash_type': 'sha256',
+                                                  'serial': 'msgpack',
+                                                  'job_cache_store_endtime': True}}}
+
+    def tearDown(self):
+        for conn in getattr(sqlite_local_cache._LOCAL, 'conns', {}).values():
+            conn.close()
+        sqlite_local_cache._LOCAL.conns = {}
+        shutil.rmtree(TMP_CACHE_DIR, ignore_errors=True)
+
+    def _run_job(self, fun='test.ping', minions=('alpha', 'beta')):
+        jid = sqlite_local_cache.prep_jid()
+        sqlite_local_cache.save_load(
+            jid, {'jid': jid, 'fun': fun, 'arg': [], 'tgt': 'a*',
+                  'tgt_type': 'glob', 'user': 'root'},
+            minions=list(minions))
+        return jid
+
+    def test_prep_jid(self):
+        jid = sqlite_local_cache.prep_jid()
+        self.assertNotEqual(sqlite_local_cache.prep_jid(), jid)
+        # A passed jid is kept even if it is already in the cache
+        self.assertEqual(sqlite_local_cache.prep_jid(passed_jid=jid), jid)
+        # Colliding generated jids are retried
+        with patch('salt.utils.jid.gen_jid', side_effect=[jid, jid, '20180101000000000000']), \
+                patch('time.sleep'):
+            self.assertEqual(sqlite_local_cache.prep_jid(), '20180101000000000000')
+
+    def test_returns(self):
+        jid = self._run_job()
+        load = sqlite_local_cache.get_load(jid)
+        self.assertEqual(load['fun'], 'test.ping')
+        self.assertEqual(load['Minions'], ['alpha', 'beta'])
+
+        sqlite_local_cache.save_minions(jid, ['gamma'], syndic_id='syndic')
+        self.assertEqual(sqlite_local_cache.get_load(jid)['Minions'],
+                         ['alpha', 'beta', 'gamma'])
+
+        self.assertIsNone(sqlite_local_cache.returner(
+            {'jid': jid, 'id': 'alpha', 'return': True, 'retcode': 0,
+             'success': True, 'fun': 'test.ping'}))
+        sqlite_local_cache.returner(
+            {'jid': jid, 'id': 'beta', 'return': {'foo': 'bar'}, 'out': 'highstate'})
+        # A second return of the same minion is dropped
+        self.assertFalse(sqlite_local_cache.returner(
+            {'jid': jid, 'id': 'alpha', 'return': False}))
+        self.assertEqual(
+            sqlite_local_cache.get_jid(jid),
+            {'alpha': {'return': True, 'retcode': 0, 'success': True},
+             'beta': {'return': {'foo': 'bar'}, 'out': 'highstate'}})
+
+        self.assertEqual(sqlite_local_cache.get_load('missing'), {})
+        self.assertEqual(sqlite_local_cache.get_jid('missing'), {})
+
+    def test_returner_nocache(self):
+        jid = sqlite_local_cache.prep_jid(nocache=True)
+        sqlite_local_cache.returner({'jid': jid, 'id': 'alpha', 'return': True})
+        self.assertEqual(sqlite_local_cache.get_jid(jid), {})
+
+        # Standalone jobs get a jid of their own
+        load = {'jid': 'req', 'id': 'alpha', 'return': True}
+        sqlite_local_cache.returner(load)
+        self.assertNotEqual(load['jid'], 'req')
+        self.assertEqual(sqlite_local_cache.get_jid(load['jid']),
+                         {'alpha': {'return': True}})
+
+    def test_get_jids(self):
+        first = self._run_job()
+        find_job = self._run_job(fun='saltutil.find_job')
+        last = self._run_job(fun='test.version')
+        sqlite_local_cache.update_endtime(last, '2018, Jan 01 00:00:00.000000')
+        # A job without a load is not listed
+        sqlite_local_cache.prep_jid()
+
+        jids = sqlite_local_cache.get_jids()
+        self.assertEqual(sorted(jids), sorted([first, find_job, last]))
+        self.assertEqual(jids[first]['Function'], 'test.ping')
+        self.assertNotIn('EndTime', jids[first])
+        self.assertEqual(jids[last]['EndTime'], '2018, Jan 01 00:00:00.000000')
+        self.assertEqual(sqlite_local_cache.get_endtime(last),
+                         '2018, Jan 01 00:00:00.000000')
+        self.assertFalse(sqlite_local_cache.get_endtime(first))
+
+        self.assertEqual(
+            [job['JID'] for job in sqlite_local_cache.get_jids_filter(5)],
+            [first, last])
+        self.assertEqual(
+            [job['JID'] for job in sqlite_local_cache.get_jids_filter(2, False)],
+            [find_job, last])
+
+    def test_clean_old_jobs(self):
+        jid = self._run_job()
+        sqlite_local_cache.returner({'jid': jid, 'id': 'alpha', 'return': True})
+
+        sqlite_local_cache.clean_old_jobs()
+        self.assertIn(jid, sqlite_local_cache.get_jids())
+
+        with patch.dict(sqlite_local_cache.__opts__, {'keep_jobs': 0}):
+            with patch('time.time', return_value=1e10):
+                sqlite_local_cache.clean_old_jobs()
+        self.assertIn(jid, sqlite_local_cache.get_jids())
+
+        with patch('time.time', return_value=1e10):
+            sqlite_local_cache.clean_old_jobs()
+        self.assertEqual(sqlite_local_cache.get_jids(), {})
+        self.assertEqual(sqlite_local_cache.get_jid(jid), {})
+        self.assertEqual(sqlite_local_cache.get_load(jid), {})
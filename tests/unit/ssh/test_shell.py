@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.client.ssh.shell
+'''
+
+# Import python libs
+from __future__ import absolute_import, unicode_literals
+import os
+import shutil
+import tempfile
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import NO_MOCK, NO_MOCK_REASON, patch, MagicMock
+
+# Import Salt libs
+import salt.client.ssh.shell as shell
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class ShellMultiplexTests(TestCase):
+    '''
+    Tests for sharing a master connection between ssh and scp commands
+    '''
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cachedir, ignore_errors=True)
+        self.opts = {'cachedir': self.cachedir,
+                     '_ssh_version': (7, 4),
+                     'ssh_multiplex': True,
+                     'ssh_multiplex_persist': 0}
+
+    def _shell(self, **kwargs):
+        return shell.Shell(self.opts, 'host1', user='root', port=22,
+                           priv='/tmp/key', timeout=60, **kwargs)
+
+    def test_cmd_str(self):
+        '''
+        Both ssh and scp commands go through the control socket of the target
+        '''
+        sh_ = self._shell(ssh_options=['ControlPersist=5'])
+        path = shell.control_path(self.opts, 'host1', 'root', 22)
+        self.assertEqual(sh_.control_path, path)
+        self.assertTrue(path.startswith(os.path.join(self.cachedir, 'ssh_mux')))
+        for ssh in ('ssh', 'scp'):
+            cmd = sh_._cmd_str('true', ssh=ssh)
+            self.assertIn('-o ControlMaster=auto', cmd)
+            self.assertIn('-o ControlPath={0}'.format(path), cmd)
+            # The ssh_options given by the user take precedence
+            self.assertLess(cmd.index('ControlPersist=5'),
+                            cmd.index('ControlPersist={0}'.format(shell.MULTIPLEX_IDLE_TIMEOUT)))
+        self.assertTrue(os.path.isdir(os.path.dirname(path)))
+
+        self.opts['ssh_multiplex_persist'] = 600
+        self.assertIn('-o ControlPersist=600', self._shell()._cmd_str('true'))
+
+        self.opts['ssh_multiplex'] = False
+        sh_ = self._shell()
+        self.assertIsNone(sh_.control_path)
+        self.assertNotIn('ControlPath', sh_._cmd_str('true'))
+
+    def test_control_path(self):
+        '''
+        Control paths differ per target and stay short enough for a unix socket
+        '''
+        self.assertNotEqual(shell.control_path(self.opts, 'host1', 'root', 22),
+                            shell.control_path(self.opts, 'host1', 'root', 2222))
+        self.assertEqual(shell.control_path(self.opts, '[::1]', 'root', 22),
+                         shell.control_path(self.opts, '::1', 'root', 22))
+        self.opts['cachedir'] = os.path.join(self.cachedir, 'x' * 100)
+        path = shell.control_path(self.opts, 'host1', 'root', 22)
+        self.assertLessEqual(len(path), shell.MAX_CONTROL_PATH)
+        self.assertTrue(path.startswith(tempfile.gettempdir()))
+
+    def test_connection_stats(self):
+        '''
+        Commands are timed and counted as reusing the master connection when
+        its control socket exists
+        '''
+        sh_ = self._shell()
+        with patch.object(sh_, '_run_cmd', MagicMock(return_value=('', '', 0))):
+            sh_.exec_cmd('true')
+            # The first command opened the master connection
+            with open(sh_.control_path, 'w'):
+                pass
+            sh_.exec_cmd('true')
+            sh_.send('/tmp/a', '/tmp/b')
+        self.assertEqual([reused for _, reused in sh_.timings], [False, True, True])
+        sh_.timings = [(1.0, False), (0.25, True), (0.25, True)]
+        stats = sh_.connection_stats()
+        self.assertEqual(stats['commands'], 3)
+        self.assertEqual(stats['reused'], 2)
+        self.assertAlmostEqual(stats['time'], 1.5)
+        self.assertAlmostEqual(stats['saved'], 1.5)
+
+    def test_close_master(self):
+        '''
+        Only an existing master connection is asked to exit
+        '''
+        sh_ = self._shell()
+        call = MagicMock(return_value=0)
+        with patch('subprocess.call', call):
+            self.assertFalse(sh_.close_master())
+            call.assert_not_called()
+            sh_._cmd_str('true')
+            with open(sh_.control_path, 'w'):
+                pass
+            self.assertTrue(sh_.close_master())
+        self.assertEqual(
+            call.call_args[0][0],
+            ['ssh', '-O', 'exit', '-o', 'ControlPath={0}'.format(sh_.control_path), 'host1'])
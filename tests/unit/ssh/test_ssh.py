@@ -6,9 +6,11 @@
 # Import python libs
 from __future__ import absolute_import, unicode_literals
 import os
+import threading
+import time
 
 # Import Salt Testing libs
-from tests.support.unit import skipIf
+from tests.support.unit import TestCase, skipIf
 from tests.support.case import ShellCase
 from tests.support.mock import NO_MOCK, NO_MOCK_REASON, patch, MagicMock
 
@@ -47,3 +49,63 @@ class SSHPasswordTests(ShellCase):
                 client.run()
         display_output.assert_called_once_with(expected, 'nested', opts)
         self.assertIs(ret, handle_ssh_ret[0])
+
+
+def _routine(que, opts, host, target, mine=False):
+    '''
+    Stand in for SSH.handle_routine
+    '''
+    if host == 'host3':
+        if threading.current_thread().name == 'MainThread':
+            os._exit(1)
+        raise Exception('boom')
+    time.sleep(0.05)
+    que.put({'id': host, 'ret': os.getpid()})
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class SSHHandleTests(TestCase):
+    '''
+    Tests for running the targets from a process each or from worker processes
+    '''
+    def _client(self, **opts):
+        client = ssh.SSH.__new__(ssh.SSH)
+        client.opts = {'ssh_max_procs': 4, 'argv': ['test.ping']}
+        client.opts.update(opts)
+        client.targets = dict(('host{0}'.format(num), {}) for num in range(10))
+        client.defaults = {'user': 'root'}
+        client.handle_routine = _routine
+        return client
+
+    def _run(self, client):
+        rets = {}
+        for ret in client.handle_ssh():
+            rets.update(ret)
+        self.assertEqual(sorted(rets), sorted(client.targets))
+        self.assertIn('did not return any data', rets.pop('host3'))
+        self.assertEqual(client.targets['host0'], {'user': 'root', 'host': 'host0'})
+        return set(rets.values())
+
+    def test_process_per_target(self):
+        '''
+        Every target runs in a process of its own
+        '''
+        self.assertEqual(len(self._run(self._client())), 9)
+
+    def test_workers(self):
+        '''
+        The targets are spread over the worker processes
+        '''
+        client = self._client(ssh_workers=2)
+        with patch('salt.loader.ssh_wrapper', MagicMock(return_value={})):
+            pids = self._run(client)
+        self.assertEqual(len(pids), 2)
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_workers_wrapper(self):
+        '''
+        Wrapper functions still run in a process per target
+        '''
+        client = self._client(ssh_workers=2, argv=['state.sls'])
+        with patch('salt.loader.ssh_wrapper', MagicMock(return_value={'state.sls': None})):
+            self.assertEqual(len(self._run(client)), 9)
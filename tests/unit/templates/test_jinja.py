@@ -10,6 +10,7 @@ import os
 import pprint
 import re
 import tempfile
+import time
 
 # Import Salt Testing libs
 from tests.support.unit import skipIf, TestCase
@@ -20,14 +21,17 @@ from tests.support.paths import TMP_CONF_DIR
 # Import Salt libs
 import salt.config
 import salt.loader
+import salt.runners.cache
 from salt.exceptions import SaltRenderError
 
 from salt.ext import six
 from salt.ext.six.moves import builtins
 
 import salt.utils.json
+import salt.utils.jinja
 from salt.utils.decorators.jinja import JinjaFilter
 from salt.utils.jinja import (
+    CompiledTemplateCache,
     SaltCacheLoader,
     SerializerExtension,
     ensure_sequence_filter
@@ -589,6 +593,156 @@ class TestJinjaDefaultOptions(TestCase):
         self.assertEqual(rendered, 'onetwothree')
 
 
+class TestCompiledTemplateCache(TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.templates_dir = os.path.join(self.tempdir, 'files', 'test')
+        _setup_test_dir(
+            os.path.join(TEMPLATES_DIR, 'files', 'test'),
+            self.templates_dir
+        )
+        self.local_opts = {
+            'cachedir': self.tempdir,
+            'file_client': 'local',
+            'file_ignore_regex': None,
+            'file_ignore_glob': None,
+            'file_roots': {
+                'test': [self.templates_dir]
+            },
+            'pillar_roots': {
+                'test': [self.templates_dir]
+            },
+            'fileserver_backend': ['roots'],
+            'hash_type': 'md5',
+            'extension_modules': os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                'extmods'),
+            'jinja_cache_size': 10,
+        }
+        patcher = patch('salt.utils.jinja._TEMPLATE_CACHE', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        salt.utils.files.rm_rf(self.tempdir)
+
+    def _render(self, template, **kwargs):
+        return render_jinja_tmpl(
+            template, dict(opts=self.local_opts, saltenv='test', salt={}, **kwargs))
+
+    def _stats(self):
+        stats = salt.utils.jinja.get_template_cache(self.local_opts).stats()
+        return stats['hits'], stats['misses']
+
+    def test_reuse(self):
+        '''
+        A template is only compiled again when its source changes
+        '''
+        self.assertEqual(self._render('{{ a }}', a='one'), 'one')
+        self.assertEqual(self._render('{{ a }}', a='two'), 'two')
+        self.assertEqual(self._stats(), (1, 1))
+        self.assertEqual(self._render('{{ a }}!', a='two'), 'two!')
+        self.assertEqual(self._stats(), (1, 2))
+
+    def test_environment_options(self):
+        '''
+        A template compiled with other environment options is not reused
+        '''
+        template = '{% if a %}\n{{ a }}{% endif %}'
+        self.assertEqual(self._render(template, a='one'), '\none')
+        self.local_opts['jinja_env'] = {'trim_blocks': True}
+        self.assertEqual(self._render(template, a='one'), 'one')
+        self.assertEqual(self._stats(), (0, 2))
+
+    def test_imports(self):
+        '''
+        Templates imported through the loader are cached too
+        '''
+        filename = os.path.join(self.templates_dir, 'hello_import')
+        with salt.utils.files.fopen(filename) as fp_:
+            template = salt.utils.stringutils.to_unicode(fp_.read())
+        fc = MockFileClient()
+        with patch.object(SaltCacheLoader, 'file_client', MagicMock(return_value=fc)):
+            for _ in range(2):
+                self.assertEqual(self._render(template), 'Hey world !a b !' + os.linesep)
+        # The template and the macro file it imports, which the environment
+        # itself only loads once per render
+        self.assertEqual(self._stats(), (2, 2))
+
+    def test_lru(self):
+        '''
+        The least recently used templates are dropped first
+        '''
+        self.local_opts['jinja_cache_size'] = 2
+        for template in ('1', '2', '1', '3', '1', '2'):
+            self._render(template)
+        self.assertEqual(self._stats(), (2, 4))
+
+    def test_disabled(self):
+        '''
+        Templates are rendered without a cache if its size is 0
+        '''
+        self.local_opts['jinja_cache_size'] = 0
+        self.assertIsNone(salt.utils.jinja.get_template_cache(self.local_opts))
+        self.assertEqual(self._render('{{ a }}', a='one'), 'one')
+
+    def test_bytecode_cache(self):
+        '''
+        Compiled templates stored on disk are found by a new cache
+        '''
+        directory = os.path.join(self.tempdir, 'jinja')
+        env = Environment()
+        cache = CompiledTemplateCache(10, directory)
+        self.assertEqual(cache.from_string(env, '{{ a }}').render(a='one'), 'one')
+        self.assertEqual(len(os.listdir(directory)), 1)
+        cache = CompiledTemplateCache(10, directory)
+        self.assertEqual(cache.from_string(env, '{{ a }}').render(a='two'), 'two')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 0, 'size': 1})
+
+    def test_bytecode_cache_pruned(self):
+        '''
+        Only the most recently used compiled templates are kept on disk
+        '''
+        directory = os.path.join(self.tempdir, 'jinja')
+        env = Environment()
+        cache = CompiledTemplateCache(2, directory)
+        for template in ('1', '2', '3', '4', '5'):
+            cache.from_string(env, template)
+        # Pruned on the first, third and fifth store
+        self.assertEqual(len(os.listdir(directory)), 2)
+        old = time.time() - 60
+        for name in os.listdir(directory):
+            os.utime(os.path.join(directory, name), (old, old))
+        # Loading a compiled template from disk marks it as used
+        cache.clear()
+        cache.from_string(env, '4')
+        cache.from_string(env, '6')
+        cache._prune()
+        self.assertEqual(len(os.listdir(directory)), 2)
+        cache = CompiledTemplateCache(2, directory)
+        for template in ('4', '6', '5'):
+            cache.from_string(env, template)
+        self.assertEqual(cache.stats()['hits'], 2)
+
+    def test_stats_runner(self):
+        '''
+        The runner adds up the hits and misses of the processes
+        '''
+        self.local_opts['cachedir'] = self.tempdir
+        salt.utils.jinja.get_template_cache(self.local_opts)._written_at = 0
+        self._render('{{ a }}', a='one')
+        stats_dir = os.path.join(self.tempdir, 'jinja_cache_stats')
+        with salt.utils.files.fopen(os.path.join(stats_dir, '1.json'), 'w') as fp_:
+            fp_.write('{"hits": 3, "misses": 0}')
+        with patch.dict(salt.runners.cache.__dict__,
+                        {'__opts__': self.local_opts}, clear=False):
+            self.assertEqual(salt.runners.cache.jinja_stats(reset=True),
+                             {'hits': 3, 'misses': 1, 'hit_ratio': 0.75})
+            self.assertEqual(salt.runners.cache.jinja_stats(),
+                             {'hits': 0, 'misses': 0, 'hit_ratio': 0.0})
+
+
 class TestCustomExtensions(TestCase):
 
     def __init__(self, *args, **kws):
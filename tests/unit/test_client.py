@@ -5,14 +5,18 @@
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import os
+import time
 
 # Import Salt Testing libs
 import tests.integration as integration
+from tests.unit.utils.test_event import eventpublisher_process, SOCK_DIR
 from tests.support.unit import TestCase, skipIf
-from tests.support.mock import patch, NO_MOCK, NO_MOCK_REASON
+from tests.support.mock import patch, MagicMock, NO_MOCK, NO_MOCK_REASON
 
 # Import Salt libs
 from salt import client
+import salt.utils.event
 import salt.utils.platform
 from salt.exceptions import (
     EauthAuthenticationError, SaltInvocationError, SaltClientError, SaltReqTimeoutError
@@ -80,6 +84,84 @@ class LocalClientTestCase(TestCase,
                                                     kwarg=None, tgt_type='list', full_return=True,
                                                     ret='')
 
+    @skipIf(salt.utils.platform.is_windows(), 'Not supported on Windows')
+    def test_job_event_filter(self):
+        '''
+        Tests that the event publisher only sends the client the events of the
+        jobs it waits for
+        '''
+        opts = self.get_temp_config('master', transport='zeromq')
+        opts['sock_dir'] = SOCK_DIR
+        if not os.path.isdir(SOCK_DIR):
+            os.makedirs(SOCK_DIR)
+        local_client = client.LocalClient(mopts=opts)
+        with eventpublisher_process():
+            local_client._check_pub_data({'jid': '1234', 'minions': ['m1']})
+            self.assertEqual(local_client.event.publish_filter, ['salt/job/1234/'])
+            self.assertTrue(local_client.event.connect_pub())
+            sender = salt.utils.event.MasterEvent(SOCK_DIR, listen=False)
+            time.sleep(0.5)
+            sender.fire_event({'id': 'm1', 'return': 'other'}, 'salt/job/5678/ret/m1')
+            sender.fire_event({'id': 'm1', 'return': 'mine'}, 'salt/job/1234/ret/m1')
+            evt = local_client.event.get_event(wait=5, full=True)
+            self.assertEqual(evt['tag'], 'salt/job/1234/ret/m1')
+            self.assertIsNone(local_client.event.get_event(wait=0.5))
+
+            local_client._clean_up_subscriptions('1234')
+            self.assertEqual(local_client.event.publish_filter, [])
+            time.sleep(0.5)
+            sender.fire_event({'id': 'm1', 'return': 'other'}, 'salt/job/5678/ret/m1')
+            evt = local_client.event.get_event(wait=5, full=True)
+            self.assertEqual(evt['tag'], 'salt/job/5678/ret/m1')
+
+    def test_job_event_filter_lifted_while_publishing(self):
+        '''
+        Tests that the event filter lets all events through while a job is
+        published, and is narrowed again to all the jobs waited for
+        '''
+        local_client = client.LocalClient(mopts=self.get_temp_config('master'))
+        local_client.event = MagicMock()
+        local_client._filter_job_events('1234')
+        filters = []
+
+        def send(load, timeout=None):
+            filters.append(local_client.event.set_publish_filter.call_args[0][0])
+            return {'load': {'jid': '5678', 'minions': ['m1']}}
+
+        channel = MagicMock(send=MagicMock(side_effect=send))
+        with patch('salt.transport.Channel.factory', MagicMock(return_value=channel)), \
+                patch('os.path.exists', MagicMock(return_value=True)):
+            local_client.run_job('m1', 'test.ping', listen=True)
+        self.assertEqual(filters, [[]])
+        local_client.event.set_publish_filter.assert_called_with(
+            ['salt/job/1234/', 'salt/job/5678/'])
+
+    def test_job_event_filter_cleaned_up(self):
+        '''
+        Tests that the jobs are removed from the event filter when the
+        returns are no longer iterated, or were all found
+        '''
+        local_client = client.LocalClient(mopts=self.get_temp_config('master'))
+        local_client.event = MagicMock()
+        local_client.event.get_event.return_value = {
+            'tag': 'salt/job/1234/ret/m1', 'id': 'm1', 'return': True,
+            'data': {'id': 'm1', 'return': True}}
+        local_client.returners = {
+            'local_cache.get_load': MagicMock(return_value={'fun': 'test.ping'}),
+            'local_cache.get_jid': MagicMock(return_value={})}
+        with patch.object(local_client, 'pub',
+                          MagicMock(return_value={'jid': '1234', 'minions': ['m1', 'm2']})):
+            returns = local_client.cmd_iter('*', 'test.ping')
+            self.assertEqual(next(returns), {'m1': {'ret': True}})
+            self.assertEqual(local_client.event_jids, set(['1234']))
+            returns.close()
+        self.assertEqual(local_client.event_jids, set())
+        local_client.event.unsubscribe.assert_called_with('salt/job/1234')
+
+        self.assertEqual(local_client.get_full_returns('1234', ['m1']),
+                         {'m1': {'ret': True}})
+        self.assertEqual(local_client.event_jids, set())
+
     @skipIf(salt.utils.platform.is_windows(), 'Not supported on Windows')
     def test_pub(self):
         '''
@@ -2,6 +2,7 @@
 
 # python libs
 from __future__ import absolute_import
+import copy
 import os
 import tempfile
 import shutil
@@ -250,3 +251,55 @@ class TestBadCryptodomePubKey(TestCase):
         '''
         key = salt.crypt.get_rsa_pub_key(self.key_path)
         assert key.can_encrypt()
+
+
+class CrypticleTestCase(TestCase):
+    '''
+    Tests for the symmetric encryption of the AES channel
+    '''
+    def setUp(self):
+        self.key = crypt.Crypticle.generate_key_string()
+        self.crypticle = crypt.Crypticle({}, self.key)
+
+    def test_encrypt_decrypt(self):
+        '''
+        Messages of any length decrypt with the reused cipher contexts, and
+        with fresh ones on the other end
+        '''
+        other = crypt.Crypticle({}, self.key)
+        for size in (0, 1, 15, 16, 17, 1024, 65537):
+            data = os.urandom(size)
+            encrypted = self.crypticle.encrypt(data)
+            self.assertEqual(self.crypticle.decrypt(encrypted), data)
+            self.assertEqual(other.decrypt(encrypted), data)
+            self.assertEqual(crypt.Crypticle({}, self.key).decrypt(encrypted), data)
+
+    def test_encrypt_random_iv(self):
+        '''
+        Encrypting the same message twice does not give the same ciphertext
+        '''
+        data = b'salt' * 16
+        self.assertNotEqual(self.crypticle.encrypt(data)[:16],
+                            self.crypticle.encrypt(data)[:16])
+
+    def test_decrypt_tampered(self):
+        '''
+        Messages which fail the HMAC check are rejected, and do not break the
+        decryption of the next messages
+        '''
+        encrypted = bytearray(self.crypticle.encrypt(b'salt'))
+        encrypted[20] ^= 1
+        self.assertRaises(crypt.AuthenticationError,
+                          self.crypticle.decrypt, bytes(encrypted))
+        self.assertRaises(crypt.AuthenticationError,
+                          self.crypticle.decrypt, b'short')
+        self.assertEqual(
+            self.crypticle.decrypt(self.crypticle.encrypt(b'salt')), b'salt')
+
+    def test_dumps_loads_copy(self):
+        '''
+        A copied Crypticle gets its own contexts
+        '''
+        crypticle = copy.deepcopy(self.crypticle)
+        self.assertEqual(
+            crypticle.loads(self.crypticle.dumps({'foo': 'bar'})), {'foo': 'bar'})
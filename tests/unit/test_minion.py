@@ -6,14 +6,20 @@
 # Import python libs
 from __future__ import absolute_import
 import copy
+import multiprocessing
 import os
+import signal
+import time
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import NO_MOCK, NO_MOCK_REASON, patch, MagicMock
 from tests.support.helpers import skip_if_not_root
 # Import salt libs
+import salt.config
 import salt.minion
+import salt.utils.minion
+import salt.utils.process
 import salt.utils.event as event
 from salt.exceptions import SaltSystemExit
 import salt.syspaths
@@ -212,49 +218,76 @@ class MinionTestCase(TestCase):
     def test_process_count_max(self):
         '''
         Tests that the _handle_decoded_payload function does not spawn more than the configured amount of processes,
-        as per process_count_max.
+        as per process_count_max, and queues the other jobs until a running one ends.
         '''
         with patch('salt.minion.Minion.ctx', MagicMock(return_value={})), \
                 patch('salt.utils.process.SignalHandlingMultiprocessingProcess.start', MagicMock(return_value=True)), \
                 patch('salt.utils.process.SignalHandlingMultiprocessingProcess.join', MagicMock(return_value=True)), \
                 patch('salt.utils.minion.running', MagicMock(return_value=[])), \
-                patch('tornado.gen.sleep', MagicMock(return_value=tornado.concurrent.Future())):
+                patch('salt.utils.minion.write_job_queue', MagicMock()):
             process_count_max = 10
-            mock_opts = salt.config.DEFAULT_MINION_OPTS
+            mock_opts = copy.copy(salt.config.DEFAULT_MINION_OPTS)
             mock_opts['minion_jid_queue_hwm'] = 100
-            mock_opts["process_count_max"] = process_count_max
+            mock_opts['process_count_max'] = process_count_max
+            mock_opts['job_queue_priorities'] = {'test.*': 10}
 
             io_loop = tornado.ioloop.IOLoop()
             minion = salt.minion.Minion(mock_opts, jid_queue=[], io_loop=io_loop)
             try:
+                start = salt.utils.process.SignalHandlingMultiprocessingProcess.start
 
-                # mock gen.sleep to throw a special Exception when called, so that we detect it
-                class SleepCalledEception(Exception):
-                    """Thrown when sleep is called"""
-                    pass
-                tornado.gen.sleep.return_value.set_exception(SleepCalledEception())
-
-                # up until process_count_max: gen.sleep does not get called, processes are started normally
+                # up until process_count_max: processes are started normally
                 for i in range(process_count_max):
                     mock_data = {'fun': 'foo.bar',
                                  'jid': i}
                     io_loop.run_sync(lambda data=mock_data: minion._handle_decoded_payload(data))
-                    self.assertEqual(salt.utils.process.SignalHandlingMultiprocessingProcess.start.call_count, i + 1)
+                    self.assertEqual(start.call_count, i + 1)
                     self.assertEqual(len(minion.jid_queue), i + 1)
-                    salt.utils.minion.running.return_value += [i]
 
-                # above process_count_max: gen.sleep does get called, JIDs are created but no new processes are started
-                mock_data = {'fun': 'foo.bar',
-                             'jid': process_count_max + 1}
+                # above process_count_max: JIDs are created but no new processes are started
+                for jid, fun in ((process_count_max, 'foo.bar'), (process_count_max + 1, 'test.ping')):
+                    mock_data = {'fun': fun,
+                                 'jid': jid}
+                    io_loop.run_sync(lambda data=mock_data: minion._handle_decoded_payload(data))
+                self.assertEqual(start.call_count, process_count_max)
+                self.assertEqual(len(minion.jid_queue), process_count_max + 2)
+                self.assertEqual(len(minion.job_queue), 2)
+
+                # a job ending starts the queued job with the highest priority
+                minion._job_done(0)
+                self.assertEqual(start.call_count, process_count_max + 1)
+                self.assertIn(process_count_max + 1, minion.job_queue.running)
+                self.assertEqual(
+                    [job['jid'] for job in minion.job_queue.info()['queued']],
+                    [process_count_max])
 
-                self.assertRaises(SleepCalledEception,
-                                  lambda: io_loop.run_sync(lambda: minion._handle_decoded_payload(mock_data)))
-                self.assertEqual(salt.utils.process.SignalHandlingMultiprocessingProcess.start.call_count,
-                                 process_count_max)
-                self.assertEqual(len(minion.jid_queue), process_count_max + 1)
+                # the end of a job which is not running frees no slot
+                minion._job_done(0)
+                self.assertEqual(start.call_count, process_count_max + 1)
+                minion._job_done(1)
+                self.assertEqual(start.call_count, process_count_max + 2)
+                self.assertEqual(len(minion.job_queue), 0)
             finally:
                 minion.destroy()
 
+    def test_minion_manager_job_queue_restart(self):
+        '''
+        Tests that the job queue shared by the minions of a MinionManager
+        counts the jobs still running from before a restart
+        '''
+        running = [{'jid': '20180101000000000000', 'fun': 'test.sleep'},
+                   {'jid': '20180101000000000001', 'fun': 'test.sleep'}]
+        with patch('salt.utils.minion.running', MagicMock(return_value=running)):
+            mock_opts = copy.copy(salt.config.DEFAULT_MINION_OPTS)
+            mock_opts['process_count_max'] = 2
+            manager = salt.minion.MinionManager(mock_opts)
+            try:
+                self.assertEqual(sorted(manager.job_queue.running),
+                                 [job['jid'] for job in running])
+                self.assertTrue(manager.job_queue.full())
+            finally:
+                manager.destroy()
+
     def test_beacons_before_connect(self):
         '''
         Tests that the 'beacons_before_connect' option causes the beacons to be initialized before connect.
@@ -301,3 +334,67 @@ class MinionTestCase(TestCase):
                 self.assertTrue('beacons' not in minion.periodic_callbacks)
             finally:
                 minion.destroy()
+
+
+def _job_worker(results, running, conn):
+    '''
+    Stand in for Minion._pool_worker
+    '''
+    while True:
+        data = conn.recv()
+        if data is None:
+            break
+        if data['fun'] == 'wait':
+            running.wait(10)
+        results.put((data['jid'], os.getpid()))
+        conn.send(data['jid'])
+
+
+class JobWorkerPoolTestCase(TestCase):
+    '''
+    Tests for the pool of processes running jobs
+    '''
+    def setUp(self):
+        self.results = multiprocessing.Queue()
+        self.running = multiprocessing.Event()
+        self.pool = salt.minion.JobWorkerPool(
+            1, 2, _job_worker, (self.results, self.running))
+        self.addCleanup(self.pool.stop)
+
+    def _wait_idle(self):
+        '''
+        Submit a job as soon as the worker is idle, return the PID it ran in
+        '''
+        timeout = time.time() + 10
+        while not self.pool.submit({'jid': 'idle', 'fun': 'test.ping'}):
+            self.assertLess(time.time(), timeout)
+            time.sleep(0.01)
+        jid, pid = self.results.get(timeout=10)
+        self.assertEqual(jid, 'idle')
+        return pid
+
+    def test_submit(self):
+        '''
+        Jobs are only handed to idle workers, which are replaced after
+        max_jobs jobs
+        '''
+        pid = self.pool.workers[0].process.pid
+        self.assertTrue(self.pool.submit({'jid': '1', 'fun': 'wait'}))
+        self.assertFalse(self.pool.submit({'jid': '2', 'fun': 'test.ping'}))
+        self.running.set()
+        self.assertEqual(self.results.get(timeout=10), ('1', pid))
+        self.assertEqual(self._wait_idle(), pid)
+        # The worker ran two jobs and is replaced
+        self.assertNotEqual(self._wait_idle(), pid)
+
+    def test_replace(self):
+        '''
+        Workers which die, or run with outdated modules, are replaced
+        '''
+        pid = self.pool.workers[0].process.pid
+        os.kill(pid, signal.SIGKILL)
+        self.pool.workers[0].process.join(10)
+        new_pid = self._wait_idle()
+        self.assertNotEqual(new_pid, pid)
+        self.pool.recycle()
+        self.assertNotEqual(self._wait_idle(), new_pid)
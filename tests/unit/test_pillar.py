@@ -10,7 +10,11 @@
 
 # Import python libs
 from __future__ import absolute_import
+import os
+import shutil
 import tempfile
+import threading
+import time
 
 # Import Salt Testing libs
 from tests.support.unit import skipIf, TestCase
@@ -19,6 +23,8 @@ from tests.support.paths import TMP
 
 # Import salt libs
 import salt.pillar
+import salt.runners.pillar
+import salt.utils.files
 import salt.utils.stringutils
 import salt.exceptions
 
@@ -627,6 +633,84 @@ generic:
             self.assertEqual(compiled_pillar['foo1'], 'bar1')
             self.assertEqual(compiled_pillar['foo2'], 'bar2')
 
+    def _concurrent_pillar(self, ext_pillars, order, **kwargs):
+        opts = {
+            'renderer': 'yaml',
+            'renderer_blacklist': [],
+            'renderer_whitelist': [],
+            'state_top': '',
+            'pillar_roots': {'base': []},
+            'file_roots': {'base': []},
+            'extension_modules': '',
+            'ext_pillar': [{name: {}} for name in order],
+            'ext_pillar_workers': 4,
+        }
+        opts.update(kwargs)
+        with patch('salt.loader.pillars', MagicMock(return_value=ext_pillars)):
+            return salt.pillar.Pillar(opts, {}, 'mocked-minion', 'base')
+
+    def test_concurrent_ext_pillar(self):
+        '''
+        The ext_pillars run at the same time, are passed the same pillar data
+        and are merged in the configured order
+        '''
+        barrier = threading.Event()
+        started = []
+        passed = []
+
+        def _ext_pillar(name, wait):
+            def ext_pillar(minion_id, pillar):
+                started.append(name)
+                passed.append(dict(pillar))
+                pillar['modified'] = name
+                if wait:
+                    # Only returns once the other ext_pillar has started
+                    if not barrier.wait(5):
+                        raise Exception('not run concurrently')
+                else:
+                    barrier.set()
+                return {'key': name, name: True}
+            return ext_pillar
+
+        pillar = self._concurrent_pillar(
+            {'first': _ext_pillar('first', True),
+             'second': _ext_pillar('second', False)},
+            ['first', 'second'])
+        ret, errors = pillar.ext_pillar({'base': True})
+        self.assertEqual(errors, [])
+        self.assertEqual(ret, {'base': True, 'key': 'second',
+                               'first': True, 'second': True})
+        self.assertEqual(passed, [{'base': True}, {'base': True}])
+        self.assertEqual([name for name, _ in pillar.ext_pillar_timings],
+                         ['first', 'second'])
+
+    def test_concurrent_ext_pillar_errors(self):
+        '''
+        A failing or slow ext_pillar does not keep the others from being
+        merged
+        '''
+        def _slow(minion_id, pillar):
+            time.sleep(5)
+            return {'slow': True}
+
+        def _failing(minion_id, pillar):
+            raise Exception('boom')
+
+        def _good(minion_id, pillar):
+            return {'good': True}
+
+        pillar = self._concurrent_pillar(
+            {'slow': _slow, 'failing': _failing, 'good': _good},
+            ['slow', 'failing', 'good'],
+            ext_pillar_timeout=0.5)
+        start = time.time()
+        ret, errors = pillar.ext_pillar({})
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(ret, {'good': True})
+        self.assertEqual(errors, [
+            'Failed to load ext_pillar slow: timed out after 0.5 seconds',
+            'Failed to load ext_pillar failing: boom'])
+
     def _setup_test_include_mocks(self, Matcher, get_file_client):
         self.top_file = top_file = tempfile.NamedTemporaryFile(dir=TMP, delete=False)
         top_file.write(b'''
@@ -685,6 +769,175 @@ foo_wildcard:
         client.get_state.side_effect = get_state
 
 
+class _SyncThread(object):
+    '''
+    Run the target of a thread right away
+    '''
+    def __init__(self, target, name=None):
+        self.target = target
+        self.daemon = False
+
+    def start(self):
+        self.target()
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class PillarCacheTestCase(TestCase):
+    '''
+    Tests for the fingerprint-aware master pillar cache
+    '''
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp(dir=TMP)
+        self.addCleanup(shutil.rmtree, self.cachedir, ignore_errors=True)
+        self.sls = os.path.join(self.cachedir, 'data.sls')
+        with salt.utils.files.fopen(self.sls, 'w') as fp_:
+            fp_.write('foo: bar')
+        self.opts = {'cachedir': self.cachedir,
+                     'pillar_roots': {'base': [self.cachedir]},
+                     'pillar_cache_backend': 'memory',
+                     'pillar_cache_ttl': 3600,
+                     'pillar_cache_background_refresh': True}
+        self.compiled = 0
+        self.pillar_opts = []
+        for patcher in (patch('salt.pillar._MEMORY_CACHES', {}),
+                        patch('salt.pillar.Pillar', self._pillar),
+                        patch('salt.pillar.threading.Thread', _SyncThread)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(salt.pillar._CACHE_STATS.update,
+                        dict(salt.pillar._CACHE_STATS))
+        salt.pillar._CACHE_STATS_WRITTEN[0] = 0
+
+    def _pillar(self, *args, **kwargs):
+        self.compiled += 1
+        self.pillar_opts.append(args[0])
+        return MagicMock(compile_pillar=MagicMock(return_value={'run': self.compiled}),
+                         rendered_files=set([self.sls]))
+
+    def _compile(self, grains=None):
+        return salt.pillar.PillarCache(
+            self.opts, grains or {'os': 'Linux'}, 'minion', 'base').compile_pillar()
+
+    def _stats(self):
+        stats = salt.pillar._CACHE_STATS
+        return dict((stat, count) for stat, count in stats.items() if count)
+
+    def test_hit(self):
+        '''
+        The pillar is only compiled once for the same grains and files
+        '''
+        salt.pillar._CACHE_STATS_WRITTEN[0] = time.time()
+        self.assertEqual(self._compile(), {'run': 1})
+        self.assertEqual(self._compile(), {'run': 1})
+        self.assertEqual(self._stats(), {'misses': 1, 'hits': 1})
+
+    def test_grains_changed(self):
+        '''
+        A cached pillar is compiled again when the grains change
+        '''
+        salt.pillar._CACHE_STATS_WRITTEN[0] = time.time()
+        self.assertEqual(self._compile(), {'run': 1})
+        self.assertEqual(self._compile({'os': 'Windows'}), {'run': 2})
+        self.assertEqual(self._stats(), {'misses': 1, 'invalidated': 1})
+
+    def test_file_changed(self):
+        '''
+        A cached pillar is compiled again when a file it was rendered from
+        changes
+        '''
+        self.assertEqual(self._compile(), {'run': 1})
+        mtime = os.path.getmtime(self.sls)
+        os.utime(self.sls, (mtime + 10, mtime + 10))
+        self.assertEqual(self._compile(), {'run': 2})
+        self.assertEqual(self._compile(), {'run': 2})
+
+    def test_background_refresh(self):
+        '''
+        A cached pillar past its TTL is sent back while it is compiled again
+        '''
+        salt.pillar._CACHE_STATS_WRITTEN[0] = time.time()
+        self.assertEqual(self._compile(), {'run': 1})
+        self.opts['pillar_cache_ttl'] = 0
+        self.assertEqual(self._compile(), {'run': 1})
+        self.assertEqual(self.compiled, 2)
+        self.opts['pillar_cache_ttl'] = 3600
+        self.assertEqual(self._compile(), {'run': 2})
+        self.assertEqual(self._stats(),
+                         {'misses': 1, 'stale': 1, 'refreshes': 1, 'hits': 1})
+
+    def test_background_refresh_opts(self):
+        '''
+        A background refresh compiles the pillar with its own copy of the opts
+        '''
+        self._compile()
+        self.opts['pillar_cache_ttl'] = 0
+        self._compile()
+        self.assertEqual(self.compiled, 2)
+        self.assertIs(self.pillar_opts[0], self.opts)
+        self.assertIsNot(self.pillar_opts[1], self.opts)
+        self.assertEqual(self.pillar_opts[1], self.opts)
+
+    def test_no_background_refresh(self):
+        '''
+        A cached pillar past its TTL is compiled again before it is sent back
+        if background refreshes are disabled
+        '''
+        self.opts['pillar_cache_background_refresh'] = False
+        self.assertEqual(self._compile(), {'run': 1})
+        self.opts['pillar_cache_ttl'] = 0
+        self.assertEqual(self._compile(), {'run': 2})
+
+    def test_memory_cache_created_once(self):
+        '''
+        The in-memory cache of a minion is only created on a miss
+        '''
+        factory = MagicMock(return_value={})
+        with patch('salt.utils.cache.CacheFactory.factory', factory):
+            first = salt.pillar.PillarCache(self.opts, {}, 'minion', 'base')
+            second = salt.pillar.PillarCache(self.opts, {}, 'minion', 'base')
+        self.assertIs(first.cache, second.cache)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_store_locked(self):
+        '''
+        The cached pillars of a minion are updated holding its lock, and the
+        pillars of its other pillarenvs are kept
+        '''
+        lock = salt.pillar._minion_lock('minion')
+        test = self
+
+        class _Cache(dict):
+            def __setitem__(self, key, value):
+                test.assertTrue(lock.locked())
+                super(_Cache, self).__setitem__(key, value)
+
+        salt.pillar._MEMORY_CACHES['minion'] = cache = _Cache()
+        for pillarenv in ('dev', 'prod'):
+            salt.pillar.PillarCache(
+                self.opts, {}, 'minion', 'base', pillarenv=pillarenv)._store('x')
+        self.assertFalse(lock.locked())
+        self.assertEqual(sorted(cache['minion']), ['dev', 'prod'])
+
+    def test_cache_stats_runner(self):
+        '''
+        The runner adds up the stats of the master workers
+        '''
+        self._compile()
+        self._compile()
+        salt.pillar._CACHE_STATS_WRITTEN[0] = 0
+        self._compile()
+        stats_dir = os.path.join(self.cachedir, 'pillar_cache_stats')
+        with salt.utils.files.fopen(os.path.join(stats_dir, '1.json'), 'w') as fp_:
+            fp_.write('{"misses": 1, "hits": 4}')
+        with patch.dict(salt.runners.pillar.__dict__, {'__opts__': self.opts}, clear=False):
+            self.assertEqual(
+                salt.runners.pillar.cache_stats(reset=True),
+                {'hits': 6, 'stale': 0, 'misses': 2, 'invalidated': 0,
+                 'refreshes': 0, 'hit_ratio': 0.75})
+            self.assertEqual(
+                salt.runners.pillar.cache_stats()['hit_ratio'], 0.0)
+
+
 @skipIf(NO_MOCK, NO_MOCK_REASON)
 @patch('salt.transport.Channel.factory', MagicMock())
 class RemotePillarTestCase(TestCase):
@@ -672,3 +672,139 @@ class StateFormatSlotsTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
             self.state_obj.format_slots(cdata)
         mock.assert_not_called()
         self.assertEqual(cdata, sls_data)
+
+
+class ChunkIndexTestCase(TestCase):
+    '''
+    TestCase for the requisite index over low chunks
+    '''
+    def setUp(self):
+        self.chunks = [
+            {'state': 'pkg', 'fun': 'installed', '__id__': 'nginx',
+             'name': 'nginx', '__sls__': 'web.nginx'},
+            {'state': 'file', 'fun': 'managed', '__id__': 'nginx_conf',
+             'name': '/etc/nginx/nginx.conf', '__sls__': 'web.nginx'},
+            {'state': 'service', 'fun': 'running', '__id__': 'nginx_svc',
+             'name': 'nginx', '__sls__': 'web.service'},
+            {'state': 'file', 'fun': 'managed', '__id__': 'motd',
+             'name': '/etc/motd', '__sls__': 'base'},
+        ]
+        self.index = salt.state.ChunkIndex(self.chunks)
+
+    def _scan(self, req_key, req_val):
+        return [chunk for chunk in self.chunks
+                if salt.state.req_matches(chunk, req_key, req_val)]
+
+    def test_match_agrees_with_scan(self):
+        '''
+        Test that indexed lookups return the same chunks, in the same order,
+        as walking the chunk list
+        '''
+        reqs = [('id', 'nginx'), ('pkg', 'nginx'), ('service', 'nginx'),
+                ('file', '/etc/*'), ('id', 'nginx*'), ('sls', 'web.*'),
+                ('sls', 'base'), ('file', 'nginx'), ('id', 'missing'),
+                ('sls', 'web.nginx')]
+        self.assertTrue(self.index.indexed)
+        for req_key, req_val in reqs:
+            self.assertEqual(self.index.match(req_key, req_val),
+                             self._scan(req_key, req_val))
+
+    def test_match_none(self):
+        '''
+        Test that a requisite without a value matches nothing
+        '''
+        self.assertEqual(self.index.match('id', None), [])
+
+    def test_find(self):
+        '''
+        Test that find returns the last chunk with a matching id or name
+        '''
+        self.assertIs(self.index.find('nginx'), self.chunks[2])
+        self.assertIs(self.index.find('motd'), self.chunks[3])
+        self.assertIsNone(self.index.find('missing'))
+
+    def test_non_string_fields_fall_back_to_scan(self):
+        '''
+        Test that chunks with non-string names are matched by a linear scan
+        '''
+        self.chunks.append({'state': 'cmd', 'fun': 'run', '__id__': 'num',
+                            'name': 5, '__sls__': 'base'})
+        index = salt.state.ChunkIndex(self.chunks)
+        self.assertFalse(index.indexed)
+        self.assertEqual(index.match('sls', 'base'), [self.chunks[3], self.chunks[4]])
+
+    def test_covers(self):
+        '''
+        Test that the index notices when its chunk list has changed
+        '''
+        self.assertTrue(self.index.covers(self.chunks))
+        self.assertFalse(self.index.covers(list(self.chunks)))
+        self.chunks.pop()
+        self.assertFalse(self.index.covers(self.chunks))
+
+
+class GuardCacheTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
+    '''
+    TestCase for the per-run cache of onlyif and unless commands
+    '''
+    def setUp(self):
+        with patch('salt.state.State._gather_pillar'):
+            minion_opts = self.get_temp_config('minion')
+            minion_opts['state_guard_cache'] = True
+            self.state_obj = salt.state.State(minion_opts)
+        self.retcode = MagicMock(return_value=0)
+
+    def test_retcode(self):
+        '''
+        Test that a guard command only runs once for the same arguments
+        '''
+        cache = salt.state.GuardCache()
+        self.assertEqual(cache.retcode(self.retcode, 'true', cwd='/'), 0)
+        self.assertEqual(cache.retcode(self.retcode, 'true', cwd='/'), 0)
+        self.assertEqual(cache.retcode(self.retcode, 'true', cwd='/tmp'), 0)
+        self.assertEqual(cache.retcode(self.retcode, 'true', scope='root', cwd='/'), 0)
+        self.assertEqual(self.retcode.call_count, 3)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 3})
+        cache.clear()
+        cache.retcode(self.retcode, 'true', cwd='/')
+        self.assertEqual(self.retcode.call_count, 4)
+
+    def test_disabled(self):
+        '''
+        Test that guard commands run every time without state_guard_cache
+        '''
+        with patch('salt.state.State._gather_pillar'):
+            state_obj = salt.state.State(self.get_temp_config('minion'))
+        self.assertIsNone(state_obj.guard_cache)
+        with patch.dict(state_obj.functions, {'cmd.retcode': self.retcode}):
+            for _ in range(2):
+                state_obj._run_check_onlyif({'onlyif': 'true'}, {})
+        self.assertEqual(self.retcode.call_count, 2)
+
+    def test_cleared_on_changes(self):
+        '''
+        Test that the cached return codes are dropped when a state reports
+        changes, and that the cache usage is added to the state return
+        '''
+        def _state(name, changes=False, **kwargs):
+            return {'name': name,
+                    'changes': {'name': name} if changes else {},
+                    'result': True,
+                    'comment': ''}
+
+        def _low(name, changes=False):
+            return {'state': 'test', 'fun': 'guarded', '__id__': name,
+                    'name': name, 'changes': changes, 'unless': 'false',
+                    '__sls__': 'guards', '__env__': 'base'}
+
+        self.retcode.return_value = 1
+        with patch.dict(self.state_obj.functions, {'cmd.retcode': self.retcode}), \
+                patch.dict(self.state_obj.states, {'test.guarded': _state}):
+            rets = [self.state_obj.call(_low('first')),
+                    self.state_obj.call(_low('second', changes=True)),
+                    self.state_obj.call(_low('third'))]
+        self.assertEqual(self.retcode.call_count, 2)
+        self.assertEqual([ret['guard_cache'] for ret in rets],
+                         [{'hits': 0, 'misses': 1},
+                          {'hits': 1, 'misses': 0},
+                          {'hits': 0, 'misses': 1}])
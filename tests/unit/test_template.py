@@ -5,12 +5,18 @@
 
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import os
+import shutil
+import tempfile
+import time
 
 # Import Salt Testing libs
+from tests.support.paths import TMP
 from tests.support.unit import skipIf, TestCase
-from tests.support.mock import NO_MOCK, NO_MOCK_REASON, MagicMock
+from tests.support.mock import NO_MOCK, NO_MOCK_REASON, MagicMock, patch
 
 # Import Salt libs
+import salt.utils.files
 from salt import template
 from salt.ext.six.moves import StringIO
 
@@ -100,3 +106,172 @@ class TemplateTestCase(TestCase):
         self.assertListEqual([], ret)
         ret = template.check_render_pipe_str('jinja|json', self.render_dict, ['jinja'], ['jinja', 'json'])
         self.assertListEqual([('fake_json_func', '')], ret)
+
+
+def _renderer(name, func):
+    '''
+    Make func look like the render function of the named renderer
+    '''
+    func.__module__ = 'salt.loaded.int.render.{0}'.format(name)
+    return func
+
+
+class SharedRenderCacheTestCase(TestCase):
+    '''
+    Tests for sharing the rendering of templates between minions
+    '''
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(dir=TMP)
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.calls = []
+
+        def jinja(data, saltenv, sls, **kwargs):
+            self.calls.append(sls)
+            return data
+
+        def yaml(data, saltenv, sls, **kwargs):
+            return {'key': {'value': data.read().strip()}}
+
+        self.renderers = {'jinja': _renderer('jinja', jinja),
+                          'yaml': _renderer('yaml', yaml)}
+
+    def _compile(self, contents, cache, sls='foo', **kwargs):
+        path = os.path.join(self.tmpdir, 'foo.sls')
+        with salt.utils.files.fopen(path, 'w') as ofile:
+            ofile.write(contents)
+        return template.compile_template(
+            path, self.renderers, 'jinja|yaml', [], [], 'base', sls,
+            shared_cache=cache, **kwargs)
+
+    def test_jinja_is_shareable(self):
+        '''
+        Only templates using no minion specific variables are shared
+        '''
+        variables = template.SHAREABLE_VARIABLES | set(['port'])
+        for source, shareable in (
+                ('{% for i in range(3) %}{{ i }}: {{ sls }}{% endfor %}', True),
+                ('{% set x = port|int %}{% do [x].append(1) %}{{ x }}', True),
+                ('{{ grains.id }}', False),
+                ('{{ salt["cmd.run"]("id") }}', False),
+                ('{% set x = 1 %}{{ pillar.get("x", x) }}', False),
+                ('{% include "other.sls" %}', False),
+                ('{% from "map.jinja" import x %}', False),
+                ('{% import_yaml "x.yaml" as x %}', False),
+                ('{% if %}', False),
+                ('a: {{ "True"|to_bool }}', True),
+                ('{% filter upper %}{{ sls|replace(".", "/") }}{% endfilter %}', True),
+                ('{{ show_full_context()["grains"]["id"] }}', False),
+                ('{{ lipsum() }}', False),
+                ('{{ [1, 2]|random }}', False),
+                ('{{ sls|random_hash }}', False),
+                ('{{ "%Y"|strftime }}', False),
+                ('{{ sls|uuid }}', False),
+                ('{% filter random_str %}8{% endfilter %}', False),
+                ('{{ sls|no_such_filter }}', False)):
+            self.assertEqual(
+                template.jinja_is_shareable(source, variables), shareable,
+                source)
+
+    def test_shared_render_declaration(self):
+        '''
+        A comment at the top of a template overrides the detection
+        '''
+        self.assertTrue(template.shared_render_declaration(
+            '#!jinja|yaml\n# shared_render: True\n{{ grains.id }}'))
+        self.assertFalse(template.shared_render_declaration(
+            '# shared_render: false\nfoo: bar'))
+        self.assertIsNone(template.shared_render_declaration(
+            'foo: bar\n# shared_render: True'))
+
+    def test_compile_template_shared(self):
+        '''
+        A shareable template is only rendered once, every caller gets its own
+        copy of the data
+        '''
+        cache = template.SharedRenderCache(10)
+        ret = self._compile('{{ sls }}', cache)
+        self.assertEqual(ret, {'key': {'value': '{{ sls }}'}})
+        ret['key']['value'] = 'changed'
+        self.assertEqual(self._compile('{{ sls }}', cache),
+                         {'key': {'value': '{{ sls }}'}})
+        self.assertEqual(self.calls, ['foo'])
+        # A different sls, keyword argument or contents is rendered again
+        self._compile('{{ sls }}', cache, sls='bar')
+        self._compile('{{ sls }}', cache, defaults={'a': 1})
+        self._compile('{{ sls }} ', cache)
+        self.assertEqual(self.calls, ['foo', 'bar', 'foo', 'foo'])
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 4, 'size': 4})
+
+    def test_compile_template_not_shared(self):
+        '''
+        A template depending on the minion is rendered every time
+        '''
+        cache = template.SharedRenderCache(10)
+        for _ in range(2):
+            self._compile('{{ grains.id }}', cache)
+            self._compile('{{ rendered_sls }}', cache, rendered_sls=set())
+            self._compile('#!jinja|yaml\n# shared_render: False\n', cache)
+        self.assertEqual(len(self.calls), 6)
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_shared_between_processes(self):
+        '''
+        Renderings stored on disk are used by other caches
+        '''
+        directory = os.path.join(self.tmpdir, 'shared_render')
+        self._compile('{{ sls }}', template.SharedRenderCache(10, directory))
+        cache = template.SharedRenderCache(10, directory)
+        ret = self._compile('{{ sls }}', cache)
+        self.assertEqual(ret, {'key': {'value': '{{ sls }}'}})
+        self.assertEqual(self.calls, ['foo'])
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_key_settings(self):
+        '''
+        The Salt version and the renderer options are part of the key
+        '''
+        cache = template.SharedRenderCache(10)
+        render_pipe = [(self.renderers['jinja'], '')]
+        key = cache.key('foo.sls', render_pipe, '{{ sls }}', 'base', 'foo', {})
+        self.assertNotEqual(
+            template.SharedRenderCache(10, settings={'jinja_trim_blocks': True}).key(
+                'foo.sls', render_pipe, '{{ sls }}', 'base', 'foo', {}),
+            key)
+        with patch('salt.version.__version__', '0.0.1'):
+            self.assertNotEqual(
+                cache.key('foo.sls', render_pipe, '{{ sls }}', 'base', 'foo', {}),
+                key)
+
+    def test_get_shared_render_cache_settings(self):
+        '''
+        A change to the renderer options gives a new cache
+        '''
+        opts = {'shared_render_cache': True, 'cachedir': self.tmpdir,
+                'jinja_env': {}}
+        self.addCleanup(setattr, template, '_SHARED_RENDER_CACHE', None)
+        cache = template.get_shared_render_cache(opts)
+        self.assertIs(template.get_shared_render_cache(opts), cache)
+        opts['jinja_env'] = {'trim_blocks': True}
+        self.assertIsNot(template.get_shared_render_cache(opts), cache)
+
+    def test_prune_directory(self):
+        '''
+        Only the most recently used renderings are kept on disk
+        '''
+        directory = os.path.join(self.tmpdir, 'shared_render')
+        cache = template.SharedRenderCache(2, directory)
+        for i in range(5):
+            cache.set('key{0}'.format(i), {'value': i})
+        # Pruned on the first, third and fifth store
+        self.assertEqual(sorted(os.listdir(directory)),
+                         ['key3.json', 'key4.json'])
+        old = time.time() - 60
+        for i in (3, 4):
+            os.utime(cache._path('key{0}'.format(i)), (old, old))
+        # Reading a rendering from disk marks it as used
+        cache.clear()
+        self.assertEqual(cache.get('key3'), {'value': 3})
+        cache.set('key5', {'value': 5})
+        cache._prune()
+        self.assertEqual(sorted(os.listdir(directory)),
+                         ['key3.json', 'key5.json'])
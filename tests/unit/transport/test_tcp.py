@@ -10,6 +10,7 @@ import threading
 import tornado.gen
 import tornado.ioloop
 import tornado.concurrent
+import tornado.iostream
 from tornado.testing import AsyncTestCase, gen_test
 
 import salt.config
@@ -20,7 +21,7 @@ import salt.transport.server
 import salt.transport.client
 import salt.exceptions
 from salt.ext.six.moves import range
-from salt.transport.tcp import SaltMessageClientPool
+from salt.transport.tcp import SaltMessageClientPool, PubServer
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase, skipIf
@@ -310,3 +311,42 @@ class SaltMessageClientPoolTest(AsyncTestCase):
 
         with self.assertRaises(tornado.ioloop.TimeoutError):
             test_connect(self)
+
+
+class PubServerTest(AsyncTestCase):
+    def setUp(self):
+        super(PubServerTest, self).setUp()
+        opts = {'transport': 'tcp', 'tcp_pub_max_client_buffer': 1024}
+        with patch('salt.master.AESFuncs', MagicMock()):
+            self.pub_server = PubServer(opts, io_loop=self.io_loop)
+
+    def tearDown(self):
+        self.pub_server.close()
+        del self.pub_server
+        super(PubServerTest, self).tearDown()
+
+    def _add_client(self, write_side_effect=None):
+        stream = MagicMock()
+        stream.write.side_effect = write_side_effect
+        # Do not start reading from the mocked stream
+        with patch.object(self.io_loop, 'spawn_callback'):
+            self.pub_server.handle_stream(stream, ('127.0.0.1', 4506))
+        self.assertEqual(stream.max_write_buffer_size, 1024)
+        return stream
+
+    @gen_test
+    def test_publish_payload(self):
+        fast = self._add_client()
+        slow = self._add_client(tornado.iostream.StreamBufferFullError())
+        gone = self._add_client(tornado.iostream.StreamClosedError())
+
+        yield self.pub_server.publish_payload({'payload': 'foo'}, None)
+        # Every subscriber is handed the same framed buffer
+        payload = fast.write.call_args[0][0]
+        self.assertIs(slow.write.call_args[0][0], payload)
+        self.assertIs(gone.write.call_args[0][0], payload)
+        # The slow subscriber only misses the publish, the closed one is gone
+        self.assertEqual(len(self.pub_server.clients), 2)
+        self.assertEqual(self.pub_server.stats['runs'], 1)
+        self.assertEqual(self.pub_server.stats['mean_clients'], 3)
+        self.assertEqual(self.pub_server.stats['dropped'], 1)
@@ -25,6 +25,7 @@ from multiprocessing import Process
 from tests.support.unit import expectedFailure, skipIf, TestCase
 
 # Import salt libs
+import salt.transport.frame
 import salt.utils.event
 import salt.utils.stringutils
 import tests.integration as integration
@@ -292,6 +293,39 @@ class TestSaltEvent(TestCase):
             evt2 = me2.get_event(tag='evt1')
             self.assertGotEvent(evt2, {'data': 'foo1'})
 
+    def test_event_publish_filter(self):
+        '''Test the publisher only forwards events matching a listener's filter'''
+        with eventpublisher_process():
+            me1 = salt.utils.event.MasterEvent(SOCK_DIR, listen=True)
+            me1.set_publish_filter(['salt/job/'])
+            me2 = salt.utils.event.MasterEvent(SOCK_DIR, listen=True)
+            time.sleep(0.5)
+            me2.fire_event({'data': 'foo1'}, 'evt1')
+            me2.fire_event({'data': 'foo2'}, 'salt/job/123/ret/minion')
+            # The unfiltered listener still gets every event in order
+            self.assertGotEvent(me2.get_event(), {'data': 'foo1'})
+            self.assertGotEvent(me2.get_event(), {'data': 'foo2'})
+            # The filtered listener never received evt1
+            self.assertGotEvent(me1.get_event(), {'data': 'foo2'})
+            self.assertIsNone(me1.get_event(wait=0.5))
+
+            me1.set_publish_filter()
+            time.sleep(0.5)
+            me2.fire_event({'data': 'foo3'}, 'evt3')
+            self.assertGotEvent(me1.get_event(tag='evt3'), {'data': 'foo3'})
+
+    def test_event_publish_filter_bad_message(self):
+        '''Test a listener keeps getting events after a bad subscription message'''
+        with eventpublisher_process():
+            me1 = salt.utils.event.MasterEvent(SOCK_DIR, listen=True)
+            pack = salt.transport.frame.frame_msg_ipc(
+                5, header={'cmd': 'subscribe'}, raw_body=True)
+            me1.io_loop.run_sync(lambda: me1.subscriber.stream.write(pack))
+            me2 = salt.utils.event.MasterEvent(SOCK_DIR, listen=False)
+            time.sleep(0.5)
+            me2.fire_event({'data': 'foo1'}, 'evt1')
+            self.assertGotEvent(me1.get_event(tag='evt1'), {'data': 'foo1'})
+
     @expectedFailure
     def test_event_nested_sub_all(self):
         '''Test nested event subscriptions do not drop events, get event for all tags'''
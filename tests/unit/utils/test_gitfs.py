@@ -6,6 +6,10 @@ any remotes.
 
 # Import python libs
 from __future__ import absolute_import, unicode_literals, print_function
+import shutil
+import tempfile
+import threading
+import time
 
 # Import Salt Testing libs
 from tests.support.unit import skipIf, TestCase
@@ -90,3 +94,91 @@ class TestGitFSProvider(TestCase):
                                 role_class,
                                 *args,
                                 **kwargs)
+
+
+class FakeRemote(object):
+    '''
+    A remote which takes a while to fetch and records how many remotes are
+    fetched at the same time
+    '''
+    lock = threading.Lock()
+    running = 0
+    most_running = 0
+
+    def __init__(self, id_, gitdir, changed=None, exc=None):
+        self.id = id_
+        self.gitdir = gitdir
+        self.changed = changed
+        self.exc = exc
+
+    def fetch(self):
+        with self.lock:
+            FakeRemote.running += 1
+            FakeRemote.most_running = max(FakeRemote.running,
+                                          FakeRemote.most_running)
+        try:
+            time.sleep(0.2)
+            if self.exc is not None:
+                raise self.exc
+            return self.changed
+        finally:
+            with self.lock:
+                FakeRemote.running -= 1
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class TestGitBaseFetch(TestCase):
+    '''
+    Fetching the remotes one after the other and from a number of threads
+    '''
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        opts = dict(OPTS, cachedir=self.tmpdir, gitfs_fetch_workers=1)
+        with patch.object(salt.utils.gitfs.GitFS, 'verify_gitpython',
+                          MagicMock(return_value=True)):
+            with patch.object(salt.utils.gitfs.GitFS, 'verify_pygit2',
+                              MagicMock(return_value=False)):
+                self.gitfs = salt.utils.gitfs.GitFS(opts, {}, init_remotes=False)
+        self.gitfs.remotes = [
+            FakeRemote('remote{0}'.format(num), tempfile.mkdtemp(dir=self.tmpdir))
+            for num in range(4)]
+        FakeRemote.most_running = 0
+
+    def test_fetch_remotes(self):
+        '''
+        The remotes are fetched one after the other by default
+        '''
+        self.assertFalse(self.gitfs.fetch_remotes())
+        self.assertEqual(FakeRemote.most_running, 1)
+        durations = self.gitfs.fetch_durations()
+        self.assertEqual(sorted(durations), ['remote0', 'remote1', 'remote2', 'remote3'])
+        for fetch in durations.values():
+            self.assertGreaterEqual(fetch['duration'], 0.2)
+            self.assertFalse(fetch['changed'])
+
+    def test_fetch_remotes_workers(self):
+        '''
+        The remotes are fetched from as many threads as configured, a failing
+        fetch does not keep the others from being fetched
+        '''
+        self.gitfs.opts['gitfs_fetch_workers'] = 4
+        self.gitfs.remotes[1].changed = True
+        self.gitfs.remotes[2].exc = Exception('fetch failed')
+        start = time.time()
+        self.assertTrue(self.gitfs.fetch_remotes())
+        self.assertLess(time.time() - start, 0.6)
+        self.assertEqual(FakeRemote.most_running, 4)
+        durations = self.gitfs.fetch_durations()
+        self.assertEqual(
+            dict((id_, fetch['changed']) for id_, fetch in durations.items()),
+            {'remote0': False, 'remote1': True, 'remote2': False, 'remote3': False})
+
+    def test_fetch_remotes_selected(self):
+        '''
+        Only the selected remotes are fetched and have a duration
+        '''
+        self.gitfs.opts['gitfs_fetch_workers'] = 4
+        self.assertFalse(self.gitfs.fetch_remotes(remotes=[('remote3', None)]))
+        self.assertEqual(FakeRemote.most_running, 1)
+        self.assertEqual(list(self.gitfs.fetch_durations()), ['remote3'])
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.utils.job
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import (
+    MagicMock,
+    NO_MOCK,
+    NO_MOCK_REASON,
+)
+
+# Import Salt libs
+import salt.utils.job
+
+JID = '20180101000000000000'
+OTHER_JID = '20180101000000000001'
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class StoreJobBatchTestCase(TestCase):
+    '''
+    Tests for storing job returns through the job cache writer queue
+    '''
+    def setUp(self):
+        self.opts = {'master_job_cache': 'local_cache',
+                     'job_cache': True,
+                     'ext_job_cache': '',
+                     'job_cache_store_endtime': True,
+                     'hash_type': 'sha256',
+                     'pki_dir': '/etc/salt/pki/master',
+                     'minion_id_caching': False,
+                     'unique_jid': False}
+        self.returners = dict(
+            ('local_cache.{0}'.format(fun), MagicMock())
+            for fun in ('prep_jid', 'save_load', 'get_load', 'returner',
+                        'update_endtime'))
+        self.mminion = MagicMock(returners=self.returners)
+
+    def _load(self, jid, minion):
+        return {'jid': jid, 'id': minion, 'fun': 'test.ping', 'return': True}
+
+    def test_store_job_queued(self):
+        '''
+        A queued return is fired on the event bus, but not stored
+        '''
+        return_queue = salt.utils.job.ReturnQueue(10)
+        event = MagicMock()
+        load = self._load(JID, 'minion1')
+        salt.utils.job.store_job(
+            self.opts, load, event=event, mminion=self.mminion,
+            return_queue=return_queue)
+        self.assertEqual(event.fire_event.call_count, 1)
+        for func in self.returners.values():
+            func.assert_not_called()
+        batch = return_queue.get_batch(10, 1)
+        self.assertEqual(len(batch), 1)
+        self.assertEqual(batch[0][0], load)
+
+    def test_store_job_queue_full(self):
+        '''
+        A return which does not fit in the queue is stored right away
+        '''
+        return_queue = salt.utils.job.ReturnQueue(1)
+        self.assertTrue(return_queue.put(self._load(JID, 'minion0'), ''))
+        load = self._load(JID, 'minion1')
+        salt.utils.job.store_job(
+            self.opts, load, mminion=self.mminion, return_queue=return_queue)
+        self.returners['local_cache.returner'].assert_called_once_with(load)
+        self.assertEqual(return_queue.pop_overflows(), 1)
+        self.assertEqual(return_queue.pop_overflows(), 0)
+        self.assertEqual(len(return_queue.drain()), 1)
+
+    def test_store_job_batch(self):
+        '''
+        Every return is stored, the job itself only once per batch
+        '''
+        jobs = [(self._load(JID, 'minion1'), 'end1'),
+                (self._load(OTHER_JID, 'minion1'), 'end2'),
+                (self._load(JID, 'minion2'), 'end3')]
+        errors = salt.utils.job.store_job_batch(self.opts, jobs, mminion=self.mminion)
+        self.assertEqual(errors, 0)
+        self.assertEqual(self.returners['local_cache.returner'].call_count, 3)
+        self.assertEqual(
+            [call[0] for call in self.returners['local_cache.prep_jid'].call_args_list],
+            [(False,), (False,)])
+        self.assertEqual(
+            [call[0] for call in self.returners['local_cache.save_load'].call_args_list],
+            [(JID, jobs[2][0]), (OTHER_JID, jobs[1][0])])
+        self.assertEqual(
+            [call[0] for call in self.returners['local_cache.update_endtime'].call_args_list],
+            [(JID, 'end3'), (OTHER_JID, 'end2')])
+
+    def test_store_job_batch_errors(self):
+        '''
+        A failing return does not keep the rest of the batch from being stored
+        '''
+        self.returners['local_cache.returner'].side_effect = [Exception('boom'), None]
+        jobs = [(self._load(JID, 'minion1'), ''),
+                (self._load(JID, 'minion2'), '')]
+        errors = salt.utils.job.store_job_batch(self.opts, jobs, mminion=self.mminion)
+        self.assertEqual(errors, 1)
+        self.assertEqual(self.returners['local_cache.returner'].call_count, 2)
+
+    def test_store_job_batch_no_cache(self):
+        '''
+        With job_cache disabled only the jids are stored
+        '''
+        self.opts['job_cache'] = False
+        jobs = [(self._load(JID, 'minion1'), '')]
+        salt.utils.job.store_job_batch(self.opts, jobs, mminion=self.mminion)
+        self.assertEqual(self.returners['local_cache.prep_jid'].call_count, 1)
+        self.returners['local_cache.returner'].assert_not_called()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for salt.utils.minion
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import os
+import shutil
+import tempfile
+import time
+
+# Import Salt Testing libs
+from tests.support.paths import TMP
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import MagicMock, NO_MOCK, NO_MOCK_REASON, patch
+
+# Import Salt libs
+import salt.payload
+import salt.utils.files
+import salt.utils.minion
+
+
+class JidQueueTestCase(TestCase):
+    '''
+    Tests for the JIDs of the recently received jobs
+    '''
+    def test_hwm(self):
+        jids = salt.utils.minion.JidQueue(2, ['1', '2'])
+        self.assertIn('1', jids)
+        jids.append('3')
+        self.assertNotIn('1', jids)
+        self.assertEqual(jids, ['2', '3'])
+        jids.append('3')
+        self.assertEqual(jids, ['2', '3'])
+
+
+class JobQueueTestCase(TestCase):
+    '''
+    Tests for queueing the jobs beyond process_count_max
+    '''
+    def _put(self, job_queue, jid, fun):
+        job_queue.put({'jid': jid, 'fun': fun}, None)
+
+    def test_priorities(self):
+        '''
+        Jobs are started by priority, and in the order they were queued
+        '''
+        job_queue = salt.utils.minion.JobQueue(
+            1, {'state.*': -1, 'saltutil.find_job': 10, 'saltutil.*': 5})
+        self.assertEqual(job_queue.priority('saltutil.find_job'), 10)
+        self.assertEqual(job_queue.priority(['state.apply', 'saltutil.sync_all']), 5)
+        self.assertEqual(job_queue.priority('test.ping'), 0)
+        for jid, fun in (('1', 'test.ping'), ('2', 'state.apply'),
+                         ('3', 'test.ping'), ('4', 'saltutil.find_job')):
+            self._put(job_queue, jid, fun)
+        self.assertEqual(
+            [job['jid'] for job in job_queue.info()['queued']],
+            ['4', '1', '3', '2'])
+        started = []
+        while len(job_queue):
+            _, data = job_queue.pop()
+            started.append(data['jid'])
+            self.assertIsNone(job_queue.pop())
+            self.assertTrue(job_queue.finished(data['jid']))
+        self.assertEqual(started, ['4', '1', '3', '2'])
+        self.assertFalse(job_queue.finished('4'))
+
+    @skipIf(NO_MOCK, NO_MOCK_REASON)
+    def test_ended_jobs(self):
+        '''
+        Jobs whose proc file is gone, or never appeared, have ended
+        '''
+        cachedir = tempfile.mkdtemp(dir=TMP)
+        self.addCleanup(shutil.rmtree, cachedir, ignore_errors=True)
+        opts = {'cachedir': cachedir, 'multiprocessing': True}
+        os.makedirs(os.path.join(cachedir, 'proc'))
+        with salt.utils.files.fopen(os.path.join(cachedir, 'proc', 'running'), 'wb') as fp_:
+            fp_.write(salt.payload.Serial(opts).dumps({'pid': os.getppid(), 'jid': 'running'}))
+        now = time.time()
+        running = {'running': now - 60, 'starting': now, 'gone': now - 60}
+        with patch('salt.utils.minion._check_cmdline', MagicMock(return_value=True)):
+            self.assertEqual(salt.utils.minion.ended_jobs(opts, running), ['gone'])
@@ -4,7 +4,9 @@
 from __future__ import absolute_import, unicode_literals
 
 # Import Salt Libs
+import salt.utils.data
 import salt.utils.minions as minions
+from salt.ext import six
 
 # Import Salt Testing Libs
 from tests.support.unit import TestCase
@@ -366,3 +368,129 @@ class CkMinionsTestCase(TestCase):
         args = ['1', '2']
         ret = self.ckminions.auth_check(auth_list, 'test.arg', args, 'runner')
         self.assertTrue(ret)
+
+
+class FakeCache(object):
+    '''
+    Minimal stand-in for salt.cache.Cache holding minion data in memory
+    '''
+    driver = 'fake'
+    cachedir = 'fake'
+    modules = {'fake.updated': None}
+
+    def __init__(self, data):
+        self.data = data
+        self.stamps = dict((id_, 1 if data[id_] else None) for id_ in data)
+        self.fetches = 0
+
+    def list(self, bank):
+        return list(self.data)
+
+    def updated(self, bank, key):
+        return self.stamps[bank.split('/', 1)[1]]
+
+    def fetch(self, bank, key):
+        self.fetches += 1
+        return self.data[bank.split('/', 1)[1]]
+
+
+MINION_DATA = {
+    'web1': {'grains': {'role': 'web', 'os': 'Ubuntu', 'roles': ['web', 'db'],
+                        'ipv4': ['10.0.0.1']},
+             'pillar': {'env': 'prod', 'nested': {'key': 'value'}}},
+    'web2': {'grains': {'role': 'Web', 'os': 'CentOS', 'roles': [{'web': 1}],
+                        'ipv4': ['10.0.0.2']},
+             'pillar': {'env': 'dev'}},
+    'db1': {'grains': {'role': 'db', 'os': 'Ubuntu', 'num': 3,
+                       'ipv4': ['10.0.1.1']},
+            'pillar': {'env': 'prod', 'list': [1, 2]}},
+    'nodata': None,
+}
+
+
+class MinionDataIndexTestCase(TestCase):
+    '''
+    TestCase for salt.utils.minions.MinionDataIndex
+    '''
+    def test_match(self):
+        '''
+        The index must give the same answer as matching every minion's data
+        '''
+        index = minions.MinionDataIndex()
+        index.refresh(FakeCache(MINION_DATA))
+        cases = [
+            ('grains', 'role:web', False, False),
+            ('grains', 'role:WEB', False, False),
+            ('grains', 'role:w*', False, False),
+            ('grains', 'roles:web', False, False),
+            ('grains', 'roles:db', False, False),
+            ('grains', 'roles:*:web', False, False),
+            ('grains', 'num:3', False, False),
+            ('grains', 'os:ubu.*', True, False),
+            ('grains', 'missing:web', False, False),
+            ('grains', 'role', False, False),
+            ('pillar', 'nested:key:value', False, False),
+            ('pillar', 'nested:key', False, False),
+            ('pillar', 'env:prod', False, True),
+            ('pillar', 'list:2', False, False),
+        ]
+        for search, expr, regex, exact in cases:
+            expected = set(
+                id_ for id_, data in six.iteritems(MINION_DATA)
+                if data and salt.utils.data.subdict_match(
+                    data[search], expr, regex_match=regex, exact_match=exact)
+            )
+            self.assertEqual(
+                index.match(search, expr, ':', regex_match=regex, exact_match=exact),
+                expected,
+                expr)
+
+    def test_refresh(self):
+        '''
+        Only changed minion data is fetched again
+        '''
+        cache = FakeCache(dict(MINION_DATA))
+        index = minions.MinionDataIndex()
+        with patch('time.time', MagicMock(return_value=100)):
+            index.refresh(cache)
+            self.assertEqual(cache.fetches, 3)
+            index.refresh(cache)
+            self.assertEqual(cache.fetches, 3)
+
+            cache.data['web2'] = {'grains': {'role': 'db'}, 'pillar': {}}
+            cache.stamps['web2'] = 50
+            del cache.data['db1']
+            index.refresh(cache)
+            self.assertEqual(cache.fetches, 4)
+            self.assertEqual(index.match('grains', 'role:db', ':'), set(['web2']))
+            self.assertNotIn('db1', index.minions)
+
+            # Data updated within the last second is fetched again next time
+            cache.stamps['web1'] = 100
+            index.refresh(cache)
+            index.refresh(cache)
+            self.assertEqual(cache.fetches, 6)
+
+    def test_check_minions(self):
+        '''
+        Grain and pillar targets give the same result with the index
+        '''
+        cache = FakeCache(MINION_DATA)
+        opts = {'minion_data_cache': True, 'pki_dir': '/pki'}
+        ckminions = minions.CkMinions(opts)
+        ckminions.cache = cache
+        pki_minions = MagicMock(return_value=['db1', 'nodata', 'other', 'web1', 'web2'])
+        with patch('salt.utils.minions._list_pki_dir', pki_minions), \
+                patch.dict(minions._DATA_INDEXES, clear=True):
+            for tgt, tgt_type in (('role:web', 'grain'),
+                                  ('G@os:Ubuntu and P@env:prod', 'compound'),
+                                  ('env:prod', 'pillar_exact'),
+                                  ('10.0.0.0/24', 'ipcidr')):
+                for greedy in (True, False):
+                    opts['minion_data_index'] = False
+                    expected = ckminions.check_minions(tgt, tgt_type, greedy=greedy)
+                    opts['minion_data_index'] = True
+                    ret = ckminions.check_minions(tgt, tgt_type, greedy=greedy)
+                    self.assertEqual(sorted(ret['minions']),
+                                     sorted(expected['minions']),
+                                     (tgt, greedy))
@@ -331,3 +331,125 @@ class ScheduleTestCase(TestCase):
         self.schedule.eval()
         self.assertTrue(self.schedule.opts['schedule']['testjob']['_splay'] >
                         self.schedule.opts['schedule']['testjob']['_next_fire_time'])
+
+    def test_eval_schedule_time_runs(self):
+        '''
+        Tests eval runs a job every so many seconds when evaluated more often
+        '''
+        self.schedule.opts.update({'pillar': {'schedule': {}}})
+        self.schedule.opts.update({'schedule': {'testjob': {'function': 'test.true', 'seconds': 5}}})
+        start = datetime.datetime(2018, 1, 1)
+        runs = []
+        with patch.object(self.schedule, '_run_job', MagicMock()):
+            for second in range(16):
+                now = start + datetime.timedelta(seconds=second)
+                self.schedule.eval(now=now)
+                if self.schedule._run_job.called:
+                    runs.append(second)
+                    self.schedule._run_job.reset_mock()
+        self.assertEqual(runs, [5, 10, 15])
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class ScheduleQueueTestCase(TestCase):
+    '''
+    Unit tests for the queue of the next fire times of the jobs
+    '''
+
+    def setUp(self):
+        opts = copy.deepcopy(DEFAULT_CONFIG)
+        opts.update({'schedule_queue': True,
+                     'pillar': {'schedule': {}},
+                     'schedule': {'five': {'function': 'test.true', 'seconds': 5},
+                                  'seven': {'function': 'test.true', 'seconds': 7}}})
+        with patch('salt.utils.schedule.clean_proc_dir', MagicMock(return_value=None)):
+            self.schedule = Schedule(opts, {}, returners={}, new_instance=True)
+        self.start = datetime.datetime(2018, 1, 1)
+        self.runs = []
+        self.evaluated = []
+        due_jobs = self.schedule._due_jobs
+
+        def _due_jobs(schedule, now):
+            due = due_jobs(schedule, now)
+            self.evaluated.append(sorted(due))
+            return due
+
+        self.schedule._due_jobs = _due_jobs
+        self.schedule._run_job = lambda func, data: self.runs.append(data['name'])
+
+    def _eval(self, second):
+        self.schedule.eval(now=self.start + datetime.timedelta(seconds=second))
+
+    def test_eval(self):
+        '''
+        Only the jobs whose next fire time has come are evaluated, and they
+        run as without the queue
+        '''
+        self._eval(0)
+        self.assertEqual(self.schedule.time_to_next_fire(self.start), 5)
+        runs = {}
+        for second in range(1, 15):
+            self._eval(second)
+            if self.runs:
+                runs[second] = self.runs
+                self.runs = []
+        self.assertEqual(runs, {5: ['five'], 7: ['seven'], 10: ['five'], 14: ['seven']})
+        self.assertEqual(self.evaluated[0], ['five', 'seven'])
+        self.assertEqual(
+            [(second, due) for second, due in enumerate(self.evaluated) if due],
+            [(0, ['five', 'seven']), (5, ['five']), (7, ['seven']),
+             (10, ['five']), (14, ['seven'])])
+
+    def test_eval_changed_jobs(self):
+        '''
+        Jobs which are added, replaced or modified are evaluated right away
+        '''
+        self._eval(0)
+        self.schedule.opts['schedule']['nine'] = {'function': 'test.true', 'seconds': 9}
+        self._eval(1)
+        self.assertEqual(self.evaluated[-1], ['nine'])
+
+        with patch('salt.utils.event.get_event', MagicMock()):
+            self.schedule.disable_job('five', persist=False)
+        self._eval(2)
+        self.assertEqual(self.evaluated[-1], ['five'])
+        self._eval(5)
+        self.assertEqual(self.runs, [])
+
+        self.schedule.opts['schedule']['seven'] = {'function': 'test.true', 'seconds': 3}
+        self._eval(6)
+        self.assertEqual(self.evaluated[-1], ['seven'])
+        self._eval(9)
+        self.assertEqual(self.runs, ['seven'])
+
+    def test_eval_changed_settings(self):
+        '''
+        All of the jobs are evaluated when the settings for all of the jobs or
+        the pillar change
+        '''
+        self._eval(0)
+        self.schedule.opts['schedule']['splay'] = 2
+        self._eval(1)
+        self.assertEqual(self.evaluated[-1], ['five', 'seven'])
+        self._eval(2)
+        self.assertEqual(self.evaluated[-1], [])
+        self.schedule.opts['pillar'] = {'schedule': {}}
+        self._eval(3)
+        self.assertEqual(self.evaluated[-1], ['five', 'seven'])
+
+    def test_time_to_next_fire(self):
+        '''
+        Jobs without a next fire time in the future are evaluated every time
+        '''
+        self.assertIsNone(self.schedule.time_to_next_fire())
+        self.schedule.opts['schedule'] = {
+            'once': {'function': 'test.true', 'once': '2017-12-31T00:00:00'}}
+        self._eval(0)
+        self.assertIsNone(self.schedule.time_to_next_fire(self.start))
+        self._eval(1)
+        self.assertEqual(self.evaluated, [['once'], ['once']])
+        self.schedule.queue = False
+        self.schedule.opts['schedule'] = {
+            'once': {'function': 'test.true', 'once': '2018-01-01T00:01:00'}}
+        self._eval(2)
+        self.assertIsNone(self.schedule.time_to_next_fire(self.start))
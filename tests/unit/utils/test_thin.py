@@ -5,7 +5,11 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 import os
+import shutil
 import sys
+import tarfile
+import tempfile
+import threading
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import (
     NO_MOCK,
@@ -13,7 +17,9 @@ from tests.support.mock import (
     MagicMock,
     patch)
 
+import salt.client.ssh.ssh_py_shim as shim
 import salt.exceptions
+import salt.utils.files
 from salt.utils import thin
 from salt.utils import json
 import salt.utils.stringutils
@@ -610,3 +616,111 @@ class SSHThinTestCase(TestCase):
             tops=tops, extended_cfg=ext_cfg)).strip().split('\n')
         for t_line in ['second-system-effect:2:7', 'solar-interference:2:6']:
             assert t_line in out
+
+
+class ThinDeltaTestCase(TestCase):
+    '''
+    TestCase for incremental thin deployment
+    '''
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.cachedir = os.path.join(self.root, 'cache')
+        os.makedirs(os.path.join(self.cachedir, 'thin'))
+
+    def _write(self, path, files):
+        for name, content in files.items():
+            fpath = os.path.join(path, name)
+            if not os.path.isdir(os.path.dirname(fpath)):
+                os.makedirs(os.path.dirname(fpath))
+            with salt.utils.files.fopen(fpath, 'w') as fp_:
+                fp_.write(content)
+
+    def _read(self, path):
+        files = {}
+        for root, dirs, names in os.walk(path):
+            for name in names:
+                fpath = os.path.join(root, name)
+                with salt.utils.files.fopen(fpath) as fp_:
+                    files[os.path.relpath(fpath, path)] = fp_.read()
+        return files
+
+    def _gen_thin(self, files):
+        '''
+        Stand in for gen_thin, the files are packed in sorted order
+        '''
+        src = os.path.join(self.root, 'src')
+        shutil.rmtree(src, ignore_errors=True)
+        self._write(src, files)
+        thindir = os.path.join(self.cachedir, 'thin')
+        self._write(thindir, {'code-checksum': files['code-checksum']})
+        tfp = tarfile.open(os.path.join(thindir, 'thin.tgz'), 'w:gz')
+        for name in sorted(files):
+            tfp.add(os.path.join(src, name), arcname=name)
+        tfp.close()
+
+    def test_thin_delta(self):
+        '''
+        Only the files which changed are sent, the ones gone are removed
+        '''
+        old = {'code-checksum': 'aaa', 'salt-call': 'call',
+               'py3/salt/a.py': 'a', 'py3/salt/b.py': 'b', 'py3/salt/c.py': 'c'}
+        new = {'code-checksum': 'bbb', 'salt-call': 'call',
+               'py3/salt/a.py': 'a', 'py3/salt/b.py': 'b2', 'py3/salt/d.py': 'd'}
+        self._gen_thin(old)
+        self.assertEqual(thin.thin_manifest(self.cachedir), 'aaa')
+        self._gen_thin(new)
+        self.assertIsNone(thin.gen_thin_delta(self.cachedir, 'ccc'))
+        self.assertIsNone(thin.gen_thin_delta(self.cachedir, '../aaa'))
+        delta = thin.gen_thin_delta(self.cachedir, 'aaa')
+        self.assertEqual(thin.gen_thin_delta(self.cachedir, 'aaa'), delta)
+        tfp = tarfile.open(delta)
+        self.assertEqual(
+            tfp.getnames(),
+            ['py3/salt/b.py', 'py3/salt/d.py', 'salt-call', 'code-checksum', thin.THIN_DELTA])
+        tfp.close()
+
+        # What the shim does with it on the target
+        saltdir = os.path.join(self.root, 'saltdir')
+        self._write(saltdir, old)
+        shutil.copy(delta, os.path.join(saltdir, shim.THIN_ARCHIVE))
+        with patch.object(shim, 'OPTIONS', MagicMock(saltdir=saltdir, incremental=True)):
+            shim.unpack_thin(os.path.join(saltdir, shim.THIN_ARCHIVE))
+        self.assertEqual(self._read(saltdir), new)
+
+        # A full thin replaces whatever was there
+        self._write(saltdir, {'stale.py': ''})
+        shutil.copy(os.path.join(self.cachedir, 'thin', 'thin.tgz'),
+                    os.path.join(saltdir, shim.THIN_ARCHIVE))
+        with patch.object(shim, 'OPTIONS', MagicMock(saltdir=saltdir, incremental=True)):
+            shim.unpack_thin(os.path.join(saltdir, shim.THIN_ARCHIVE))
+        self.assertEqual(self._read(saltdir), new)
+
+    def test_thin_delta_threads(self):
+        '''
+        Threads deploying at the same time build the delta once and all get a
+        complete one
+        '''
+        self._gen_thin({'code-checksum': 'aaa', 'py3/salt/a.py': 'a'})
+        thin.thin_manifest(self.cachedir)
+        self._gen_thin({'code-checksum': 'bbb', 'py3/salt/a.py': 'a2'})
+        deltas = []
+
+        def _deploy():
+            deltas.append(thin.gen_thin_delta(self.cachedir, 'aaa'))
+
+        with patch('salt.utils.thin._tmp_path', wraps=thin._tmp_path) as tmp_path:
+            threads = [threading.Thread(target=_deploy) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        # One for the manifest of the new thin, one for the delta
+        self.assertEqual(tmp_path.call_count, 2)
+        self.assertEqual(len(set(deltas)), 1)
+        tfp = tarfile.open(deltas[0])
+        self.assertEqual(tfp.getnames(),
+                         ['py3/salt/a.py', 'code-checksum', thin.THIN_DELTA])
+        tfp.close()
+        self.assertEqual(os.listdir(os.path.dirname(deltas[0])),
+                         [os.path.basename(deltas[0])])
@@ -10,8 +10,10 @@ import textwrap
 
 # Import Salt Libs
 from yaml.constructor import ConstructorError
+from yaml.scanner import ScannerError
 from salt.utils.yamlloader import SaltYamlSafeLoader
 import salt.utils.files
+import salt.utils.yamlloader
 from salt.ext import six
 
 # Import Salt Testing Libs
@@ -172,3 +174,46 @@ class YamlLoaderTestCase(TestCase):
                   b: {foo: bar, one: 1, list: [1, two, 3]}''')),
             {'foo': {'b': {'foo': 'bar', 'one': 1, 'list': [1, 'two', 3]}}}
         )
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+@skipIf(not salt.utils.yamlloader.HAS_LIBYAML, 'libyaml is not available')
+class YamlCLoaderTestCase(YamlLoaderTestCase):
+    '''
+    Run the SaltYamlSafeLoader tests against the libyaml based loader
+    '''
+    @staticmethod
+    def render_yaml(data):
+        '''
+        Takes a YAML string, puts it into a mock file, and loads it with the
+        SaltYamlSafeCLoader
+        '''
+        if six.PY2:
+            data = salt.utils.data.encode(data)
+        with patch('salt.utils.files.fopen', mock_open(read_data=data)) as mocked_file:
+            with salt.utils.files.fopen(mocked_file) as mocked_stream:
+                return salt.utils.yamlloader.load(
+                    mocked_stream, Loader=salt.utils.yamlloader.SaltYamlSafeCLoader)
+
+    def test_default_loader(self):
+        '''
+        Test that the libyaml based loader is used by default
+        '''
+        self.assertIs(salt.utils.yamlloader.FastSaltYamlSafeLoader,
+                      salt.utils.yamlloader.SaltYamlSafeCLoader)
+
+    def test_fallback(self):
+        '''
+        Test that YAML which libyaml fails to parse is loaded again with the
+        pure Python loader
+        '''
+        error = ScannerError(problem='found unexpected \':\'')
+        with patch.object(salt.utils.yamlloader.SaltYamlSafeCLoader,
+                          'get_single_node', side_effect=error):
+            self.assertEqual(
+                salt.utils.yamlloader.load("foo: {u'c': u'https://foo.com'}"),
+                {'foo': {'c': 'https://foo.com'}})
+            with self.assertRaises(ScannerError) as exc:
+                salt.utils.yamlloader.load('foo:\n\t- bar')
+        # The error comes from the pure Python loader
+        self.assertIsNotNone(exc.exception.problem_mark.buffer)